@@ -1,9 +1,8 @@
 from celery.utils.log import get_task_logger
-from django.db.models import Exists, OuterRef, Q
 
 from ..attribute.models import AttributeValue
 from ..celeryconf import app
-from ..product.models import Product, ProductVariant
+from ..product.search import mark_attribute_value_search_index_changed
 
 task_logger = get_task_logger(__name__)
 
@@ -22,10 +21,4 @@ def update_associated_products_search_vector(attribute_value_pk: int):
         )
         return
 
-    variants = ProductVariant.objects.filter(
-        Exists(instance.variantassignments.filter(variant_id=OuterRef("id")))
-    )
-    Product.objects.filter(
-        Q(Exists(instance.productassignments.filter(product_id=OuterRef("id"))))
-        | Q(Exists(variants.filter(product_id=OuterRef("id"))))
-    ).update(search_index_dirty=True)
+    mark_attribute_value_search_index_changed(instance.pk)
@@ -286,7 +286,7 @@ def fetch_checkout_lines(
             # discount from voucher
             return lines_info, unavailable_variant_pks
         if voucher.type == VoucherType.SPECIFIC_PRODUCT or voucher.apply_once_per_order:
-            discounts = fetch_active_discounts()
+            discounts = fetch_active_discounts(channel_slug)
             voucher_info = fetch_voucher_info(voucher)
             apply_voucher_to_checkout_line(
                 voucher_info, checkout, lines_info, discounts
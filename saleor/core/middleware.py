@@ -1,10 +1,13 @@
+import asyncio
 import logging
 from datetime import datetime
 from typing import TYPE_CHECKING, Union
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.exceptions import MiddlewareNotUsed
 from django.utils import timezone
+from django.utils.decorators import sync_and_async_middleware
 from django.utils.translation import get_language
 
 from . import analytics
@@ -19,13 +22,14 @@ Requestor = Union["User", "App"]
 logger = logging.getLogger(__name__)
 
 
+@sync_and_async_middleware
 def google_analytics(get_response):
     """Report a page view to Google Analytics."""
 
     if not settings.GOOGLE_ANALYTICS_TRACKING_ID:
         raise MiddlewareNotUsed()
 
-    def _google_analytics_middleware(request):
+    def _report_view(request):
         client_id = analytics.get_client_id(request)
         path = request.path
         language = get_language()
@@ -36,12 +40,32 @@ def google_analytics(get_response):
             )
         except Exception:
             logger.exception("Unable to update analytics")
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def _google_analytics_middleware_async(request):
+            await sync_to_async(_report_view, thread_sensitive=False)(request)
+            return await get_response(request)
+
+        return _google_analytics_middleware_async
+
+    def _google_analytics_middleware(request):
+        _report_view(request)
         return get_response(request)
 
     return _google_analytics_middleware
 
 
+@sync_and_async_middleware
 def request_time(get_response):
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def _stamp_request_async(request):
+            request.request_time = timezone.now()
+            return await get_response(request)
+
+        return _stamp_request_async
+
     def _stamp_request(request):
         request.request_time = timezone.now()
         return get_response(request)
@@ -49,30 +73,39 @@ def request_time(get_response):
     return _stamp_request
 
 
+def set_jwt_refresh_token_cookie(request, response):
+    """Append generated refresh_token to response object."""
+    jwt_refresh_token = getattr(request, "refresh_token", None)
+    if jwt_refresh_token:
+        expires = None
+        secure = not settings.DEBUG
+        if settings.JWT_EXPIRE:
+            refresh_token_payload = jwt_decode_with_exception_handler(jwt_refresh_token)
+            if refresh_token_payload and refresh_token_payload.get("exp"):
+                expires = datetime.utcfromtimestamp(refresh_token_payload.get("exp"))
+        response.set_cookie(
+            JWT_REFRESH_TOKEN_COOKIE_NAME,
+            jwt_refresh_token,
+            expires=expires,
+            httponly=True,  # protects token from leaking
+            secure=secure,
+            samesite="None" if secure else "Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
 def jwt_refresh_token_middleware(get_response):
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware_async(request):
+            response = await get_response(request)
+            return set_jwt_refresh_token_cookie(request, response)
+
+        return middleware_async
+
     def middleware(request):
-        """Append generated refresh_token to response object."""
         response = get_response(request)
-        jwt_refresh_token = getattr(request, "refresh_token", None)
-        if jwt_refresh_token:
-            expires = None
-            secure = not settings.DEBUG
-            if settings.JWT_EXPIRE:
-                refresh_token_payload = jwt_decode_with_exception_handler(
-                    jwt_refresh_token
-                )
-                if refresh_token_payload and refresh_token_payload.get("exp"):
-                    expires = datetime.utcfromtimestamp(
-                        refresh_token_payload.get("exp")
-                    )
-            response.set_cookie(
-                JWT_REFRESH_TOKEN_COOKIE_NAME,
-                jwt_refresh_token,
-                expires=expires,
-                httponly=True,  # protects token from leaking
-                secure=secure,
-                samesite="None" if secure else "Lax",
-            )
-        return response
+        return set_jwt_refresh_token_cookie(request, response)
 
     return middleware
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.19 on 2026-10-18 12:00
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_alter_eventdelivery_webhook"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("event_type", models.CharField(max_length=255)),
+                ("payload", models.TextField(blank=True)),
+                (
+                    "webhook_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(), size=None
+                    ),
+                ),
+                ("object_type", models.CharField(blank=True, max_length=255)),
+                ("object_id", models.CharField(blank=True, max_length=255)),
+                ("requestor_type", models.CharField(blank=True, max_length=255)),
+                ("requestor_id", models.CharField(blank=True, max_length=255)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ("pk",),
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@ import datetime
 from typing import Any
 
 import pytz
+from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.indexes import GinIndex
 from django.db import models, transaction
 from django.db.models import JSONField  # type: ignore
@@ -146,6 +147,27 @@ class EventDelivery(models.Model):
         ordering = ("-created_at",)
 
 
+class OutboxEvent(models.Model):
+    """Async event committed together with the change that triggered it.
+
+    Deliveries of the event are created by the outbox dispatcher, once the
+    transaction is committed.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    event_type = models.CharField(max_length=255)
+    payload = models.TextField(blank=True)
+    webhook_ids = ArrayField(models.PositiveIntegerField())
+    object_type = models.CharField(max_length=255, blank=True)
+    object_id = models.CharField(max_length=255, blank=True)
+    requestor_type = models.CharField(max_length=255, blank=True)
+    requestor_id = models.CharField(max_length=255, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ("pk",)
+
+
 class EventDeliveryAttempt(models.Model):
     delivery = models.ForeignKey(
         EventDelivery, related_name="attempts", null=True, on_delete=models.CASCADE
@@ -6,8 +6,9 @@ from django.contrib.postgres.search import (
     CombinedSearchVector,
     SearchVector,
     SearchVectorCombinable,
+    SearchVectorField,
 )
-from django.db.models import Expression
+from django.db.models import Expression, Func, Value
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,21 @@ class NoValidationSearchVector(SearchVector, NoValidationSearchVectorCombinable)
     """
 
 
+class FilterSearchVectorWeights(Func):
+    """Keep only the lexemes of the search vector that have the given weights."""
+
+    function = "ts_filter"
+    template = '%(function)s(%(expressions)s::"char"[])'
+    output_field = SearchVectorField()
+
+    contains_aggregate = False
+    contains_over_clause = False
+
+    def __init__(self, expression, weights):
+        weights_array = "{%s}" % ",".join(sorted(weights)).lower()
+        super().__init__(expression, Value(weights_array))
+
+
 class FlatConcat(Expression):
     """Generate a SQL statements for expressions to be concatenated.
 
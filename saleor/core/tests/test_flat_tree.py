@@ -0,0 +1,31 @@
+from ...product.models import Category
+from ..utils.flat_tree import FlatTree
+
+
+def _category(pk, parent_id=None):
+    return Category(pk=pk, parent_id=parent_id, name=str(pk), slug=str(pk))
+
+
+def test_flat_tree_lookups():
+    # given
+    nodes = [
+        _category(1),
+        _category(2, parent_id=1),
+        _category(3, parent_id=2),
+        _category(4, parent_id=1),
+        _category(5),
+    ]
+
+    # when
+    tree = FlatTree(nodes)
+
+    # then
+    assert tree.parents == [-1, 0, 1, 0, -1]
+    assert tree.get(3) == nodes[2]
+    assert tree.get(6) is None
+    assert tree.get_roots() == [nodes[0], nodes[4]]
+    assert tree.get_children(1) == [nodes[1], nodes[3]]
+    assert tree.get_children(6) == []
+    assert tree.get_subtree_ids(1) == [1, 2, 3, 4]
+    assert tree.get_subtree_ids(1, include_self=False) == [2, 3, 4]
+    assert tree.get_subtree_ids(6) == []
@@ -1,3 +1,4 @@
+from asgiref.sync import async_to_sync
 from django.core.handlers.base import BaseHandler
 from freezegun import freeze_time
 
@@ -78,3 +79,18 @@ def test_jwt_refresh_token_middleware_samesite_none(rf, customer_user, settings)
     response = handler.get_response(request)
     cookie = response.cookies.get(JWT_REFRESH_TOKEN_COOKIE_NAME)
     assert cookie["samesite"] == "None"
+
+
+@freeze_time("2020-03-18 12:00:00")
+def test_jwt_refresh_token_middleware_async(rf, customer_user, settings):
+    refresh_token = create_refresh_token(customer_user)
+    settings.MIDDLEWARE = [
+        "saleor.core.middleware.jwt_refresh_token_middleware",
+    ]
+    request = rf.request()
+    request.refresh_token = refresh_token
+    handler = BaseHandler()
+    handler.load_middleware(is_async=True)
+    response = async_to_sync(handler.get_response_async)(request)
+    cookie = response.cookies.get(JWT_REFRESH_TOKEN_COOKIE_NAME)
+    assert cookie.value == refresh_token
@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, Optional, Set, Type, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+
+from .versioned_cache import increment_cache_version
+
+
+def get_cache_tag_version_key(tag: str) -> str:
+    return f"cache-tag:{tag}"
+
+
+def get_model_cache_tag(model: Union[Model, Type[Model]]) -> str:
+    return model._meta.label_lower
+
+
+def get_instance_cache_tag(instance: Model) -> str:
+    return f"{get_model_cache_tag(instance)}:{instance.pk}"
+
+
+def get_cache_tags_versions(tags: Iterable[str]) -> Dict[str, Optional[int]]:
+    """Return the current versions of the tags; `None` if a tag was never purged."""
+    keys = {get_cache_tag_version_key(tag): tag for tag in tags}
+    versions = cache.get_many(list(keys))
+    return {tag: versions.get(key) for key, tag in keys.items()}
+
+
+def get_cache_tag_version_timeout() -> int:
+    # An expired version is read as never purged, so it has to outlive every
+    # response cached before it was set; otherwise that response would be valid
+    # again.
+    return 2 * (
+        settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+        + settings.GRAPHQL_RESPONSE_CACHE_STALE_TIMEOUT
+    )
+
+
+def purge_cache_tags(tags: Iterable[str]):
+    """Invalidate cache entries tagged with any of the tags.
+
+    Entries store the versions of their tags from the time they were built, so
+    bumping a version makes them stale. The versions are bumped once the current
+    transaction is committed.
+    """
+    if not settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+        return
+    timeout = get_cache_tag_version_timeout()
+    for tag in tags:
+        increment_cache_version(get_cache_tag_version_key(tag), timeout=timeout)
+
+
+def purge_instances_cache_tags(instances: Iterable[Model]):
+    """Invalidate cache entries tagged with the instances or with their models."""
+    tags: Set[str] = set()
+    for instance in instances:
+        tags.add(get_model_cache_tag(instance))
+        tags.add(get_instance_cache_tag(instance))
+    purge_cache_tags(tags)
@@ -0,0 +1,58 @@
+from typing import Dict, Generic, Iterable, List, Optional, TypeVar
+
+from django.db.models import Model
+
+T = TypeVar("T", bound=Model)
+
+
+class FlatTree(Generic[T]):
+    """Tree of model instances kept in flat lists, for lookups without queries.
+
+    Nodes keep the given order, which is also the order of roots and children.
+    `parents[i]` is the index of the parent of the node at index `i`, or -1 for
+    roots, and `children[i]` holds the indexes of its children.
+    """
+
+    def __init__(self, nodes: Iterable[T], parent_field: str = "parent_id"):
+        self.nodes: List[T] = list(nodes)
+        self.ids: List[int] = [node.pk for node in self.nodes]
+        self._indexes: Dict[int, int] = {pk: index for index, pk in enumerate(self.ids)}
+        self.parents: List[int] = [
+            self._indexes.get(getattr(node, parent_field), -1) for node in self.nodes
+        ]
+        self.roots: List[int] = []
+        self.children: List[List[int]] = [[] for _ in self.nodes]
+        for index, parent in enumerate(self.parents):
+            if parent == -1:
+                self.roots.append(index)
+            else:
+                self.children[parent].append(index)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def get(self, pk: int) -> Optional[T]:
+        index = self._indexes.get(pk)
+        return None if index is None else self.nodes[index]
+
+    def get_roots(self) -> List[T]:
+        return [self.nodes[index] for index in self.roots]
+
+    def get_children(self, pk: int) -> List[T]:
+        index = self._indexes.get(pk)
+        if index is None:
+            return []
+        return [self.nodes[child] for child in self.children[index]]
+
+    def get_subtree_ids(self, pk: int, include_self: bool = True) -> List[int]:
+        """Return IDs of all descendants of the node, in depth-first order."""
+        index = self._indexes.get(pk)
+        if index is None:
+            return []
+        subtree_ids = []
+        stack = [index] if include_self else list(reversed(self.children[index]))
+        while stack:
+            index = stack.pop()
+            subtree_ids.append(self.ids[index])
+            stack.extend(reversed(self.children[index]))
+        return subtree_ids
@@ -0,0 +1,70 @@
+import random
+from time import monotonic
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from django.core.cache import cache
+from django.db import transaction
+from pytimeparse import parse
+
+T = TypeVar("T")
+
+# Safety net for the in-memory entries in case a version bump was lost, e.g. when
+# the data was changed outside of the API.
+DEFAULT_MAX_AGE = parse("10 minutes")
+
+
+def get_cache_version(version_key: str) -> Optional[int]:
+    return cache.get(version_key)
+
+
+def increment_cache_version(version_key: str, timeout: Optional[int] = None):
+    """Bump the shared version counter once the current transaction is committed.
+
+    The counter starts from a random value, so a counter evicted from the cache
+    won't be recreated with the version that some process already has cached.
+    The `timeout` applies when the counter is created; incrementing it doesn't
+    extend it.
+    """
+
+    def _increment():
+        if cache.add(version_key, random.randint(1, 2**31), timeout=timeout):
+            return
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # The key expired between `add` and `incr`.
+            cache.set(version_key, random.randint(1, 2**31), timeout=timeout)
+
+    transaction.on_commit(_increment)
+
+
+class VersionedMemoryCache(Generic[T]):
+    """Process-wide cache rebuilt when the shared version counter changes.
+
+    Values are kept in the memory of the current process and shared between all
+    requests, while the version counter is stored in the Django cache, so bumping it
+    with `increment_cache_version` invalidates the values in all workers.
+    """
+
+    def __init__(self, version_key: str, max_age: float = DEFAULT_MAX_AGE):
+        self.version_key = version_key
+        self.max_age = max_age
+        self._entries: Dict[Hashable, Tuple[Optional[int], float, T]] = {}
+
+    def get_or_build(self, key: Hashable, build: Callable[[], T]) -> T:
+        # The version has to be fetched before building the value; otherwise a
+        # change committed in the meantime could be stored under the new version.
+        version = get_cache_version(self.version_key)
+        if cached := self._entries.get(key):
+            cached_version, built_at, value = cached
+            if cached_version == version and monotonic() - built_at <= self.max_age:
+                return value
+        value = build()
+        self._entries[key] = (version, monotonic(), value)
+        return value
+
+    def invalidate(self):
+        increment_cache_version(self.version_key)
+
+    def clear(self):
+        self._entries.clear()
@@ -32,3 +32,13 @@ class FileTypes:
         (CSV, "Plain CSV file."),
         (XLSX, "Excel XLSX file."),
     ]
+
+
+class ImportFileTypes:
+    CSV = "csv"
+    JSONL = "jsonl"
+
+    CHOICES = [
+        (CSV, "Plain CSV file."),
+        (JSONL, "JSON Lines file, with a JSON object per line."),
+    ]
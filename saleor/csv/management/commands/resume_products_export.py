@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ....core import JobStatus
+from ...models import ExportFile
+from ...tasks import export_products_in_shards_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Resume a failed products export exported in shards. "
+        "Shards exported before the failure are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("export_file_id", type=int)
+
+    def handle(self, *args, **options):
+        export_file_id = options["export_file_id"]
+        export_file = ExportFile.objects.filter(pk=export_file_id).first()
+        if not export_file:
+            raise CommandError(f"Export file {export_file_id} doesn't exist.")
+        if export_file.status != JobStatus.FAILED:
+            raise CommandError("Only failed exports can be resumed.")
+        if "arguments" not in export_file.checkpoint:
+            raise CommandError("The export wasn't exported in shards.")
+
+        export_file.status = JobStatus.PENDING
+        export_file.save(update_fields=["status", "updated_at"])
+        export_products_in_shards_task.delay(
+            export_file.pk, *export_file.checkpoint["arguments"]
+        )
+        self.stdout.write(f"Resumed export of export file {export_file_id}.")
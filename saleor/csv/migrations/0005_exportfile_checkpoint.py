@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+import saleor.core.utils.json_serializer
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("csv", "0004_auto_20210709_1043"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportfile",
+            name="checkpoint",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                encoder=saleor.core.utils.json_serializer.CustomJsonEncoder,
+            ),
+        ),
+    ]
@@ -6,7 +6,7 @@ from ..account.models import User
 from ..app.models import App
 from ..core.models import Job
 from ..core.utils.json_serializer import CustomJsonEncoder
-from . import ExportEvents
+from . import ExportEvents, ImportFileTypes
 
 
 class ExportFile(Job):
@@ -17,6 +17,22 @@ class ExportFile(Job):
         App, related_name="export_files", on_delete=models.CASCADE, null=True
     )
     content_file = models.FileField(upload_to="export_files", null=True)
+    # Progress of exports split into shards: PK ranges of the shards and storage
+    # paths of the parts of the completed shards.
+    checkpoint = JSONField(blank=True, default=dict, encoder=CustomJsonEncoder)
+
+
+class ImportFile(Job):
+    user = models.ForeignKey(
+        User, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    app = models.ForeignKey(
+        App, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    content_file = models.FileField(upload_to="import_files")
+    file_type = models.CharField(max_length=50, choices=ImportFileTypes.CHOICES)
+    # Errors of the rows that weren't imported.
+    errors = JSONField(blank=True, default=list, encoder=CustomJsonEncoder)
 
 
 class ExportEvent(models.Model):
@@ -1,9 +1,11 @@
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 
 import celery
+from celery.exceptions import ChordError
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.files.storage import default_storage
+from django.db import DatabaseError
 from django.db.models import Q
 from django.db.models.expressions import Exists, OuterRef
 from django.utils import timezone
@@ -11,38 +13,53 @@ from django.utils import timezone
 from ..celeryconf import app
 from ..core import JobStatus
 from . import events
-from .models import ExportEvent, ExportFile
+from .models import ExportEvent, ExportFile, ImportFile
 from .notifications import send_export_failed_info
-from .utils.export import export_gift_cards, export_products
+from .utils.export import (
+    export_gift_cards,
+    export_products,
+    export_products_shard,
+    get_pending_products_export_shards,
+    merge_products_export,
+)
+from .utils.products_import import import_products
 
 task_logger = get_task_logger(__name__)
 
 
+def report_export_failure(
+    export_file_id: int, data_type: Optional[str], exc: BaseException, error_type
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+
+    export_file.content_file = None
+    export_file.status = JobStatus.FAILED
+    export_file.save(update_fields=["status", "updated_at", "content_file"])
+
+    events.export_failed_event(
+        export_file=export_file,
+        user=export_file.user,
+        app=export_file.app,
+        message=str(exc),
+        error_type=str(error_type),
+    )
+
+    send_export_failed_info(export_file, data_type)
+
+
 class ExportTask(celery.Task):
     # should be updated when new export task is added
     TASK_NAME_TO_DATA_TYPE_MAPPING = {
         "export-products": "products",
         "export-gift-cards": "gift cards",
+        "export-products-in-shards": "products",
+        "export-products-shard": "products",
+        "merge-products-export": "products",
     }
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
-        export_file_id = args[0]
-        export_file = ExportFile.objects.get(pk=export_file_id)
-
-        export_file.content_file = None
-        export_file.status = JobStatus.FAILED
-        export_file.save(update_fields=["status", "updated_at", "content_file"])
-
-        events.export_failed_event(
-            export_file=export_file,
-            user=export_file.user,
-            app=export_file.app,
-            message=str(exc),
-            error_type=str(einfo.type),
-        )
-
         data_type = ExportTask.TASK_NAME_TO_DATA_TYPE_MAPPING.get(self.name)
-        send_export_failed_info(export_file, data_type)
+        report_export_failure(args[0], data_type, exc, einfo.type)
 
     def on_success(self, retval, task_id, args, kwargs):
         export_file_id = args[0]
@@ -67,6 +84,108 @@ def export_products_task(
     export_products(export_file, scope, export_info, file_type, delimiter)
 
 
+class ExportPartTask(ExportTask):
+    """Task doing a part of an export, finished by another task."""
+
+    def on_success(self, retval, task_id, args, kwargs):
+        pass
+
+
+class ExportShardTask(ExportPartTask):
+    """Task exporting a shard, run in parallel with the other shards of an export.
+
+    Failures are reported once for all the shards, by the error callback of the
+    chord merging them.
+    """
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        pass
+
+
+@app.task(name="export-products-in-shards", base=ExportPartTask)
+def export_products_in_shards_task(
+    export_file_id: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ",",
+):
+    """Export products in shards run in parallel and merge them when all are done.
+
+    Shards exported by previous runs for the same export file are skipped, so
+    the task can be run again to resume a failed export. The arguments are kept
+    in the export file checkpoint, so failed exports can be resumed with the
+    `resume_products_export` command.
+    """
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    pending_shards = get_pending_products_export_shards(export_file, scope)
+    if "arguments" not in export_file.checkpoint:
+        export_file.checkpoint["arguments"] = [
+            scope,
+            export_info,
+            file_type,
+            delimiter,
+        ]
+        export_file.save(update_fields=["checkpoint", "updated_at"])
+    merge_task = merge_products_export_task.si(
+        export_file_id, export_info, file_type, delimiter
+    )
+    if not pending_shards:
+        merge_task.delay()
+        return
+
+    merge_task.link_error(export_products_shards_failed_task.s(export_file_id))
+    celery.chord(
+        export_products_shard_task.si(
+            export_file_id, shard_index, scope, export_info, file_type, delimiter
+        )
+        for shard_index in pending_shards
+    )(merge_task)
+
+
+@app.task(
+    name="export-products-shard",
+    base=ExportShardTask,
+    autoretry_for=(DatabaseError, OSError),
+    retry_backoff=10,
+    retry_kwargs={"max_retries": 3},
+)
+def export_products_shard_task(
+    export_file_id: int,
+    shard_index: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ",",
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    export_products_shard(
+        export_file, shard_index, scope, export_info, file_type, delimiter
+    )
+
+
+@app.task(name="export-products-shards-failed")
+def export_products_shards_failed_task(request, exc, traceback, export_file_id: int):
+    """Report a failed products export when any of its shards failed.
+
+    Called by the chord once for all the shards. Failures of the merge are
+    reported by the merge task itself.
+    """
+    if isinstance(exc, ChordError):
+        report_export_failure(export_file_id, "products", exc, type(exc))
+
+
+@app.task(name="merge-products-export", base=ExportTask)
+def merge_products_export_task(
+    export_file_id: int,
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ",",
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    merge_products_export(export_file, export_info, file_type, delimiter)
+
+
 @app.task(name="export-gift-cards", base=ExportTask)
 def export_gift_cards_task(
     export_file_id: int,
@@ -78,6 +197,31 @@ def export_gift_cards_task(
     export_gift_cards(export_file, scope, file_type, delimiter)
 
 
+class ImportTask(celery.Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        import_file = ImportFile.objects.get(pk=args[0])
+        import_file.status = JobStatus.FAILED
+        import_file.message = str(exc)[:255]
+        import_file.save(update_fields=["status", "message", "updated_at"])
+
+
+@app.task(name="import-products", base=ImportTask)
+def import_products_task(import_file_id: int):
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    result = import_products(import_file, import_file.file_type)
+
+    import_file.status = JobStatus.SUCCESS
+    import_file.errors = result.errors
+    import_file.message = (
+        f"Processed {result.rows_count} rows: "
+        f"created {len(result.created_product_ids)} products, "
+        f"{len(result.created_variant_ids)} variants; "
+        f"updated {len(result.updated_product_ids)} products, "
+        f"{len(result.updated_variant_ids)} variants."
+    )
+    import_file.save(update_fields=["status", "errors", "message", "updated_at"])
+
+
 @app.task
 def delete_old_export_files():
     now = timezone.now()
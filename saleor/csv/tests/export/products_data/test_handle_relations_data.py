@@ -16,6 +16,7 @@ from ....utils.products_data import (
     add_warehouse_info_to_data,
     get_products_relations_data,
     get_variants_relations_data,
+    iter_relations_data,
     prepare_products_relations_data,
     prepare_variants_relations_data,
 )
@@ -216,6 +217,29 @@ def test_prepare_products_relations_data(
     assert result == expected_result
 
 
+def test_iter_relations_data(product_with_images, collection_list):
+    # given
+    product = product_with_images
+    collection_list[0].products.add(product)
+    collection_list[1].products.add(product)
+    qs = Product.objects.filter(pk=product.pk)
+
+    # when
+    result = list(
+        iter_relations_data(qs, "pk", [{"collections__slug"}, {"media__image"}])
+    )
+
+    # then
+    # collections and media are fetched separately, not as their cartesian product
+    assert len(result) == 4
+    assert {data["collections__slug"] for data in result[:2]} == {
+        collection.slug for collection in collection_list[:2]
+    }
+    assert {data["media__image"] for data in result[2:]} == {
+        media.image.name for media in product.media.all()
+    }
+
+
 def test_prepare_products_relations_data_only_fields(
     product_with_image, collection_list
 ):
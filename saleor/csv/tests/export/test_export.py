@@ -1,12 +1,11 @@
 import datetime
+import gzip
 import json
 import shutil
-from tempfile import NamedTemporaryFile
 from unittest.mock import ANY, MagicMock, patch
 
 import graphene
 import openpyxl
-import petl as etl
 import pytest
 from django.core.files import File
 from freezegun import freeze_time
@@ -18,24 +17,27 @@ from ....graphql.product.filters import ProductFilter
 from ....product.models import Product, ProductChannelListing
 from ... import FileTypes
 from ...utils.export import (
-    append_to_file,
-    create_file_with_headers,
+    create_file_writer,
     export_gift_cards,
     export_gift_cards_in_batches,
     export_products,
     export_products_in_batches,
+    export_products_shard,
     get_filename,
+    get_pending_products_export_shards,
     get_queryset,
+    merge_products_export,
     parse_input,
     save_csv_file_in_export_file,
 )
+from ...utils.writers import ExportFileWriter, iter_file_rows
 
 
 @pytest.mark.parametrize(
     "file_type",
     [FileTypes.CSV, FileTypes.XLSX],
 )
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_products_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -43,7 +45,7 @@ def test_export_products(
     save_file_mock,
     send_email_mock,
     export_products_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     product_list,
     user_export_file,
     file_type,
@@ -61,7 +63,9 @@ def test_export_products(
     }
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
 
     product_list[0].variants.update(sku=None)
 
@@ -69,7 +73,7 @@ def test_export_products(
     export_products(user_export_file, {"all": ""}, export_info, file_type)
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(
+    create_file_writer_mock.assert_called_once_with(
         ["id", "name", "variant id", "variant sku"], ",", file_type
     )
     assert export_products_in_batches_mock.call_count == 1
@@ -81,15 +85,13 @@ def test_export_products(
         export_info,
         {"id", "name", "variants__id", "variants__sku"},
         ["id", "name", "variants__id", "variants__sku"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
 
 
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_products_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -97,7 +99,7 @@ def test_export_products_ids(
     save_file_mock,
     send_email_mock,
     export_products_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     product_list,
     user_export_file,
 ):
@@ -110,13 +112,15 @@ def test_export_products_ids(
     assert not user_export_file.content_file
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
 
     # when
     export_products(user_export_file, {"ids": pks}, export_info, file_type)
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(["id"], ",", file_type)
+    create_file_writer_mock.assert_called_once_with(["id"], ",", file_type)
 
     assert export_products_in_batches_mock.call_count == 1
     args, kwargs = export_products_in_batches_mock.call_args
@@ -128,15 +132,13 @@ def test_export_products_ids(
         export_info,
         {"id"},
         ["id"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
 
 
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_products_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -144,7 +146,7 @@ def test_export_products_filter_is_published(
     save_file_mock,
     send_email_mock,
     export_products_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     product_list,
     user_export_file,
     channel_USD,
@@ -161,7 +163,9 @@ def test_export_products_filter_is_published(
     assert not user_export_file.content_file
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
 
     # when
     export_products(
@@ -172,7 +176,7 @@ def test_export_products_filter_is_published(
     )
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(["id"], ",", file_type)
+    create_file_writer_mock.assert_called_once_with(["id"], ",", file_type)
 
     assert export_products_in_batches_mock.call_count == 1
     args, _ = export_products_in_batches_mock.call_args
@@ -185,15 +189,13 @@ def test_export_products_filter_is_published(
         export_info,
         {"id"},
         ["id"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
     )
     send_email_mock.assert_called_once_with(user_export_file, "products")
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
 
 
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_products_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -201,7 +203,7 @@ def test_export_products_filter_collections(
     save_file_mock,
     send_email_mock,
     export_products_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     product_list,
     user_export_file,
     channel_USD,
@@ -217,7 +219,9 @@ def test_export_products_filter_collections(
     assert not user_export_file.content_file
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
 
     # when
     export_products(
@@ -232,17 +236,17 @@ def test_export_products_filter_collections(
     )
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(["id"], ",", file_type)
+    create_file_writer_mock.assert_called_once_with(["id"], ",", file_type)
 
     assert export_products_in_batches_mock.call_count == 1
     batch_args, _ = export_products_in_batches_mock.call_args
     assert set(batch_args[0].values_list("pk", flat=True)) == {product_list[-1].pk}
-    assert batch_args[1:] == (export_info, {"id"}, ["id"], ",", mock_file, file_type)
+    assert batch_args[1:] == (export_info, {"id"}, ["id"], mock_writer)
     send_email_mock.assert_called_once_with(user_export_file, "products")
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
 
 
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_products_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -250,7 +254,7 @@ def test_export_products_by_app(
     save_file_mock,
     send_email_mock,
     export_products_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     product_list,
     app_export_file,
 ):
@@ -264,15 +268,15 @@ def test_export_products_by_app(
     file_type = FileTypes.CSV
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
 
     # when
     export_products(app_export_file, {"all": ""}, export_info, file_type)
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(
-        ["id", "name"], ",", file_type
-    )
+    create_file_writer_mock.assert_called_once_with(["id", "name"], ",", file_type)
 
     assert export_products_in_batches_mock.call_count == 1
     args, kwargs = export_products_in_batches_mock.call_args
@@ -283,9 +287,7 @@ def test_export_products_by_app(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
     )
 
     send_email_mock.assert_called_once_with(app_export_file, "products")
@@ -293,7 +295,7 @@ def test_export_products_by_app(
     save_file_mock.assert_called_once_with(app_export_file, mock_file, ANY)
 
 
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_gift_cards_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -301,7 +303,7 @@ def test_export_gift_cards(
     save_file_mock,
     send_email_mock,
     export_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     user_export_file,
     gift_card,
     gift_card_expiry_date,
@@ -310,13 +312,15 @@ def test_export_gift_cards(
     file_type = FileTypes.CSV
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
 
     # when
     export_gift_cards(user_export_file, {"all": ""}, file_type)
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(["code"], ",", file_type)
+    create_file_writer_mock.assert_called_once_with(["code"], ",", file_type)
 
     assert export_in_batches_mock.call_count == 1
     args, kwargs = export_in_batches_mock.call_args
@@ -325,9 +329,7 @@ def test_export_gift_cards(
     )
     assert args[1:] == (
         ["code"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
@@ -335,7 +337,7 @@ def test_export_gift_cards(
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
 
 
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_gift_cards_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -343,7 +345,7 @@ def test_export_gift_cards_by_app(
     save_file_mock,
     send_email_mock,
     export_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     app_export_file,
     gift_card,
     gift_card_expiry_date,
@@ -352,13 +354,15 @@ def test_export_gift_cards_by_app(
     file_type = FileTypes.CSV
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
 
     # when
     export_gift_cards(app_export_file, {"all": ""}, file_type)
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(["code"], ",", file_type)
+    create_file_writer_mock.assert_called_once_with(["code"], ",", file_type)
 
     assert export_in_batches_mock.call_count == 1
     args, kwargs = export_in_batches_mock.call_args
@@ -367,9 +371,7 @@ def test_export_gift_cards_by_app(
     )
     assert args[1:] == (
         ["code"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
     )
 
     send_email_mock.assert_called_once_with(app_export_file, "gift cards")
@@ -377,7 +379,7 @@ def test_export_gift_cards_by_app(
     save_file_mock.assert_called_once_with(app_export_file, mock_file, ANY)
 
 
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_gift_cards_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -385,7 +387,7 @@ def test_export_gift_cards_ids(
     save_file_mock,
     send_email_mock,
     export_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     user_export_file,
     gift_card,
     gift_card_expiry_date,
@@ -394,23 +396,23 @@ def test_export_gift_cards_ids(
     file_type = FileTypes.CSV
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
     pks = [gift_card.pk]
 
     # when
     export_gift_cards(user_export_file, {"ids": pks}, file_type)
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(["code"], ",", file_type)
+    create_file_writer_mock.assert_called_once_with(["code"], ",", file_type)
 
     assert export_in_batches_mock.call_count == 1
     args, kwargs = export_in_batches_mock.call_args
     assert set(args[0].values_list("pk", flat=True)) == set(pks)
     assert args[1:] == (
         ["code"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
@@ -418,7 +420,7 @@ def test_export_gift_cards_ids(
     save_file_mock.assert_called_once_with(user_export_file, mock_file, ANY)
 
 
-@patch("saleor.csv.utils.export.create_file_with_headers")
+@patch("saleor.csv.utils.export.create_file_writer")
 @patch("saleor.csv.utils.export.export_gift_cards_in_batches")
 @patch("saleor.csv.utils.export.send_export_download_link_notification")
 @patch("saleor.csv.utils.export.save_csv_file_in_export_file")
@@ -426,7 +428,7 @@ def test_export_gift_cards_with_filter(
     save_file_mock,
     send_email_mock,
     export_in_batches_mock,
-    create_file_with_headers_mock,
+    create_file_writer_mock,
     user_export_file,
     gift_card,
     gift_card_expiry_date,
@@ -436,7 +438,9 @@ def test_export_gift_cards_with_filter(
     file_type = FileTypes.CSV
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock(compressed=False)
+    mock_writer.close.return_value = mock_file
+    create_file_writer_mock.return_value = mock_writer
 
     gift_card_expiry_date.product = shippable_gift_card_product
     gift_card_used.product = shippable_gift_card_product
@@ -458,16 +462,14 @@ def test_export_gift_cards_with_filter(
     )
 
     # then
-    create_file_with_headers_mock.assert_called_once_with(["code"], ",", file_type)
+    create_file_writer_mock.assert_called_once_with(["code"], ",", file_type)
 
     assert export_in_batches_mock.call_count == 1
     args, kwargs = export_in_batches_mock.call_args
     assert set(args[0].values_list("pk", flat=True)) == {gift_card_expiry_date.pk}
     assert args[1:] == (
         ["code"],
-        ",",
-        mock_file,
-        file_type,
+        mock_writer,
     )
 
     send_email_mock.assert_called_once_with(user_export_file, "gift cards")
@@ -514,14 +516,14 @@ def get_product_queryset_filter(product_list):
     assert queryset.count() == len(product_list) - 1
 
 
-def test_create_file_with_headers_csv(user_export_file, tmpdir, media_root):
+def test_create_file_writer_csv(user_export_file, tmpdir, media_root):
     # given
     file_headers = ["id", "name", "collections"]
 
     assert not user_export_file.content_file
 
     # when
-    csv_file = create_file_with_headers(file_headers, ",", FileTypes.CSV)
+    csv_file = create_file_writer(file_headers, ",", FileTypes.CSV).close()
 
     # then
     assert csv_file
@@ -533,14 +535,14 @@ def test_create_file_with_headers_csv(user_export_file, tmpdir, media_root):
     shutil.rmtree(tmpdir)
 
 
-def test_create_file_with_headers_xlsx(user_export_file, tmpdir, media_root):
+def test_create_file_writer_xlsx(user_export_file, tmpdir, media_root):
     # given
     file_headers = ["id", "name", "collections"]
 
     assert not user_export_file.content_file
 
     # when
-    xlsx_file = create_file_with_headers(file_headers, ",", FileTypes.XLSX)
+    xlsx_file = create_file_writer(file_headers, ",", FileTypes.XLSX).close()
 
     # then
     assert xlsx_file
@@ -571,7 +573,7 @@ def test_save_csv_file_in_export_file(user_export_file, tmpdir, media_root):
     shutil.rmtree(tmpdir)
 
 
-def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
+def test_export_file_writer_write_rows_csv(user_export_file, tmpdir, media_root):
     # given
     export_data = [
         {"id": "123", "name": "test1", "collections": "coll1"},
@@ -579,17 +581,14 @@ def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
     ]
     headers = ["id", "name", "collections"]
     delimiter = ","
-
-    table = etl.fromdicts([{"id": "1", "name": "A"}], header=headers, missing=" ")
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=delimiter)
+    writer = ExportFileWriter(headers, FileTypes.CSV, delimiter)
+    writer.write_rows([{"id": "1", "name": "A"}], headers)
 
     # when
-    append_to_file(export_data, headers, temp_file, FileTypes.CSV, delimiter)
+    writer.write_rows(export_data, headers)
 
     # then
-    user_export_file.refresh_from_db()
+    temp_file = writer.close()
 
     file_content = temp_file.read().decode().split("\r\n")
     assert ",".join(headers) in file_content
@@ -600,27 +599,21 @@ def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
     shutil.rmtree(tmpdir)
 
 
-def test_append_to_file_for_xlsx(user_export_file, tmpdir, media_root):
+def test_export_file_writer_write_rows_xlsx(user_export_file, tmpdir, media_root):
     # given
     export_data = [
         {"id": "123", "name": "test1", "collections": "coll1"},
         {"id": "345", "name": "test2"},
     ]
     expected_headers = ["id", "name", "collections"]
-    delimiter = ","
-
-    table = etl.fromdicts(
-        [{"id": "1", "name": "A"}], header=expected_headers, missing=" "
-    )
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = ExportFileWriter(expected_headers, FileTypes.XLSX)
+    writer.write_rows([{"id": "1", "name": "A"}], expected_headers)
 
     # when
-    append_to_file(export_data, expected_headers, temp_file, FileTypes.XLSX, delimiter)
+    writer.write_rows(export_data, expected_headers)
 
     # then
-    user_export_file.refresh_from_db()
+    temp_file = writer.close()
 
     wb_obj = openpyxl.load_workbook(temp_file)
 
@@ -668,11 +661,7 @@ def test_export_products_in_batches_for_csv(
     }
     export_fields = ["id", "name", "variants__sku"]
     expected_headers = ["id", "name", "variant sku"]
-
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=",")
+    writer = ExportFileWriter(expected_headers, FileTypes.CSV)
 
     # when
     export_products_in_batches(
@@ -680,12 +669,11 @@ def test_export_products_in_batches_for_csv(
         export_info,
         set(export_fields),
         export_fields,
-        ",",
-        temp_file,
-        FileTypes.CSV,
+        writer,
     )
 
     # then
+    temp_file = writer.close()
 
     expected_data = []
     for product in qs.order_by("pk"):
@@ -738,11 +726,7 @@ def test_export_products_in_batches_for_xlsx(
     }
     export_fields = ["id", "name", "description_as_str", "variants__sku"]
     expected_headers = ["id", "name", "description", "variant sku"]
-
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = ExportFileWriter(expected_headers, FileTypes.XLSX)
 
     # when
     export_products_in_batches(
@@ -750,12 +734,11 @@ def test_export_products_in_batches_for_xlsx(
         export_info,
         set(export_fields),
         export_fields,
-        ",",
-        temp_file,
-        FileTypes.XLSX,
+        writer,
     )
 
     # then
+    temp_file = writer.close()
     expected_data = []
     for product in qs:
         product_data = []
@@ -798,20 +781,13 @@ def test_export_gift_cards_in_batches_to_csv(
     # given
     gift_cards = GiftCard.objects.exclude(id=gift_card_used.id).order_by("pk")
 
-    table = etl.wrap([["code"]])
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=",")
+    writer = ExportFileWriter(["code"], FileTypes.CSV)
 
     # when
-    export_gift_cards_in_batches(
-        gift_cards,
-        ["code"],
-        ",",
-        temp_file,
-        "csv",
-    )
+    export_gift_cards_in_batches(gift_cards, ["code"], writer)
 
     # then
+    temp_file = writer.close()
     file_content = temp_file.read().decode().split("\r\n")
 
     # ensure headers are in the file
@@ -833,20 +809,13 @@ def test_export_gift_cards_in_batches_to_xlsx(
     # given
     gift_cards = GiftCard.objects.exclude(id=gift_card_used.id).order_by("pk")
 
-    table = etl.wrap([["code"]])
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = ExportFileWriter(["code"], FileTypes.XLSX)
 
     # when
-    export_gift_cards_in_batches(
-        gift_cards,
-        ["code"],
-        ",",
-        temp_file,
-        "xlsx",
-    )
+    export_gift_cards_in_batches(gift_cards, ["code"], writer)
 
     # then
+    temp_file = writer.close()
     wb_obj = openpyxl.load_workbook(temp_file)
 
     sheet_obj = wb_obj.active
@@ -904,3 +873,97 @@ def test_parse_input():
     parsed_data = parse_input(data)
 
     assert data == parsed_data
+
+
+def test_export_file_writer_compressed_csv(tmpdir):
+    # given
+    headers = ["id", "name"]
+    writer = ExportFileWriter(headers, FileTypes.CSV, compress=True)
+
+    # when
+    writer.write_rows([{"id": "1", "name": "A"}, {"id": "2"}], headers)
+
+    # then
+    temp_file = writer.close()
+    assert temp_file.name.endswith(".csv.gz")
+    file_content = gzip.decompress(temp_file.read()).decode().split("\r\n")
+    assert file_content[:3] == ["id,name", "1,A", "2, "]
+    temp_file.close()
+
+
+def test_iter_file_rows_xlsx(tmpdir):
+    # given
+    headers = ["id", "name"]
+    writer = ExportFileWriter(headers, FileTypes.XLSX)
+    writer.write_rows([{"id": "1", "name": "A"}, {"id": "2"}], headers)
+    temp_file = writer.close()
+
+    # when
+    rows = list(iter_file_rows(temp_file, FileTypes.XLSX))
+
+    # then
+    assert rows == [("1", "A"), ("2", " ")]
+    temp_file.close()
+
+
+def test_get_pending_products_export_shards(user_export_file, product_list, settings):
+    # given
+    settings.EXPORT_PRODUCTS_SHARD_SIZE = 2
+    pks = sorted(product.pk for product in product_list)
+
+    # when
+    pending_shards = get_pending_products_export_shards(user_export_file, {"all": ""})
+
+    # then
+    assert pending_shards == [0, 1]
+    user_export_file.refresh_from_db()
+    assert user_export_file.checkpoint == {
+        "shards": [[pks[0], pks[1]], [pks[2], pks[2]]],
+        "parts": {},
+    }
+
+
+def test_get_pending_products_export_shards_resumed(user_export_file, product_list):
+    # given
+    user_export_file.checkpoint = {
+        "shards": [[1, 2], [3, 3]],
+        "parts": {"0": "export_files/parts/part.csv"},
+    }
+    user_export_file.save(update_fields=["checkpoint"])
+
+    # when
+    pending_shards = get_pending_products_export_shards(user_export_file, {"all": ""})
+
+    # then
+    assert pending_shards == [1]
+
+
+@patch("saleor.csv.utils.export.send_export_download_link_notification")
+def test_export_products_in_shards_and_merge(
+    send_email_mock, user_export_file, product_list, media_root, settings
+):
+    # given
+    settings.EXPORT_PRODUCTS_SHARD_SIZE = 2
+    scope = {"all": ""}
+    export_info = {"fields": [ProductFieldEnum.NAME.value]}
+    shards = get_pending_products_export_shards(user_export_file, scope)
+
+    # when
+    for shard_index in shards:
+        export_products_shard(
+            user_export_file, shard_index, scope, export_info, FileTypes.CSV
+        )
+    user_export_file.refresh_from_db()
+    merge_products_export(user_export_file, export_info, FileTypes.CSV)
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.checkpoint == {}
+    file_content = user_export_file.content_file.read().decode().split("\r\n")
+    assert file_content[0].startswith("id,name")
+    exported_ids = [row.split(",")[0] for row in file_content[1:] if row]
+    assert list(dict.fromkeys(exported_ids)) == [
+        graphene.Node.to_global_id("Product", product.pk)
+        for product in sorted(product_list, key=lambda product: product.pk)
+    ]
+    send_email_mock.assert_called_once_with(user_export_file, "products")
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from ...core import JobStatus
+from .. import FileTypes
+
+COMMAND_MODULE = "saleor.csv.management.commands.resume_products_export"
+
+
+@patch(f"{COMMAND_MODULE}.export_products_in_shards_task")
+def test_resume_products_export(export_products_in_shards_task_mock, user_export_file):
+    # given
+    arguments = [{"all": ""}, {"fields": "name"}, FileTypes.CSV, ","]
+    user_export_file.status = JobStatus.FAILED
+    user_export_file.checkpoint = {
+        "shards": [[1, 2]],
+        "parts": {},
+        "arguments": arguments,
+    }
+    user_export_file.save(update_fields=["status", "checkpoint"])
+
+    # when
+    call_command("resume_products_export", user_export_file.pk)
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.PENDING
+    export_products_in_shards_task_mock.delay.assert_called_once_with(
+        user_export_file.pk, *arguments
+    )
+
+
+@patch(f"{COMMAND_MODULE}.export_products_in_shards_task")
+def test_resume_products_export_not_failed(
+    export_products_in_shards_task_mock, user_export_file
+):
+    # given
+    user_export_file.checkpoint = {"arguments": [{"all": ""}, {}, FileTypes.CSV, ","]}
+    user_export_file.save(update_fields=["checkpoint"])
+
+    # when
+    with pytest.raises(CommandError):
+        call_command("resume_products_export", user_export_file.pk)
+
+    # then
+    export_products_in_shards_task_mock.delay.assert_not_called()
@@ -0,0 +1,230 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+
+from ...product.models import Product, ProductSearchIndexChange, ProductVariant
+from .. import ImportFileTypes
+from ..models import ImportFile
+from ..utils.products_import import import_products
+
+
+def create_import_file(user, content, file_type):
+    import_file = ImportFile(user=user, file_type=file_type)
+    import_file.content_file.save(
+        f"products.{file_type}", ContentFile(content.encode()), save=False
+    )
+    import_file.save()
+    return import_file
+
+
+@patch("saleor.csv.utils.products_import.send_import_webhooks")
+def test_import_products_csv(
+    send_import_webhooks_mock,
+    staff_user,
+    product_type,
+    category,
+    channel_USD,
+    warehouse,
+    color_attribute,
+    size_attribute,
+    media_root,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    headers = [
+        "product slug",
+        "name",
+        "product type",
+        "category",
+        "variant sku",
+        f"{channel_USD.slug} (channel published)",
+        f"{channel_USD.slug} (channel price amount)",
+        f"{warehouse.slug} (warehouse quantity)",
+        f"{color_attribute.slug} (product attribute)",
+        f"{size_attribute.slug} (variant attribute)",
+    ]
+    rows = [
+        ["t-shirt", "T-shirt", product_type.slug, category.slug, "TS-S"]
+        + ["true", "10.50", "5", "Red", "Small"],
+        ["t-shirt", "", "", "", "TS-XL", "", "12", "3", "", "Extra large"],
+    ]
+    content = "\r\n".join(",".join(row) for row in [headers, *rows])
+    import_file = create_import_file(staff_user, content, ImportFileTypes.CSV)
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        result = import_products(import_file, ImportFileTypes.CSV)
+
+    # then
+    assert result.errors == []
+    product = Product.objects.get(slug="t-shirt")
+    assert product.name == "T-shirt"
+    assert product.category == category
+    assert product.default_variant.sku == "TS-S"
+    assert result.created_product_ids == [product.pk]
+    listing = product.channel_listings.get()
+    assert listing.channel == channel_USD
+    assert listing.is_published
+    assert listing.published_at
+
+    variant = ProductVariant.objects.get(sku="TS-XL")
+    assert variant.channel_listings.get().price_amount == Decimal("12")
+    assert variant.stocks.get().quantity == 3
+    assert list(variant.attributes.get().values.values_list("name", flat=True)) == [
+        "Extra large"
+    ]
+    assert list(product.attributes.get().values.values_list("slug", flat=True)) == [
+        "red"
+    ]
+    assert ProductSearchIndexChange.objects.filter(product=product).exists()
+    send_import_webhooks_mock.assert_called_once_with(
+        [product.pk], [], list(result.created_variant_ids), []
+    )
+
+
+@patch("saleor.csv.utils.products_import.send_import_webhooks")
+def test_import_products_jsonl_updates_existing_product(
+    send_import_webhooks_mock, staff_user, product, warehouse, media_root
+):
+    # given
+    variant = product.variants.first()
+    lines = [
+        {
+            "product slug": product.slug,
+            "name": "New name",
+            "charge taxes": False,
+            "variant sku": variant.sku,
+            f"{warehouse.slug} (warehouse quantity)": 100,
+        }
+    ]
+    content = "\n".join(json.dumps(line) for line in lines)
+    import_file = create_import_file(staff_user, content, ImportFileTypes.JSONL)
+
+    # when
+    result = import_products(import_file, ImportFileTypes.JSONL)
+
+    # then
+    assert result.errors == []
+    assert result.updated_product_ids == [product.pk]
+    assert result.updated_variant_ids == [variant.pk]
+    product.refresh_from_db()
+    assert product.name == "New name"
+    assert product.charge_taxes is False
+    assert variant.stocks.get(warehouse=warehouse).quantity == 100
+
+
+@patch("saleor.csv.utils.products_import.send_import_webhooks")
+def test_import_products_invalid_rows(
+    send_import_webhooks_mock, staff_user, product, product_type, media_root
+):
+    # given
+    content = "\r\n".join(
+        [
+            "product slug,product type,variant sku,charge taxes",
+            "new-product,missing-type,,",
+            f"other-product,{product_type.slug},{product.variants.first().sku},",
+            f"third-product,{product_type.slug},,maybe",
+            f"valid-product,{product_type.slug},,",
+        ]
+    )
+    import_file = create_import_file(staff_user, content, ImportFileTypes.CSV)
+
+    # when
+    result = import_products(import_file, ImportFileTypes.CSV)
+
+    # then
+    assert result.errors == [
+        "Row 3: maybe is not a valid boolean.",
+        "Row 1: Product type missing-type doesn't exist.",
+        f"Row 2: Variant {product.variants.first().sku} belongs to another product.",
+    ]
+    assert list(Product.objects.filter(slug__in=["new-product", "other-product"])) == []
+    assert Product.objects.filter(slug="valid-product").exists()
+
+
+@patch("saleor.csv.utils.products_import.send_import_webhooks")
+def test_import_products_values_out_of_range(
+    send_import_webhooks_mock,
+    staff_user,
+    product_type,
+    channel_USD,
+    warehouse,
+    media_root,
+):
+    # given
+    price_header = f"{channel_USD.slug} (channel price amount)"
+    quantity_header = f"{warehouse.slug} (warehouse quantity)"
+    product_data = {"product type": product_type.slug, "variant sku": "SKU"}
+    lines = [
+        {"product slug": "a" * 256, "product type": product_type.slug},
+        {"product slug": "negative-stock", quantity_header: -1, **product_data},
+        {"product slug": "nan-price", price_header: "NaN", **product_data},
+        {"product slug": "big-price", price_header: "1e20", **product_data},
+        {"product slug": "valid-product", "product type": product_type.slug},
+    ]
+    content = "\n".join(json.dumps(line) for line in lines)
+    import_file = create_import_file(staff_user, content, ImportFileTypes.JSONL)
+
+    # when
+    result = import_products(import_file, ImportFileTypes.JSONL)
+
+    # then
+    assert result.errors == [
+        "Row 1: Product slug can't be longer than 255 characters.",
+        f"Row 2: Quantity must be between 0 and {2**31 - 1}.",
+        "Row 3: NaN is not a valid decimal.",
+        f"Row 4: Value must be lower than {10**9}.",
+    ]
+    assert not Product.objects.filter(
+        slug__in=["negative-stock", "nan-price", "big-price"]
+    ).exists()
+    assert Product.objects.filter(slug="valid-product").exists()
+
+
+@patch("saleor.csv.utils.products_import.send_import_webhooks")
+def test_import_products_jsonl_reports_malformed_lines(
+    send_import_webhooks_mock,
+    staff_user,
+    product_type,
+    color_attribute,
+    media_root,
+):
+    # given
+    attribute_header = f"{color_attribute.slug} (product attribute)"
+    lines = [
+        json.dumps(
+            {
+                "product slug": "first-product",
+                "product type": product_type.slug,
+                attribute_header: "Navy",
+            }
+        ),
+        '{"product slug": "broken-product"',
+        json.dumps(["not", "an", "object"]),
+        json.dumps(
+            {
+                "product slug": "second-product",
+                "product type": product_type.slug,
+                attribute_header: "navy",
+            }
+        ),
+    ]
+    import_file = create_import_file(
+        staff_user, "\n".join(lines), ImportFileTypes.JSONL
+    )
+
+    # when
+    result = import_products(import_file, ImportFileTypes.JSONL)
+
+    # then
+    assert result.errors == [
+        "Row 2: Row is not valid JSON.",
+        "Row 3: Row must be a JSON object.",
+    ]
+    first_product = Product.objects.get(slug="first-product")
+    second_product = Product.objects.get(slug="second-product")
+    first_value = first_product.attributes.get().values.get()
+    assert first_value.name == "Navy"
+    assert second_product.attributes.get().values.get() == first_value
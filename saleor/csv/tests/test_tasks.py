@@ -2,20 +2,27 @@ import datetime
 from unittest.mock import ANY, MagicMock, Mock, patch
 
 import pytz
+from celery.exceptions import ChordError
 from django.core.files import File
 from django.test import override_settings
 from django.utils import timezone
 from freezegun import freeze_time
 
 from ...core import JobStatus
-from .. import ExportEvents, FileTypes
-from ..models import ExportEvent, ExportFile
+from .. import ExportEvents, FileTypes, ImportFileTypes
+from ..models import ExportEvent, ExportFile, ImportFile
 from ..tasks import (
     ExportTask,
     delete_old_export_files,
     export_gift_cards_task,
+    export_products_in_shards_task,
+    export_products_shard_task,
+    export_products_shards_failed_task,
     export_products_task,
+    import_products_task,
+    merge_products_export_task,
 )
+from ..utils.products_import import ImportResult
 
 
 @patch("saleor.csv.tasks.export_products")
@@ -58,6 +65,185 @@ def test_export_products_task_failed(
     send_export_failed_info_mock.assert_called_once_with(user_export_file, "products")
 
 
+@patch("saleor.csv.tasks.merge_products_export")
+@patch("saleor.csv.tasks.export_products_shard")
+def test_export_products_in_shards_task(
+    export_products_shard_mock,
+    merge_products_export_mock,
+    user_export_file,
+    product_list,
+    settings,
+):
+    # given
+    settings.EXPORT_PRODUCTS_SHARD_SIZE = 2
+    scope = {"all": ""}
+    export_info = {"fields": "name"}
+    file_type = FileTypes.CSV
+    delimiter = ";"
+
+    # when
+    export_products_in_shards_task(
+        user_export_file.id, scope, export_info, file_type, delimiter
+    )
+
+    # then
+    assert export_products_shard_mock.call_count == 2
+    export_products_shard_mock.assert_called_with(
+        user_export_file, 1, scope, export_info, file_type, delimiter
+    )
+    merge_products_export_mock.assert_called_once_with(
+        user_export_file, export_info, file_type, delimiter
+    )
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.SUCCESS
+
+
+@patch("saleor.csv.tasks.merge_products_export")
+@patch("saleor.csv.tasks.export_products_shard")
+def test_export_products_in_shards_task_resumed(
+    export_products_shard_mock, merge_products_export_mock, user_export_file
+):
+    # given
+    user_export_file.checkpoint = {
+        "shards": [[1, 2]],
+        "parts": {"0": "export_files/parts/part.csv"},
+    }
+    user_export_file.save(update_fields=["checkpoint"])
+    export_info = {"fields": "name"}
+
+    # when
+    export_products_in_shards_task(
+        user_export_file.id, {"all": ""}, export_info, FileTypes.CSV
+    )
+
+    # then
+    export_products_shard_mock.assert_not_called()
+    merge_products_export_mock.assert_called_once_with(
+        user_export_file, export_info, FileTypes.CSV, ","
+    )
+    user_export_file.refresh_from_db()
+    assert user_export_file.checkpoint["arguments"] == [
+        {"all": ""},
+        export_info,
+        FileTypes.CSV,
+        ",",
+    ]
+
+
+@patch("saleor.csv.tasks.send_export_failed_info")
+@patch("saleor.csv.tasks.export_products_shard")
+def test_export_products_shard_task_failed(
+    export_products_shard_mock, send_export_failed_info_mock, user_export_file
+):
+    # given
+    export_products_shard_mock.side_effect = Exception("Test error")
+
+    # when
+    export_products_shard_task.delay(
+        user_export_file.id, 0, {"all": ""}, {"fields": "name"}, FileTypes.CSV
+    )
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.PENDING
+    send_export_failed_info_mock.assert_not_called()
+
+
+@patch("saleor.csv.tasks.send_export_failed_info")
+def test_export_products_shards_failed_task(
+    send_export_failed_info_mock, user_export_file
+):
+    # given
+    exc = ChordError("Dependency raised Exception('Test error')")
+
+    # when
+    export_products_shards_failed_task(Mock(), exc, None, user_export_file.id)
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.FAILED
+    assert user_export_file.events.filter(type=ExportEvents.EXPORT_FAILED).count() == 1
+    send_export_failed_info_mock.assert_called_once_with(user_export_file, "products")
+
+
+@patch("saleor.csv.tasks.send_export_failed_info")
+def test_export_products_shards_failed_task_skips_merge_failure(
+    send_export_failed_info_mock, user_export_file
+):
+    # when
+    export_products_shards_failed_task(
+        Mock(), Exception("Test error"), None, user_export_file.id
+    )
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.PENDING
+    send_export_failed_info_mock.assert_not_called()
+
+
+@patch("saleor.csv.tasks.send_export_failed_info")
+@patch("saleor.csv.tasks.merge_products_export")
+def test_merge_products_export_task_failed(
+    merge_products_export_mock, send_export_failed_info_mock, user_export_file
+):
+    # given
+    merge_products_export_mock.side_effect = Exception("Test error")
+
+    # when
+    merge_products_export_task.delay(
+        user_export_file.id, {"fields": "name"}, FileTypes.CSV
+    )
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.FAILED
+    send_export_failed_info_mock.assert_called_once_with(user_export_file, "products")
+
+
+@patch("saleor.csv.tasks.import_products")
+def test_import_products_task(import_products_mock, staff_user):
+    # given
+    import_file = ImportFile.objects.create(
+        user=staff_user,
+        file_type=ImportFileTypes.CSV,
+        content_file="import_files/a.csv",
+    )
+    import_products_mock.return_value = ImportResult(
+        created_product_ids=[1, 2],
+        errors=["Row 3: Product slug is required."],
+        rows_count=3,
+    )
+
+    # when
+    import_products_task(import_file.pk)
+
+    # then
+    import_products_mock.assert_called_once_with(import_file, ImportFileTypes.CSV)
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.SUCCESS
+    assert import_file.errors == ["Row 3: Product slug is required."]
+    assert import_file.message.startswith("Processed 3 rows: created 2 products")
+
+
+@patch("saleor.csv.tasks.import_products")
+def test_import_products_task_failed(import_products_mock, staff_user):
+    # given
+    import_file = ImportFile.objects.create(
+        user=staff_user,
+        file_type=ImportFileTypes.CSV,
+        content_file="import_files/a.csv",
+    )
+    import_products_mock.side_effect = Exception("Test error")
+
+    # when
+    import_products_task.delay(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.FAILED
+    assert import_file.message == "Test error"
+
+
 @patch("saleor.csv.tasks.export_gift_cards")
 def test_export_gift_cards_task(export_gift_cards_mock, user_export_file):
     # given
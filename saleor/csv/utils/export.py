@@ -1,24 +1,25 @@
 import uuid
 from datetime import date, datetime
-from tempfile import NamedTemporaryFile
 from typing import IO, TYPE_CHECKING, Any, Dict, List, Set, Union
 
-import petl as etl
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.utils import timezone
 
 from ...giftcard.models import GiftCard
 from ...product.models import Product
-from .. import FileTypes
+from ..models import ExportFile
 from ..notifications import send_export_download_link_notification
 from .product_headers import get_product_export_fields_and_headers_info
-from .products_data import get_products_data
+from .products_data import iter_products_data
+from .writers import ExportFileWriter, iter_file_rows
 
 if TYPE_CHECKING:
     # flake8: noqa
     from django.db.models import QuerySet
 
-    from ..models import ExportFile
-
 
 BATCH_SIZE = 10000
 
@@ -41,21 +42,132 @@ def export_products(
         data_headers,
     ) = get_product_export_fields_and_headers_info(export_info)
 
-    temporary_file = create_file_with_headers(file_headers, delimiter, file_type)
+    writer = create_file_writer(file_headers, delimiter, file_type)
+    if writer.compressed:
+        file_name += ".gz"
 
     export_products_in_batches(
         queryset,
         export_info,
         set(export_fields),
         data_headers,
-        delimiter,
-        temporary_file,
-        file_type,
+        writer,
+    )
+
+    temporary_file = writer.close()
+    save_csv_file_in_export_file(export_file, temporary_file, file_name)
+    temporary_file.close()
+
+    send_export_download_link_notification(export_file, "products")
+
+
+def get_pending_products_export_shards(
+    export_file: "ExportFile", scope: Dict[str, Union[str, dict]]
+) -> List[int]:
+    """Return indexes of the shards of the products export that aren't exported yet.
+
+    The exported products are split into shards of `EXPORT_PRODUCTS_SHARD_SIZE`
+    consecutive PKs. PK ranges of the shards are stored in the export file
+    checkpoint on the first run, so a retried export resumes with the same shards
+    and skips the ones whose parts are already saved.
+    """
+    from ...graphql.product.filters import ProductFilter
+
+    checkpoint = export_file.checkpoint
+    if "shards" not in checkpoint:
+        queryset = get_queryset(Product, ProductFilter, scope)
+        pks = list(queryset.values_list("pk", flat=True))
+        shard_size = settings.EXPORT_PRODUCTS_SHARD_SIZE
+        shards = [
+            [pks[index], pks[min(index + shard_size, len(pks)) - 1]]
+            for index in range(0, len(pks), shard_size)
+        ]
+        export_file.checkpoint = checkpoint = {"shards": shards, "parts": {}}
+        export_file.save(update_fields=["checkpoint", "updated_at"])
+
+    return [
+        index
+        for index in range(len(checkpoint["shards"]))
+        if str(index) not in checkpoint["parts"]
+    ]
+
+
+def export_products_shard(
+    export_file: "ExportFile",
+    shard_index: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ",",
+):
+    """Export products of the shard to a part file and save it in the checkpoint."""
+    from ...graphql.product.filters import ProductFilter
+
+    start_pk, end_pk = export_file.checkpoint["shards"][shard_index]
+    queryset = get_queryset(Product, ProductFilter, scope).filter(
+        pk__gte=start_pk, pk__lte=end_pk
+    )
+
+    (
+        export_fields,
+        file_headers,
+        data_headers,
+    ) = get_product_export_fields_and_headers_info(export_info)
+
+    writer = ExportFileWriter(file_headers, file_type, delimiter=delimiter)
+    export_products_in_batches(
+        queryset,
+        export_info,
+        set(export_fields),
+        data_headers,
+        writer,
+    )
+
+    temporary_file = writer.close()
+    part_path = default_storage.save(
+        f"export_files/parts/{export_file.pk}_{shard_index}.{file_type}",
+        File(temporary_file),
     )
+    temporary_file.close()
+
+    # shards are exported concurrently, so the checkpoint is updated under a lock
+    with transaction.atomic():
+        export_file = ExportFile.objects.select_for_update().get(pk=export_file.pk)
+        export_file.checkpoint["parts"][str(shard_index)] = part_path
+        export_file.save(update_fields=["checkpoint", "updated_at"])
 
+
+def merge_products_export(
+    export_file: "ExportFile",
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ",",
+):
+    """Merge parts of the exported shards into the export file and delete them."""
+    file_name = get_filename("product", file_type)
+    _, file_headers, _ = get_product_export_fields_and_headers_info(export_info)
+
+    writer = create_file_writer(file_headers, delimiter, file_type)
+    if writer.compressed:
+        file_name += ".gz"
+
+    checkpoint = export_file.checkpoint
+    part_paths = [
+        checkpoint["parts"][str(index)] for index in range(len(checkpoint["shards"]))
+    ]
+    for part_path in part_paths:
+        with default_storage.open(part_path, "rb") as part_file:
+            writer.write_values(iter_file_rows(part_file, file_type, delimiter))
+
+    temporary_file = writer.close()
     save_csv_file_in_export_file(export_file, temporary_file, file_name)
     temporary_file.close()
 
+    for part_path in part_paths:
+        default_storage.delete(part_path)
+    export_file.checkpoint = {}
+    export_file.save(update_fields=["checkpoint", "updated_at"])
+
     send_export_download_link_notification(export_file, "products")
 
 
@@ -74,16 +186,13 @@ def export_gift_cards(
     queryset = queryset.filter(used_by_email__isnull=True)
 
     export_fields = ["code"]
-    temporary_file = create_file_with_headers(export_fields, delimiter, file_type)
+    writer = create_file_writer(export_fields, delimiter, file_type)
+    if writer.compressed:
+        file_name += ".gz"
 
-    export_gift_cards_in_batches(
-        queryset,
-        export_fields,
-        delimiter,
-        temporary_file,
-        file_type,
-    )
+    export_gift_cards_in_batches(queryset, export_fields, writer)
 
+    temporary_file = writer.close()
     save_csv_file_in_export_file(export_file, temporary_file, file_name)
     temporary_file.close()
 
@@ -135,17 +244,15 @@ def parse_input(data: Any) -> Dict[str, Union[str, dict]]:
     return data
 
 
-def create_file_with_headers(file_headers: List[str], delimiter: str, file_type: str):
-    table = etl.wrap([file_headers])
-
-    if file_type == FileTypes.CSV:
-        temp_file = NamedTemporaryFile("ab+", suffix=".csv")
-        etl.tocsv(table, temp_file.name, delimiter=delimiter)
-    else:
-        temp_file = NamedTemporaryFile("ab+", suffix=".xlsx")
-        etl.io.xlsx.toxlsx(table, temp_file.name)
-
-    return temp_file
+def create_file_writer(
+    file_headers: List[str], delimiter: str, file_type: str
+) -> ExportFileWriter:
+    return ExportFileWriter(
+        file_headers,
+        file_type,
+        delimiter=delimiter,
+        compress=settings.EXPORT_FILES_CSV_GZIP,
+    )
 
 
 def export_products_in_batches(
@@ -153,44 +260,35 @@ def export_products_in_batches(
     export_info: Dict[str, list],
     export_fields: Set[str],
     headers: List[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    writer: ExportFileWriter,
 ):
     warehouses = export_info.get("warehouses")
     attributes = export_info.get("attributes")
     channels = export_info.get("channels")
 
     for batch_pks in queryset_in_batches(queryset):
-        product_batch = Product.objects.filter(pk__in=batch_pks).prefetch_related(
-            "attributes",
-            "variants",
-            "collections",
-            "media",
-            "product_type",
-            "category",
-        )
+        # rows are built from flat values() queries, so no model instances are
+        # prefetched for the batch
+        product_batch = Product.objects.filter(pk__in=batch_pks)
 
-        export_data = get_products_data(
+        export_data = iter_products_data(
             product_batch, export_fields, attributes, warehouses, channels
         )
 
-        append_to_file(export_data, headers, temporary_file, file_type, delimiter)
+        writer.write_rows(export_data, headers)
 
 
 def export_gift_cards_in_batches(
     queryset: "QuerySet",
     export_fields: List[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    writer: ExportFileWriter,
 ):
     for batch_pks in queryset_in_batches(queryset):
         gift_card_batch = GiftCard.objects.filter(pk__in=batch_pks)
 
-        export_data = list(gift_card_batch.values(*export_fields))
+        export_data = gift_card_batch.values(*export_fields).iterator()
 
-        append_to_file(export_data, export_fields, temporary_file, file_type, delimiter)
+        writer.write_rows(export_data, export_fields)
 
 
 def queryset_in_batches(queryset):
@@ -212,21 +310,6 @@ def queryset_in_batches(queryset):
         start_pk = pks[-1]
 
 
-def append_to_file(
-    export_data: List[Dict[str, Union[str, bool]]],
-    headers: List[str],
-    temporary_file: Any,
-    file_type: str,
-    delimiter: str,
-):
-    table = etl.fromdicts(export_data, header=headers, missing=" ")
-
-    if file_type == FileTypes.CSV:
-        etl.io.csv.appendcsv(table, temporary_file.name, delimiter=delimiter)
-    else:
-        etl.io.xlsx.appendxlsx(table, temporary_file.name)
-
-
 def save_csv_file_in_export_file(
     export_file: "ExportFile", temporary_file: IO[bytes], file_name: str
 ):
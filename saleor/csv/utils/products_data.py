@@ -1,11 +1,11 @@
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Union
 from urllib.parse import urljoin
 
 import graphene
 from django.conf import settings
-from django.db.models import Case, CharField
+from django.db.models import Case, CharField, Expression
 from django.db.models import Value as V
 from django.db.models import When
 from django.db.models.functions import Cast, Concat
@@ -31,8 +31,25 @@ def get_products_data(
     It return list with product and variant data which can be used as import to
     csv writer and list of attribute and warehouse headers.
     """
+    return list(
+        iter_products_data(
+            queryset, export_fields, attribute_ids, warehouse_ids, channel_ids
+        )
+    )
+
 
-    products_with_variants_data = []
+def iter_products_data(
+    queryset: "QuerySet",
+    export_fields: Set[str],
+    attribute_ids: Optional[List[int]],
+    warehouse_ids: Optional[List[int]],
+    channel_ids: Optional[List[int]],
+) -> Iterator[Dict[str, Union[str, bool]]]:
+    """Yield data of products and their variants one row at a time.
+
+    Rows are read from the database with a server-side cursor, so the product rows
+    of the queryset aren't all kept in memory.
+    """
     export_variant_id = "variants__id" in export_fields
 
     product_fields = set(
@@ -42,26 +59,18 @@ def get_products_data(
     if not export_variant_id:
         product_export_fields.add("variants__id")
 
+    # only the exported fields are computed by the database
+    annotations = {
+        name: expression
+        for name, expression in get_products_data_annotations().items()
+        if name in product_export_fields
+    }
     products_data = (
-        queryset.annotate(
-            product_weight=Case(
-                When(weight__isnull=False, then=Concat("weight", V(" g"))),
-                default=V(""),
-                output_field=CharField(),
-            ),
-            variant_weight=Case(
-                When(
-                    variants__weight__isnull=False,
-                    then=Concat("variants__weight", V(" g")),
-                ),
-                default=V(""),
-                output_field=CharField(),
-            ),
-            description_as_str=Cast("description", CharField()),
-        )
+        queryset.annotate(**annotations)
         .order_by("pk", "variants__pk")
         .values(*product_export_fields)
         .distinct("pk", "variants__pk")
+        .iterator()
     )
 
     products_relations_data = get_products_relations_data(
@@ -90,11 +99,41 @@ def get_products_data(
                 "ProductVariant", variant_pk
             )
 
-        data = {**product_data, **product_relations_data, **variant_relations_data}
+        yield {**product_data, **product_relations_data, **variant_relations_data}
 
-        products_with_variants_data.append(data)
 
-    return products_with_variants_data
+def get_products_data_annotations() -> Dict[str, Expression]:
+    return {
+        "product_weight": Case(
+            When(weight__isnull=False, then=Concat("weight", V(" g"))),
+            default=V(""),
+            output_field=CharField(),
+        ),
+        "variant_weight": Case(
+            When(
+                variants__weight__isnull=False,
+                then=Concat("variants__weight", V(" g")),
+            ),
+            default=V(""),
+            output_field=CharField(),
+        ),
+        "description_as_str": Cast("description", CharField()),
+    }
+
+
+def iter_relations_data(
+    queryset: "QuerySet", pk_lookup: str, lookups_groups: List[Set[str]]
+) -> Iterator[dict]:
+    """Yield flat values of the relations of the queryset, one group at a time.
+
+    Every group of lookups is fetched with a separate `values()` query, so rows
+    of unrelated relations, like collections and attribute values, aren't
+    multiplied by each other in a single join.
+    """
+    queryset = queryset.order_by()
+    for lookups in lookups_groups:
+        if lookups:
+            yield from queryset.values(pk_lookup, *lookups).iterator()
 
 
 def get_products_relations_data(
@@ -135,17 +174,17 @@ def prepare_products_relations_data(
     channel_fields = ProductExportFields.PRODUCT_CHANNEL_LISTING_FIELDS.copy()
     result_data: Dict[int, dict] = defaultdict(dict)
 
-    fields.add("pk")
+    lookups_groups = [{field} for field in fields - {"pk"}]
     if attribute_ids:
-        fields.update(attribute_fields.values())
+        lookups_groups.append(set(attribute_fields.values()))
     if channel_ids:
-        fields.update(channel_fields.values())
+        lookups_groups.append(set(channel_fields.values()))
 
-    relations_data = queryset.values(*fields)
+    relations_data = iter_relations_data(queryset, "pk", lookups_groups)
 
     channel_pk_lookup = channel_fields.pop("channel_pk")
     channel_slug_lookup = channel_fields.pop("slug")
-    for data in relations_data.iterator():
+    for data in relations_data:
         pk = data.get("pk")
         collection = data.get("collections__slug")
         image = data.pop("media__image", None)
@@ -217,21 +256,21 @@ def prepare_variants_relations_data(
     channel_fields = ProductExportFields.VARIANT_CHANNEL_LISTING_FIELDS.copy()
 
     result_data: Dict[int, dict] = defaultdict(dict)
-    fields.add("variants__pk")
 
+    lookups_groups = [{field} for field in fields - {"variants__pk"}]
     if attribute_ids:
-        fields.update(attribute_fields.values())
+        lookups_groups.append(set(attribute_fields.values()))
     if warehouse_ids:
-        fields.update(warehouse_fields.values())
+        lookups_groups.append(set(warehouse_fields.values()))
     if channel_ids:
-        fields.update(channel_fields.values())
+        lookups_groups.append(set(channel_fields.values()))
 
-    relations_data = queryset.values(*fields)
+    relations_data = iter_relations_data(queryset, "variants__pk", lookups_groups)
 
     channel_pk_lookup = channel_fields.pop("channel_pk")
     channel_slug_lookup = channel_fields.pop("slug")
 
-    for data in relations_data.iterator():
+    for data in relations_data:
         pk = data.get("variants__pk")
         image = data.pop("variants__media__image", None)
 
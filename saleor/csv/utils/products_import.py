@@ -0,0 +1,924 @@
+import codecs
+import csv
+import json
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from measurement.measures import Weight
+from text_unidecode import unidecode
+
+from ...attribute import AttributeInputType
+from ...attribute.models import (
+    AssignedProductAttribute,
+    AssignedProductAttributeValue,
+    AssignedVariantAttribute,
+    AssignedVariantAttributeValue,
+    Attribute,
+    AttributeProduct,
+    AttributeValue,
+    AttributeVariant,
+)
+from ...channel.models import Channel
+from ...core.utils.editorjs import clean_editor_js
+from ...graphql.core.validators import (
+    validate_decimal_max_value,
+    validate_price_precision,
+)
+from ...plugins.manager import get_plugins_manager
+from ...product import ProductSearchIndexChangeSource
+from ...product.listing_index import mark_products_listing_index_dirty
+from ...product.models import (
+    Category,
+    Product,
+    ProductChannelListing,
+    ProductType,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ...product.search import mark_products_search_index_changed
+from ...product.utils.variant_prices import update_products_discounted_prices
+from ...warehouse.models import Stock, Warehouse
+from ...warehouse.shards import fold_stock_shards
+from .. import ImportFileTypes
+
+if TYPE_CHECKING:
+    from ..models import ImportFile
+
+
+BATCH_SIZE = 1000
+# Number of row errors stored in the import file.
+ERRORS_LIMIT = 1000
+
+ATTRIBUTE_INPUT_TYPES = [AttributeInputType.DROPDOWN, AttributeInputType.MULTISELECT]
+RELATION_HEADER_PATTERN = re.compile(
+    r"^(?P<slug>.+) \((?P<kind>product attribute|variant attribute|"
+    r"warehouse quantity|channel (?P<channel_field>.+))\)$"
+)
+PRODUCT_CHANNEL_FIELDS = {
+    "published": "is_published",
+    "searchable": "visible_in_listings",
+    "available for purchase": "available_for_purchase_at",
+}
+VARIANT_CHANNEL_FIELDS = {
+    "price amount": "price_amount",
+    "variant cost price": "cost_price_amount",
+}
+# Largest value of integer database columns.
+MAX_INT = 2**31 - 1
+TRUE_VALUES = {"true", "yes", "1"}
+FALSE_VALUES = {"false", "no", "0"}
+
+
+@dataclass
+class ImportRow:
+    """Values of a single row of the imported file, ready to be saved."""
+
+    number: int
+    product_slug: str
+    product_fields: Dict[str, Any] = field(default_factory=dict)
+    product_type_slug: Optional[str] = None
+    category_slug: Optional[str] = None
+    variant_sku: Optional[str] = None
+    variant_fields: Dict[str, Any] = field(default_factory=dict)
+    product_channels: DefaultDict[int, Dict[str, Any]] = field(
+        default_factory=lambda: defaultdict(dict)
+    )
+    variant_channels: DefaultDict[int, Dict[str, Any]] = field(
+        default_factory=lambda: defaultdict(dict)
+    )
+    stocks: Dict[int, int] = field(default_factory=dict)
+    product_attributes: Dict[int, List[str]] = field(default_factory=dict)
+    variant_attributes: Dict[int, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class ImportResult:
+    created_product_ids: List[int] = field(default_factory=list)
+    updated_product_ids: List[int] = field(default_factory=list)
+    created_variant_ids: List[int] = field(default_factory=list)
+    updated_variant_ids: List[int] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    rows_count: int = 0
+
+    def add_error(self, row_number: int, error: ValidationError):
+        for message in error.messages:
+            if len(self.errors) < ERRORS_LIMIT:
+                self.errors.append(f"Row {row_number}: {message}")
+
+
+class ImportContext:
+    """Channels, warehouses and attributes referred by the headers of the file.
+
+    They are loaded once per import, as their number doesn't depend on the number
+    of imported rows.
+    """
+
+    def __init__(self):
+        channels = list(Channel.objects.all())
+        self.channels = {channel.slug: channel for channel in channels}
+        self.channels_by_id = {channel.pk: channel for channel in channels}
+        self.warehouse_ids = dict(Warehouse.objects.values_list("slug", "pk"))
+        self.attributes = {
+            attribute.slug: attribute
+            for attribute in Attribute.objects.only("pk", "slug", "input_type")
+        }
+
+
+def import_products(import_file: "ImportFile", file_type: str) -> ImportResult:
+    """Import products and variants from the file of the import job.
+
+    Rows are validated and saved in batches, each in a separate transaction, with
+    bulk queries, so the import doesn't run the product mutations row by row.
+    Rows with invalid data are skipped and reported in the result. Products are
+    matched by slug and variants by SKU, so importing the same file again updates
+    the imported objects.
+    """
+    context = ImportContext()
+    result = ImportResult()
+    try:
+        with import_file.content_file.open("rb") as file:
+            rows = enumerate(iter_import_rows(file, file_type), start=1)
+            while batch := list(islice(rows, BATCH_SIZE)):
+                import_products_batch(batch, context, result)
+                result.rows_count += len(batch)
+    finally:
+        # Batches are committed separately, so the products of the committed ones
+        # are updated even when the import fails.
+        product_ids = result.created_product_ids + result.updated_product_ids
+        update_imported_products(product_ids)
+    return result
+
+
+class DecodedLines:
+    """Lines of a UTF-8 file, decoded one by one.
+
+    Lines that can't be decoded are decoded with replacement characters and
+    `invalid` is set, so the row they belong to can be reported instead of
+    failing the whole import.
+    """
+
+    def __init__(self, file: IO[bytes]):
+        self.file = file
+        self.invalid = False
+
+    def __iter__(self) -> Iterator[str]:
+        for number, line in enumerate(self.file):
+            if number == 0 and line.startswith(codecs.BOM_UTF8):
+                line = line[len(codecs.BOM_UTF8) :]  # noqa: E203
+            try:
+                yield line.decode("utf-8")
+            except UnicodeDecodeError:
+                self.invalid = True
+                yield line.decode("utf-8", errors="replace")
+
+    def pop_invalid(self) -> bool:
+        invalid, self.invalid = self.invalid, False
+        return invalid
+
+
+def iter_import_rows(
+    file: IO[bytes], file_type: str
+) -> Iterator[Union[Dict[str, Any], ValidationError]]:
+    """Yield rows of the file as dicts of values by headers.
+
+    Rows that can't be read are yielded as errors, so they're reported with
+    their row numbers.
+    """
+    lines = DecodedLines(file)
+    if file_type == ImportFileTypes.CSV:
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                data = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                lines.pop_invalid()
+                yield ValidationError(f"Row can't be read: {e}.")
+                continue
+            if lines.pop_invalid():
+                yield ValidationError("Row is not valid UTF-8 text.")
+            else:
+                yield data
+    else:
+        for line in lines:
+            if lines.pop_invalid():
+                yield ValidationError("Row is not valid UTF-8 text.")
+                continue
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield ValidationError("Row is not valid JSON.")
+                continue
+            if not isinstance(data, dict):
+                yield ValidationError("Row must be a JSON object.")
+                continue
+            yield data
+
+
+def import_products_batch(
+    batch: List[Tuple[int, Union[Dict[str, Any], ValidationError]]],
+    context: ImportContext,
+    result: ImportResult,
+):
+    rows = []
+    for number, data in batch:
+        if isinstance(data, ValidationError):
+            result.add_error(number, data)
+            continue
+        try:
+            rows.append(parse_row(number, data, context))
+        except ValidationError as error:
+            result.add_error(number, error)
+
+    with transaction.atomic():
+        rows = validate_rows(rows, result)
+        products, created_products = save_products(rows)
+        variants, created_variants = save_variants(rows, products)
+        save_channel_listings(rows, products, variants, context)
+        save_stocks(rows, variants)
+        save_attributes(rows, products, variants, result)
+
+        created_product_ids = [product.pk for product in created_products]
+        updated_product_ids = list(
+            {product.pk for product in products.values()} - set(created_product_ids)
+        )
+        created_variant_ids = [variant.pk for variant in created_variants]
+        updated_variant_ids = list(
+            {variant.pk for variant in variants.values()} - set(created_variant_ids)
+        )
+        transaction.on_commit(
+            lambda: send_import_webhooks(
+                created_product_ids,
+                updated_product_ids,
+                created_variant_ids,
+                updated_variant_ids,
+            )
+        )
+
+    result.created_product_ids += created_product_ids
+    result.updated_product_ids += updated_product_ids
+    result.created_variant_ids += created_variant_ids
+    result.updated_variant_ids += updated_variant_ids
+
+
+def parse_row(number: int, data: Dict[str, Any], context: ImportContext) -> ImportRow:
+    """Parse values of the row, without querying the database."""
+    values = {
+        header.strip(): str(value).strip()
+        for header, value in data.items()
+        if header and value is not None and str(value).strip()
+    }
+    product_slug = values.pop("product slug", None)
+    if not product_slug:
+        raise ValidationError("Product slug is required.")
+    _validate_length(product_slug, Product, "slug", "Product slug")
+
+    row = ImportRow(number=number, product_slug=product_slug)
+    row.product_type_slug = values.pop("product type", None)
+    row.category_slug = values.pop("category", None)
+    row.variant_sku = values.pop("variant sku", None)
+    if row.variant_sku:
+        _validate_length(row.variant_sku, ProductVariant, "sku", "Variant SKU")
+    if "name" in values:
+        row.product_fields["name"] = values.pop("name")
+        _validate_length(row.product_fields["name"], Product, "name", "Name")
+    if "description" in values:
+        description = _parse_description(values.pop("description"))
+        row.product_fields["description"] = description
+        row.product_fields["description_plaintext"] = clean_editor_js(
+            description, to_string=True
+        )
+    if "charge taxes" in values:
+        row.product_fields["charge_taxes"] = _parse_bool(values.pop("charge taxes"))
+    if "product weight" in values:
+        row.product_fields["weight"] = _parse_weight(values.pop("product weight"))
+    if "variant name" in values:
+        row.variant_fields["name"] = values.pop("variant name")
+        _validate_length(
+            row.variant_fields["name"], ProductVariant, "name", "Variant name"
+        )
+    if "variant weight" in values:
+        row.variant_fields["weight"] = _parse_weight(values.pop("variant weight"))
+
+    for header, value in values.items():
+        match = RELATION_HEADER_PATTERN.match(header)
+        if not match:
+            continue
+        slug, kind = match.group("slug"), match.group("kind")
+        if kind == "warehouse quantity":
+            row.stocks[_get_warehouse_id(slug, context)] = _parse_quantity(value)
+        elif kind in ("product attribute", "variant attribute"):
+            attribute = _get_attribute(slug, context)
+            attribute_values = [name.strip() for name in value.split(",")]
+            if attribute.input_type == AttributeInputType.DROPDOWN:
+                attribute_values = [value]
+            for name in attribute_values:
+                _validate_length(name, AttributeValue, "name", "Attribute value")
+            attributes = (
+                row.product_attributes
+                if kind == "product attribute"
+                else row.variant_attributes
+            )
+            attributes[attribute.pk] = attribute_values
+        else:
+            channel = _get_channel(slug, context)
+            channel_field = match.group("channel_field")
+            if channel_field in PRODUCT_CHANNEL_FIELDS:
+                field_name = PRODUCT_CHANNEL_FIELDS[channel_field]
+                row.product_channels[channel.pk][field_name] = (
+                    _parse_datetime(value)
+                    if field_name == "available_for_purchase_at"
+                    else _parse_bool(value)
+                )
+            elif channel_field in VARIANT_CHANNEL_FIELDS:
+                field_name = VARIANT_CHANNEL_FIELDS[channel_field]
+                row.variant_channels[channel.pk][field_name] = _parse_price(
+                    value, channel
+                )
+
+    has_variant_data = any(
+        [row.variant_fields, row.variant_channels, row.stocks, row.variant_attributes]
+    )
+    if has_variant_data and not row.variant_sku:
+        raise ValidationError("Variant SKU is required to import variant data.")
+    return row
+
+
+def validate_rows(rows: List[ImportRow], result: ImportResult) -> List[ImportRow]:
+    """Resolve the related objects of the rows and drop rows that can't be saved."""
+    product_types = ProductType.objects.in_bulk(
+        {row.product_type_slug for row in rows if row.product_type_slug},
+        field_name="slug",
+    )
+    categories = Category.objects.in_bulk(
+        {row.category_slug for row in rows if row.category_slug}, field_name="slug"
+    )
+    product_type_ids = dict(
+        Product.objects.filter(slug__in={row.product_slug for row in rows}).values_list(
+            "slug", "product_type_id"
+        )
+    )
+    variant_products = dict(
+        ProductVariant.objects.filter(
+            sku__in={row.variant_sku for row in rows if row.variant_sku}
+        ).values_list("sku", "product__slug")
+    )
+
+    valid_rows = []
+    for row in rows:
+        try:
+            product_type_id = product_type_ids.get(row.product_slug)
+            if row.product_type_slug:
+                product_type = product_types.get(row.product_type_slug)
+                if not product_type:
+                    raise ValidationError(
+                        f"Product type {row.product_type_slug} doesn't exist."
+                    )
+                if product_type_id not in (None, product_type.pk):
+                    raise ValidationError(
+                        "Product type of an existing product can't be changed."
+                    )
+                product_type_id = product_type.pk
+                row.product_fields["product_type_id"] = product_type_id
+            if product_type_id is None:
+                raise ValidationError("Product type is required for new products.")
+            if row.category_slug:
+                category = categories.get(row.category_slug)
+                if not category:
+                    raise ValidationError(
+                        f"Category {row.category_slug} doesn't exist."
+                    )
+                row.product_fields["category_id"] = category.pk
+            if variant_products.get(row.variant_sku, row.product_slug) != (
+                row.product_slug
+            ):
+                raise ValidationError(
+                    f"Variant {row.variant_sku} belongs to another product."
+                )
+        except ValidationError as error:
+            result.add_error(row.number, error)
+        else:
+            # later rows of new products and variants are validated against this one
+            product_type_ids[row.product_slug] = product_type_id
+            if row.variant_sku:
+                variant_products[row.variant_sku] = row.product_slug
+            valid_rows.append(row)
+    return valid_rows
+
+
+def save_products(rows: List[ImportRow]) -> Tuple[Dict[str, Product], List[Product]]:
+    """Create and update products of the rows; return products by slug.
+
+    New products without a name are named after their slug.
+    """
+    products = Product.objects.in_bulk(
+        {row.product_slug for row in rows}, field_name="slug"
+    )
+    existing_products = list(products.values())
+    created_products = []
+    updated_fields: Set[str] = set()
+    for row in rows:
+        product = products.get(row.product_slug)
+        if product is None:
+            product = Product(slug=row.product_slug, name=row.product_slug)
+            products[row.product_slug] = product
+            created_products.append(product)
+        elif product.pk:
+            updated_fields.update(row.product_fields)
+        for field_name, value in row.product_fields.items():
+            setattr(product, field_name, value)
+
+    Product.objects.bulk_create(created_products)
+    if existing_products and updated_fields:
+        for product in existing_products:
+            product.updated_at = timezone.now()
+        Product.objects.bulk_update(existing_products, [*updated_fields, "updated_at"])
+    return products, created_products
+
+
+def save_variants(
+    rows: List[ImportRow], products: Dict[str, Product]
+) -> Tuple[Dict[str, ProductVariant], List[ProductVariant]]:
+    """Create and update variants of the rows; return variants by SKU."""
+    variants = ProductVariant.objects.in_bulk(
+        {row.variant_sku for row in rows if row.variant_sku}, field_name="sku"
+    )
+    existing_variants = list(variants.values())
+    created_variants = []
+    updated_fields: Set[str] = set()
+    for row in rows:
+        if not row.variant_sku:
+            continue
+        variant = variants.get(row.variant_sku)
+        if variant is None:
+            variant = ProductVariant(
+                sku=row.variant_sku, product=products[row.product_slug]
+            )
+            variants[row.variant_sku] = variant
+            created_variants.append(variant)
+        elif variant.pk:
+            updated_fields.update(row.variant_fields)
+        for field_name, value in row.variant_fields.items():
+            setattr(variant, field_name, value)
+
+    ProductVariant.objects.bulk_create(created_variants)
+    if existing_variants and updated_fields:
+        for variant in existing_variants:
+            variant.updated_at = timezone.now()
+        ProductVariant.objects.bulk_update(
+            existing_variants, [*updated_fields, "updated_at"]
+        )
+
+    products_without_default_variant = []
+    for variant in created_variants:
+        product = variant.product
+        if product.default_variant_id is None:
+            product.default_variant = variant
+            products_without_default_variant.append(product)
+    Product.objects.bulk_update(products_without_default_variant, ["default_variant"])
+    return variants, created_variants
+
+
+def save_channel_listings(
+    rows: List[ImportRow],
+    products: Dict[str, Product],
+    variants: Dict[str, ProductVariant],
+    context: ImportContext,
+):
+    """Create and update product and variant channel listings of the rows.
+
+    Products are listed in the channels of their imported variant listings.
+    """
+    product_listings_data: DefaultDict[Tuple[int, int], Dict[str, Any]] = defaultdict(
+        dict
+    )
+    variant_listings_data: DefaultDict[Tuple[int, int], Dict[str, Any]] = defaultdict(
+        dict
+    )
+    for row in rows:
+        product_id = products[row.product_slug].pk
+        for channel_id, listing in row.product_channels.items():
+            product_listings_data[(product_id, channel_id)].update(listing)
+        for channel_id, listing in row.variant_channels.items():
+            product_listings_data.setdefault((product_id, channel_id), {})
+            variant_id = variants[row.variant_sku].pk  # type: ignore
+            variant_listings_data[(variant_id, channel_id)].update(listing)
+
+    _save_listings(ProductChannelListing, "product_id", product_listings_data, context)
+    _save_listings(
+        ProductVariantChannelListing, "variant_id", variant_listings_data, context
+    )
+
+
+def _save_listings(
+    model,
+    instance_field: str,
+    listings_data: Dict[Tuple[int, int], Dict[str, Any]],
+    context: ImportContext,
+):
+    if not listings_data:
+        return
+    lookup = {
+        f"{instance_field}__in": {instance_id for instance_id, _ in listings_data},
+        "channel_id__in": {channel_id for _, channel_id in listings_data},
+    }
+    listings = {
+        (getattr(listing, instance_field), listing.channel_id): listing
+        for listing in model.objects.filter(**lookup)
+    }
+    created_listings = []
+    updated_fields: Set[str] = set()
+    for (instance_id, channel_id), data in listings_data.items():
+        listing = listings.get((instance_id, channel_id))
+        if listing is None:
+            listing = model(
+                **{instance_field: instance_id},
+                channel_id=channel_id,
+                currency=context.channels_by_id[channel_id].currency_code,
+            )
+            created_listings.append(listing)
+        else:
+            updated_fields.update(data)
+        for field_name, value in data.items():
+            setattr(listing, field_name, value)
+        if getattr(listing, "is_published", False) and not listing.published_at:
+            listing.published_at = timezone.now()
+            updated_fields.add("published_at")
+
+    model.objects.bulk_create(created_listings)
+    if listings and updated_fields:
+        model.objects.bulk_update(listings.values(), sorted(updated_fields))
+
+
+def save_stocks(rows: List[ImportRow], variants: Dict[str, ProductVariant]):
+    quantities: Dict[Tuple[int, int], int] = {}
+    for row in rows:
+        for warehouse_id, quantity in row.stocks.items():
+            variant_id = variants[row.variant_sku].pk  # type: ignore
+            quantities[(variant_id, warehouse_id)] = quantity
+    if not quantities:
+        return
+
+    stocks = {
+        (stock.product_variant_id, stock.warehouse_id): stock
+        for stock in Stock.objects.filter(
+            product_variant_id__in={variant_id for variant_id, _ in quantities},
+            warehouse_id__in={warehouse_id for _, warehouse_id in quantities},
+        )
+    }
+    created_stocks = []
+    for (variant_id, warehouse_id), quantity in quantities.items():
+        stock = stocks.get((variant_id, warehouse_id))
+        if stock is None:
+            created_stocks.append(
+                Stock(
+                    product_variant_id=variant_id,
+                    warehouse_id=warehouse_id,
+                    quantity=quantity,
+                )
+            )
+        else:
+            stock.quantity = quantity
+    Stock.objects.bulk_create(created_stocks)
+    Stock.objects.bulk_update(stocks.values(), ["quantity"])
+    if settings.STOCK_SHARDS:
+        fold_stock_shards(
+            [stock.pk for stock in created_stocks]
+            + [stock.pk for stock in stocks.values()]
+        )
+
+
+def save_attributes(
+    rows: List[ImportRow],
+    products: Dict[str, Product],
+    variants: Dict[str, ProductVariant],
+    result: ImportResult,
+):
+    """Replace the values of the imported attributes of products and variants."""
+    product_values: Dict[Tuple[int, int], Tuple[int, List[str]]] = {}
+    variant_values: Dict[Tuple[int, int], Tuple[int, List[str]]] = {}
+    for row in rows:
+        product = products[row.product_slug]
+        for attribute_id, names in row.product_attributes.items():
+            product_values[(product.pk, attribute_id)] = (row.number, names)
+        for attribute_id, names in row.variant_attributes.items():
+            variant = variants[row.variant_sku]  # type: ignore
+            variant_values[(variant.pk, attribute_id)] = (row.number, names)
+
+    product_type_ids = {
+        product.pk: product.product_type_id for product in products.values()
+    }
+    variant_product_type_ids = {
+        variant.pk: product_type_ids[variant.product_id]
+        for variant in variants.values()
+    }
+    _save_attribute_values(
+        product_values,
+        product_type_ids,
+        AttributeProduct,
+        AssignedProductAttribute,
+        AssignedProductAttributeValue,
+        "product_id",
+        result,
+    )
+    _save_attribute_values(
+        variant_values,
+        variant_product_type_ids,
+        AttributeVariant,
+        AssignedVariantAttribute,
+        AssignedVariantAttributeValue,
+        "variant_id",
+        result,
+    )
+
+
+def _save_attribute_values(
+    instance_values: Dict[Tuple[int, int], Tuple[int, List[str]]],
+    product_type_ids: Dict[int, int],
+    attribute_assignment_model,
+    assigned_attribute_model,
+    assigned_value_model,
+    instance_field: str,
+    result: ImportResult,
+):
+    if not instance_values:
+        return
+
+    attribute_assignment_ids = {
+        (product_type_id, attribute_id): pk
+        for pk, product_type_id, attribute_id in (
+            attribute_assignment_model.objects.filter(
+                product_type_id__in=set(product_type_ids.values())
+            ).values_list("pk", "product_type_id", "attribute_id")
+        )
+    }
+    values_to_assign = {}
+    for (instance_id, attribute_id), (number, names) in instance_values.items():
+        product_type_id = product_type_ids[instance_id]
+        attribute_assignment_id = attribute_assignment_ids.get(
+            (product_type_id, attribute_id)
+        )
+        if attribute_assignment_id is None:
+            result.add_error(
+                number,
+                ValidationError(
+                    "Attribute is not assigned to the product type of the product."
+                ),
+            )
+            continue
+        values_to_assign[(instance_id, attribute_assignment_id)] = (
+            attribute_id,
+            names,
+        )
+    if not values_to_assign:
+        return
+
+    attribute_values = _get_or_create_attribute_values(
+        {
+            (attribute_id, name)
+            for attribute_id, names in values_to_assign.values()
+            for name in names
+        }
+    )
+
+    assigned_attribute_model.objects.bulk_create(
+        [
+            assigned_attribute_model(
+                **{instance_field: instance_id}, assignment_id=assignment_id
+            )
+            for instance_id, assignment_id in values_to_assign
+        ],
+        ignore_conflicts=True,
+    )
+    assigned_attribute_ids = {
+        (getattr(assigned, instance_field), assigned.assignment_id): assigned.pk
+        for assigned in assigned_attribute_model.objects.filter(
+            **{
+                f"{instance_field}__in": {
+                    instance_id for instance_id, _ in values_to_assign
+                },
+                "assignment_id__in": {
+                    assignment_id for _, assignment_id in values_to_assign
+                },
+            }
+        )
+    }
+    assigned_value_model.objects.filter(
+        assignment_id__in=assigned_attribute_ids.values()
+    ).delete()
+    assigned_value_model.objects.bulk_create(
+        [
+            assigned_value_model(
+                assignment_id=assigned_attribute_ids[key],
+                value_id=value_id,
+                sort_order=sort_order,
+            )
+            for key, (attribute_id, names) in values_to_assign.items()
+            for sort_order, value_id in enumerate(
+                # Names with equal slugs point to the same value.
+                dict.fromkeys(attribute_values[(attribute_id, name)] for name in names)
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _get_or_create_attribute_values(
+    names: Set[Tuple[int, str]]
+) -> Dict[Tuple[int, str], int]:
+    """Return IDs of the attribute values with given names, creating missing ones.
+
+    Names with equal slugs, like "Red" and "red", share a single value, which is
+    created with the first of the names.
+    """
+    slugs = {
+        (attribute_id, name): slugify(unidecode(name))
+        for attribute_id, name in sorted(names)
+    }
+    new_values: Dict[Tuple[int, str], str] = {}
+    for (attribute_id, name), slug in slugs.items():
+        new_values.setdefault((attribute_id, slug), name)
+    existing_values = {
+        (attribute_id, slug): pk
+        for pk, attribute_id, slug in AttributeValue.objects.filter(
+            attribute_id__in={attribute_id for attribute_id, _ in new_values},
+            slug__in={slug for _, slug in new_values},
+        ).values_list("pk", "attribute_id", "slug")
+    }
+    created_values = AttributeValue.objects.bulk_create(
+        [
+            AttributeValue(attribute_id=attribute_id, slug=slug, name=name)
+            for (attribute_id, slug), name in new_values.items()
+            if (attribute_id, slug) not in existing_values
+        ]
+    )
+    for value in created_values:
+        existing_values[(value.attribute_id, value.slug)] = value.pk
+    return {
+        (attribute_id, name): existing_values[(attribute_id, slug)]
+        for (attribute_id, name), slug in slugs.items()
+    }
+
+
+def update_imported_products(product_ids: List[int]):
+    """Update data derived from the imported products in a single pass.
+
+    Search vectors are updated by the search indexer from the recorded changes.
+    Discounted prices, which also mark the listing index dirty, are recalculated
+    in batches.
+    """
+    mark_products_search_index_changed(product_ids, ProductSearchIndexChangeSource.ALL)
+    for index in range(0, len(product_ids), BATCH_SIZE):
+        batch_ids = product_ids[index : index + BATCH_SIZE]  # noqa: E203
+        update_products_discounted_prices(Product.objects.filter(pk__in=batch_ids))
+        mark_products_listing_index_dirty(batch_ids)
+
+
+def send_import_webhooks(
+    created_product_ids: List[int],
+    updated_product_ids: List[int],
+    created_variant_ids: List[int],
+    updated_variant_ids: List[int],
+):
+    """Send events of a batch of imported products and variants.
+
+    Objects of the whole batch are fetched with single queries, but the events
+    are sent one per object, as there are no bulk product events.
+    """
+    manager = get_plugins_manager()
+    products = Product.objects.in_bulk(created_product_ids + updated_product_ids)
+    for product_id in created_product_ids:
+        manager.product_created(products[product_id])
+    for product_id in updated_product_ids:
+        manager.product_updated(products[product_id])
+
+    variants = ProductVariant.objects.select_related("product").in_bulk(
+        created_variant_ids + updated_variant_ids
+    )
+    for variant_id in created_variant_ids:
+        manager.product_variant_created(variants[variant_id])
+    for variant_id in updated_variant_ids:
+        manager.product_variant_updated(variants[variant_id])
+
+
+def _get_channel(slug: str, context: ImportContext) -> Channel:
+    channel = context.channels.get(slug)
+    if channel is None:
+        raise ValidationError(f"Channel {slug} doesn't exist.")
+    return channel
+
+
+def _get_warehouse_id(slug: str, context: ImportContext) -> int:
+    warehouse_id = context.warehouse_ids.get(slug)
+    if warehouse_id is None:
+        raise ValidationError(f"Warehouse {slug} doesn't exist.")
+    return warehouse_id
+
+
+def _get_attribute(slug: str, context: ImportContext) -> Attribute:
+    attribute = context.attributes.get(slug)
+    if attribute is None:
+        raise ValidationError(f"Attribute {slug} doesn't exist.")
+    if attribute.input_type not in ATTRIBUTE_INPUT_TYPES:
+        raise ValidationError(
+            f"Importing values of {attribute.input_type} attributes is not supported."
+        )
+    return attribute
+
+
+def _parse_bool(value: str) -> bool:
+    if value.lower() in TRUE_VALUES:
+        return True
+    if value.lower() in FALSE_VALUES:
+        return False
+    raise ValidationError(f"{value} is not a valid boolean.")
+
+
+def _parse_quantity(value: str) -> int:
+    try:
+        quantity = int(value)
+    except ValueError:
+        raise ValidationError(f"{value} is not a valid integer.")
+    if not 0 <= quantity <= MAX_INT:
+        raise ValidationError(f"Quantity must be between 0 and {MAX_INT}.")
+    return quantity
+
+
+def _parse_price(value: str, channel: Channel) -> Decimal:
+    """Parse price amount validated like in the variant channel listing mutation."""
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        raise ValidationError(f"{value} is not a valid decimal.")
+    if not price.is_finite():
+        raise ValidationError(f"{value} is not a valid decimal.")
+    if price < 0:
+        raise ValidationError("Price can't be negative.")
+    validate_price_precision(price, channel.currency_code)
+    validate_decimal_max_value(price)
+    return price
+
+
+def _validate_length(value: str, model, field_name: str, label: str):
+    max_length = model._meta.get_field(field_name).max_length
+    if len(value) > max_length:
+        raise ValidationError(f"{label} can't be longer than {max_length} characters.")
+
+
+def _parse_datetime(value: str) -> datetime:
+    try:
+        date_time = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValidationError(f"{value} is not a valid ISO 8601 date time.")
+    if timezone.is_naive(date_time):
+        date_time = timezone.make_aware(date_time)
+    return date_time
+
+
+def _parse_weight(value: str) -> Weight:
+    """Parse weight like "1.5 kg"; grams are assumed when the unit is missing."""
+    amount, _, unit = value.partition(" ")
+    try:
+        weight = Weight(**{unit.strip() or "g": float(amount)})
+    except (AttributeError, TypeError, ValueError):
+        raise ValidationError(f"{value} is not a valid weight.")
+    if not math.isfinite(weight.g) or weight.g < 0:
+        raise ValidationError(f"{value} is not a valid weight.")
+    return weight
+
+
+def _parse_description(value: str) -> dict:
+    """Parse EditorJS JSON of the description, or wrap plain text in a paragraph."""
+    try:
+        description = json.loads(value)
+    except ValueError:
+        description = None
+    if isinstance(description, dict) and "blocks" in description:
+        return description
+    return {"blocks": [{"type": "paragraph", "data": {"text": value}}]}
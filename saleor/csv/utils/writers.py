@@ -0,0 +1,104 @@
+import csv
+import gzip
+import io
+from tempfile import NamedTemporaryFile
+from typing import IO, Any, Dict, Iterable, Iterator, List, Sequence
+
+from openpyxl import Workbook, load_workbook
+
+from .. import FileTypes
+
+# Value of the cells of fields missing in the exported data.
+MISSING_VALUE = " "
+
+
+class ExportFileWriter:
+    """Write exported rows to a temporary file opened once for the whole export.
+
+    CSV rows are written to the file as they come, optionally gzip compressed.
+    XLSX rows are written to a write-only workbook, which keeps only the current
+    row in memory and serializes the sheet when the writer is closed.
+    """
+
+    def __init__(
+        self,
+        headers: List[str],
+        file_type: str,
+        delimiter: str = ",",
+        compress: bool = False,
+    ):
+        self.file_type = file_type
+        self.compressed = compress and file_type == FileTypes.CSV
+        suffix = ".csv.gz" if self.compressed else f".{file_type}"
+        self.temporary_file: IO[bytes] = NamedTemporaryFile("w+b", suffix=suffix)
+
+        if file_type == FileTypes.CSV:
+            binary_file: IO[bytes] = self.temporary_file
+            if self.compressed:
+                binary_file = gzip.GzipFile(fileobj=self.temporary_file, mode="wb")
+            self._binary_file = binary_file
+            self._text_file = io.TextIOWrapper(
+                binary_file, newline="", encoding="utf-8"
+            )
+            self._csv_writer = csv.writer(self._text_file, delimiter=delimiter)
+            self._csv_writer.writerow(headers)
+        else:
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet()
+            self._sheet.append(headers)
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]], fields: List[str]):
+        """Write values of the given fields of every row, in the order of fields."""
+        append = (
+            self._csv_writer.writerow
+            if self.file_type == FileTypes.CSV
+            else self._sheet.append
+        )
+        for row in rows:
+            append([row.get(field, MISSING_VALUE) for field in fields])
+
+    def write_values(self, rows: Iterable[Sequence[Any]]):
+        """Write rows of values that are already in the order of the headers."""
+        append = (
+            self._csv_writer.writerow
+            if self.file_type == FileTypes.CSV
+            else self._sheet.append
+        )
+        for row in rows:
+            append(row)
+
+    def close(self) -> IO[bytes]:
+        """Finish the file and return the temporary file rewound to the start.
+
+        The caller is responsible for closing the returned file.
+        """
+        if self.file_type == FileTypes.CSV:
+            # detach, so closing the wrapper doesn't close the temporary file
+            self._text_file.flush()
+            self._text_file.detach()
+            if self.compressed:
+                self._binary_file.close()
+        else:
+            self._workbook.save(self.temporary_file)
+        self.temporary_file.seek(0)
+        return self.temporary_file
+
+
+def iter_file_rows(
+    file: IO[bytes], file_type: str, delimiter: str = ","
+) -> Iterator[Sequence[Any]]:
+    """Yield rows of values of a file written by `ExportFileWriter`, without headers.
+
+    Used to merge the parts of exports split into shards.
+    """
+    if file_type == FileTypes.CSV:
+        text_file = io.TextIOWrapper(file, newline="", encoding="utf-8")
+        reader = csv.reader(text_file, delimiter=delimiter)
+        next(reader, None)
+        yield from reader
+        # detach, so the caller stays responsible for closing the file
+        text_file.detach()
+    else:
+        workbook = load_workbook(file, read_only=True)
+        yield from workbook.active.iter_rows(min_row=2, values_only=True)
+        workbook.close()
@@ -16,11 +16,17 @@ from ..models import (
     VoucherCustomer,
 )
 from ..utils import (
+    IndexedDiscounts,
+    _discounts_snapshot_cache,
     add_voucher_usage_by_customer,
     decrease_voucher_usage,
+    fetch_active_discounts,
     fetch_catalogue_info,
+    fetch_discounts,
     get_product_discount_on_sale,
+    get_product_discounts,
     increase_voucher_usage,
+    invalidate_discounts_cache,
     remove_voucher_usage_by_customer,
     validate_voucher,
 )
@@ -718,3 +724,88 @@ def test_fetch_catalogue_info_for_sale_has_one_element_sets(sale):
     assert catalogue_info["collections"] == collection_ids
     assert catalogue_info["products"] == product_ids
     assert catalogue_info["variants"] == variant_ids
+
+
+def test_get_product_discounts_with_indexed_discounts(
+    product, product_with_two_variants, channel_USD
+):
+    # given
+    sale = Sale.objects.create(name="Product sale")
+    other_sale = Sale.objects.create(name="Other product sale")
+    for sale_instance, sale_product in [
+        (sale, product),
+        (other_sale, product_with_two_variants),
+    ]:
+        SaleChannelListing.objects.create(
+            sale=sale_instance,
+            channel=channel_USD,
+            discount_value=5,
+            currency=channel_USD.currency_code,
+        )
+        sale_instance.products.add(sale_product)
+    discounts = fetch_active_discounts()
+
+    # when
+    product_discounts = list(
+        get_product_discounts(
+            product=product,
+            collections=[],
+            discounts=discounts,
+            channel=channel_USD,
+        )
+    )
+
+    # then
+    assert isinstance(discounts, IndexedDiscounts)
+    assert len(discounts) == 2
+    assert [sale_id for sale_id, _ in product_discounts] == [sale.id]
+
+
+def test_fetch_discounts_cache_shared_between_calls(
+    settings, sale, django_assert_num_queries
+):
+    # given
+    settings.DISCOUNTS_CACHE_ENABLED = True
+    _discounts_snapshot_cache.clear()
+    fetch_active_discounts()
+
+    # when
+    with django_assert_num_queries(0):
+        discounts = fetch_active_discounts()
+
+    # then
+    assert [discount.sale for discount in discounts] == [sale]
+
+
+def test_fetch_discounts_cache_filters_by_date_and_channel(settings, sale, channel_PLN):
+    # given
+    settings.DISCOUNTS_CACHE_ENABLED = True
+    _discounts_snapshot_cache.clear()
+    now = timezone.now()
+    sale.start_date = now + timedelta(days=1)
+    sale.save(update_fields=["start_date"])
+
+    # when
+    current_discounts = fetch_discounts(now)
+    future_discounts = fetch_discounts(now + timedelta(days=2))
+    other_channel_discounts = fetch_discounts(now + timedelta(days=2), channel_PLN.slug)
+
+    # then
+    assert current_discounts == []
+    assert [discount.sale for discount in future_discounts] == [sale]
+    assert other_channel_discounts == []
+
+
+def test_invalidate_discounts_cache(settings, sale, django_capture_on_commit_callbacks):
+    # given
+    settings.DISCOUNTS_CACHE_ENABLED = True
+    _discounts_snapshot_cache.clear()
+    fetch_active_discounts()
+    sale.delete()
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_discounts_cache()
+
+    # then
+    assert fetch_active_discounts() == []
@@ -1,5 +1,6 @@
 import datetime
 from collections import defaultdict
+from dataclasses import dataclass
 from decimal import Decimal
 from functools import partial
 from typing import (
@@ -18,12 +19,14 @@ from typing import (
 )
 
 from django.conf import settings
-from django.db.models import F
+from django.db.models import F, Q
 from django.utils import timezone
 from prices import Money, TaxedMoney, fixed_discount, percentage_discount
 
 from ..channel.models import Channel
 from ..core.taxes import include_taxes_in_prices, zero_money
+from ..core.utils.cache_tags import get_model_cache_tag, purge_cache_tags
+from ..core.utils.versioned_cache import VersionedMemoryCache
 from . import DiscountInfo
 from .models import (
     DiscountValueType,
@@ -44,6 +47,7 @@ if TYPE_CHECKING:
 
 CatalogueInfo = DefaultDict[str, Set[int]]
 CATALOGUE_FIELDS = ["categories", "collections", "products", "variants"]
+DISCOUNTS_CACHE_VERSION_KEY = "discounts_version"
 
 
 def increase_voucher_usage(voucher: "Voucher") -> None:
@@ -113,6 +117,8 @@ def get_product_discounts(
 ) -> Iterator[Tuple[int, Callable]]:
     """Return sale ids, discount values for all discounts applicable to a product."""
     product_collections = set(pc.id for pc in collections)
+    if isinstance(discounts, IndexedDiscounts):
+        discounts = discounts.for_product(product, product_collections, variant_id)
     for discount in discounts or []:
         try:
             yield get_product_discount_on_sale(
@@ -355,14 +361,146 @@ def fetch_sale_channel_listings(
     return channel_listings_map
 
 
-def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
-    sales = list(Sale.objects.active(date))
+class CatalogueDiscountsIndex:
+    """Reverse index of sales applicable to catalogue items.
+
+    Maps IDs of products, variants, categories and collections to IDs of the sales
+    that include them, so sales of a product are found without scanning all sales.
+    """
+
+    def __init__(self, discounts: Iterable[DiscountInfo]):
+        self.product_sale_ids: DefaultDict[int, List[int]] = defaultdict(list)
+        self.variant_sale_ids: DefaultDict[int, List[int]] = defaultdict(list)
+        self.category_sale_ids: DefaultDict[int, List[int]] = defaultdict(list)
+        self.collection_sale_ids: DefaultDict[int, List[int]] = defaultdict(list)
+        for discount in discounts:
+            sale_id = discount.sale.pk
+            for product_id in discount.product_ids:
+                self.product_sale_ids[product_id].append(sale_id)
+            for variant_id in discount.variants_ids:
+                self.variant_sale_ids[variant_id].append(sale_id)
+            for category_id in discount.category_ids:
+                self.category_sale_ids[category_id].append(sale_id)
+            for collection_id in discount.collection_ids:
+                self.collection_sale_ids[collection_id].append(sale_id)
+
+    def get_sale_ids(
+        self,
+        product: "Product",
+        collection_ids: Iterable[int],
+        variant_id: Optional[int] = None,
+    ) -> Set[int]:
+        sale_ids = set(self.product_sale_ids.get(product.id, []))
+        sale_ids.update(self.category_sale_ids.get(product.category_id, []))
+        for collection_id in collection_ids:
+            sale_ids.update(self.collection_sale_ids.get(collection_id, []))
+        if variant_id:
+            sale_ids.update(self.variant_sale_ids.get(variant_id, []))
+        return sale_ids
+
+
+class IndexedDiscounts(list):
+    """List of discounts that finds discounts of a product with a reverse index.
+
+    The index may include more sales than the list, e.g. when it's shared by lists
+    of sales active at different dates. The list may be shared between requests,
+    so it must not be modified.
+    """
+
+    def __init__(
+        self, discounts: Iterable[DiscountInfo], index: CatalogueDiscountsIndex
+    ):
+        super().__init__(discounts)
+        self.index = index
+        self._positions = {
+            discount.sale.pk: position for position, discount in enumerate(self)
+        }
+
+    def for_product(
+        self,
+        product: "Product",
+        collection_ids: Iterable[int],
+        variant_id: Optional[int] = None,
+    ) -> List[DiscountInfo]:
+        """Return discounts that may apply to the product, in the list order."""
+        positions = sorted(
+            self._positions[sale_id]
+            for sale_id in self.index.get_sale_ids(product, collection_ids, variant_id)
+            if sale_id in self._positions
+        )
+        return [self[position] for position in positions]
+
+
+@dataclass(frozen=True)
+class DiscountsSnapshot:
+    """Sales that weren't finished when the snapshot was built, with their index.
+
+    Sales starting and ending after the snapshot was built are filtered out by
+    their dates, so the snapshot doesn't have to be rebuilt when they do.
+    """
+
+    built_at: datetime.datetime
+    discounts: List[DiscountInfo]
+    index: CatalogueDiscountsIndex
+
+    def get_discounts(
+        self, date: datetime.datetime, channel_slug: Optional[str] = None
+    ) -> IndexedDiscounts:
+        return IndexedDiscounts(
+            [
+                discount
+                for discount in self.discounts
+                if _is_sale_active(cast(Sale, discount.sale), date)
+                and (channel_slug is None or channel_slug in discount.channel_listings)
+            ],
+            self.index,
+        )
+
+
+_discounts_snapshot_cache: VersionedMemoryCache[
+    DiscountsSnapshot
+] = VersionedMemoryCache(DISCOUNTS_CACHE_VERSION_KEY)
+
+
+def _is_sale_active(sale: Sale, date: datetime.datetime) -> bool:
+    return sale.start_date <= date and (sale.end_date is None or sale.end_date >= date)
+
+
+def build_discounts_snapshot() -> DiscountsSnapshot:
+    built_at = timezone.now()
+    sales = list(
+        Sale.objects.filter(Q(end_date__isnull=True) | Q(end_date__gte=built_at))
+    )
+    discounts = fetch_discount_infos(sales)
+    return DiscountsSnapshot(
+        built_at=built_at,
+        discounts=discounts,
+        index=CatalogueDiscountsIndex(discounts),
+    )
+
+
+def invalidate_discounts_cache():
+    """Make all workers rebuild the discounts snapshot once the transaction commits.
+
+    Cached responses with product pricing are purged as well, as they are built
+    from the snapshot.
+    """
+    from ..product.models import Product
+
+    _discounts_snapshot_cache.invalidate()
+    purge_cache_tags([get_model_cache_tag(Product)])
+
+
+def fetch_discount_infos(
+    sales: List[Sale],
+    database_connection_name: str = settings.DATABASE_CONNECTION_DEFAULT_NAME,
+) -> List[DiscountInfo]:
     pks = {s.pk for s in sales}
-    collections = fetch_collections(pks)
-    channel_listings = fetch_sale_channel_listings(pks)
-    products = fetch_products(pks)
-    categories = fetch_categories(pks)
-    variants = fetch_variants(pks)
+    collections = fetch_collections(pks, database_connection_name)
+    channel_listings = fetch_sale_channel_listings(pks, database_connection_name)
+    products = fetch_products(pks, database_connection_name)
+    categories = fetch_categories(pks, database_connection_name)
+    variants = fetch_variants(pks, database_connection_name)
 
     return [
         DiscountInfo(
@@ -377,8 +515,30 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
     ]
 
 
-def fetch_active_discounts() -> List[DiscountInfo]:
-    return fetch_discounts(timezone.now())
+def fetch_discounts(
+    date: datetime.datetime, channel_slug: Optional[str] = None
+) -> List[DiscountInfo]:
+    """Return sales active at the given date, limited to the channel if given.
+
+    With `settings.DISCOUNTS_CACHE_ENABLED`, sales are taken from the snapshot
+    shared by the whole process, unless the date precedes the snapshot.
+    """
+    if settings.DISCOUNTS_CACHE_ENABLED:
+        snapshot = _discounts_snapshot_cache.get_or_build(
+            DISCOUNTS_CACHE_VERSION_KEY, build_discounts_snapshot
+        )
+        if date >= snapshot.built_at:
+            return snapshot.get_discounts(date, channel_slug)
+
+    sales = Sale.objects.active(date)
+    if channel_slug:
+        sales = sales.filter(channel_listings__channel__slug=channel_slug)
+    discounts = fetch_discount_infos(list(sales))
+    return IndexedDiscounts(discounts, CatalogueDiscountsIndex(discounts))
+
+
+def fetch_active_discounts(channel_slug: Optional[str] = None) -> List[DiscountInfo]:
+    return fetch_discounts(timezone.now(), channel_slug)
 
 
 def fetch_catalogue_info(instance: Sale) -> CatalogueInfo:
@@ -21,6 +21,7 @@ from ....core.utils.url import validate_storefront_url
 from ....giftcard.utils import assign_user_gift_cards
 from ....order.utils import match_orders_with_new_user
 from ....thumbnail import models as thumbnail_models
+from ....thumbnail.tasks import schedule_thumbnails_creation
 from ...account.enums import AddressTypeEnum
 from ...account.types import Address, AddressInput, User
 from ...app.dataloaders import get_app_promise
@@ -656,6 +657,7 @@ class UserAvatarUpdate(BaseMutation):
             thumbnail_models.Thumbnail.objects.filter(user_id=user.id).delete()
         user.avatar = image_data
         user.save()
+        schedule_thumbnails_creation("User", user.pk)
 
         return UserAvatarUpdate(user=user)
 
@@ -5517,6 +5517,33 @@ def test_user_avatar_update_mutation(
     assert file_name.endswith(format)
 
 
+@patch("saleor.thumbnail.tasks.create_thumbnails_task.delay")
+def test_user_avatar_update_mutation_schedules_thumbnails(
+    create_thumbnails_task_mock,
+    staff_api_client,
+    media_root,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.THUMBNAIL_PREGENERATION_ENABLED = True
+    image_file, image_name = create_image("avatar")
+    variables = {"image": image_name}
+    body = get_multipart_request_body(
+        USER_AVATAR_UPDATE_MUTATION, variables, image_file, image_name
+    )
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        response = staff_api_client.post_multipart(body)
+
+    # then
+    get_graphql_content(response)
+    create_thumbnails_task_mock.assert_called_once_with(
+        "User", staff_api_client.user.pk
+    )
+
+
 def test_user_avatar_update_mutation_image_exists(
     staff_api_client, media_root, site_settings
 ):
@@ -2,7 +2,6 @@ from typing import TYPE_CHECKING
 
 import graphene
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.db import transaction
 from django.db.models import Exists, OuterRef, Q
 from django.utils.text import slugify
 from text_unidecode import unidecode
@@ -18,7 +17,12 @@ from ...core.permissions import (
 )
 from ...core.tracing import traced_atomic_transaction
 from ...core.utils import generate_unique_slug
+from ...product import ProductSearchIndexChangeSource
 from ...product import models as product_models
+from ...product.search import (
+    mark_attribute_value_search_index_changed,
+    mark_products_search_index_changed,
+)
 from ..core.descriptions import DEPRECATED_IN_3X_INPUT
 from ..core.enums import MeasurementUnitsEnum
 from ..core.fields import JSONString
@@ -31,7 +35,6 @@ from ..plugins.dataloaders import get_plugin_manager_promise
 from .descriptions import AttributeDescriptions, AttributeValueDescriptions
 from .enums import AttributeEntityTypeEnum, AttributeInputTypeEnum, AttributeTypeEnum
 from .types import Attribute, AttributeValue
-from .utils import queryset_in_batches
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -759,35 +762,7 @@ class AttributeValueUpdate(AttributeValueCreate):
 
     @classmethod
     def post_save_action(cls, info, instance, cleaned_input):
-        with transaction.atomic():
-            variants = product_models.ProductVariant.objects.filter(
-                Exists(instance.variantassignments.filter(variant_id=OuterRef("id")))
-            )
-            # SELECT … FOR UPDATE needs to lock rows in a consistent order
-            # to avoid deadlocks between updates touching the same rows.
-            qs = (
-                product_models.Product.objects.select_for_update(of=("self",))
-                .filter(
-                    Q(search_index_dirty=False)
-                    & (
-                        Q(
-                            Exists(
-                                instance.productassignments.filter(
-                                    product_id=OuterRef("id")
-                                )
-                            )
-                        )
-                        | Q(Exists(variants.filter(product_id=OuterRef("id"))))
-                    )
-                )
-                .order_by("pk")
-            )
-            PRODUCTS_BATCH_SIZE = 10000
-            for batch_pks in queryset_in_batches(qs, PRODUCTS_BATCH_SIZE):
-                product_models.Product.objects.filter(pk__in=batch_pks).update(
-                    search_index_dirty=True
-                )
-
+        mark_attribute_value_search_index_changed(instance.pk)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.attribute_value_updated, instance)
         cls.call_event(manager.attribute_updated, instance.attribute)
@@ -813,8 +788,8 @@ class AttributeValueDelete(ModelDeleteMutation):
         instance = cls.get_node_or_error(info, node_id, only_type=AttributeValue)
         product_ids = cls.get_product_ids_to_update(instance)
         response = super().perform_mutation(_root, info, **data)
-        product_models.Product.objects.filter(id__in=product_ids).update(
-            search_index_dirty=True
+        mark_products_search_index_changed(
+            product_ids, ProductSearchIndexChangeSource.ATTRIBUTES
         )
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.attribute_value_deleted, instance)
@@ -8,6 +8,8 @@ from freezegun import freeze_time
 
 from .....attribute.utils import associate_attribute_values_to_instance
 from .....core.utils.json_serializer import CustomJsonEncoder
+from .....product import ProductSearchIndexChangeSource
+from .....product.models import ProductSearchIndexChange
 from .....webhook.event_types import WebhookEventAsyncType
 from .....webhook.payloads import generate_meta, generate_requestor
 
@@ -45,7 +47,7 @@ def test_delete_attribute_value(
         value.refresh_from_db()
 
 
-def test_delete_attribute_value_update_search_index_dirty_in_product(
+def test_delete_attribute_value_records_search_index_change_of_product(
     staff_api_client,
     product,
     permission_manage_product_types_and_attributes,
@@ -60,12 +62,13 @@ def test_delete_attribute_value_update_search_index_dirty_in_product(
     staff_api_client.post_graphql(
         query, variables, permissions=[permission_manage_product_types_and_attributes]
     )
-    product.refresh_from_db(fields=["search_index_dirty"])
 
     # then
     with pytest.raises(value._meta.model.DoesNotExist):
         value.refresh_from_db()
-    assert product.search_index_dirty is True
+    change = ProductSearchIndexChange.objects.get()
+    assert change.product_id == product.id
+    assert change.source == ProductSearchIndexChangeSource.ATTRIBUTES
 
 
 @freeze_time("2022-05-12 12:00:00")
@@ -10,6 +10,8 @@ from freezegun import freeze_time
 from .....attribute.error_codes import AttributeErrorCode
 from .....attribute.utils import associate_attribute_values_to_instance
 from .....core.utils.json_serializer import CustomJsonEncoder
+from .....product import ProductSearchIndexChangeSource
+from .....product.models import ProductSearchIndexChange
 from .....webhook.event_types import WebhookEventAsyncType
 from .....webhook.payloads import generate_meta, generate_requestor
 from ....tests.utils import get_graphql_content
@@ -75,7 +77,7 @@ def test_update_attribute_value(
     ]
 
 
-def test_update_attribute_value_update_search_index_dirty_in_product(
+def test_update_attribute_value_records_search_index_change(
     staff_api_client,
     product,
     permission_manage_product_types_and_attributes,
@@ -94,7 +96,10 @@ def test_update_attribute_value_update_search_index_dirty_in_product(
     product.refresh_from_db(fields=["search_index_dirty"])
 
     # then
-    assert product.search_index_dirty is True
+    assert product.search_index_dirty is False
+    change = ProductSearchIndexChange.objects.get()
+    assert change.attribute_value_id == value.id
+    assert change.source == ProductSearchIndexChangeSource.ATTRIBUTE_VALUE
 
 
 @freeze_time("2022-05-12 12:00:00")
@@ -13,6 +13,7 @@ from ...core.permissions import ChannelPermissions
 from ...core.tracing import traced_atomic_transaction
 from ...core.utils.date_time import convert_to_utc_date_time
 from ...order.models import Order
+from ...plugins.manager import invalidate_plugins_snapshot
 from ...shipping.tasks import drop_invalid_shipping_methods_relations_for_given_channels
 from ..account.enums import CountryCodeEnum
 from ..core.descriptions import ADDED_IN_31, ADDED_IN_35, ADDED_IN_37, PREVIEW_FEATURE
@@ -120,6 +121,7 @@ class ChannelCreate(ModelMutation):
 
     @classmethod
     def post_save_action(cls, info, instance, cleaned_input):
+        invalidate_plugins_snapshot()
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.channel_created, instance)
 
@@ -242,6 +244,7 @@ class ChannelUpdate(ModelMutation):
 
     @classmethod
     def post_save_action(cls, info, instance, cleaned_input):
+        invalidate_plugins_snapshot()
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.channel_updated, instance)
 
@@ -333,6 +336,7 @@ class ChannelDelete(ModelDeleteMutation):
 
     @classmethod
     def post_save_action(cls, info, instance, cleaned_input):
+        invalidate_plugins_snapshot()
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.channel_deleted, instance)
 
@@ -502,6 +506,7 @@ class ChannelActivate(BaseMutation):
         cls.clean_channel_availability(channel)
         channel.is_active = True
         channel.save(update_fields=["is_active"])
+        invalidate_plugins_snapshot()
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.channel_status_changed, channel)
         return ChannelActivate(channel=channel)
@@ -537,6 +542,7 @@ class ChannelDeactivate(BaseMutation):
         cls.clean_channel_availability(channel)
         channel.is_active = False
         channel.save(update_fields=["is_active"])
+        invalidate_plugins_snapshot()
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.channel_status_changed, channel)
         return ChannelDeactivate(channel=channel)
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set
 
 from django.conf import settings
 from django.http import HttpRequest
@@ -20,6 +20,7 @@ class SaleorContext(HttpRequest):
     is_mutation: bool
     dataloaders: Dict[str, "DataLoader"]
     app: Optional["App"]
+    response_cache_tags: Optional[Set[str]]
     user: UserType  # type: ignore
 
 
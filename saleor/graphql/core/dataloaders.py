@@ -2,9 +2,11 @@ from typing import Generic, Iterable, List, Optional, TypeVar, Union
 
 import opentracing
 import opentracing.tags
+from django.db.models import Model
 from promise import Promise
 from promise.dataloader import DataLoader as BaseLoader
 
+from ...core.utils.cache_tags import get_instance_cache_tag
 from . import SaleorContext
 from .context import get_database_connection_name
 
@@ -45,8 +47,20 @@ class DataLoader(BaseLoader, Generic[K, R]):
             span.set_tag(opentracing.tags.COMPONENT, "dataloaders")
             results = self.batch_load(keys)
             if not isinstance(results, Promise):
-                return Promise.resolve(results)
+                results = Promise.resolve(results)
+            if getattr(self.context, "response_cache_tags", None) is not None:
+                results = results.then(self.collect_response_cache_tags)
             return results
 
+    def collect_response_cache_tags(self, results: List[R]) -> List[R]:
+        """Tag the cached response with the model instances loaded for it."""
+        tags = self.context.response_cache_tags  # type: ignore
+        for result in results:
+            values = result if isinstance(result, (list, tuple)) else [result]
+            for value in values:
+                if isinstance(value, Model):
+                    tags.add(get_instance_cache_tag(value))
+        return results
+
     def batch_load(self, keys: Iterable[K]) -> Union[Promise[List[R]], List[R]]:
         raise NotImplementedError()
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from functools import cached_property, partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLDocument, GraphQLSchema
+from graphql.backend.core import execute_and_validate
+from graphql.error import GraphQLError
+from graphql.language.printer import print_ast
+from graphql.validation import validate
+
+from ... import __version__ as saleor_version
+from .validators.query_cost import validate_query_cost
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of distinct variable sets for which the query cost of a single
+# document is remembered.
+MAX_QUERY_COSTS_PER_DOCUMENT = 32
+
+QueryCost = Tuple[int, Optional[List[GraphQLError]]]
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_shared_cache_key(query_hash: str) -> str:
+    return f"{saleor_version}-document-{query_hash}"
+
+
+def _get_query_cost_key(variables: Optional[dict], maximum_cost: int) -> Optional[str]:
+    try:
+        variables_key = json.dumps(variables, sort_keys=True)
+    except (TypeError, ValueError):
+        # Variables contain values that can't be serialized, like uploaded files.
+        return None
+    return f"{maximum_cost}:{variables_key}"
+
+
+class CachedDocument:
+    """Parsed GraphQL document with the results of its static analysis.
+
+    The schema validation result doesn't depend on the variables, so it's computed
+    only once per document. The query cost depends on the variables, so it's
+    remembered separately for each set of variables.
+    """
+
+    def __init__(
+        self,
+        document: GraphQLDocument,
+        validation_errors: Optional[List[GraphQLError]] = None,
+    ):
+        self.document = document
+        self.validation_errors = validation_errors
+        self.query_costs: Dict[str, QueryCost] = {}
+
+    @cached_property
+    def normalized_query_hash(self) -> str:
+        """Hash of the printed AST, equal for queries that differ only in formatting."""
+        return get_query_hash(print_ast(self.document.document_ast))
+
+    @property
+    def is_validated(self) -> bool:
+        return self.validation_errors is not None
+
+    def validate(self) -> List[GraphQLError]:
+        if self.validation_errors is None:
+            self.validation_errors = validate(
+                self.document.schema, self.document.document_ast
+            )
+        return self.validation_errors
+
+    def get_query_cost(
+        self, schema, variables: Optional[dict], cost_map: dict, maximum_cost: int
+    ) -> QueryCost:
+        key = _get_query_cost_key(variables, maximum_cost)
+        if key is not None and key in self.query_costs:
+            return self.query_costs[key]
+        query_cost = validate_query_cost(
+            schema, self.document, variables, cost_map, maximum_cost
+        )
+        if key is not None and len(self.query_costs) < MAX_QUERY_COSTS_PER_DOCUMENT:
+            self.query_costs[key] = query_cost
+        return query_cost
+
+
+def build_document(
+    schema: GraphQLSchema, document_string: str, document_ast
+) -> GraphQLDocument:
+    """Create a document from an already parsed AST without printing it again."""
+    return GraphQLDocument(
+        schema=schema,
+        document_string=document_string,
+        document_ast=document_ast,
+        execute=partial(execute_and_validate, schema, document_ast),
+    )
+
+
+class DocumentCache:
+    """Bounded LRU cache of parsed GraphQL documents keyed by the query hash.
+
+    Documents are kept in the memory of the current process. When
+    `GRAPHQL_DOCUMENT_CACHE_SHARED` is enabled, the ASTs of valid documents are also
+    stored in the Django cache, so other processes can skip parsing and validation.
+    """
+
+    def __init__(self):
+        self._documents: "OrderedDict[str, CachedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return settings.GRAPHQL_DOCUMENT_CACHE_SIZE
+
+    def get_or_parse(
+        self,
+        schema: GraphQLSchema,
+        query: str,
+        parse: Callable[[], GraphQLDocument],
+    ) -> Tuple[CachedDocument, bool]:
+        """Return the cached document and whether it was found in the cache."""
+        if not self.max_size:
+            return CachedDocument(parse()), False
+
+        query_hash = get_query_hash(query)
+        with self._lock:
+            cached_document = self._documents.get(query_hash)
+            if cached_document and cached_document.document.schema is schema:
+                self._documents.move_to_end(query_hash)
+                self.hits += 1
+                return cached_document, True
+            self.misses += 1
+
+        cached_document = self._get_shared(schema, query, query_hash)
+        if cached_document is None:
+            # Parsing errors are raised before the document is stored.
+            cached_document = CachedDocument(parse())
+        self._set(query_hash, cached_document)
+        return cached_document, False
+
+    def warm_up(
+        self,
+        schema: GraphQLSchema,
+        query: str,
+        parse: Callable[[], GraphQLDocument],
+    ) -> CachedDocument:
+        """Parse and validate the query ahead of the first request using it."""
+        cached_document, _ = self.get_or_parse(schema, query, parse)
+        self.validate(query, cached_document)
+        return cached_document
+
+    def validate(
+        self, query: str, cached_document: CachedDocument
+    ) -> List[GraphQLError]:
+        """Validate the document and share it with other processes if it's valid.
+
+        The document is stored in the shared cache only when it's validated for
+        the first time, so documents already validated, including the ones loaded
+        from the shared cache, aren't stored again on every execution.
+        """
+        if cached_document.is_validated:
+            return cached_document.validation_errors or []
+        validation_errors = cached_document.validate()
+        if not validation_errors:
+            self._store_shared(query, cached_document)
+        return validation_errors
+
+    def _store_shared(self, query: str, cached_document: CachedDocument):
+        if not settings.GRAPHQL_DOCUMENT_CACHE_SHARED:
+            return
+        key = get_shared_cache_key(get_query_hash(query))
+        try:
+            cache.set(key, cached_document.document.document_ast)
+        except Exception:
+            logger.warning("Could not store the GraphQL document.", exc_info=True)
+
+    def _get_shared(
+        self, schema: GraphQLSchema, query: str, query_hash: str
+    ) -> Optional[CachedDocument]:
+        if not settings.GRAPHQL_DOCUMENT_CACHE_SHARED:
+            return None
+        try:
+            document_ast = cache.get(get_shared_cache_key(query_hash))
+        except Exception:
+            logger.warning("Could not fetch the GraphQL document.", exc_info=True)
+            return None
+        if document_ast is None:
+            return None
+        # Only documents that passed the validation are shared.
+        return CachedDocument(
+            build_document(schema, query, document_ast), validation_errors=[]
+        )
+
+    def _set(self, query_hash: str, cached_document: CachedDocument):
+        with self._lock:
+            self._documents[query_hash] = cached_document
+            self._documents.move_to_end(query_hash)
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._documents),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+document_cache = DocumentCache()
@@ -25,6 +25,7 @@ from ...core.permissions import (
     message_one_of_permissions_required,
     one_of_permissions_or_auth_filter_required,
 )
+from ...core.utils.cache_tags import purge_instances_cache_tags
 from ...core.utils.events import call_event
 from ..meta.permissions import PRIVATE_META_PERMISSION_MAP, PUBLIC_META_PERMISSION_MAP
 from ..payment.utils import metadata_contains_empty_key
@@ -646,6 +647,7 @@ class ModelMutation(BaseMutation):
         cls.save(info, instance, cleaned_input)
         cls._save_m2m(info, instance, cleaned_input)
         cls.post_save_action(info, instance, cleaned_input)
+        purge_instances_cache_tags([instance])
         return cls.success_response(instance)
 
 
@@ -678,6 +680,7 @@ class ModelDeleteMutation(ModelMutation):
         # ID so that the success response contains ID of the deleted object.
         instance.id = db_id
         cls.post_save_action(info, instance, None)
+        purge_instances_cache_tags([instance])
         return cls.success_response(instance)
 
 
@@ -772,6 +775,9 @@ class BaseBulkMutation(BaseMutation):
         if count:
             qs = instance_model.objects.filter(pk__in=clean_instance_ids)
             cls.bulk_action(info=info, queryset=qs, **data)
+            purge_instances_cache_tags(
+                instance for instance in instances if instance.pk in clean_instance_ids
+            )
         return count, errors
 
     @classmethod
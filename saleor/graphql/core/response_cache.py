@@ -0,0 +1,142 @@
+import hashlib
+import json
+import time
+from typing import Dict, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from graphql import GraphQLDocument, get_operation_ast
+from graphql.execution import ExecutionResult
+from graphql.language import ast
+
+from ... import __version__ as saleor_version
+from ...core.auth import get_token_from_request
+from ...core.utils.cache_tags import get_cache_tags_versions
+
+# Root fields of the queries whose responses can be cached, with the tag of the
+# model they return. The tag is purged whenever any instance of the model changes,
+# as the instances returned by the root fields are fetched without dataloaders.
+RESPONSE_CACHE_ROOT_FIELDS = {
+    "categories": "product.category",
+    "category": "product.category",
+    "collection": "product.collection",
+    "collections": "product.collection",
+    "menu": "menu.menu",
+    "menus": "menu.menu",
+    "product": "product.product",
+    "products": "product.product",
+}
+
+# Time in seconds for which a single request revalidates a stale response, while
+# the other requests are served the stale one.
+REVALIDATION_LOCK_TIMEOUT = 30
+
+
+def get_root_fields_cache_tags(
+    document: GraphQLDocument, operation_name: Optional[str]
+) -> Optional[Set[str]]:
+    """Return tags of the root fields, or `None` if the operation can't be cached."""
+    operation = get_operation_ast(document.document_ast, operation_name)
+    if not operation or operation.operation != "query":
+        return None
+    tags = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, ast.Field):
+            return None
+        field_name = selection.name.value
+        if field_name == "__typename":
+            continue
+        if field_name not in RESPONSE_CACHE_ROOT_FIELDS:
+            return None
+        tags.add(RESPONSE_CACHE_ROOT_FIELDS[field_name])
+    return tags
+
+
+class ResponseCacheEntry:
+    """Cached response of an anonymous storefront query.
+
+    Responses are keyed by the query, its variables, which include the channel,
+    and the host, as absolute URLs in responses depend on it. Every entry stores
+    the versions of the tags of the entity types and instances it was built from;
+    purging any of them makes the entry invalid. Entries older than
+    `GRAPHQL_RESPONSE_CACHE_TIMEOUT` are served for
+    `GRAPHQL_RESPONSE_CACHE_STALE_TIMEOUT` more seconds, while a single request
+    rebuilds them.
+    """
+
+    def __init__(self, key: str, root_tags: Set[str]):
+        self.key = key
+        self.root_tags = root_tags
+        self.root_tags_versions: Dict[str, Optional[int]] = {}
+
+    @classmethod
+    def for_request(
+        cls,
+        request: HttpRequest,
+        document: GraphQLDocument,
+        variables: Optional[dict],
+        operation_name: Optional[str],
+    ) -> Optional["ResponseCacheEntry"]:
+        if not settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+            return None
+        if get_token_from_request(request):
+            return None
+        root_tags = get_root_fields_cache_tags(document, operation_name)
+        if root_tags is None:
+            return None
+        try:
+            params = json.dumps(
+                [
+                    document.document_string,
+                    operation_name,
+                    variables,
+                    request.get_host(),
+                ],
+                sort_keys=True,
+            )
+        except TypeError:
+            return None
+        hashed_params = hashlib.sha256(params.encode("utf-8")).hexdigest()
+        return cls(f"response-cache:{saleor_version}:{hashed_params}", root_tags)
+
+    @property
+    def lock_key(self) -> str:
+        return f"{self.key}:revalidate"
+
+    def get(self) -> Optional[ExecutionResult]:
+        """Return the cached response, or `None` if it has to be built."""
+        cached = cache.get(self.key)
+        if cached and self._is_valid(cached):
+            age = time.time() - cached["created_at"]
+            if age <= settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT or not cache.add(
+                self.lock_key, 1, timeout=REVALIDATION_LOCK_TIMEOUT
+            ):
+                return ExecutionResult(data=cached["data"])
+        # The versions have to be fetched before the response is built; otherwise
+        # a change committed in the meantime could be stored as up to date.
+        self.root_tags_versions = get_cache_tags_versions(self.root_tags)
+        return None
+
+    def _is_valid(self, cached: dict) -> bool:
+        tags_versions: Dict[str, Optional[int]] = cached["tags"]
+        return get_cache_tags_versions(tags_versions) == tags_versions
+
+    def set(self, result: ExecutionResult, tags: Set[str]):
+        """Store the result built after `get` returned `None`, unless it has errors.
+
+        Instance tags are only known once the response is built, so their versions
+        are fetched here, which leaves a short window where a purge of an instance
+        is missed until the entry expires.
+        """
+        if result.errors or result.invalid:
+            return
+        tags_versions = get_cache_tags_versions(tags - self.root_tags)
+        tags_versions.update(self.root_tags_versions)
+        timeout = (
+            settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+            + settings.GRAPHQL_RESPONSE_CACHE_STALE_TIMEOUT
+        )
+        entry = {"data": result.data, "created_at": time.time(), "tags": tags_versions}
+        cache.set(self.key, entry, timeout=timeout)
+        cache.delete(self.lock_key)
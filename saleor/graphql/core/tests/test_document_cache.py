@@ -0,0 +1,208 @@
+from unittest import mock
+
+import pytest
+from graphql.language.parser import parse
+
+from ...api import schema
+from ...query_cost_map import COST_MAP
+from ...tests.utils import get_graphql_content
+from ..document_cache import (
+    DocumentCache,
+    document_cache,
+    get_query_hash,
+    get_shared_cache_key,
+)
+
+QUERY_SHOP = """
+    query {
+        shop {
+            name
+        }
+    }
+"""
+
+QUERY_PRODUCTS = """
+    query Products($first: Int!, $channel: String) {
+        products(first: $first, channel: $channel) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def clean_document_cache():
+    document_cache.clear()
+    yield document_cache
+    document_cache.clear()
+
+
+def test_document_cache_reuses_parsed_document():
+    # given
+    cache = DocumentCache()
+    parse_document = mock.Mock(return_value=mock.Mock(schema=schema))
+
+    # when
+    first_document, first_hit = cache.get_or_parse(schema, QUERY_SHOP, parse_document)
+    second_document, second_hit = cache.get_or_parse(schema, QUERY_SHOP, parse_document)
+
+    # then
+    assert first_document is second_document
+    assert first_hit is False
+    assert second_hit is True
+    parse_document.assert_called_once_with()
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_document_cache_evicts_least_recently_used(settings):
+    # given
+    settings.GRAPHQL_DOCUMENT_CACHE_SIZE = 1
+    cache = DocumentCache()
+    parse_document = mock.Mock(return_value=mock.Mock(schema=schema))
+    cache.get_or_parse(schema, QUERY_SHOP, parse_document)
+
+    # when
+    cache.get_or_parse(schema, QUERY_PRODUCTS, parse_document)
+    _, cache_hit = cache.get_or_parse(schema, QUERY_SHOP, parse_document)
+
+    # then
+    assert cache_hit is False
+    assert cache.get_stats()["size"] == 1
+    assert parse_document.call_count == 3
+
+
+def test_document_cache_disabled(settings):
+    # given
+    settings.GRAPHQL_DOCUMENT_CACHE_SIZE = 0
+    cache = DocumentCache()
+    parse_document = mock.Mock(return_value=mock.Mock(schema=schema))
+
+    # when
+    cache.get_or_parse(schema, QUERY_SHOP, parse_document)
+    _, cache_hit = cache.get_or_parse(schema, QUERY_SHOP, parse_document)
+
+    # then
+    assert cache_hit is False
+    assert parse_document.call_count == 2
+    assert cache.get_stats()["size"] == 0
+
+
+@mock.patch("saleor.graphql.core.document_cache.validate_query_cost")
+def test_cached_document_query_cost_is_computed_once_per_variables(
+    mocked_validate_query_cost,
+):
+    # given
+    mocked_validate_query_cost.return_value = (10, None)
+    cache = DocumentCache()
+    cached_document, _ = cache.get_or_parse(
+        schema,
+        QUERY_PRODUCTS,
+        lambda: mock.Mock(schema=schema),
+    )
+
+    # when
+    cached_document.get_query_cost(schema, {"first": 10}, COST_MAP, 50000)
+    cached_document.get_query_cost(schema, {"first": 10}, COST_MAP, 50000)
+    cached_document.get_query_cost(schema, {"first": 20}, COST_MAP, 50000)
+
+    # then
+    assert mocked_validate_query_cost.call_count == 2
+
+
+def test_view_reuses_cached_document(api_client, clean_document_cache):
+    # when
+    get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+    content = get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+
+    # then
+    assert content["data"]["shop"]
+    stats = clean_document_cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+@mock.patch("saleor.graphql.core.document_cache.validate")
+def test_view_validates_cached_document_once(
+    mocked_validate, api_client, clean_document_cache
+):
+    # given
+    mocked_validate.return_value = []
+
+    # when
+    api_client.post_graphql(QUERY_SHOP)
+    api_client.post_graphql(QUERY_SHOP)
+
+    # then
+    mocked_validate.assert_called_once()
+
+
+def test_view_returns_cached_validation_errors(api_client, clean_document_cache):
+    # given
+    query = "query { shop { notExistingField } }"
+
+    # when
+    first_response = api_client.post_graphql(query)
+    second_response = api_client.post_graphql(query)
+
+    # then
+    assert first_response.status_code == second_response.status_code == 400
+    assert first_response.json() == second_response.json()
+
+
+def test_view_stores_valid_document_in_shared_cache(
+    settings, api_client, clean_document_cache
+):
+    # given
+    settings.GRAPHQL_DOCUMENT_CACHE_SHARED = True
+
+    # when
+    with mock.patch("saleor.graphql.core.document_cache.cache") as mocked_cache:
+        mocked_cache.get.return_value = None
+        get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+
+    # then
+    key, document_ast = mocked_cache.set.call_args[0]
+    assert key == get_shared_cache_key(get_query_hash(QUERY_SHOP))
+    assert document_ast.definitions
+
+
+def test_view_stores_document_in_shared_cache_once(
+    settings, api_client, clean_document_cache
+):
+    # given
+    settings.GRAPHQL_DOCUMENT_CACHE_SHARED = True
+
+    # when
+    with mock.patch("saleor.graphql.core.document_cache.cache") as mocked_cache:
+        mocked_cache.get.return_value = None
+        get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+        get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+
+    # then
+    mocked_cache.set.assert_called_once()
+
+
+def test_view_uses_document_from_shared_cache(
+    settings, api_client, clean_document_cache
+):
+    # given
+    settings.GRAPHQL_DOCUMENT_CACHE_SHARED = True
+    document_ast = parse(QUERY_SHOP)
+
+    # when
+    with mock.patch("saleor.graphql.core.document_cache.cache") as mocked_cache:
+        mocked_cache.get.return_value = document_ast
+        with mock.patch("saleor.graphql.core.document_cache.validate") as validate:
+            content = get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+
+    # then
+    assert content["data"]["shop"]
+    mocked_cache.get.assert_called_once_with(
+        get_shared_cache_key(get_query_hash(QUERY_SHOP))
+    )
+    validate.assert_not_called()
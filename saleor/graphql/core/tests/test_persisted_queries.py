@@ -0,0 +1,158 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+from ...utils.persisted_queries import (
+    get_persisted_query,
+    register_persisted_query,
+)
+from ..document_cache import get_query_hash
+
+QUERY_SHOP = """
+    query {
+        shop {
+            name
+        }
+    }
+"""
+
+
+def _persisted_query_extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+@pytest.fixture
+def persisted_queries_enabled(settings):
+    settings.GRAPHQL_PERSISTED_QUERIES_ENABLED = True
+    settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST = False
+    return settings
+
+
+def test_persisted_query_not_found(api_client, persisted_queries_enabled):
+    # given
+    data = {"extensions": _persisted_query_extensions("a" * 64)}
+
+    # when
+    response = api_client.post(data)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    error = content["errors"][0]
+    assert error["message"] == "PersistedQueryNotFound"
+    assert error["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+
+def test_persisted_query_registered_and_executed_by_hash(
+    api_client, persisted_queries_enabled
+):
+    # given
+    query_hash = get_query_hash(QUERY_SHOP)
+    extensions = _persisted_query_extensions(query_hash)
+    get_graphql_content(
+        api_client.post({"query": QUERY_SHOP, "extensions": extensions})
+    )
+
+    # when
+    response = api_client.post({"extensions": extensions})
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]
+    assert get_persisted_query(query_hash) == QUERY_SHOP
+
+
+def test_persisted_query_hash_mismatch(api_client, persisted_queries_enabled):
+    # given
+    data = {
+        "query": QUERY_SHOP,
+        "extensions": _persisted_query_extensions("a" * 64),
+    }
+
+    # when
+    response = api_client.post(data)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_ERROR"
+    assert get_persisted_query("a" * 64) is None
+
+
+def test_persisted_query_not_supported(api_client, settings):
+    # given
+    settings.GRAPHQL_PERSISTED_QUERIES_ENABLED = False
+    data = {"extensions": _persisted_query_extensions(get_query_hash(QUERY_SHOP))}
+
+    # when
+    response = api_client.post(data)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+def test_persisted_query_allowlist_rejects_unregistered_query(
+    api_client, persisted_queries_enabled
+):
+    # given
+    persisted_queries_enabled.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST = True
+    query = "query { shop { description } }"
+
+    # when
+    response = api_client.post_graphql(query)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotAllowed"
+    assert get_persisted_query(get_query_hash(query)) is None
+
+
+def test_persisted_query_allowlist_accepts_registered_query(
+    api_client, persisted_queries_enabled
+):
+    # given
+    persisted_queries_enabled.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST = True
+    query_hash = register_persisted_query(QUERY_SHOP, allowlisted=True)
+
+    # when
+    response = api_client.post({"extensions": _persisted_query_extensions(query_hash)})
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]
+
+
+def test_persisted_query_allowlist_rejects_query_registered_by_client(
+    api_client, persisted_queries_enabled
+):
+    # given
+    query_hash = register_persisted_query(QUERY_SHOP)
+    persisted_queries_enabled.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST = True
+
+    # when
+    response = api_client.post({"extensions": _persisted_query_extensions(query_hash)})
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_register_persisted_queries_command(tmpdir):
+    # given
+    query_file = tmpdir.join("shop.graphql")
+    query_file.write(QUERY_SHOP)
+
+    # when
+    call_command("register_persisted_queries", str(query_file))
+
+    # then
+    assert get_persisted_query(get_query_hash(QUERY_SHOP)) == QUERY_SHOP
+
+
+def test_register_persisted_queries_command_invalid_query(tmpdir):
+    # given
+    query_file = tmpdir.join("invalid.graphql")
+    query_file.write("query { shop { notExistingField } }")
+
+    # when & then
+    with pytest.raises(CommandError):
+        call_command("register_persisted_queries", str(query_file))
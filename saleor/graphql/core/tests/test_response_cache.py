@@ -0,0 +1,164 @@
+from unittest.mock import ANY, patch
+
+import graphene
+import pytest
+from django.core.cache import cache
+
+from ....core.utils.cache_tags import (
+    get_cache_tags_versions,
+    purge_cache_tags,
+    purge_instances_cache_tags,
+)
+from ....discount.utils import invalidate_discounts_cache
+from ....product.utils.variant_prices import update_product_discounted_price
+from ...tests.utils import get_graphql_content
+
+QUERY_PRODUCT = """
+    query Product($id: ID!, $channel: String) {
+        product(id: $id, channel: $channel) {
+            name
+            category {
+                name
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_response_cache_purged_by_instance_tag(
+    api_client, product, channel_USD, settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    variables = {
+        "id": graphene.Node.to_global_id("Product", product.pk),
+        "channel": channel_USD.slug,
+    }
+    get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    category = product.category
+    old_name = category.name
+    category.name = "New name"
+    category.save(update_fields=["name"])
+
+    # when
+    cached_content = get_graphql_content(
+        api_client.post_graphql(QUERY_PRODUCT, variables)
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        purge_instances_cache_tags([category])
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+
+    # then
+    assert cached_content["data"]["product"]["category"]["name"] == old_name
+    assert content["data"]["product"]["category"]["name"] == "New name"
+
+
+@patch("saleor.core.utils.versioned_cache.cache")
+def test_purge_cache_tags_sets_version_timeout(
+    cache_mock, settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    settings.GRAPHQL_RESPONSE_CACHE_STALE_TIMEOUT = 30
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        purge_cache_tags(["product.category"])
+
+    # then
+    cache_mock.add.assert_called_once_with(
+        "cache-tag:product.category", ANY, timeout=180
+    )
+
+
+def test_invalidate_discounts_cache_purges_products_tag(
+    settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_discounts_cache()
+
+    # then
+    assert get_cache_tags_versions(["product.product"])["product.product"]
+
+
+def test_update_product_discounted_price_purges_product_tags(
+    product, settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    product_tag = f"product.product:{product.pk}"
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        update_product_discounted_price(product)
+
+    # then
+    versions = get_cache_tags_versions(["product.product", product_tag])
+    assert versions["product.product"]
+    assert versions[product_tag]
+
+
+def test_response_cache_not_used_for_authenticated_requests(
+    user_api_client, product, channel_USD, settings
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    variables = {
+        "id": graphene.Node.to_global_id("Product", product.pk),
+        "channel": channel_USD.slug,
+    }
+    get_graphql_content(user_api_client.post_graphql(QUERY_PRODUCT, variables))
+    product.name = "New name"
+    product.save(update_fields=["name"])
+
+    # when
+    content = get_graphql_content(
+        user_api_client.post_graphql(QUERY_PRODUCT, variables)
+    )
+
+    # then
+    assert content["data"]["product"]["name"] == "New name"
+
+
+@patch("saleor.graphql.core.response_cache.time.time")
+def test_response_cache_serves_stale_response_while_revalidating(
+    time_mock, api_client, product, channel_USD, settings
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    settings.GRAPHQL_RESPONSE_CACHE_STALE_TIMEOUT = 60
+    variables = {
+        "id": graphene.Node.to_global_id("Product", product.pk),
+        "channel": channel_USD.slug,
+    }
+    time_mock.return_value = 1000
+    old_name = product.name
+    get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    product.name = "New name"
+    product.save(update_fields=["name"])
+    time_mock.return_value = 1090
+
+    # when
+    # another request holds the revalidation lock
+    with patch.object(cache, "add", return_value=False):
+        stale_content = get_graphql_content(
+            api_client.post_graphql(QUERY_PRODUCT, variables)
+        )
+    revalidated_content = get_graphql_content(
+        api_client.post_graphql(QUERY_PRODUCT, variables)
+    )
+
+    # then
+    assert stale_content["data"]["product"]["name"] == old_name
+    assert revalidated_content["data"]["product"]["name"] == "New name"
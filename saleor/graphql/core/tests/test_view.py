@@ -1,13 +1,18 @@
+import asyncio
+import json
 from unittest import mock
 
 import graphene
 import pytest
+from asgiref.sync import async_to_sync
 from django.test import override_settings
 from graphql.execution.base import ExecutionResult
 
 from .... import __version__ as saleor_version
 from ....demo.views import EXAMPLE_QUERY
 from ....graphql.utils import INTERNAL_ERROR_MESSAGE
+from ...api import schema
+from ...product.dataloaders import CategoryByIdLoader
 from ...tests.fixtures import (
     ACCESS_CONTROL_ALLOW_CREDENTIALS,
     ACCESS_CONTROL_ALLOW_HEADERS,
@@ -16,7 +21,8 @@ from ...tests.fixtures import (
     API_PATH,
 )
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
-from ...views import generate_cache_key
+from ...utils.persisted_queries import resolve_persisted_query
+from ...views import AsyncGraphQLView, GraphQLView, generate_cache_key
 
 
 def test_batch_queries(category, product, api_client, channel_USD):
@@ -65,6 +71,147 @@ def test_batch_queries(category, product, api_client, channel_USD):
     assert data["category"]["name"] == category.name
 
 
+QUERY_PRODUCT_WITH_CATEGORY = """
+    query GetProduct($id: ID!, $channel: String) {
+        product(id: $id, channel: $channel) {
+            name
+            category {
+                name
+            }
+        }
+    }
+"""
+
+
+@mock.patch.object(
+    CategoryByIdLoader,
+    "batch_load",
+    autospec=True,
+    side_effect=CategoryByIdLoader.batch_load,
+)
+def test_concurrent_batch_queries_share_dataloaders(
+    mocked_batch_load, settings, product_list, api_client, channel_USD
+):
+    # given
+    settings.GRAPHQL_BATCH_CONCURRENT_EXECUTION = True
+    data = [
+        {
+            "query": QUERY_PRODUCT_WITH_CATEGORY,
+            "variables": {
+                "id": graphene.Node.to_global_id("Product", product.pk),
+                "channel": channel_USD.slug,
+            },
+        }
+        for product in product_list[:2]
+    ]
+
+    # when
+    response = api_client.post(data)
+
+    # then
+    batch_content = get_graphql_content(response)
+    assert [content["data"]["product"]["name"] for content in batch_content] == [
+        product.name for product in product_list[:2]
+    ]
+    assert [
+        content["data"]["product"]["category"]["name"] for content in batch_content
+    ] == [product.category.name for product in product_list[:2]]
+    mocked_batch_load.assert_called_once()
+
+
+def test_concurrent_batch_executes_mutations_in_order(
+    settings, staff_api_client, product, channel_USD, permission_manage_products
+):
+    # given
+    settings.GRAPHQL_BATCH_CONCURRENT_EXECUTION = True
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+    product_id = graphene.Node.to_global_id("Product", product.pk)
+    query_variables = {"id": product_id, "channel": channel_USD.slug}
+    mutation = """
+        mutation ProductUpdate($id: ID!, $name: String!) {
+            productUpdate(id: $id, input: {name: $name}) {
+                product {
+                    name
+                }
+            }
+        }
+    """
+    data = [
+        {"query": QUERY_PRODUCT_WITH_CATEGORY, "variables": query_variables},
+        {"query": mutation, "variables": {"id": product_id, "name": "New name"}},
+        {"query": QUERY_PRODUCT_WITH_CATEGORY, "variables": query_variables},
+    ]
+    old_name = product.name
+
+    # when
+    response = staff_api_client.post(data)
+
+    # then
+    first, second, third = get_graphql_content(response)
+    assert first["data"]["product"]["name"] == old_name
+    assert second["data"]["productUpdate"]["product"]["name"] == "New name"
+    assert third["data"]["product"]["name"] == "New name"
+
+
+@mock.patch(
+    "saleor.graphql.views.resolve_persisted_query",
+    wraps=resolve_persisted_query,
+)
+def test_concurrent_batch_resolves_params_once(
+    mocked_resolve_persisted_query, settings, api_client
+):
+    # given
+    settings.GRAPHQL_BATCH_CONCURRENT_EXECUTION = True
+    data = [{"query": "{ __typename }"}, {"query": "{ shop { name } }"}]
+
+    # when
+    response = api_client.post(data)
+
+    # then
+    batch_content = get_graphql_content(response)
+    assert len(batch_content) == 2
+    assert mocked_resolve_persisted_query.call_count == 2
+
+
+def test_concurrent_batch_resolves_document_once(settings, api_client):
+    # given
+    settings.GRAPHQL_BATCH_CONCURRENT_EXECUTION = True
+    data = [{"query": "{ __typename }"}, {"query": "{ shop { name } }"}]
+
+    # when
+    with mock.patch.object(
+        GraphQLView,
+        "get_cached_document",
+        autospec=True,
+        side_effect=GraphQLView.get_cached_document,
+    ) as mocked_get_cached_document:
+        response = api_client.post(data)
+
+    # then
+    batch_content = get_graphql_content(response)
+    assert len(batch_content) == 2
+    assert mocked_get_cached_document.call_count == 2
+
+
+def test_async_graphql_view(rf, settings):
+    # given
+    settings.GRAPHQL_ASYNC_VIEW_THREADS = 1
+    view = AsyncGraphQLView.as_view(schema=schema)
+    request = rf.post(
+        API_PATH,
+        data={"query": "{ __typename }"},
+        content_type="application/json",
+    )
+
+    # when
+    response = async_to_sync(view)(request)
+
+    # then
+    assert asyncio.iscoroutinefunction(view)
+    assert response.status_code == 200
+    assert json.loads(response.content) == {"data": {"__typename": "Query"}}
+
+
 def test_graphql_view_query_with_invalid_object_type(
     staff_api_client, product, permission_manage_orders, graphql_log_handler
 ):
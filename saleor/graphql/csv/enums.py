@@ -1,10 +1,11 @@
 import graphene
 
-from ...csv import ExportEvents, FileTypes
+from ...csv import ExportEvents, FileTypes, ImportFileTypes
 from ...graphql.core.enums import to_enum
 
 ExportEventEnum = to_enum(ExportEvents)
 FileTypeEnum = to_enum(FileTypes)
+ImportFileTypeEnum = to_enum(ImportFileTypes)
 
 
 class ExportScope(graphene.Enum):
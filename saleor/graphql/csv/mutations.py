@@ -1,26 +1,32 @@
 from typing import Dict, List, Mapping, Union
 
 import graphene
+from django.conf import settings
 from django.core.exceptions import ValidationError
 
 from ...core.permissions import GiftcardPermissions, ProductPermissions
 from ...csv import models as csv_models
 from ...csv.events import export_started_event
-from ...csv.tasks import export_gift_cards_task, export_products_task
+from ...csv.tasks import (
+    export_gift_cards_task,
+    export_products_in_shards_task,
+    export_products_task,
+    import_products_task,
+)
 from ..app.dataloaders import get_app_promise
 from ..attribute.types import Attribute
 from ..channel.types import Channel
-from ..core.descriptions import ADDED_IN_31, PREVIEW_FEATURE
+from ..core.descriptions import ADDED_IN_31, ADDED_IN_38, PREVIEW_FEATURE
 from ..core.enums import ExportErrorCode
 from ..core.mutations import BaseMutation
-from ..core.types import ExportError, NonNullList
+from ..core.types import ExportError, NonNullList, Upload
 from ..giftcard.filters import GiftCardFilterInput
 from ..giftcard.types import GiftCard
 from ..product.filters import ProductFilterInput
 from ..product.types import Product
 from ..warehouse.types import Warehouse
-from .enums import ExportScope, FileTypeEnum, ProductFieldEnum
-from .types import ExportFile
+from .enums import ExportScope, FileTypeEnum, ImportFileTypeEnum, ProductFieldEnum
+from .types import ExportFile, ImportFile
 
 
 class BaseExportMutation(BaseMutation):
@@ -135,7 +141,12 @@ class ExportProducts(BaseExportMutation):
 
         export_file = csv_models.ExportFile.objects.create(**kwargs)
         export_started_event(export_file=export_file, **kwargs)
-        export_products_task.delay(export_file.pk, scope, export_info, file_type)
+        if settings.EXPORT_PRODUCTS_SHARD_SIZE:
+            export_products_in_shards_task.delay(
+                export_file.pk, scope, export_info, file_type
+            )
+        else:
+            export_products_task.delay(export_file.pk, scope, export_info, file_type)
 
         export_file.refresh_from_db()
         return cls(export_file=export_file)
@@ -208,3 +219,58 @@ class ExportGiftCards(BaseExportMutation):
 
         export_file.refresh_from_db()
         return cls(export_file=export_file)
+
+
+class ImportProducts(BaseMutation):
+    import_file = graphene.Field(
+        ImportFile,
+        description=(
+            "The newly created import file job which is responsible for import data."
+        ),
+    )
+
+    class Arguments:
+        file = Upload(
+            required=True,
+            description=(
+                "Represents a file in a multipart request. Products are matched "
+                "by the `product slug` column and variants by the `variant sku` "
+                "column, other columns use the headers of the products export."
+            ),
+        )
+        file_type = ImportFileTypeEnum(
+            description="Type of imported file.", required=True
+        )
+
+    class Meta:
+        description = (
+            "Import products and variants from a CSV or JSON Lines file."
+            + ADDED_IN_38
+            + PREVIEW_FEATURE
+        )
+        permissions = (ProductPermissions.MANAGE_PRODUCTS,)
+        error_type_class = ExportError
+
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        file_data = info.context.FILES.get(data["file"])
+        if not file_data:
+            raise ValidationError(
+                {
+                    "file": ValidationError(
+                        "You must provide a file to import.",
+                        code=ExportErrorCode.REQUIRED.value,
+                    )
+                }
+            )
+
+        app = get_app_promise(info.context).get()
+        kwargs = {"app": app} if app else {"user": info.context.user}
+
+        import_file = csv_models.ImportFile(file_type=data["file_type"], **kwargs)
+        import_file.content_file.save(file_data.name, file_data, save=False)
+        import_file.save()
+        import_products_task.delay(import_file.pk)
+
+        import_file.refresh_from_db()
+        return cls(import_file=import_file)
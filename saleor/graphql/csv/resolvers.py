@@ -7,3 +7,7 @@ def resolve_export_file(id):
 
 def resolve_export_files():
     return models.ExportFile.objects.all()
+
+
+def resolve_import_file(id):
+    return models.ImportFile.objects.filter(id=id).first()
@@ -2,13 +2,14 @@ import graphene
 
 from ...core.permissions import ProductPermissions
 from ..core.connection import create_connection_slice, filter_connection_queryset
+from ..core.descriptions import ADDED_IN_38, PREVIEW_FEATURE
 from ..core.fields import FilterConnectionField, PermissionsField
 from ..core.utils import from_global_id_or_error
 from .filters import ExportFileFilterInput
-from .mutations import ExportGiftCards, ExportProducts
-from .resolvers import resolve_export_file, resolve_export_files
+from .mutations import ExportGiftCards, ExportProducts, ImportProducts
+from .resolvers import resolve_export_file, resolve_export_files, resolve_import_file
 from .sorters import ExportFileSortingInput
-from .types import ExportFile, ExportFileCountableConnection
+from .types import ExportFile, ExportFileCountableConnection, ImportFile
 
 
 class CsvQueries(graphene.ObjectType):
@@ -27,6 +28,14 @@ class CsvQueries(graphene.ObjectType):
         description="List of export files.",
         permissions=[ProductPermissions.MANAGE_PRODUCTS],
     )
+    import_file = PermissionsField(
+        ImportFile,
+        id=graphene.Argument(
+            graphene.ID, description="ID of the import file job.", required=True
+        ),
+        description="Look up an import file by ID." + ADDED_IN_38 + PREVIEW_FEATURE,
+        permissions=[ProductPermissions.MANAGE_PRODUCTS],
+    )
 
     def resolve_export_file(self, _info, id):
         _, id = from_global_id_or_error(id, ExportFile)
@@ -37,7 +46,12 @@ class CsvQueries(graphene.ObjectType):
         qs = filter_connection_queryset(qs, kwargs)
         return create_connection_slice(qs, info, kwargs, ExportFileCountableConnection)
 
+    def resolve_import_file(self, _info, id):
+        _, id = from_global_id_or_error(id, ImportFile)
+        return resolve_import_file(id)
+
 
 class CsvMutations(graphene.ObjectType):
     export_products = ExportProducts.Field()
     export_gift_cards = ExportGiftCards.Field()
+    import_products = ImportProducts.Field()
@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from .....csv import ImportFileTypes
+from .....csv.models import ImportFile
+from ....tests.utils import get_graphql_content, get_multipart_request_body
+from ...enums import ImportFileTypeEnum
+
+IMPORT_PRODUCTS_MUTATION = """
+    mutation ImportProducts($file: Upload!, $fileType: ImportFileTypesEnum!){
+        importProducts(file: $file, fileType: $fileType){
+            importFile {
+                id
+                status
+                rowErrors
+                user {
+                    email
+                }
+            }
+            errors {
+                field
+                code
+                message
+            }
+        }
+    }
+"""
+
+
+@patch("saleor.graphql.csv.mutations.import_products_task.delay")
+def test_import_products_mutation(
+    import_products_task_mock,
+    staff_api_client,
+    permission_manage_products,
+    media_root,
+):
+    # given
+    file_name = "products.csv"
+    file = SimpleUploadedFile(file_name, b"product slug,name\r\nshirt,Shirt\r\n")
+    variables = {"file": file_name, "fileType": ImportFileTypeEnum.CSV.name}
+    body = get_multipart_request_body(
+        IMPORT_PRODUCTS_MUTATION, variables, file, file_name
+    )
+
+    # when
+    response = staff_api_client.post_multipart(
+        body, permissions=[permission_manage_products]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["importProducts"]
+    assert not data["errors"]
+    assert data["importFile"]["status"] == "PENDING"
+    assert data["importFile"]["rowErrors"] == []
+    assert data["importFile"]["user"]["email"] == staff_api_client.user.email
+    import_file = ImportFile.objects.get()
+    assert import_file.file_type == ImportFileTypes.CSV
+    assert import_file.content_file.read() == b"product slug,name\r\nshirt,Shirt\r\n"
+    import_products_task_mock.assert_called_once_with(import_file.pk)
+
+
+def test_import_products_mutation_no_permission(staff_api_client, media_root):
+    # given
+    file_name = "products.csv"
+    file = SimpleUploadedFile(file_name, b"product slug\r\nshirt\r\n")
+    variables = {"file": file_name, "fileType": ImportFileTypeEnum.CSV.name}
+    body = get_multipart_request_body(
+        IMPORT_PRODUCTS_MUTATION, variables, file, file_name
+    )
+
+    # when
+    response = staff_api_client.post_multipart(body)
+
+    # then
+    content = get_graphql_content(response, ignore_errors=True)
+    assert content["errors"][0]["extensions"]["exception"]["code"] == (
+        "PermissionDenied"
+    )
+    assert not ImportFile.objects.exists()
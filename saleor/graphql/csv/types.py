@@ -8,6 +8,7 @@ from ..account.utils import check_is_owner_or_has_one_of_perms
 from ..app.dataloaders import AppByIdLoader
 from ..app.types import App
 from ..core.connection import CountableConnection
+from ..core.descriptions import ADDED_IN_38, PREVIEW_FEATURE
 from ..core.types import Job, ModelObjectType, NonNullList
 from ..utils import get_user_or_app_from_context
 from .enums import ExportEventEnum
@@ -114,3 +115,46 @@ class ExportFile(ModelObjectType):
 class ExportFileCountableConnection(CountableConnection):
     class Meta:
         node = ExportFile
+
+
+class ImportFile(ModelObjectType):
+    id = graphene.GlobalID(required=True)
+    url = graphene.String(description="The URL of the imported file.")
+    row_errors = NonNullList(
+        graphene.String,
+        description="Errors of the rows of the file that weren't imported.",
+        required=True,
+    )
+    user = graphene.Field(User)
+    app = graphene.Field(App)
+
+    class Meta:
+        description = (
+            "Represents a job data of imported file." + ADDED_IN_38 + PREVIEW_FEATURE
+        )
+        interfaces = [graphene.relay.Node, Job]
+        model = models.ImportFile
+
+    @staticmethod
+    def resolve_url(root: models.ImportFile, info):
+        return build_absolute_uri(root.content_file.url)
+
+    @staticmethod
+    def resolve_row_errors(root: models.ImportFile, _info):
+        return root.errors
+
+    @staticmethod
+    def resolve_user(root: models.ImportFile, info):
+        requestor = get_user_or_app_from_context(info.context)
+        check_is_owner_or_has_one_of_perms(
+            requestor, root.user, AccountPermissions.MANAGE_STAFF
+        )
+        return root.user
+
+    @staticmethod
+    def resolve_app(root: models.ImportFile, info):
+        requestor = get_user_or_app_from_context(info.context)
+        check_is_owner_or_has_one_of_perms(
+            requestor, root.user, AppPermission.MANAGE_APPS
+        )
+        return AppByIdLoader(info.context).load(root.app_id) if root.app_id else None
@@ -2,7 +2,7 @@ import graphene
 
 from ...core.permissions import DiscountPermissions
 from ...discount import models
-from ...discount.utils import fetch_catalogue_info
+from ...discount.utils import fetch_catalogue_info, invalidate_discounts_cache
 from ..core.mutations import ModelBulkDeleteMutation
 from ..core.types import DiscountError, NonNullList
 from ..plugins.dataloaders import get_plugin_manager_promise
@@ -31,6 +31,7 @@ class SaleBulkDelete(ModelBulkDeleteMutation):
             for sale in list(queryset)
         ]
         queryset.delete()
+        invalidate_discounts_cache()
         manager = get_plugin_manager_promise(info.context).get()
         for sale, previous_catalogue in sales_and_catalogues:
             manager.sale_deleted(sale, previous_catalogue)
@@ -1,8 +1,8 @@
 from collections import defaultdict
 
+from django.conf import settings
 from django.db.models import F
 
-from ...discount import DiscountInfo
 from ...discount.interface import VoucherInfo
 from ...discount.models import (
     OrderDiscount,
@@ -12,11 +12,10 @@ from ...discount.models import (
     VoucherChannelListing,
 )
 from ...discount.utils import (
-    fetch_categories,
-    fetch_collections,
-    fetch_products,
-    fetch_sale_channel_listings,
-    fetch_variants,
+    CatalogueDiscountsIndex,
+    IndexedDiscounts,
+    fetch_discount_infos,
+    fetch_discounts,
 )
 from ..core.dataloaders import DataLoader
 
@@ -25,6 +24,8 @@ class DiscountsByDateTimeLoader(DataLoader):
     context_key = "discounts"
 
     def batch_load(self, keys):
+        if settings.DISCOUNTS_CACHE_ENABLED:
+            return [fetch_discounts(datetime) for datetime in keys]
         sales_map = {
             datetime: list(
                 Sale.objects.using(self.database_connection_name)
@@ -33,27 +34,18 @@ class DiscountsByDateTimeLoader(DataLoader):
             )
             for datetime in keys
         }
-        pks = {s.pk for d, ss in sales_map.items() for s in ss}
-        collections = fetch_collections(pks, self.database_connection_name)
-        channel_listings = fetch_sale_channel_listings(
-            pks, self.database_connection_name
-        )
-        products = fetch_products(pks, self.database_connection_name)
-        categories = fetch_categories(pks, self.database_connection_name)
-        variants = fetch_variants(pks, self.database_connection_name)
-
+        sales = {s.pk: s for d, ss in sales_map.items() for s in ss}
+        discounts = {
+            discount.sale.pk: discount
+            for discount in fetch_discount_infos(
+                list(sales.values()), self.database_connection_name
+            )
+        }
+        index = CatalogueDiscountsIndex(discounts.values())
         return [
-            [
-                DiscountInfo(
-                    sale=sale,
-                    channel_listings=channel_listings[sale.pk],
-                    category_ids=categories[sale.pk],
-                    collection_ids=collections[sale.pk],
-                    product_ids=products[sale.pk],
-                    variants_ids=variants[sale.pk],
-                )
-                for sale in sales_map[datetime]
-            ]
+            IndexedDiscounts(
+                [discounts[sale.pk] for sale in sales_map[datetime]], index
+            )
             for datetime in keys
         ]
 
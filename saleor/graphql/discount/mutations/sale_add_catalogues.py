@@ -1,6 +1,6 @@
 from ....core.permissions import DiscountPermissions
 from ....core.tracing import traced_atomic_transaction
-from ....discount.utils import fetch_catalogue_info
+from ....discount.utils import fetch_catalogue_info, invalidate_discounts_cache
 from ...channel import ChannelContext
 from ...core.types import DiscountError
 from ...plugins.dataloaders import get_plugin_manager_promise
@@ -25,6 +25,7 @@ class SaleAddCatalogues(SaleBaseCatalogueMutation):
         manager = get_plugin_manager_promise(info.context).get()
         with traced_atomic_transaction():
             cls.add_catalogues_to_node(sale, data.get("input"))
+            invalidate_discounts_cache()
             current_catalogue = fetch_catalogue_info(sale)
             previous_cat_converted = convert_catalogue_info_to_global_ids(
                 previous_catalogue
@@ -9,6 +9,7 @@ from ....core.tracing import traced_atomic_transaction
 from ....discount import DiscountValueType
 from ....discount.error_codes import DiscountErrorCode
 from ....discount.models import SaleChannelListing
+from ....discount.utils import invalidate_discounts_cache
 from ....product.tasks import update_products_discounted_prices_of_discount_task
 from ...channel import ChannelContext
 from ...channel.mutations import BaseChannelListingMutation
@@ -123,6 +124,7 @@ class SaleChannelListingUpdate(BaseChannelListingMutation):
             cls.add_channels(sale, cleaned_input.get("add_channels", []))
             cls.remove_channels(sale, cleaned_input.get("remove_channels", []))
             update_products_discounted_prices_of_discount_task.delay(sale.pk)
+            invalidate_discounts_cache()
 
     @classmethod
     def perform_mutation(cls, _root, info, id, input):
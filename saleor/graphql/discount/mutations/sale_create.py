@@ -8,7 +8,7 @@ from ....core.permissions import DiscountPermissions
 from ....core.tracing import traced_atomic_transaction
 from ....discount import models
 from ....discount.error_codes import DiscountErrorCode
-from ....discount.utils import fetch_catalogue_info
+from ....discount.utils import fetch_catalogue_info, invalidate_discounts_cache
 from ....product.tasks import update_products_discounted_prices_of_discount_task
 from ...channel import ChannelContext
 from ...core.descriptions import ADDED_IN_31
@@ -28,6 +28,7 @@ class SaleUpdateDiscountedPriceMixin:
         # Update the "discounted_prices" of the associated, discounted
         # products (including collections and categories).
         update_products_discounted_prices_of_discount_task.delay(instance.pk)
+        invalidate_discounts_cache()
         return super().success_response(
             ChannelContext(node=instance, channel_slug=None)
         )
@@ -1,6 +1,6 @@
 from ....core.permissions import DiscountPermissions
 from ....core.tracing import traced_atomic_transaction
-from ....discount.utils import fetch_catalogue_info
+from ....discount.utils import fetch_catalogue_info, invalidate_discounts_cache
 from ....graphql.channel import ChannelContext
 from ...core.types import DiscountError
 from ...plugins.dataloaders import get_plugin_manager_promise
@@ -25,6 +25,7 @@ class SaleRemoveCatalogues(SaleBaseCatalogueMutation):
         manager = get_plugin_manager_promise(info.context).get()
         with traced_atomic_transaction():
             cls.remove_catalogues_from_node(sale, data.get("input"))
+            invalidate_discounts_cache()
             current_catalogue = fetch_catalogue_info(sale)
             cls.call_event(
                 lambda: manager.sale_updated(
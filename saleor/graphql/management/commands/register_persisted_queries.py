@@ -0,0 +1,63 @@
+import json
+from typing import Iterable
+
+from django.core.management.base import BaseCommand, CommandError
+from graphql import get_default_backend
+from graphql.error import GraphQLSyntaxError
+
+from ...api import schema
+from ...core.document_cache import document_cache
+from ...utils import query_fingerprint, query_identifier
+from ...utils.persisted_queries import register_persisted_query
+
+
+def read_queries(path: str) -> Iterable[str]:
+    """Read queries from a `.graphql` file or an Apollo persisted query manifest."""
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    if not path.endswith(".json"):
+        yield content
+        return
+    manifest = json.loads(content)
+    for operation in manifest.get("operations", []):
+        yield operation["body"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Registers GraphQL queries in the persisted queries registry, so they can be "
+        "requested by their sha256 hash and are accepted in the allowlist mode."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="+",
+            help=(
+                "Paths to .graphql files or JSON manifests in the Apollo persisted "
+                "query manifest format."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        backend = get_default_backend()
+        for path in options["paths"]:
+            for query in read_queries(path):
+                try:
+                    cached_document = document_cache.warm_up(
+                        schema,
+                        query,
+                        lambda: backend.document_from_string(schema, query),
+                    )
+                except (ValueError, GraphQLSyntaxError) as e:
+                    raise CommandError(f"Could not parse query from {path}: {e}")
+                if errors := cached_document.validate():
+                    messages = ", ".join(error.message for error in errors)
+                    raise CommandError(f"Invalid query in {path}: {messages}")
+
+                query_hash = register_persisted_query(query, allowlisted=True)
+                document = cached_document.document
+                self.stdout.write(
+                    f"{query_hash} {query_identifier(document)} "
+                    f"({query_fingerprint(document)})"
+                )
@@ -1,6 +1,9 @@
 from collections import defaultdict
 
+from django.conf import settings
+
 from ...menu.models import Menu, MenuItem
+from ...menu.utils import get_menus_snapshot
 from ..core.dataloaders import DataLoader
 
 
@@ -8,7 +11,14 @@ class MenuByIdLoader(DataLoader):
     context_key = "menu_by_id"
 
     def batch_load(self, keys):
-        menus = Menu.objects.using(self.database_connection_name).in_bulk(keys)
+        menus = {}
+        if settings.NAVIGATION_CACHE_ENABLED:
+            cached_menus = get_menus_snapshot().menus
+            menus = {key: cached_menus[key] for key in keys if key in cached_menus}
+        if missing_keys := [key for key in keys if key not in menus]:
+            menus.update(
+                Menu.objects.using(self.database_connection_name).in_bulk(missing_keys)
+            )
         return [menus.get(menu_id) for menu_id in keys]
 
 
@@ -16,7 +26,16 @@ class MenuItemByIdLoader(DataLoader):
     context_key = "menuitem_by_id"
 
     def batch_load(self, keys):
-        menu_items = MenuItem.objects.using(self.database_connection_name).in_bulk(keys)
+        menu_items = {}
+        if settings.NAVIGATION_CACHE_ENABLED:
+            items = get_menus_snapshot().items
+            menu_items = {key: items.get(key) for key in keys if items.get(key)}
+        if missing_keys := [key for key in keys if key not in menu_items]:
+            menu_items.update(
+                MenuItem.objects.using(self.database_connection_name).in_bulk(
+                    missing_keys
+                )
+            )
         return [menu_items.get(menu_item_id) for menu_item_id in keys]
 
 
@@ -24,6 +43,9 @@ class MenuItemsByParentMenuLoader(DataLoader):
     context_key = "menuitems_by_parent_menu"
 
     def batch_load(self, keys):
+        if settings.NAVIGATION_CACHE_ENABLED:
+            items_by_menu = get_menus_snapshot().items_by_menu
+            return [items_by_menu.get(menu_id, []) for menu_id in keys]
         menu_items = MenuItem.objects.using(self.database_connection_name).filter(
             menu_id__in=keys, level=0
         )
@@ -37,6 +59,9 @@ class MenuItemChildrenLoader(DataLoader):
     context_key = "menuitem_children"
 
     def batch_load(self, keys):
+        if settings.NAVIGATION_CACHE_ENABLED:
+            items = get_menus_snapshot().items
+            return [items.get_children(menu_item_id) for menu_item_id in keys]
         menu_items = MenuItem.objects.using(self.database_connection_name).filter(
             parent_id__in=keys
         )
@@ -9,6 +9,7 @@ from ...core.permissions import MenuPermissions, SitePermissions
 from ...core.tracing import traced_atomic_transaction
 from ...menu import models
 from ...menu.error_codes import MenuErrorCode
+from ...menu.utils import invalidate_menus_cache
 from ...page import models as page_models
 from ...product import models as product_models
 from ..channel import ChannelContext
@@ -487,6 +488,8 @@ class MenuItemMove(BaseMutation):
 
                 if operation.sort_order or operation.parent_changed:
                     cls.call_event(manager.menu_item_updated, menu_item)
+            # sort orders are updated in bulk, without sending the model signals
+            invalidate_menus_cache()
 
         menu = qs.get(pk=menu.pk)
         MenuItemsByParentMenuLoader(info.context).clear(menu.id)
@@ -9,7 +9,9 @@ from freezegun import freeze_time
 
 from ....core.utils.json_serializer import CustomJsonEncoder
 from ....menu.error_codes import MenuErrorCode
-from ....menu.models import Menu, MenuItem
+from ....menu.models import Menu, MenuItem, MenuItemTranslation
+from ....menu.utils import _menus_snapshot_cache
+from ....product.category_tree import _category_tree_snapshot_cache
 from ....product.models import Category
 from ....webhook.event_types import WebhookEventAsyncType
 from ....webhook.payloads import generate_meta, generate_requestor
@@ -400,6 +402,54 @@ def test_menu_items_query(
     assert items[1]["children"][1]["collection"]["name"] == published_collection.name
 
 
+QUERY_MENU_ITEMS_TREE = """
+    query menu($id: ID!) {
+        menu(id: $id) {
+            items {
+                name
+                children {
+                    name
+                    category {
+                        name
+                    }
+                    translation(languageCode: PL) {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def test_menu_items_tree_navigation_cache_enabled(
+    user_api_client, menu_with_items, category, settings
+):
+    # given
+    settings.NAVIGATION_CACHE_ENABLED = True
+    _menus_snapshot_cache.clear()
+    _category_tree_snapshot_cache.clear()
+    child = menu_with_items.items.get(category=category)
+    MenuItemTranslation.objects.create(
+        menu_item=child, language_code="pl", name="Kategoria"
+    )
+    variables = {"id": graphene.Node.to_global_id("Menu", menu_with_items.pk)}
+
+    # when
+    response = user_api_client.post_graphql(QUERY_MENU_ITEMS_TREE, variables)
+
+    # then
+    content = get_graphql_content(response)
+    items = content["data"]["menu"]["items"]
+    assert [item["name"] for item in items] == ["Link 1", "Link 2"]
+    assert items[0]["children"] == []
+    children = items[1]["children"]
+    assert children[0]["name"] == category.name
+    assert children[0]["category"]["name"] == category.name
+    assert children[0]["translation"]["name"] == "Kategoria"
+    assert children[1]["translation"] is None
+
+
 def test_menu_items_collection_in_other_channel(
     user_api_client, menu_item, published_collection, channel_PLN
 ):
@@ -2,6 +2,7 @@ from collections import defaultdict
 from typing import Iterable
 
 import graphene
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.models import Exists, OuterRef, Q, Subquery
@@ -12,22 +13,20 @@ from graphene.types import InputObjectType
 from ....attribute import AttributeInputType
 from ....attribute import models as attribute_models
 from ....core.permissions import ProductPermissions, ProductTypePermissions
-from ....core.postgres import FlatConcatSearchVector
 from ....core.tracing import traced_atomic_transaction
 from ....order import events as order_events
 from ....order import models as order_models
 from ....order.tasks import recalculate_orders_task
-from ....product import models
+from ....product import ProductSearchIndexChangeSource, models
 from ....product.error_codes import ProductErrorCode
-from ....product.search import (
-    prepare_product_search_vector_value,
-    update_product_search_vector,
-)
+from ....product.listing_index import mark_products_listing_index_dirty_on_commit
+from ....product.search import mark_products_search_index_changed
 from ....product.tasks import update_product_discounted_price_task
 from ....product.utils import delete_categories
 from ....product.utils.variants import generate_and_set_variant_name
 from ....warehouse import models as warehouse_models
 from ....warehouse.error_codes import StockErrorCode
+from ....warehouse.shards import fold_stock_shards
 from ...app.dataloaders import get_app_promise
 from ...channel import ChannelContext
 from ...channel.types import Channel
@@ -567,7 +566,10 @@ class ProductVariantBulkCreate(BaseMutation):
             ChannelContext(node=instance, channel_slug=None) for instance in instances
         ]
 
-        update_product_search_vector(product)
+        mark_products_search_index_changed(
+            [product.pk], ProductSearchIndexChangeSource.VARIANTS
+        )
+        mark_products_listing_index_dirty_on_commit([product.pk])
         manager = get_plugin_manager_promise(info.context).get()
         transaction.on_commit(
             lambda: [
@@ -658,22 +660,17 @@ class ProductVariantBulkDelete(ModelBulkDeleteMutation):
         if order_pks:
             recalculate_orders_task.delay(list(order_pks))
 
+        mark_products_search_index_changed(
+            product_pks, ProductSearchIndexChangeSource.VARIANTS
+        )
+        mark_products_listing_index_dirty_on_commit(product_pks)
         # set new product default variant if any has been removed
         products = models.Product.objects.filter(
             pk__in=product_pks, default_variant__isnull=True
         )
         for product in products:
-            product.search_vector = FlatConcatSearchVector(
-                *prepare_product_search_vector_value(product)
-            )
             product.default_variant = product.variants.first()
-            product.save(
-                update_fields=[
-                    "default_variant",
-                    "search_vector",
-                    "updated_at",
-                ]
-            )
+            product.save(update_fields=["default_variant", "updated_at"])
 
         return response
 
@@ -753,6 +750,7 @@ class ProductVariantStocksCreate(BaseMutation):
             if errors:
                 raise ValidationError(errors)
             new_stocks = create_stocks(variant, stocks, warehouses)
+            mark_products_listing_index_dirty_on_commit([variant.product_id])
 
             for stock in new_stocks:
                 transaction.on_commit(
@@ -898,6 +896,10 @@ class ProductVariantStocksUpdate(ProductVariantStocksCreate):
             stocks.append(stock)
 
         warehouse_models.Stock.objects.bulk_update(stocks, ["quantity"])
+        if settings.STOCK_SHARDS:
+            # decreased stock quantity can't stay leased to the stock shards
+            fold_stock_shards([stock.pk for stock in stocks])
+        mark_products_listing_index_dirty_on_commit([variant.product_id])
 
 
 class ProductVariantStocksDelete(BaseMutation):
@@ -959,6 +961,7 @@ class ProductVariantStocksDelete(BaseMutation):
             transaction.on_commit(lambda: manager.product_variant_out_of_stock(stock))
 
         stocks_to_delete.delete()
+        mark_products_listing_index_dirty_on_commit([variant.product_id])
 
         StocksWithAvailableQuantityByProductVariantIdCountryCodeAndChannelLoader(
             info.context
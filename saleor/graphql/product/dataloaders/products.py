@@ -1,9 +1,11 @@
 from collections import defaultdict
 from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple
 
+from django.conf import settings
 from django.db.models import F
 
 from ....product import ProductMediaTypes
+from ....product.category_tree import get_category_tree_snapshot
 from ....product.models import (
     Category,
     Collection,
@@ -18,6 +20,7 @@ from ....product.models import (
     VariantMedia,
 )
 from ....thumbnail.models import Thumbnail
+from ....thumbnail.utils import cache_thumbnail_names, get_cached_thumbnail_names
 from ...core.dataloaders import DataLoader
 
 ProductIdAndChannelSlug = Tuple[int, str]
@@ -28,7 +31,16 @@ class CategoryByIdLoader(DataLoader):
     context_key = "category_by_id"
 
     def batch_load(self, keys):
-        categories = Category.objects.using(self.database_connection_name).in_bulk(keys)
+        categories = {}
+        if settings.NAVIGATION_CACHE_ENABLED:
+            tree = get_category_tree_snapshot().categories
+            categories = {key: tree.get(key) for key in keys if tree.get(key)}
+        if missing_keys := [key for key in keys if key not in categories]:
+            categories.update(
+                Category.objects.using(self.database_connection_name).in_bulk(
+                    missing_keys
+                )
+            )
         return [categories.get(category_id) for category_id in keys]
 
 
@@ -632,6 +644,9 @@ class CategoryChildrenByCategoryIdLoader(DataLoader):
     context_key = "categorychildren_by_category"
 
     def batch_load(self, keys):
+        if settings.NAVIGATION_CACHE_ENABLED:
+            tree = get_category_tree_snapshot().categories
+            return [tree.get_children(category_id) for category_id in keys]
         categories = Category.objects.using(self.database_connection_name).filter(
             parent__isnull=False
         )
@@ -644,33 +659,61 @@ class CategoryChildrenByCategoryIdLoader(DataLoader):
 
 class BaseThumbnailBySizeAndFormatLoader(DataLoader):
     model_name = None
+    object_type = None
 
     def batch_load(self, keys):
         model_name = self.model_name.lower()
-        instance_ids = [id for id, _, _ in keys]
+        # thumbnails with cached file names are returned without querying the
+        # database, the storage URL is built from the name
+        thumbnails_by_instance_id_size_and_format_map = {
+            (instance_id, size, format): Thumbnail(
+                image=name,
+                size=size,
+                format=format,
+                **{f"{model_name}_id": instance_id},
+            )
+            for (instance_id, size, format), name in get_cached_thumbnail_names(
+                self.object_type, keys
+            ).items()
+        }
+        instance_ids = {
+            key[0]
+            for key in keys
+            if key not in thumbnails_by_instance_id_size_and_format_map
+        }
+        if not instance_ids:
+            return [thumbnails_by_instance_id_size_and_format_map[key] for key in keys]
+
         lookup = {f"{model_name}_id__in": instance_ids}
         thumbnails = Thumbnail.objects.using(self.database_connection_name).filter(
             **lookup
         )
-        thumbnails_by_instance_id_size_and_format_map = defaultdict()
+        thumbnails_by_instance_id = defaultdict(list)
         for thumbnail in thumbnails:
+            instance_id = getattr(thumbnail, f"{model_name}_id")
             format = thumbnail.format.lower() if thumbnail.format else None
             thumbnails_by_instance_id_size_and_format_map[
-                (getattr(thumbnail, f"{model_name}_id"), thumbnail.size, format)
+                (instance_id, thumbnail.size, format)
             ] = thumbnail
+            thumbnails_by_instance_id[instance_id].append(thumbnail)
+        for instance_id, instance_thumbnails in thumbnails_by_instance_id.items():
+            cache_thumbnail_names(self.object_type, instance_id, instance_thumbnails)
         return [thumbnails_by_instance_id_size_and_format_map.get(key) for key in keys]
 
 
 class ThumbnailByCategoryIdSizeAndFormatLoader(BaseThumbnailBySizeAndFormatLoader):
     context_key = "thumbnail_by_category_size_and_format"
     model_name = "category"
+    object_type = "Category"
 
 
 class ThumbnailByCollectionIdSizeAndFormatLoader(BaseThumbnailBySizeAndFormatLoader):
     context_key = "thumbnail_by_collection_size_and_format"
     model_name = "collection"
+    object_type = "Collection"
 
 
 class ThumbnailByProductMediaIdSizeAndFormatLoader(BaseThumbnailBySizeAndFormatLoader):
     context_key = "thumbnail_by_productmedia_size_and_format"
     model_name = "product_media"
+    object_type = "ProductMedia"
@@ -6,6 +6,7 @@ from typing import Dict, Iterable, List, Optional
 import django_filters
 import graphene
 import pytz
+from django.conf import settings
 from django.db.models import Exists, FloatField, OuterRef, Q, Subquery, Sum
 from django.db.models.expressions import ExpressionWrapper
 from django.db.models.fields import IntegerField
@@ -29,6 +30,7 @@ from ...product.models import (
     CollectionProduct,
     Product,
     ProductChannelListing,
+    ProductListingIndex,
     ProductType,
     ProductVariant,
     ProductVariantChannelListing,
@@ -178,7 +180,15 @@ def _clean_product_attributes_boolean_filter_input(filter_value, queries):
             queries[attr_pk] += [value_pk]
 
 
-def filter_products_by_attributes_values(qs, queries: T_PRODUCT_FILTER_QUERIES):
+def filter_products_by_attributes_values(
+    qs, queries: T_PRODUCT_FILTER_QUERIES, channel_slug=None
+):
+    if _use_listing_index(channel_slug):
+        index_lookup = Q()
+        for values in queries.values():
+            index_lookup &= Q(attribute_value_ids__overlap=list(values))
+        return qs.filter(_listing_index_filter(channel_slug, index_lookup))
+
     filters = []
     for values in queries.values():
         assigned_product_attribute_values = (
@@ -247,6 +257,7 @@ def filter_products_by_attributes(
     filter_boolean_values,
     date_range_list,
     date_time_range_list,
+    channel_slug=None,
 ):
     queries: Dict[int, List[Optional[int]]] = defaultdict(list)
     try:
@@ -270,10 +281,47 @@ def filter_products_by_attributes(
             )
     except ValueError:
         return Product.objects.none()
-    return filter_products_by_attributes_values(qs, queries)
+    return filter_products_by_attributes_values(qs, queries, channel_slug)
+
+
+def _use_listing_index(channel_slug) -> bool:
+    return bool(settings.PRODUCT_LISTING_INDEX_ENABLED and channel_slug)
+
+
+def _get_listing_indexes(channel_slug):
+    channels = Channel.objects.filter(slug=channel_slug).values("pk")
+    return ProductListingIndex.objects.filter(
+        Exists(channels.filter(pk=OuterRef("channel_id")))
+    ).values("product_id")
+
+
+def _listing_index_filter(channel_slug, index_lookup: Q) -> Q:
+    """Match products whose listing index in the channel matches the lookup.
+
+    All predicates are checked on the same index row, in a single subquery.
+    Products listed in the channel get their index rows when their listings are
+    saved, see `mark_products_listing_index_dirty`.
+    """
+    indexes = _get_listing_indexes(channel_slug).filter(
+        index_lookup, product_id=OuterRef("pk")
+    )
+    return Q(Exists(indexes))
 
 
 def filter_products_by_variant_price(qs, channel_slug, price_lte=None, price_gte=None):
+    # The lowest and the highest variant prices of the listing index match the
+    # range exactly only when one of the bounds is given.
+    if _use_listing_index(channel_slug) and bool(price_lte) != bool(price_gte):
+        if price_lte:
+            price_lookup = Q(min_variant_price_amount__lte=price_lte)
+        else:
+            price_lookup = Q(max_variant_price_amount__gte=price_gte)
+        return qs.filter(
+            _listing_index_filter(
+                channel_slug, price_lookup | Q(has_variants_without_price=True)
+            )
+        )
+
     channels = Channel.objects.filter(slug=channel_slug).values("pk")
     product_variant_channel_listings = ProductVariantChannelListing.objects.filter(
         Exists(channels.filter(pk=OuterRef("channel_id")))
@@ -301,18 +349,16 @@ def filter_products_by_minimal_price(
     channel = Channel.objects.filter(slug=channel_slug).first()
     if not channel:
         return qs
-    product_channel_listings = ProductChannelListing.objects.filter(
-        channel_id=channel.id
-    )
+    lookup = {}
     if minimal_price_lte:
-        product_channel_listings = product_channel_listings.filter(
-            discounted_price_amount__lte=minimal_price_lte
-        )
+        lookup["discounted_price_amount__lte"] = minimal_price_lte
     if minimal_price_gte:
-        product_channel_listings = product_channel_listings.filter(
-            discounted_price_amount__gte=minimal_price_gte
-        )
-    product_channel_listings = product_channel_listings.values("product_id")
+        lookup["discounted_price_amount__gte"] = minimal_price_gte
+    if settings.PRODUCT_LISTING_INDEX_ENABLED:
+        return qs.filter(_listing_index_filter(channel_slug, Q(**lookup)))
+    product_channel_listings = ProductChannelListing.objects.filter(
+        channel_id=channel.id, **lookup
+    ).values("product_id")
     return qs.filter(Exists(product_channel_listings.filter(product_id=OuterRef("pk"))))
 
 
@@ -324,7 +370,13 @@ def filter_products_by_categories(qs, category_ids):
     return qs.filter(Exists(categories.filter(pk=OuterRef("category_id"))))
 
 
-def filter_products_by_collections(qs, collection_pks):
+def filter_products_by_collections(qs, collection_pks, channel_slug=None):
+    if _use_listing_index(channel_slug):
+        return qs.filter(
+            _listing_index_filter(
+                channel_slug, Q(collection_ids__overlap=list(collection_pks))
+            )
+        )
     collection_products = CollectionProduct.objects.filter(
         collection_id__in=collection_pks
     ).values("product_id")
@@ -332,6 +384,21 @@ def filter_products_by_collections(qs, collection_pks):
 
 
 def filter_products_by_stock_availability(qs, stock_availability, channel_slug):
+    if _use_listing_index(channel_slug):
+        in_stock_filter = _listing_index_filter(
+            channel_slug, Q(quantity_available__gt=0)
+        )
+    else:
+        in_stock_filter = _get_in_stock_filter(channel_slug)
+
+    if stock_availability == StockAvailability.IN_STOCK:
+        qs = qs.filter(in_stock_filter)
+    if stock_availability == StockAvailability.OUT_OF_STOCK:
+        qs = qs.filter(~in_stock_filter)
+    return qs
+
+
+def _get_in_stock_filter(channel_slug) -> Q:
     allocations = (
         Allocation.objects.values("stock_id")
         .filter(quantity_allocated__gt=0, stock_id=OuterRef("pk"))
@@ -361,15 +428,10 @@ def filter_products_by_stock_availability(qs, stock_availability, channel_slug):
     variants = ProductVariant.objects.filter(
         Exists(stocks.filter(product_variant_id=OuterRef("pk")))
     ).values("product_id")
+    return Q(Exists(variants.filter(product_id=OuterRef("pk"))))
 
-    if stock_availability == StockAvailability.IN_STOCK:
-        qs = qs.filter(Exists(variants.filter(product_id=OuterRef("pk"))))
-    if stock_availability == StockAvailability.OUT_OF_STOCK:
-        qs = qs.filter(~Exists(variants.filter(product_id=OuterRef("pk"))))
-    return qs
 
-
-def _filter_attributes(qs, _, value):
+def _filter_attributes(qs, _, value, channel_slug=None):
     if value:
         value_list = []
         boolean_list = []
@@ -397,6 +459,7 @@ def _filter_attributes(qs, _, value):
             boolean_list,
             date_range_list,
             date_time_range_list,
+            channel_slug,
         )
     return qs
 
@@ -437,16 +500,24 @@ def filter_has_preordered_variants(qs, _, value):
         return qs.filter(~Exists(variants.filter(product_id=OuterRef("pk"))))
 
 
-def filter_collections(qs, _, value):
+def _filter_collections(qs, _, value, channel_slug=None):
     if value:
         _, collection_pks = resolve_global_ids_to_primary_keys(
             value, product_types.Collection
         )
-        qs = filter_products_by_collections(qs, collection_pks)
+        qs = filter_products_by_collections(qs, collection_pks, channel_slug)
     return qs
 
 
 def _filter_products_is_published(qs, _, value, channel_slug):
+    if _use_listing_index(channel_slug):
+        # Products without any priced variant are never returned.
+        return qs.filter(
+            _listing_index_filter(
+                channel_slug,
+                Q(is_published=value, min_variant_price_amount__isnull=False),
+            )
+        )
     channel = Channel.objects.filter(slug=channel_slug).values("pk")
     product_channel_listings = ProductChannelListing.objects.filter(
         Exists(channel.filter(pk=OuterRef("channel_id"))), is_published=value
@@ -471,16 +542,16 @@ def _filter_products_is_available(qs, _, value, channel_slug):
     channel = Channel.objects.filter(slug=channel_slug).values("pk")
     now = datetime.datetime.now(pytz.UTC)
     if value:
-        product_channel_listings = ProductChannelListing.objects.filter(
-            Exists(channel.filter(pk=OuterRef("channel_id"))),
-            available_for_purchase_at__lte=now,
-        ).values("product_id")
+        available_lookup = Q(available_for_purchase_at__lte=now)
     else:
-        product_channel_listings = ProductChannelListing.objects.filter(
-            Exists(channel.filter(pk=OuterRef("channel_id"))),
-            Q(available_for_purchase_at__gt=now)
-            | Q(available_for_purchase_at__isnull=True),
-        ).values("product_id")
+        available_lookup = Q(available_for_purchase_at__gt=now) | Q(
+            available_for_purchase_at__isnull=True
+        )
+    if _use_listing_index(channel_slug):
+        return qs.filter(_listing_index_filter(channel_slug, available_lookup))
+    product_channel_listings = ProductChannelListing.objects.filter(
+        Exists(channel.filter(pk=OuterRef("channel_id"))), available_lookup
+    ).values("product_id")
 
     return qs.filter(Exists(product_channel_listings.filter(product_id=OuterRef("pk"))))
 
@@ -490,6 +561,8 @@ def _filter_products_channel_field_from_date(qs, _, value, channel_slug, field):
     lookup = {
         f"{field}__lte": value,
     }
+    if _use_listing_index(channel_slug):
+        return qs.filter(_listing_index_filter(channel_slug, Q(**lookup)))
     product_channel_listings = ProductChannelListing.objects.filter(
         Exists(channel.filter(pk=OuterRef("channel_id"))),
         **lookup,
@@ -499,6 +572,10 @@ def _filter_products_channel_field_from_date(qs, _, value, channel_slug, field):
 
 
 def _filter_products_visible_in_listing(qs, _, value, channel_slug):
+    if _use_listing_index(channel_slug):
+        return qs.filter(
+            _listing_index_filter(channel_slug, Q(visible_in_listings=value))
+        )
     channel = Channel.objects.filter(slug=channel_slug).values("pk")
     product_channel_listings = ProductChannelListing.objects.filter(
         Exists(channel.filter(pk=OuterRef("channel_id"))), visible_in_listings=value
@@ -668,7 +745,7 @@ class ProductFilter(MetadataFilterBase):
         method="filter_listed",
         help_text=f"Filter by visibility in product listings. {ADDED_IN_38}",
     )
-    collections = GlobalIDMultipleChoiceFilter(method=filter_collections)
+    collections = GlobalIDMultipleChoiceFilter(method="filter_collections")
     categories = GlobalIDMultipleChoiceFilter(method=filter_categories)
     has_category = django_filters.BooleanFilter(method=filter_has_category)
     price = ObjectTypeFilter(input_class=PriceRangeInput, method="filter_variant_price")
@@ -719,7 +796,12 @@ class ProductFilter(MetadataFilterBase):
         ]
 
     def filter_attributes(self, queryset, name, value):
-        return _filter_attributes(queryset, name, value)
+        channel_slug = get_channel_slug_from_filter_data(self.data)
+        return _filter_attributes(queryset, name, value, channel_slug)
+
+    def filter_collections(self, queryset, name, value):
+        channel_slug = get_channel_slug_from_filter_data(self.data)
+        return _filter_collections(queryset, name, value, channel_slug)
 
     def filter_variant_price(self, queryset, name, value):
         channel_slug = get_channel_slug_from_filter_data(self.data)
@@ -12,6 +12,7 @@ from ....core.permissions import ProductPermissions
 from ....core.tracing import traced_atomic_transaction
 from ....core.utils.date_time import convert_to_utc_date_time
 from ....product.error_codes import CollectionErrorCode, ProductErrorCode
+from ....product.listing_index import mark_products_listing_index_dirty
 from ....product.models import CollectionChannelListing
 from ....product.models import Product as ProductModel
 from ....product.models import ProductChannelListing
@@ -336,6 +337,7 @@ class ProductChannelListingUpdate(BaseChannelListingMutation):
         with traced_atomic_transaction():
             cls.update_channels(product, cleaned_input.get("update_channels", []))
             cls.remove_channels(product, cleaned_input.get("remove_channels", []))
+            mark_products_listing_index_dirty([product.pk])
             product = ProductModel.objects.prefetched_for_webhook().get(pk=product.pk)
             manager = get_plugin_manager_promise(info.context).get()
             cls.call_event(manager.product_updated, product)
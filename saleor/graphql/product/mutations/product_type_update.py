@@ -1,7 +1,8 @@
 import graphene
 
 from ....core.permissions import ProductTypePermissions
-from ....product import models
+from ....product import ProductSearchIndexChangeSource, models
+from ....product.search import mark_products_search_index_changed
 from ....product.tasks import update_variants_names
 from ...core.types import ProductError
 from ..types import ProductType
@@ -42,6 +43,9 @@ class ProductTypeUpdate(ProductTypeCreate):
             "product_attributes" in cleaned_input
             or "variant_attributes" in cleaned_input
         ):
-            models.Product.objects.filter(product_type=instance).update(
-                search_index_dirty=True
+            product_ids = models.Product.objects.filter(
+                product_type=instance
+            ).values_list("id", flat=True)
+            mark_products_search_index_changed(
+                product_ids.iterator(), ProductSearchIndexChangeSource.ATTRIBUTES
             )
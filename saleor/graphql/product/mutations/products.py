@@ -21,9 +21,13 @@ from ....core.utils.validators import get_oembed_data
 from ....order import events as order_events
 from ....order import models as order_models
 from ....order.tasks import recalculate_orders_task
-from ....product import ProductMediaTypes, models
+from ....product import ProductMediaTypes, ProductSearchIndexChangeSource, models
 from ....product.error_codes import CollectionErrorCode, ProductErrorCode
-from ....product.search import update_product_search_vector
+from ....product.listing_index import (
+    mark_products_listing_index_dirty,
+    mark_products_listing_index_dirty_on_commit,
+)
+from ....product.search import mark_products_search_index_changed
 from ....product.tasks import (
     update_product_discounted_price_task,
     update_products_discounted_prices_of_catalogues_task,
@@ -31,6 +35,7 @@ from ....product.tasks import (
 from ....product.utils import delete_categories, get_products_ids_without_variants
 from ....product.utils.variants import generate_and_set_variant_name
 from ....thumbnail import models as thumbnail_models
+from ....thumbnail.tasks import schedule_thumbnails_creation
 from ....warehouse.management import deactivate_preorder_for_variant
 from ...app.dataloaders import get_app_promise
 from ...attribute.types import AttributeValueInput
@@ -151,7 +156,9 @@ class CategoryCreate(ModelMutation):
         return super().perform_mutation(root, info, **data)
 
     @classmethod
-    def post_save_action(cls, info, instance, _cleaned_input):
+    def post_save_action(cls, info, instance, cleaned_input):
+        if cleaned_input.get("background_image"):
+            schedule_thumbnails_creation("Category", instance.pk)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.category_created, instance)
 
@@ -182,7 +189,9 @@ class CategoryUpdate(CategoryCreate):
         return super().construct_instance(instance, cleaned_data)
 
     @classmethod
-    def post_save_action(cls, info, instance, _cleaned_input):
+    def post_save_action(cls, info, instance, cleaned_input):
+        if cleaned_input.get("background_image"):
+            schedule_thumbnails_creation("Category", instance.pk)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.category_updated, instance)
 
@@ -290,6 +299,8 @@ class CollectionCreate(ModelMutation):
 
     @classmethod
     def post_save_action(cls, info, instance, cleaned_input):
+        if cleaned_input.get("background_image"):
+            schedule_thumbnails_creation("Collection", instance.pk)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.collection_created, instance)
 
@@ -335,6 +346,8 @@ class CollectionUpdate(CollectionCreate):
     @classmethod
     def post_save_action(cls, info, instance, cleaned_input):
         """Override this method with `pass` to avoid triggering product webhook."""
+        if cleaned_input.get("background_image"):
+            schedule_thumbnails_creation("Collection", instance.pk)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.collection_updated, instance)
 
@@ -487,6 +500,7 @@ class CollectionAddProducts(BaseMutation):
         manager = get_plugin_manager_promise(info.context).get()
         with traced_atomic_transaction():
             collection.products.add(*products)
+            mark_products_listing_index_dirty([product.pk for product in products])
             if collection.sale_set.exists():
                 # Updated the db entries, recalculating discounts of affected products
                 update_products_discounted_prices_of_catalogues_task.delay(
@@ -546,6 +560,7 @@ class CollectionRemoveProducts(BaseMutation):
             qs=models.Product.objects.prefetched_for_webhook(single_object=False),
         )
         collection.products.remove(*products)
+        mark_products_listing_index_dirty([product.pk for product in products])
         manager = get_plugin_manager_promise(info.context).get()
         for product in products:
             cls.call_event(manager.product_updated, product)
@@ -610,6 +625,13 @@ class ProductCreateInput(ProductInput):
 
 T_INPUT_MAP = List[Tuple[attribute_models.Attribute, AttrValuesInput]]
 
+# Parts of the product search vector changed by the product input fields.
+PRODUCT_SEARCH_INDEX_CHANGE_SOURCES = {
+    "name": ProductSearchIndexChangeSource.NAME,
+    "description": ProductSearchIndexChangeSource.DESCRIPTION,
+    "attributes": ProductSearchIndexChangeSource.ATTRIBUTES,
+}
+
 
 class ProductCreate(ModelMutation):
     class Arguments:
@@ -723,7 +745,10 @@ class ProductCreate(ModelMutation):
     @classmethod
     def post_save_action(cls, info, instance, _cleaned_input):
         product = models.Product.objects.prefetched_for_webhook().get(pk=instance.pk)
-        update_product_search_vector(instance)
+        mark_products_search_index_changed(
+            [instance.pk], ProductSearchIndexChangeSource.ALL
+        )
+        mark_products_listing_index_dirty([instance.pk])
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.product_created, product)
 
@@ -777,9 +802,12 @@ class ProductUpdate(ProductCreate):
                 AttributeAssignmentMixin.save(instance, attributes)
 
     @classmethod
-    def post_save_action(cls, info, instance, _cleaned_input):
+    def post_save_action(cls, info, instance, cleaned_input):
         product = models.Product.objects.prefetched_for_webhook().get(pk=instance.pk)
-        update_product_search_vector(instance)
+        for field, source in PRODUCT_SEARCH_INDEX_CHANGE_SOURCES.items():
+            if field in cleaned_input:
+                mark_products_search_index_changed([instance.pk], source)
+        mark_products_listing_index_dirty([instance.pk])
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.product_updated, product)
 
@@ -1152,7 +1180,10 @@ class ProductVariantCreate(ModelMutation):
                 generate_and_set_variant_name(instance, cleaned_input.get("sku"))
 
             manager = get_plugin_manager_promise(info.context).get()
-            update_product_search_vector(instance.product)
+            mark_products_search_index_changed(
+                [instance.product_id], ProductSearchIndexChangeSource.VARIANTS
+            )
+            mark_products_listing_index_dirty_on_commit([instance.product_id])
             event_to_call = (
                 manager.product_variant_created
                 if new_variant
@@ -1265,7 +1296,10 @@ class ProductVariantDelete(ModelDeleteMutation):
         # Update the "discounted_prices" of the parent product
         update_product_discounted_price_task.delay(instance.product_id)
         product = models.Product.objects.get(id=instance.product_id)
-        update_product_search_vector(product)
+        mark_products_search_index_changed(
+            [product.pk], ProductSearchIndexChangeSource.VARIANTS
+        )
+        mark_products_listing_index_dirty_on_commit([product.pk])
         # if the product default variant has been removed set the new one
         if not product.default_variant:
             product.default_variant = product.variants.first()
@@ -1469,6 +1503,8 @@ class ProductMediaCreate(BaseMutation):
                     type=media_type,
                     oembed_data=oembed_data,
                 )
+        if media.image:
+            schedule_thumbnails_creation("ProductMedia", media.pk)
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.product_updated, product)
         product = ChannelContext(node=product, channel_slug=None)
@@ -417,7 +417,12 @@ class ProductQueries(graphene.ObjectType):
         qs = resolve_products(info, requestor, channel_slug=channel)
         kwargs["channel"] = channel
         qs = filter_connection_queryset(qs, kwargs)
-        return create_connection_slice(qs, info, kwargs, ProductCountableConnection)
+        connection = create_connection_slice(
+            qs, info, kwargs, ProductCountableConnection
+        )
+        # Attribute value counts are computed for all the filtered products.
+        connection.products = qs
+        return connection
 
     @staticmethod
     def resolve_product_type(_root, _info: graphene.ResolveInfo, *, id):
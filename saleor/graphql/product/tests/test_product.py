@@ -33,8 +33,13 @@ from ....core.units import MeasurementUnits, WeightUnits
 from ....order import OrderEvents, OrderStatus
 from ....order.models import OrderEvent, OrderLine
 from ....plugins.manager import PluginsManager, get_plugins_manager
-from ....product import ProductMediaTypes, ProductTypeKind
+from ....product import (
+    ProductMediaTypes,
+    ProductSearchIndexChangeSource,
+    ProductTypeKind,
+)
 from ....product.error_codes import ProductErrorCode
+from ....product.listing_index import update_products_listing_index
 from ....product.models import (
     Category,
     Collection,
@@ -42,6 +47,7 @@ from ....product.models import (
     Product,
     ProductChannelListing,
     ProductMedia,
+    ProductSearchIndexChange,
     ProductType,
     ProductVariant,
     ProductVariantChannelListing,
@@ -3092,6 +3098,75 @@ def test_products_query_with_price_filter_as_user(
     assert products[1]["node"]["id"] == third_product_id
 
 
+@pytest.mark.parametrize(
+    "price_filter, expected_count",
+    [
+        ({"lte": 15}, 1),
+        ({"gte": 25}, 2),
+        ({"gte": 15, "lte": 25}, 2),
+        ({"gte": 35}, 1),
+    ],
+)
+def test_products_query_with_price_filter_listing_index(
+    price_filter,
+    expected_count,
+    query_products_with_filter,
+    staff_api_client,
+    product_list,
+    permission_manage_products,
+    channel_USD,
+    settings,
+):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = True
+    product_list[0].variants.first().channel_listings.update(price_amount=None)
+    update_products_listing_index([product.pk for product in product_list])
+    variables = {"filter": {"price": price_filter}, "channel": channel_USD.slug}
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+
+    # when
+    response = staff_api_client.post_graphql(query_products_with_filter, variables)
+
+    # then
+    content = get_graphql_content(response)
+    products = content["data"]["products"]["edges"]
+    assert len(products) == expected_count
+
+
+@pytest.mark.parametrize(
+    "stock_availability, expected_count", [("IN_STOCK", 2), ("OUT_OF_STOCK", 1)]
+)
+def test_products_query_with_filter_stock_availability_listing_index(
+    stock_availability,
+    expected_count,
+    query_products_with_filter,
+    staff_api_client,
+    product_list,
+    permission_manage_products,
+    channel_USD,
+    settings,
+):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = True
+    stock = product_list[0].variants.first().stocks.first()
+    stock.quantity_allocated = stock.quantity
+    stock.save(update_fields=["quantity_allocated"])
+    update_products_listing_index([product.pk for product in product_list])
+    variables = {
+        "filter": {"stockAvailability": stock_availability},
+        "channel": channel_USD.slug,
+    }
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+
+    # when
+    response = staff_api_client.post_graphql(query_products_with_filter, variables)
+
+    # then
+    content = get_graphql_content(response)
+    products = content["data"]["products"]["edges"]
+    assert len(products) == expected_count
+
+
 @pytest.mark.parametrize("is_published", [(True), (False)])
 def test_products_query_with_filter_search_by_sku(
     is_published,
@@ -9215,6 +9290,25 @@ def test_update_product_name(staff_api_client, permission_manage_products, produ
     assert data["product"]["slug"] == product_slug
 
 
+def test_update_product_name_records_search_index_change(
+    staff_api_client, permission_manage_products, product
+):
+    # given
+    product_id = graphene.Node.to_global_id("Product", product.id)
+    variables = {"productId": product_id, "input": {"name": "New name"}}
+
+    # when
+    response = staff_api_client.post_graphql(
+        UPDATE_PRODUCT, variables, permissions=[permission_manage_products]
+    )
+
+    # then
+    get_graphql_content(response)
+    change = ProductSearchIndexChange.objects.get()
+    assert change.product_id == product.pk
+    assert change.source == ProductSearchIndexChangeSource.NAME
+
+
 def test_update_product_slug_with_existing_value(
     staff_api_client, permission_manage_products, product
 ):
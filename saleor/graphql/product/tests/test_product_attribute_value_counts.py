@@ -0,0 +1,113 @@
+import graphene
+import pytest
+
+from ....product.listing_index import update_products_listing_index
+from ...tests.utils import get_graphql_content
+
+QUERY_PRODUCTS_ATTRIBUTE_VALUE_COUNTS = """
+    query ($channel: String, $filter: ProductFilterInput, $attributes: [String!]) {
+        products(first: 1, channel: $channel, filter: $filter) {
+            totalCount
+            attributeValueCounts(attributes: $attributes) {
+                attribute {
+                    slug
+                }
+                value {
+                    id
+                }
+                count
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize("listing_index_enabled", [True, False])
+def test_products_attribute_value_counts(
+    listing_index_enabled,
+    user_api_client,
+    product_list,
+    color_attribute,
+    channel_USD,
+    settings,
+):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = listing_index_enabled
+    update_products_listing_index([product.pk for product in product_list])
+    value = color_attribute.values.first()
+    variables = {"channel": channel_USD.slug, "filter": {"price": {"lte": 25}}}
+
+    # when
+    response = user_api_client.post_graphql(
+        QUERY_PRODUCTS_ATTRIBUTE_VALUE_COUNTS, variables
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["products"]
+    assert data["totalCount"] == 2
+    assert data["attributeValueCounts"] == [
+        {
+            "attribute": {"slug": color_attribute.slug},
+            "value": {"id": graphene.Node.to_global_id("AttributeValue", value.pk)},
+            "count": 2,
+        }
+    ]
+
+
+def test_products_attribute_value_counts_products_not_in_listing_index(
+    staff_api_client,
+    product_list,
+    color_attribute,
+    channel_USD,
+    permission_manage_products,
+    settings,
+):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = True
+    update_products_listing_index([product_list[0].pk])
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_PRODUCTS_ATTRIBUTE_VALUE_COUNTS, {"channel": channel_USD.slug}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    counts = content["data"]["products"]["attributeValueCounts"]
+    assert len(counts) == 1
+    assert counts[0]["count"] == len(product_list)
+
+
+def test_products_attribute_value_counts_filter_by_attributes(
+    user_api_client, product_list, size_attribute, channel_USD
+):
+    # given
+    variables = {"channel": channel_USD.slug, "attributes": [size_attribute.slug]}
+
+    # when
+    response = user_api_client.post_graphql(
+        QUERY_PRODUCTS_ATTRIBUTE_VALUE_COUNTS, variables
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["attributeValueCounts"] == []
+
+
+def test_products_attribute_value_counts_hidden_attribute(
+    user_api_client, product_list, color_attribute, channel_USD
+):
+    # given
+    color_attribute.visible_in_storefront = False
+    color_attribute.save(update_fields=["visible_in_storefront"])
+
+    # when
+    response = user_api_client.post_graphql(
+        QUERY_PRODUCTS_ATTRIBUTE_VALUE_COUNTS, {"channel": channel_USD.slug}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["attributeValueCounts"] == []
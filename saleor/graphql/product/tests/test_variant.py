@@ -4284,6 +4284,31 @@ def test_delete_variant(
     mocked_recalculate_orders_task.assert_not_called()
 
 
+@patch("saleor.product.tasks.update_product_discounted_price_task.delay")
+def test_delete_variant_marks_product_listing_index_dirty(
+    mocked_update_product_discounted_price_task,
+    staff_api_client,
+    product,
+    permission_manage_products,
+    settings,
+):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = True
+    variant = product.variants.first()
+    variables = {"id": graphene.Node.to_global_id("ProductVariant", variant.pk)}
+
+    # when
+    response = staff_api_client.post_graphql(
+        DELETE_VARIANT_MUTATION, variables, permissions=[permission_manage_products]
+    )
+
+    # then
+    get_graphql_content(response)
+    flush_post_commit_hooks()
+    product.refresh_from_db()
+    assert product.listing_index_dirty is True
+
+
 def test_delete_variant_remove_checkout_lines(
     staff_api_client,
     checkout_with_items,
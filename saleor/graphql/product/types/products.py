@@ -19,6 +19,7 @@ from ....core.tracing import traced_resolver
 from ....core.utils import build_absolute_uri, get_currency_for_country
 from ....core.weight import convert_weight_to_default_weight_unit
 from ....product import models
+from ....product.listing_index import get_attribute_value_counts
 from ....product.models import ALL_PRODUCTS_PERMISSIONS
 from ....product.utils import calculate_revenue_for_variant
 from ....product.utils.availability import (
@@ -36,6 +37,7 @@ from ...attribute.types import (
     AssignedVariantAttribute,
     Attribute,
     AttributeCountableConnection,
+    AttributeValue,
     SelectedAttribute,
 )
 from ...channel import ChannelContext, ChannelQsContext
@@ -49,6 +51,7 @@ from ...core.connection import (
 )
 from ...core.descriptions import (
     ADDED_IN_31,
+    ADDED_IN_38,
     DEPRECATED_IN_3X_FIELD,
     DEPRECATED_IN_3X_INPUT,
     PREVIEW_FEATURE,
@@ -1271,10 +1274,65 @@ class Product(ChannelContextTypeWithMetadata, ModelObjectType):
         return [products.get(root_id) for root_id in roots_ids]
 
 
+class AttributeValueCount(graphene.ObjectType):
+    attribute = graphene.Field(
+        Attribute, required=True, description="Attribute of the value."
+    )
+    value = graphene.Field(AttributeValue, required=True, description="The value.")
+    count = graphene.Int(
+        required=True, description="Number of products with the attribute value."
+    )
+
+    class Meta:
+        description = (
+            "Represents the number of products with an attribute value."
+            + ADDED_IN_38
+            + PREVIEW_FEATURE
+        )
+
+
 class ProductCountableConnection(CountableConnection):
+    attribute_value_counts = NonNullList(
+        AttributeValueCount,
+        attributes=NonNullList(
+            graphene.String,
+            description="Slugs of the attributes to count the values of.",
+        ),
+        description=(
+            "Number of the products matching the filters with each attribute value. "
+            "Available only on the `products` query." + ADDED_IN_38 + PREVIEW_FEATURE
+        ),
+    )
+
     class Meta:
         node = Product
 
+    @staticmethod
+    def resolve_attribute_value_counts(root, info, attributes=None):
+        products = getattr(root, "products", None)
+        if products is None:
+            return None
+        requestor = get_user_or_app_from_context(info.context)
+        attributes_qs = attribute_models.Attribute.objects.get_visible_to_user(
+            requestor
+        )
+        if attributes is not None:
+            attributes_qs = attributes_qs.filter(slug__in=attributes)
+        counts = get_attribute_value_counts(products.qs, products.channel_slug)
+        values = (
+            attribute_models.AttributeValue.objects.filter(
+                pk__in=counts, attribute__in=attributes_qs
+            )
+            .select_related("attribute")
+            .order_by("attribute__slug", "sort_order", "pk")
+        )
+        return [
+            AttributeValueCount(
+                attribute=value.attribute, value=value, count=counts[value.pk]
+            )
+            for value in values
+        ]
+
 
 @federated_entity("id")
 class ProductType(ModelObjectType):
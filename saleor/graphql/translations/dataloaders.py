@@ -1,10 +1,14 @@
 from collections import defaultdict
 
+from django.conf import settings
+
 from ...attribute import models as attribute_models
 from ...discount import models as discount_models
 from ...menu import models as menu_models
+from ...menu.utils import get_menus_snapshot
 from ...page import models as page_models
 from ...product import models as product_models
+from ...product.category_tree import get_category_tree_snapshot
 from ...shipping import models as shipping_models
 from ...site import models as site_models
 from ..core.dataloaders import DataLoader
@@ -64,6 +68,14 @@ class CategoryTranslationByIdAndLanguageCodeLoader(
     model = product_models.CategoryTranslation
     relation_name = "category_id"
 
+    def batch_load(self, keys):
+        if settings.NAVIGATION_CACHE_ENABLED:
+            translations = get_category_tree_snapshot().translations
+            return [
+                translations.get((int(id), language_code)) for id, language_code in keys
+            ]
+        return super().batch_load(keys)
+
 
 class CollectionTranslationByIdAndLanguageCodeLoader(
     BaseTranslationByIdAndLanguageCodeLoader
@@ -80,6 +92,14 @@ class MenuItemTranslationByIdAndLanguageCodeLoader(
     model = menu_models.MenuItemTranslation
     relation_name = "menu_item_id"
 
+    def batch_load(self, keys):
+        if settings.NAVIGATION_CACHE_ENABLED:
+            translations = get_menus_snapshot().translations
+            return [
+                translations.get((int(id), language_code)) for id, language_code in keys
+            ]
+        return super().batch_load(keys)
+
 
 class PageTranslationByIdAndLanguageCodeLoader(
     BaseTranslationByIdAndLanguageCodeLoader
@@ -0,0 +1,127 @@
+import json
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql.error import GraphQLError
+
+from ..core.document_cache import get_query_hash
+
+PERSISTED_QUERY_KEY_PREFIX = "persisted_query"
+ALLOWLISTED_QUERY_KEY_PREFIX = "allowlisted_query"
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryError(GraphQLError):
+    code = "PERSISTED_QUERY_ERROR"
+
+    def __init__(self, message: Optional[str] = None):
+        super().__init__(
+            message or self.__class__.__name__, extensions={"code": self.code}
+        )
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    # Apollo clients retry the request with the full query text when they receive
+    # an error with this message.
+    code = "PERSISTED_QUERY_NOT_FOUND"
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_SUPPORTED"
+
+
+class PersistedQueryNotAllowed(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_ALLOWED"
+
+
+def get_persisted_query_key(query_hash: str, allowlisted: bool = False) -> str:
+    prefix = ALLOWLISTED_QUERY_KEY_PREFIX if allowlisted else PERSISTED_QUERY_KEY_PREFIX
+    return f"{prefix}:{query_hash}"
+
+
+def get_persisted_query(
+    query_hash: str, allowlisted_only: bool = False
+) -> Optional[str]:
+    """Return the registered query; only the allowlisted ones if requested."""
+    query = cache.get(get_persisted_query_key(query_hash, allowlisted=True))
+    if query is None and not allowlisted_only:
+        query = cache.get(get_persisted_query_key(query_hash))
+    return query
+
+
+def register_persisted_query(query: str, allowlisted: bool = False) -> str:
+    """Store the query in the registry and return its hash.
+
+    Queries registered ahead of time for the allowlist mode are kept apart from
+    the ones registered by the clients and never expire, while the latter follow
+    `GRAPHQL_PERSISTED_QUERIES_TIMEOUT`.
+    """
+    query_hash = get_query_hash(query)
+    timeout = None if allowlisted else settings.GRAPHQL_PERSISTED_QUERIES_TIMEOUT
+    cache.set(
+        get_persisted_query_key(query_hash, allowlisted=allowlisted),
+        query,
+        timeout=timeout,
+    )
+    return query_hash
+
+
+def get_persisted_query_hash(extensions: Any) -> Optional[str]:
+    """Return the query hash sent in the `persistedQuery` request extension."""
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        raise PersistedQueryError("Unsupported persisted query version.")
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise PersistedQueryError("Persisted query hash must be provided.")
+    return query_hash.lower()
+
+
+def resolve_persisted_query(query: Any, extensions: Any) -> Any:
+    """Return the text of the query that should be executed.
+
+    The query is looked up in the registry when the client sends only its hash.
+    When the client sends both, the query is registered under the hash, unless
+    the allowlist mode is enabled and only queries registered ahead of time are
+    accepted.
+    """
+    if not settings.GRAPHQL_PERSISTED_QUERIES_ENABLED:
+        if not query and get_persisted_query_hash(extensions):
+            raise PersistedQueryNotSupported()
+        return query
+
+    allowlist = settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST
+    query_hash = get_persisted_query_hash(extensions)
+    if query_hash is None:
+        if allowlist and isinstance(query, str) and query:
+            if (
+                get_persisted_query(get_query_hash(query), allowlisted_only=True)
+                is None
+            ):
+                raise PersistedQueryNotAllowed()
+        return query
+
+    if not query:
+        query = get_persisted_query(query_hash, allowlisted_only=allowlist)
+        if query is None:
+            raise PersistedQueryNotFound()
+        return query
+
+    if not isinstance(query, str) or get_query_hash(query) != query_hash:
+        raise PersistedQueryError("Provided sha256 hash does not match the query.")
+    if allowlist:
+        if get_persisted_query(query_hash, allowlisted_only=True) is None:
+            raise PersistedQueryNotAllowed()
+    else:
+        register_persisted_query(query)
+    return query
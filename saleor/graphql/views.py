@@ -2,22 +2,26 @@ import fnmatch
 import hashlib
 import importlib
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from inspect import isclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import opentracing
 import opentracing.tags
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
-from django.db import connection
+from django.db import close_old_connections, connection
 from django.db.backends.postgresql.base import DatabaseWrapper
 from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render
 from django.views.generic import View
-from graphql import GraphQLDocument, get_default_backend
+from graphql import GraphQLDocument, get_default_backend, get_operation_ast
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.execution import ExecutionResult
 from jwt.exceptions import PyJWTError
+from promise import Promise, is_thenable
 
 from .. import __version__ as saleor_version
 from ..core.exceptions import PermissionDenied, ReadOnlyException
@@ -25,12 +29,21 @@ from ..core.utils import is_valid_ipv4, is_valid_ipv6
 from ..webhook import observability
 from .api import API_PATH, schema
 from .context import get_context_value
-from .core.validators.query_cost import validate_query_cost
+from .core import SaleorContext
+from .core.document_cache import CachedDocument, document_cache
+from .core.response_cache import ResponseCacheEntry
 from .query_cost_map import COST_MAP
 from .utils import format_error, query_fingerprint, query_identifier
+from .utils.persisted_queries import PersistedQueryError, resolve_persisted_query
 
 INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
 
+# Query, variables and operation name of a request, or the error of resolving them.
+GraphQLParams = Union[
+    Tuple[Optional[str], Optional[dict], Optional[str]], ExecutionResult
+]
+CachedDocumentOrError = Tuple[Optional[CachedDocument], Optional[ExecutionResult]]
+
 
 def tracing_wrapper(execute, sql, params, many, context):
     conn: DatabaseWrapper = context["connection"]
@@ -144,7 +157,10 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            if settings.GRAPHQL_BATCH_CONCURRENT_EXECUTION:
+                responses = self.get_batch_responses(request, data)
+            else:
+                responses = [self.get_response(request, entry) for entry in data]
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
@@ -205,30 +221,142 @@ class GraphQLView(View):
             return response
 
     def get_response(
-        self, request: HttpRequest, data: dict
+        self,
+        request: HttpRequest,
+        data: dict,
+        context: Optional[SaleorContext] = None,
+        params: Optional[GraphQLParams] = None,
+        resolved_document: Optional[CachedDocumentOrError] = None,
     ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
         with observability.report_gql_operation() as operation:
-            execution_result = self.execute_graphql_request(request, data)
-            status_code = 200
-            if execution_result:
-                response = {}
-                if execution_result.errors:
-                    response["errors"] = [
-                        self.format_error(e) for e in execution_result.errors
-                    ]
-                if execution_result.invalid:
-                    status_code = 400
-                else:
-                    response["data"] = execution_result.data
-                if execution_result.extensions:
-                    response["extensions"] = execution_result.extensions
-                result: Optional[Dict[str, List[Any]]] = response
+            execution_result = self.execute_graphql_request(
+                request,
+                data,
+                context=context,
+                params=params,
+                resolved_document=resolved_document,
+            )
+            return self.format_execution_result(execution_result, operation)
+
+    def get_batch_responses(
+        self, request: HttpRequest, entries: List[dict]
+    ) -> List[Tuple[Optional[Dict[str, List[Any]]], int]]:
+        """Execute batched operations with a single context and set of dataloaders.
+
+        Consecutive queries are started together, so the data they request through
+        the dataloaders is fetched in the same batches. Mutations are executed one
+        by one, in the order in which they were sent.
+        """
+        context = get_context_value(request)
+        responses: List[Tuple[Optional[Dict[str, List[Any]]], int]] = []
+        queries: List[Tuple[dict, GraphQLParams, Optional[CachedDocumentOrError]]] = []
+        for entry in entries:
+            # The params and the document are resolved once, as resolving
+            # a persisted query can register it.
+            params = self.get_graphql_params_or_error(request, entry)
+            resolved_document = None
+            if not isinstance(params, ExecutionResult):
+                resolved_document = self.get_cached_document(params[0])
+            if not self.is_mutation_request(params, resolved_document):
+                queries.append((entry, params, resolved_document))
+                continue
+            responses.extend(self.get_concurrent_responses(request, context, queries))
+            queries = []
+            responses.append(
+                self.get_response(
+                    request,
+                    entry,
+                    context=context,
+                    params=params,
+                    resolved_document=resolved_document,
+                )
+            )
+            # Data loaded before the mutation could be outdated, so the following
+            # operations start with fresh dataloaders, as they would if they were
+            # sent in a separate request.
+            context.dataloaders = {}
+            context.is_mutation = False
+        responses.extend(self.get_concurrent_responses(request, context, queries))
+        return responses
+
+    def get_concurrent_responses(
+        self,
+        request: HttpRequest,
+        context: SaleorContext,
+        entries: List[Tuple[dict, GraphQLParams, Optional[CachedDocumentOrError]]],
+    ) -> List[Tuple[Optional[Dict[str, List[Any]]], int]]:
+        if not entries:
+            return []
+        operations = []
+
+        def execute_entries(_):
+            # All operations are started within a single promise callback, so their
+            # resolvers are queued together and the dataloaders dispatch their keys
+            # once for all of them.
+            results = []
+            for entry, params, resolved_document in entries:
+                with observability.report_gql_operation() as operation:
+                    result = self.execute_graphql_request(
+                        request,
+                        entry,
+                        context=context,
+                        return_promise=True,
+                        params=params,
+                        resolved_document=resolved_document,
+                    )
+                operations.append(operation)
+                results.append(result)
+            return Promise.all(results)
+
+        with opentracing.global_tracer().start_active_span("graphql_batch") as scope:
+            scope.span.set_tag(opentracing.tags.COMPONENT, "graphql")
+            scope.span.set_tag("graphql.batch_size", len(entries))
+            with connection.execute_wrapper(tracing_wrapper):
+                execution_results = Promise.resolve(None).then(execute_entries).get()
+        return [
+            self.format_execution_result(execution_result, operation)
+            for execution_result, operation in zip(execution_results, operations)
+        ]
+
+    def format_execution_result(
+        self, execution_result: Optional[ExecutionResult], operation
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
+        status_code = 200
+        if execution_result:
+            response = {}
+            if execution_result.errors:
+                response["errors"] = [
+                    self.format_error(e) for e in execution_result.errors
+                ]
+            if execution_result.invalid:
+                status_code = 400
             else:
-                result = None
-            operation.result = result
-            operation.result_invalid = execution_result.invalid
+                response["data"] = execution_result.data
+            if execution_result.extensions:
+                response["extensions"] = execution_result.extensions
+            result: Optional[Dict[str, List[Any]]] = response
+        else:
+            result = None
+        operation.result = result
+        operation.result_invalid = execution_result.invalid  # type: ignore
         return result, status_code
 
+    def is_mutation_request(
+        self,
+        params: GraphQLParams,
+        resolved_document: Optional[CachedDocumentOrError],
+    ) -> bool:
+        if isinstance(params, ExecutionResult) or resolved_document is None:
+            return False
+        _, _, operation_name = params
+        cached_document, _ = resolved_document
+        if cached_document is None:
+            return False
+        operation = get_operation_ast(
+            cached_document.document.document_ast, operation_name
+        )
+        return bool(operation and operation.operation == "mutation")
+
     def get_root_value(self):
         return self.root_value
 
@@ -241,6 +369,17 @@ class GraphQLView(View):
         If the query is invalid, it returns an error as well.
         Otherwise, it returns the parsed gql document.
         """
+        cached_document, error = self.get_cached_document(query)
+        if cached_document is None:
+            return None, error
+        return cached_document.document, None
+
+    def get_cached_document(self, query: Optional[str]) -> CachedDocumentOrError:
+        """Return the parsed document together with its cached validation results.
+
+        Documents are looked up in the process-wide cache by the query hash, so
+        repeated queries are parsed only once.
+        """
         if not query or not isinstance(query, str):
             return (
                 None,
@@ -251,13 +390,21 @@ class GraphQLView(View):
 
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(self.schema, query),  # type: ignore
-                None,
+            cached_document, cache_hit = document_cache.get_or_parse(
+                self.schema,
+                query,
+                lambda: self.backend.document_from_string(  # type: ignore
+                    self.schema, query
+                ),
             )
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
+        span = opentracing.global_tracer().active_span
+        if span:
+            span.set_tag("graphql.document_cache_hit", cache_hit)
+        return cached_document, None
+
     def check_if_query_contains_only_schema(self, document: GraphQLDocument):
         query_with_schema = False
         for definition in document.document_ast.definitions:
@@ -272,7 +419,22 @@ class GraphQLView(View):
                         raise GraphQLError(msg)
         return query_with_schema
 
-    def execute_graphql_request(self, request: HttpRequest, data: dict):
+    def execute_graphql_request(
+        self,
+        request: HttpRequest,
+        data: dict,
+        context: Optional[SaleorContext] = None,
+        return_promise: bool = False,
+        params: Optional[GraphQLParams] = None,
+        resolved_document: Optional[CachedDocumentOrError] = None,
+    ) -> Union[ExecutionResult, Promise[ExecutionResult]]:
+        """Execute a single GraphQL operation.
+
+        When `return_promise` is set, the execution result may be returned as
+        a promise, which is resolved together with the other pending promises.
+        `params` and `resolved_document` are the already resolved params and
+        document of the operation, if given.
+        """
         with opentracing.global_tracer().start_active_span("graphql_query") as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "graphql")
@@ -281,18 +443,25 @@ class GraphQLView(View):
                 request.build_absolute_uri(request.get_full_path()),
             )
 
-            query, variables, operation_name = self.get_graphql_params(request, data)
+            if params is None:
+                params = self.get_graphql_params_or_error(request, data)
+            if isinstance(params, ExecutionResult):
+                return params
+            query, variables, operation_name = params
             query_cost = 0
 
-            document, error = self.parse_query(query)
+            if resolved_document is None:
+                resolved_document = self.get_cached_document(query)
+            cached_document, error = resolved_document
             with observability.report_gql_operation() as operation:
-                operation.query = document
+                operation.query = cached_document.document if cached_document else None
                 operation.name = operation_name
                 operation.variables = variables
             if error:
                 return error
 
-            if document is not None:
+            if cached_document is not None:
+                document = cached_document.document
                 raw_query_string = document.document_string
                 span.set_tag("graphql.query", raw_query_string)
                 span.set_tag("graphql.query_identifier", query_identifier(document))
@@ -304,9 +473,8 @@ class GraphQLView(View):
                 except GraphQLError as e:
                     return ExecutionResult(errors=[e], invalid=True)
 
-                query_cost, cost_errors = validate_query_cost(
+                query_cost, cost_errors = cached_document.get_query_cost(
                     schema,
-                    document,
                     variables,
                     COST_MAP,
                     settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
@@ -332,21 +500,47 @@ class GraphQLView(View):
                         key = generate_cache_key(raw_query_string)
                         response = cache.get(key)
 
+                    # Batched operations share the context, so the responses are
+                    # cached only for operations executed on their own.
+                    response_cache_entry = None
+                    if cached_document and context is None and not return_promise:
+                        response_cache_entry = ResponseCacheEntry.for_request(
+                            request, cached_document.document, variables, operation_name
+                        )
+                    if response_cache_entry:
+                        response = response_cache_entry.get()
+                        request.response_cache_tags = set()  # type: ignore
+
                     if not response:
-                        response = document.execute(  # type: ignore
-                            root=self.get_root_value(),
-                            variables=variables,
-                            operation_name=operation_name,
-                            context=get_context_value(request),
-                            middleware=self.middleware,
+                        response = self.execute_document(
+                            request,
+                            query,
+                            cached_document,  # type: ignore
+                            variables,
+                            operation_name,
+                            context=context,
+                            # Cached responses have to be resolved before storing.
+                            return_promise=return_promise
+                            and not should_use_cache_for_scheme,
                             **extra_options,
                         )
                         if should_use_cache_for_scheme:
                             cache.set(key, response)
+                        if response_cache_entry:
+                            response_cache_entry.set(
+                                response,
+                                request.response_cache_tags,  # type: ignore
+                            )
+                    if response_cache_entry:
+                        request.response_cache_tags = None  # type: ignore
 
                     if app := getattr(request, "app", None):
                         span.set_tag("app.name", app.name)
 
+                    if is_thenable(response):
+                        return response.then(
+                            partial(set_query_cost_on_result, query_cost=query_cost)
+                        )
                     return set_query_cost_on_result(response, query_cost)
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
@@ -359,6 +553,33 @@ class GraphQLView(View):
                     e = GraphQLError(str(e))
                 return ExecutionResult(errors=[e], invalid=True)
 
+    def execute_document(
+        self,
+        request: HttpRequest,
+        query: str,
+        cached_document: CachedDocument,
+        variables: Optional[dict],
+        operation_name: Optional[str],
+        context: Optional[SaleorContext] = None,
+        return_promise: bool = False,
+        **extra_options,
+    ) -> Union[ExecutionResult, Promise[ExecutionResult]]:
+        # The document is validated against the schema only once, and the result
+        # is reused for the subsequent executions of the same query.
+        validation_errors = document_cache.validate(query, cached_document)
+        if validation_errors:
+            return ExecutionResult(errors=validation_errors, invalid=True)
+        return cached_document.document.execute(
+            root=self.get_root_value(),
+            variables=variables,
+            operation_name=operation_name,
+            context=context or get_context_value(request),
+            middleware=self.middleware,
+            validate=False,
+            return_promise=return_promise,
+            **extra_options,
+        )
+
     @staticmethod
     def parse_body(request: HttpRequest):
         content_type = request.content_type
@@ -371,11 +592,20 @@ class GraphQLView(View):
             return request.POST
         return {}
 
+    def get_graphql_params_or_error(
+        self, request: HttpRequest, data: dict
+    ) -> GraphQLParams:
+        try:
+            return self.get_graphql_params(request, data)
+        except PersistedQueryError as e:
+            return ExecutionResult(errors=[e], invalid=True)
+
     @staticmethod
     def get_graphql_params(request: HttpRequest, data: dict):
         query = data.get("query")
         variables = data.get("variables")
         operation_name = data.get("operationName")
+        extensions = data.get("extensions")
         if operation_name == "null":
             operation_name = None
 
@@ -389,6 +619,8 @@ class GraphQLView(View):
                     obj_set(operations, file_instance, file_key, False)
             query = operations.get("query")
             variables = operations.get("variables")
+            extensions = operations.get("extensions")
+        query = resolve_persisted_query(query, extensions)
         return query, variables, operation_name
 
     @classmethod
@@ -396,6 +628,53 @@ class GraphQLView(View):
         return format_error(error, cls.HANDLED_EXCEPTIONS)
 
 
+_async_view_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_async_view_executor() -> ThreadPoolExecutor:
+    global _async_view_executor
+    if _async_view_executor is None:
+        _async_view_executor = ThreadPoolExecutor(
+            max_workers=settings.GRAPHQL_ASYNC_VIEW_THREADS,
+            thread_name_prefix="graphql",
+        )
+    return _async_view_executor
+
+
+class AsyncGraphQLView(GraphQLView):
+    """GraphQL view served from the event loop of an ASGI worker.
+
+    Django runs synchronous views under ASGI in a single thread, so a request
+    waiting for a sync webhook or the database blocks all the others. This view
+    is a coroutine, which executes the operations in a dedicated pool of
+    `GRAPHQL_ASYNC_VIEW_THREADS` threads, so the worker handles as many requests
+    at a time. Every thread keeps its own database connection.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        def run_view(request, *args, **kwargs):
+            # Connections of the pool threads aren't closed at the end of
+            # requests, as Django does it only in the thread handling them.
+            close_old_connections()
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                close_old_connections()
+
+        async def async_view(request, *args, **kwargs):
+            return await sync_to_async(
+                run_view, thread_sensitive=False, executor=get_async_view_executor()
+            )(request, *args, **kwargs)
+
+        async_view.view_class = view.view_class  # type: ignore
+        async_view.view_initkwargs = view.view_initkwargs  # type: ignore
+        async_view.csrf_exempt = True  # type: ignore
+        return async_view
+
+
 def get_key(key):
     try:
         int_key = int(key)
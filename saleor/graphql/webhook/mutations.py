@@ -5,7 +5,12 @@ from ...core.permissions import AppPermission, AuthorizationFilters
 from ...webhook import models
 from ...webhook.error_codes import WebhookErrorCode
 from ..app.dataloaders import get_app_promise
-from ..core.descriptions import ADDED_IN_32, DEPRECATED_IN_3X_INPUT, PREVIEW_FEATURE
+from ..core.descriptions import (
+    ADDED_IN_32,
+    ADDED_IN_38,
+    DEPRECATED_IN_3X_INPUT,
+    PREVIEW_FEATURE,
+)
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ..core.types import NonNullList, WebhookError
 from ..plugins.dataloaders import get_plugin_manager_promise
@@ -51,6 +56,15 @@ class WebhookCreateInput(graphene.InputObjectType):
         + PREVIEW_FEATURE,
         required=False,
     )
+    batch_size = graphene.Int(
+        description=(
+            "Maximum number of asynchronous events sent to the webhook in a single "
+            "request, as a JSON array. Events are sent one by one, if lower than 2."
+        )
+        + ADDED_IN_38
+        + PREVIEW_FEATURE,
+        required=False,
+    )
 
 
 def clean_webhook_events(_info, _instance, data):
@@ -170,6 +184,15 @@ class WebhookUpdateInput(graphene.InputObjectType):
         + PREVIEW_FEATURE,
         required=False,
     )
+    batch_size = graphene.Int(
+        description=(
+            "Maximum number of asynchronous events sent to the webhook in a single "
+            "request, as a JSON array. Events are sent one by one, if lower than 2."
+        )
+        + ADDED_IN_38
+        + PREVIEW_FEATURE,
+        required=False,
+    )
 
 
 class WebhookUpdate(ModelMutation):
@@ -6,7 +6,7 @@ from django.core.exceptions import ValidationError
 from django.http import HttpRequest
 from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
-from graphql import GraphQLDocument, get_default_backend, parse
+from graphql import GraphQLDocument, get_default_backend
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.language.ast import FragmentDefinition, OperationDefinition
 from promise import Promise
@@ -16,6 +16,8 @@ from ...core.exceptions import PermissionDenied
 from ...plugins.manager import PluginsManager
 from ...settings import get_host
 from ...webhook.error_codes import WebhookErrorCode
+from ..core.context import SaleorContext
+from ..core.document_cache import CachedDocument, document_cache
 from ..utils import format_error
 
 logger = get_task_logger(__name__)
@@ -108,6 +110,43 @@ def get_event_payload(event):
     return event
 
 
+def get_subscription_document(subscription_query: str) -> CachedDocument:
+    """Return the parsed subscription query.
+
+    Documents are kept in the document cache under the hash of the query, so
+    a changed subscription query of a webhook is parsed again.
+    """
+    from ..api import schema
+
+    graphql_backend = get_default_backend()
+    cached_document, _ = document_cache.get_or_parse(
+        schema,
+        subscription_query,
+        lambda: graphql_backend.document_from_string(schema, subscription_query),
+    )
+    return cached_document
+
+
+def get_subscription_context(
+    request: HttpRequest, app: Optional[App] = None
+) -> SaleorContext:
+    """Prepare the request to execute a subscription query of the app.
+
+    Dataloaders are shared between all queries executed with the request for the
+    same app. They aren't shared between apps, as the data they load depends on
+    the permissions of the app.
+    """
+    from ..context import get_context_value
+
+    request.app = app  # type: ignore
+    context = get_context_value(request)
+    app_dataloaders = getattr(request, "app_dataloaders", None)
+    if app_dataloaders is None:
+        app_dataloaders = request.app_dataloaders = {}  # type: ignore
+    context.dataloaders = app_dataloaders.setdefault(app.pk if app else None, {})
+    return context
+
+
 def generate_payload_from_subscription(
     event_type: str,
     subscribable_object,
@@ -124,30 +163,20 @@ def generate_payload_from_subscription(
     subscribable_object: is an object which have a dedicated own type in Subscription
     definition.
     subscription_query: query used to prepare a payload via graphql engine.
-    context: A dummy request used to share context between apps in order to use
-    dataloaders benefits.
+    request: A dummy request used to share dataloaders between payloads generated
+    for the same event.
     app: the owner of the given payload. Required in case when webhook contains
     protected fields.
     return: A payload ready to send via webhook. None if the function was not able to
     generate a payload
     """
-    from ..api import schema
-    from ..context import get_context_value
-
-    graphql_backend = get_default_backend()
-    ast = parse(subscription_query)  # type: ignore
-    document = graphql_backend.document_from_string(
-        schema,
-        ast,
-    )
+    document = get_subscription_document(subscription_query)  # type: ignore
     app_id = app.pk if app else None
 
-    request.app = app  # type: ignore
-
-    results = document.execute(
+    results = document.document.execute(
         allow_subscriptions=True,
         root=(event_type, subscribable_object),
-        context=get_context_value(request),
+        context=get_subscription_context(request, app),
     )
     if hasattr(results, "errors"):
         logger.warning(
@@ -11,7 +11,7 @@ from ..core.connection import (
     create_connection_slice,
     filter_connection_queryset,
 )
-from ..core.descriptions import DEPRECATED_IN_3X_FIELD
+from ..core.descriptions import ADDED_IN_38, DEPRECATED_IN_3X_FIELD, PREVIEW_FEATURE
 from ..core.fields import FilterConnectionField
 from ..core.types import ModelObjectType, NonNullList
 from ..webhook.enums import EventDeliveryStatusEnum, WebhookEventTypeEnum
@@ -186,6 +186,14 @@ class Webhook(ModelObjectType):
     subscription_query = graphene.String(
         description="Used to define payloads for specific events."
     )
+    batch_size = graphene.Int(
+        required=True,
+        description=(
+            "Maximum number of asynchronous events sent in a single request."
+            + ADDED_IN_38
+            + PREVIEW_FEATURE
+        ),
+    )
 
     class Meta:
         description = "Webhook."
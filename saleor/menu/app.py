@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class MenuAppConfig(AppConfig):
+    name = "saleor.menu"
+
+    def ready(self):
+        from .models import Menu, MenuItem, MenuItemTranslation
+        from .signals import invalidate_menus
+
+        # preventing duplicate signals
+        for signal in [post_save, post_delete]:
+            for model in [Menu, MenuItem, MenuItemTranslation]:
+                signal.connect(
+                    invalidate_menus,
+                    sender=model,
+                    dispatch_uid=f"invalidate_menus_{model.__name__}",
+                )
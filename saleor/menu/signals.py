@@ -0,0 +1,5 @@
+from .utils import invalidate_menus_cache
+
+
+def invalidate_menus(sender, instance, **kwargs):
+    invalidate_menus_cache()
@@ -0,0 +1,40 @@
+from ..models import MenuItem, MenuItemTranslation
+from ..utils import _menus_snapshot_cache, get_menus_snapshot
+
+
+def test_get_menus_snapshot(menu_with_items, django_assert_num_queries):
+    # given
+    _menus_snapshot_cache.clear()
+    parent = menu_with_items.items.get(name="Link 2")
+    translation = MenuItemTranslation.objects.create(
+        menu_item=parent, language_code="pl", name="Link 2 PL"
+    )
+    get_menus_snapshot()
+
+    # when
+    with django_assert_num_queries(0):
+        snapshot = get_menus_snapshot()
+
+    # then
+    assert snapshot.menus[menu_with_items.pk] == menu_with_items
+    assert [item.name for item in snapshot.items_by_menu[menu_with_items.pk]] == [
+        "Link 1",
+        "Link 2",
+    ]
+    assert set(snapshot.items.get_children(parent.pk)) == set(parent.children.all())
+    assert snapshot.translations[(parent.pk, "pl")] == translation
+
+
+def test_menus_snapshot_rebuilt_on_menu_item_change(
+    menu, menu_item, django_capture_on_commit_callbacks
+):
+    # given
+    _menus_snapshot_cache.clear()
+    get_menus_snapshot()
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        child = MenuItem.objects.create(menu=menu, name="Child", parent=menu_item)
+
+    # then
+    assert get_menus_snapshot().items.get_children(menu_item.pk) == [child]
@@ -0,0 +1,51 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import DefaultDict, Dict, List, Tuple
+
+from ..core.utils.flat_tree import FlatTree
+from ..core.utils.versioned_cache import VersionedMemoryCache
+from .models import Menu, MenuItem, MenuItemTranslation
+
+MENUS_CACHE_VERSION_KEY = "menus_version"
+
+
+@dataclass
+class MenusSnapshot:
+    menus: Dict[int, Menu]
+    items: FlatTree[MenuItem]
+    # top-level items of every menu
+    items_by_menu: DefaultDict[int, List[MenuItem]]
+    translations: Dict[Tuple[int, str], MenuItemTranslation]
+
+
+_menus_snapshot_cache: VersionedMemoryCache[MenusSnapshot] = VersionedMemoryCache(
+    MENUS_CACHE_VERSION_KEY
+)
+
+
+def build_menus_snapshot() -> MenusSnapshot:
+    items = FlatTree(MenuItem.objects.order_by("sort_order", "pk"))
+    items_by_menu: DefaultDict[int, List[MenuItem]] = defaultdict(list)
+    for item in items.get_roots():
+        items_by_menu[item.menu_id].append(item)
+    return MenusSnapshot(
+        menus=Menu.objects.in_bulk(),
+        items=items,
+        items_by_menu=items_by_menu,
+        translations={
+            (translation.menu_item_id, translation.language_code): translation
+            for translation in MenuItemTranslation.objects.all()
+        },
+    )
+
+
+def get_menus_snapshot() -> MenusSnapshot:
+    """Return menus with their item trees, shared by the whole process."""
+    return _menus_snapshot_cache.get_or_build(
+        MENUS_CACHE_VERSION_KEY, build_menus_snapshot
+    )
+
+
+def invalidate_menus_cache():
+    """Make all workers rebuild the menus snapshot once the transaction commits."""
+    _menus_snapshot_cache.invalidate()
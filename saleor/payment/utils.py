@@ -68,7 +68,7 @@ def create_checkout_payment_lines_information(
 ) -> PaymentLinesData:
     line_items = []
     lines, _ = fetch_checkout_lines(checkout)
-    discounts = fetch_active_discounts()
+    discounts = fetch_active_discounts(checkout.channel.slug)
     checkout_info = fetch_checkout_info(checkout, lines, discounts, manager)
     address = checkout_info.shipping_address or checkout_info.billing_address
 
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from dataclasses import dataclass
 from decimal import Decimal
 from typing import (
     TYPE_CHECKING,
@@ -30,6 +31,8 @@ from ..core.models import EventDelivery
 from ..core.payments import PaymentInterface
 from ..core.prices import quantize_price
 from ..core.taxes import TaxData, TaxType, zero_money, zero_taxed_money
+from ..core.utils.cache_tags import purge_instances_cache_tags
+from ..core.utils.versioned_cache import VersionedMemoryCache
 from ..discount import DiscountInfo
 from ..order import base_calculations as base_order_calculations
 from ..order.interface import OrderTaxedPricesData
@@ -75,6 +78,74 @@ if TYPE_CHECKING:
 
 NotifyEventTypeChoice = str
 
+PLUGINS_CONFIGURATION_VERSION_KEY = "plugins_configuration_version"
+
+
+@dataclass(frozen=True)
+class PluginsSnapshot:
+    """Request-independent data required to instantiate the plugins.
+
+    The snapshot may be shared between requests, so it must not be modified.
+    """
+
+    plugin_classes: Tuple[Tuple[str, Type["BasePlugin"]], ...]
+    channels: Tuple[Channel, ...]
+    global_db_configs: Dict[str, PluginConfiguration]
+    channel_db_configs: Dict[Channel, Dict[str, PluginConfiguration]]
+
+
+_plugins_snapshot_cache: VersionedMemoryCache[PluginsSnapshot] = VersionedMemoryCache(
+    PLUGINS_CONFIGURATION_VERSION_KEY
+)
+
+
+def _get_db_plugin_configs():
+    with opentracing.global_tracer().start_active_span("_get_db_plugin_configs"):
+        qs = (
+            PluginConfiguration.objects.all()
+            .using(settings.DATABASE_CONNECTION_REPLICA_NAME)
+            .prefetch_related("channel")
+        )
+        channel_configs: Dict[Channel, Dict[str, PluginConfiguration]] = defaultdict(
+            dict
+        )
+        global_configs = {}
+        for db_plugin_config in qs:
+            channel = db_plugin_config.channel
+            if channel is None:
+                global_configs[db_plugin_config.identifier] = db_plugin_config
+            else:
+                channel_configs[channel][db_plugin_config.identifier] = db_plugin_config
+        return global_configs, dict(channel_configs)
+
+
+def build_plugins_snapshot(plugins: Iterable[str]) -> PluginsSnapshot:
+    with opentracing.global_tracer().start_active_span("build_plugins_snapshot"):
+        global_db_configs, channel_db_configs = _get_db_plugin_configs()
+        return PluginsSnapshot(
+            plugin_classes=tuple(
+                (plugin_path, import_string(plugin_path)) for plugin_path in plugins
+            ),
+            channels=tuple(Channel.objects.all()),
+            global_db_configs=global_db_configs,
+            channel_db_configs=channel_db_configs,
+        )
+
+
+def get_plugins_snapshot(plugins: Iterable[str]) -> PluginsSnapshot:
+    """Return the plugins snapshot, shared by the whole process when cache is on."""
+    plugins = tuple(plugins)
+    if not settings.PLUGINS_MANAGER_CACHE_ENABLED:
+        return build_plugins_snapshot(plugins)
+    return _plugins_snapshot_cache.get_or_build(
+        plugins, lambda: build_plugins_snapshot(plugins)
+    )
+
+
+def invalidate_plugins_snapshot():
+    """Make all workers rebuild the plugins snapshot once the transaction commits."""
+    _plugins_snapshot_cache.invalidate()
+
 
 class PluginsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
@@ -114,12 +185,13 @@ class PluginsManager(PaymentInterface):
             self.global_plugins = []
             self.plugins_per_channel = defaultdict(list)
 
-            global_db_configs, channel_db_configs = self._get_db_plugin_configs()
-            channels = Channel.objects.all()
+            snapshot = get_plugins_snapshot(plugins)
+            global_db_configs = snapshot.global_db_configs
+            channel_db_configs = snapshot.channel_db_configs
+            channels = snapshot.channels
 
-            for plugin_path in plugins:
+            for plugin_path, PluginClass in snapshot.plugin_classes:
                 with opentracing.global_tracer().start_active_span(f"{plugin_path}"):
-                    PluginClass = import_string(plugin_path)
                     if not getattr(PluginClass, "CONFIGURATION_PER_CHANNEL", False):
                         plugin = self._load_plugin(
                             PluginClass,
@@ -140,25 +212,6 @@ class PluginsManager(PaymentInterface):
             for channel in channels:
                 self.plugins_per_channel[channel.slug].extend(self.global_plugins)
 
-    def _get_db_plugin_configs(self):
-        with opentracing.global_tracer().start_active_span("_get_db_plugin_configs"):
-            qs = (
-                PluginConfiguration.objects.all()
-                .using(settings.DATABASE_CONNECTION_REPLICA_NAME)
-                .prefetch_related("channel")
-            )
-            channel_configs = defaultdict(dict)
-            global_configs = {}
-            for db_plugin_config in qs:
-                channel = db_plugin_config.channel
-                if channel is None:
-                    global_configs[db_plugin_config.identifier] = db_plugin_config
-                else:
-                    channel_configs[channel][
-                        db_plugin_config.identifier
-                    ] = db_plugin_config
-            return global_configs, channel_configs
-
     def __run_method_on_plugins(
         self,
         method_name: str,
@@ -606,18 +659,21 @@ class PluginsManager(PaymentInterface):
 
     def collection_created(self, collection: "Collection"):
         default_value = None
+        purge_instances_cache_tags([collection])
         return self.__run_method_on_plugins(
             "collection_created", default_value, collection
         )
 
     def collection_updated(self, collection: "Collection"):
         default_value = None
+        purge_instances_cache_tags([collection])
         return self.__run_method_on_plugins(
             "collection_updated", default_value, collection
         )
 
     def collection_deleted(self, collection: "Collection"):
         default_value = None
+        purge_instances_cache_tags([collection])
         return self.__run_method_on_plugins(
             "collection_deleted", default_value, collection
         )
@@ -630,14 +686,17 @@ class PluginsManager(PaymentInterface):
 
     def product_created(self, product: "Product"):
         default_value = None
+        purge_instances_cache_tags([product])
         return self.__run_method_on_plugins("product_created", default_value, product)
 
     def product_updated(self, product: "Product"):
         default_value = None
+        purge_instances_cache_tags([product])
         return self.__run_method_on_plugins("product_updated", default_value, product)
 
     def product_deleted(self, product: "Product", variants: List[int]):
         default_value = None
+        purge_instances_cache_tags([product])
         return self.__run_method_on_plugins(
             "product_deleted", default_value, product, variants
         )
@@ -650,18 +709,21 @@ class PluginsManager(PaymentInterface):
 
     def product_variant_created(self, product_variant: "ProductVariant"):
         default_value = None
+        purge_instances_cache_tags([product_variant])
         return self.__run_method_on_plugins(
             "product_variant_created", default_value, product_variant
         )
 
     def product_variant_updated(self, product_variant: "ProductVariant"):
         default_value = None
+        purge_instances_cache_tags([product_variant])
         return self.__run_method_on_plugins(
             "product_variant_updated", default_value, product_variant
         )
 
     def product_variant_deleted(self, product_variant: "ProductVariant"):
         default_value = None
+        purge_instances_cache_tags([product_variant])
         return self.__run_method_on_plugins(
             "product_variant_deleted",
             default_value,
@@ -670,12 +732,16 @@ class PluginsManager(PaymentInterface):
 
     def product_variant_out_of_stock(self, stock: "Stock"):
         default_value = None
+        if settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+            purge_instances_cache_tags([stock, stock.product_variant])
         self.__run_method_on_plugins(
             "product_variant_out_of_stock", default_value, stock
         )
 
     def product_variant_back_in_stock(self, stock: "Stock"):
         default_value = None
+        if settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+            purge_instances_cache_tags([stock, stock.product_variant])
         self.__run_method_on_plugins(
             "product_variant_back_in_stock", default_value, stock
         )
@@ -1007,14 +1073,17 @@ class PluginsManager(PaymentInterface):
 
     def category_created(self, category: "Category"):
         default_value = None
+        purge_instances_cache_tags([category])
         return self.__run_method_on_plugins("category_created", default_value, category)
 
     def category_updated(self, category: "Category"):
         default_value = None
+        purge_instances_cache_tags([category])
         return self.__run_method_on_plugins("category_updated", default_value, category)
 
     def category_deleted(self, category: "Category"):
         default_value = None
+        purge_instances_cache_tags([category])
         return self.__run_method_on_plugins("category_deleted", default_value, category)
 
     def channel_created(self, channel: "Channel"):
@@ -1494,6 +1563,7 @@ class PluginsManager(PaymentInterface):
                 configuration.description = plugin.PLUGIN_DESCRIPTION
                 plugin.active = configuration.active
                 plugin.configuration = configuration.configuration
+                invalidate_plugins_snapshot()
                 return configuration
 
     def get_plugin(
@@ -16,7 +16,13 @@ from ...graphql.discount.mutations.utils import convert_catalogue_info_to_global
 from ...payment.interface import PaymentGateway
 from ...product.models import Product
 from ..base_plugin import ExternalAccessTokens
-from ..manager import PluginsManager, get_plugins_manager
+from ..manager import (
+    PluginsManager,
+    _plugins_snapshot_cache,
+    get_plugins_manager,
+    get_plugins_snapshot,
+    invalidate_plugins_snapshot,
+)
 from ..models import PluginConfiguration
 from ..tests.sample_plugins import (
     ACTIVE_PLUGINS,
@@ -1210,3 +1216,63 @@ def test_manager_is_event_active_for_any_plugin(channel_USD):
     assert manager.is_event_active_for_any_plugin(
         "calculate_checkout_total", channel_USD.slug
     )
+
+
+def test_get_plugins_snapshot_without_cache(settings, channel_USD):
+    # given
+    settings.PLUGINS_MANAGER_CACHE_ENABLED = False
+    plugins = ["saleor.plugins.tests.sample_plugins.ChannelPluginSample"]
+
+    # when
+    snapshot = get_plugins_snapshot(plugins)
+
+    # then
+    assert snapshot is not get_plugins_snapshot(plugins)
+    assert snapshot.channels == (channel_USD,)
+    assert snapshot.plugin_classes == (
+        (
+            "saleor.plugins.tests.sample_plugins.ChannelPluginSample",
+            ChannelPluginSample,
+        ),
+    )
+
+
+def test_get_plugins_snapshot_is_shared_between_managers(
+    settings, channel_USD, django_assert_num_queries
+):
+    # given
+    settings.PLUGINS_MANAGER_CACHE_ENABLED = True
+    _plugins_snapshot_cache.clear()
+    plugins = [
+        "saleor.plugins.tests.sample_plugins.ChannelPluginSample",
+        "saleor.plugins.tests.sample_plugins.PluginSample",
+    ]
+    PluginsManager(plugins=plugins)
+
+    # when
+    with django_assert_num_queries(0):
+        manager = PluginsManager(plugins=plugins, requestor_getter=lambda: None)
+
+    # then
+    assert len(manager.plugins_per_channel[channel_USD.slug]) == 2
+    assert len(manager.all_plugins) == 2
+
+
+def test_invalidate_plugins_snapshot(
+    settings, channel_USD, channel_PLN, django_capture_on_commit_callbacks
+):
+    # given
+    settings.PLUGINS_MANAGER_CACHE_ENABLED = True
+    _plugins_snapshot_cache.clear()
+    plugins = ["saleor.plugins.tests.sample_plugins.ChannelPluginSample"]
+    snapshot = get_plugins_snapshot(plugins)
+    channel_PLN.delete()
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_plugins_snapshot()
+
+    # then
+    new_snapshot = get_plugins_snapshot(plugins)
+    assert new_snapshot is not snapshot
+    assert new_snapshot.channels == (channel_USD,)
@@ -0,0 +1,132 @@
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import boto3
+import requests
+from django.conf import settings
+from google.cloud import pubsub_v1
+from requests.adapters import HTTPAdapter
+
+
+class WebhookClients:
+    """Connections to webhook targets reused by all deliveries of a process.
+
+    HTTP requests to the same host share a `requests.Session`, which keeps up to
+    `WEBHOOK_CONNECTION_POOL_SIZE` connections alive; connections opened above
+    the limit are closed after use. SQS clients are shared by queues using the
+    same credentials, and a single Pub/Sub publisher serves all topics.
+    Sessions don't store cookies, so responses to one app's webhooks aren't sent
+    back with other apps' deliveries to the same host. Connections aren't
+    inherited by forked processes, e.g. Celery workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sqs_clients: Dict[Tuple[str, Optional[str], Optional[str]], Any] = {}
+        self._pubsub_client: Optional[pubsub_v1.PublisherClient] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.WEBHOOK_CONNECTION_POOL_SIZE > 0
+
+    def _reset_after_fork(self):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._sessions = {}
+            self._sqs_clients = {}
+            self._pubsub_client = None
+
+    def get_http_session(self, target_url: str) -> Optional[requests.Session]:
+        """Return the session of the target host, or `None` if pooling is off."""
+        if not self.enabled:
+            return None
+        parts = urlparse(target_url)
+        port = f":{parts.port}" if parts.port else ""
+        host = f"{parts.scheme.lower()}://{parts.hostname}{port}"
+        with self._lock:
+            self._reset_after_fork()
+            if session := self._sessions.get(host):
+                return session
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=settings.WEBHOOK_CONNECTION_POOL_SIZE
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._sessions[host] = session
+            return session
+
+    def get_sqs_client(
+        self,
+        region: str,
+        access_key_id: Optional[str],
+        secret_access_key: Optional[str],
+    ):
+        if not self.enabled:
+            return self._create_sqs_client(region, access_key_id, secret_access_key)
+        key = (region, access_key_id, secret_access_key)
+        with self._lock:
+            self._reset_after_fork()
+            if (client := self._sqs_clients.get(key)) is None:
+                client = self._create_sqs_client(*key)
+                self._sqs_clients[key] = client
+            return client
+
+    @staticmethod
+    def _create_sqs_client(
+        region: str, access_key_id: Optional[str], secret_access_key: Optional[str]
+    ):
+        return boto3.client(
+            "sqs",
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+
+    def get_pubsub_client(self) -> pubsub_v1.PublisherClient:
+        if not self.enabled:
+            return pubsub_v1.PublisherClient()
+        with self._lock:
+            self._reset_after_fork()
+            if self._pubsub_client is None:
+                self._pubsub_client = pubsub_v1.PublisherClient()
+            return self._pubsub_client
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return usage of the HTTP connection pools, to tune their size.
+
+        For every host it reports the number of requests sent, the connections
+        opened for them and the idle connections kept alive.
+        """
+        http_stats = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+            sqs_clients_count = len(self._sqs_clients)
+            pubsub_client_created = self._pubsub_client is not None
+        for host, session in sessions:
+            stats = {"requests": 0, "connections": 0, "idle_connections": 0}
+            pools = session.get_adapter(host).poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools[pool_key]
+                stats["requests"] += pool.num_requests
+                stats["connections"] += pool.num_connections
+                # the queue of the pool is filled up with `None` placeholders
+                idle_connections = pool.pool.queue if pool.pool else []
+                stats["idle_connections"] += sum(
+                    connection is not None for connection in idle_connections
+                )
+            http_stats[host] = stats
+        return {
+            "http": http_stats,
+            "sqs_clients": sqs_clients_count,
+            "pubsub_client": pubsub_client_created,
+        }
+
+
+webhook_clients = WebhookClients()
@@ -1,3 +1,5 @@
 CACHE_EXCLUDED_SHIPPING_KEY = "webhook_exclude_shipping_id_"
 CACHE_EXCLUDED_SHIPPING_TIME = 60 * 3
 EXCLUDED_SHIPPING_REQUEST_TIMEOUT = 2
+# Event type sent in the headers of batches with events of different types.
+BATCH_EVENT_TYPE = "batch"
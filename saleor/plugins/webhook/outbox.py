@@ -0,0 +1,61 @@
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+
+from django.apps import apps
+from django.db.models import Model
+
+from ...core.models import OutboxEvent
+
+if TYPE_CHECKING:
+    from ...webhook.models import Webhook
+
+
+def get_instance_reference(instance) -> Tuple[str, str]:
+    """Return the model label and the primary key of a saved model instance."""
+    if isinstance(instance, Model) and instance.pk is not None:
+        return instance._meta.label_lower, str(instance.pk)
+    return "", ""
+
+
+def load_instance(model_label: str, pk: str) -> Optional[Model]:
+    if not model_label:
+        return None
+    return apps.get_model(model_label).objects.filter(pk=pk).first()
+
+
+def can_defer_event(
+    event_type: str, webhooks: Iterable["Webhook"], subscribable_object=None
+) -> bool:
+    """Return whether deliveries of the event can be created after the commit.
+
+    Subscription payloads are generated from the object loaded by the dispatcher,
+    so events of deleted objects and of objects which aren't model instances are
+    delivered right away.
+    """
+    if not any(webhook.subscription_query for webhook in webhooks):
+        return True
+    if event_type.endswith("_deleted"):
+        return False
+    object_type, _ = get_instance_reference(subscribable_object)
+    return bool(object_type)
+
+
+def create_outbox_event(
+    data: str,
+    event_type: str,
+    webhooks: Iterable["Webhook"],
+    subscribable_object=None,
+    requestor=None,
+) -> OutboxEvent:
+    webhooks = list(webhooks)
+    object_type, object_id = get_instance_reference(subscribable_object)
+    requestor_type, requestor_id = get_instance_reference(requestor)
+    has_regular_webhooks = any(not webhook.subscription_query for webhook in webhooks)
+    return OutboxEvent.objects.create(
+        event_type=event_type,
+        payload=data if has_regular_webhooks else "",
+        webhook_ids=[webhook.pk for webhook in webhooks],
+        object_type=object_type,
+        object_id=object_id,
+        requestor_type=requestor_type,
+        requestor_id=requestor_id,
+    )
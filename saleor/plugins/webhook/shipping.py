@@ -2,10 +2,9 @@ import base64
 import json
 import logging
 from collections import defaultdict
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 from django.core.cache import cache
-from django.db.models import QuerySet
 from graphql import GraphQLError
 from prices import Money
 
@@ -15,6 +14,7 @@ from ...graphql.core.utils import from_global_id_or_error
 from ...graphql.shipping.types import ShippingMethod
 from ...order.models import Order
 from ...shipping.interface import ShippingMethodData
+from ...webhook.models import Webhook
 from ...webhook.utils import get_webhooks_for_event
 from ..base_plugin import ExcludedShippingMethod
 from .const import CACHE_EXCLUDED_SHIPPING_TIME, EXCLUDED_SHIPPING_REQUEST_TIMEOUT
@@ -88,7 +88,7 @@ def _compare_order_payloads(payload: str, cached_payload: str) -> bool:
 
 
 def get_excluded_shipping_methods_or_fetch(
-    webhooks: QuerySet,
+    webhooks: Iterable["Webhook"],
     event_type: str,
     payload: str,
     cache_key: str,
@@ -3,16 +3,18 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 from json import JSONDecodeError
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from urllib.parse import unquote, urlparse, urlunparse
 
-import boto3
 import requests
 from botocore.exceptions import ClientError
 from celery import group
 from celery.exceptions import MaxRetriesExceededError, Retry
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.urls import reverse
 from google.cloud import pubsub_v1
 from requests.exceptions import RequestException
@@ -20,11 +22,17 @@ from requests.exceptions import RequestException
 from ...app.headers import AppHeaders, DeprecatedAppHeaders
 from ...celeryconf import app
 from ...core import EventDeliveryStatus
-from ...core.models import EventDelivery, EventPayload
+from ...core.models import (
+    EventDelivery,
+    EventDeliveryAttempt,
+    EventPayload,
+    OutboxEvent,
+)
 from ...core.tracing import webhooks_opentracing_trace
 from ...core.utils import build_absolute_uri
 from ...graphql.webhook.subscription_payload import (
     generate_payload_from_subscription,
+    get_subscription_document,
     initialize_request,
 )
 from ...graphql.webhook.subscription_types import WEBHOOK_TYPES_MAP
@@ -32,9 +40,13 @@ from ...payment import PaymentError
 from ...site.models import Site
 from ...webhook import observability
 from ...webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
+from ...webhook.models import Webhook
 from ...webhook.observability import WebhookData
 from ...webhook.utils import get_webhooks_for_event
 from . import signature_for_payload
+from .clients import webhook_clients
+from .const import BATCH_EVENT_TYPE
+from .outbox import can_defer_event, create_outbox_event, load_instance
 from .utils import (
     attempt_update,
     catch_duration_time,
@@ -44,9 +56,6 @@ from .utils import (
     delivery_update,
 )
 
-if TYPE_CHECKING:
-    from ...webhook.models import Webhook
-
 logger = logging.getLogger(__name__)
 task_logger = get_task_logger(__name__)
 
@@ -87,26 +96,35 @@ def create_deliveries_for_subscriptions(
         )
         return []
 
+    request = initialize_request(requestor, event_type in WebhookEventSyncType.ALL)
+    # Payloads depend on the query and on the permissions of the app, so webhooks
+    # of the same app with equal queries share a single payload.
+    payloads: Dict[Tuple[str, int], Optional[EventPayload]] = {}
     event_payloads = []
     event_deliveries = []
     for webhook in webhooks:
-        data = generate_payload_from_subscription(
-            event_type=event_type,
-            subscribable_object=subscribable_object,
-            subscription_query=webhook.subscription_query,
-            request=initialize_request(
-                requestor, event_type in WebhookEventSyncType.ALL
-            ),
-            app=webhook.app,
-        )
-        if not data:
+        document = get_subscription_document(webhook.subscription_query)
+        payload_key = (document.normalized_query_hash, webhook.app_id)
+        if payload_key not in payloads:
+            data = generate_payload_from_subscription(
+                event_type=event_type,
+                subscribable_object=subscribable_object,
+                subscription_query=webhook.subscription_query,
+                request=request,
+                app=webhook.app,
+            )
+            payloads[payload_key] = None
+            if data:
+                payloads[payload_key] = EventPayload(payload=json.dumps({**data}))
+                event_payloads.append(payloads[payload_key])
+
+        event_payload = payloads[payload_key]
+        if event_payload is None:
             logger.warning(
                 "No payload was generated with subscription for event: %s" % event_type
             )
             continue
 
-        event_payload = EventPayload(payload=json.dumps({**data}))
-        event_payloads.append(event_payload)
         event_deliveries.append(
             EventDelivery(
                 status=EventDeliveryStatus.PENDING,
@@ -173,12 +191,31 @@ def trigger_webhooks_async(
 ):
     """Trigger async webhooks - both regular and subscription.
 
+    When `WEBHOOK_OUTBOX_ENABLED` is set, only an outbox event is stored and the
+    deliveries are created by the dispatcher once the transaction is committed.
+
     :param data: used as payload in regular webhooks.
     :param event_type: used in both webhook types as event type.
     :param webhooks: used in both webhook types, queryset of async webhooks.
     :param subscribable_object: subscribable object used in subscription webhooks.
     :param requestor: used in subscription webhooks to generate meta data for payload.
     """
+    if settings.WEBHOOK_OUTBOX_ENABLED and can_defer_event(
+        event_type, webhooks, subscribable_object
+    ):
+        create_outbox_event(data, event_type, webhooks, subscribable_object, requestor)
+        schedule_outbox_dispatch()
+        return
+
+    deliveries = create_deliveries_for_webhooks(
+        data, event_type, webhooks, subscribable_object, requestor
+    )
+    send_deliveries_async(deliveries)
+
+
+def create_deliveries_for_webhooks(
+    data, event_type, webhooks, subscribable_object=None, requestor=None
+) -> List[EventDelivery]:
     regular_webhooks, subscription_webhooks = group_webhooks_by_subscription(webhooks)
     deliveries = []
 
@@ -200,9 +237,15 @@ def trigger_webhooks_async(
                 requestor=requestor,
             )
         )
+    return deliveries
+
 
+def send_deliveries_async(deliveries: List[EventDelivery]):
     for delivery in deliveries:
-        send_webhook_request_async.delay(delivery.id)
+        if delivery.webhook.batch_size > 1:
+            schedule_webhook_batch(delivery.webhook)
+        else:
+            send_webhook_request_async.delay(delivery.id)
 
 
 def group_webhooks_by_subscription(webhooks):
@@ -322,7 +365,8 @@ def send_webhook_using_http(
         AppHeaders.API_URL: build_absolute_uri(reverse("api"), domain),
     }
     try:
-        response = requests.post(
+        session = webhook_clients.get_http_session(target_url)
+        response = (session or requests).post(
             target_url,
             data=message,
             headers=headers,
@@ -357,13 +401,10 @@ def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_typ
     hostname_parts = parts.hostname.split(".")
     if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
         region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=(
-            unquote(parts.password) if parts.password else parts.password
-        ),
+    client = webhook_clients.get_sqs_client(
+        region,
+        parts.username,
+        unquote(parts.password) if parts.password else parts.password,
     )
     queue_url = urlunparse(
         (
@@ -412,7 +453,7 @@ def send_webhook_using_google_cloud_pubsub(
     target_url, message, domain, signature, event_type
 ):
     parts = urlparse(target_url)
-    client = pubsub_v1.PublisherClient()
+    client = webhook_clients.get_pubsub_client()
     topic_name = parts.path[1:]  # drop the leading slash
     with catch_duration_time() as duration:
         try:
@@ -535,6 +576,290 @@ def send_webhook_request_async(self, event_delivery_id):
     clear_successful_delivery(delivery)
 
 
+def get_webhook_batch_cache_key(webhook_id: int) -> str:
+    return f"webhook_batch:{webhook_id}"
+
+
+def schedule_webhook_batch(webhook: "Webhook"):
+    """Send the pending deliveries of the webhook together, after a short delay.
+
+    Only the first delivery in the batch schedules the task; the following ones
+    are picked up by it. The task is scheduled once the current transaction is
+    committed, so a delivery can't be committed after a running task released
+    the batch and claimed the deliveries.
+    """
+    webhook_id = webhook.id
+
+    def schedule():
+        delay = settings.WEBHOOK_BATCH_DELAY_MS / 1000
+        # The key outlives the delay, in case the task is picked up late.
+        if cache.add(get_webhook_batch_cache_key(webhook_id), True, timeout=delay + 60):
+            send_webhook_batch_async.apply_async((webhook_id,), countdown=delay)
+
+    transaction.on_commit(schedule)
+
+
+def claim_pending_deliveries(
+    webhook_id: int, batch_size: int, task_id: Optional[str]
+) -> List[EventDeliveryAttempt]:
+    """Create attempts for the pending deliveries that weren't attempted yet.
+
+    The deliveries are locked until the attempts are committed, so concurrent tasks
+    skip them and the deliveries with attempts aren't claimed again.
+    """
+    with transaction.atomic():
+        deliveries = list(
+            EventDelivery.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                webhook_id=webhook_id,
+                status=EventDeliveryStatus.PENDING,
+                event_type__in=WebhookEventAsyncType.ALL,
+            )
+            .exclude(
+                Exists(EventDeliveryAttempt.objects.filter(delivery_id=OuterRef("pk")))
+            )
+            .select_related("payload")
+            .order_by("pk")[:batch_size]
+        )
+        return [create_attempt(delivery, task_id) for delivery in deliveries]
+
+
+def get_batch_payload(deliveries: List[EventDelivery]) -> str:
+    # The payloads are already serialized, so they're joined into the array as is.
+    items = [
+        f'{{"event_type": {json.dumps(delivery.event_type)}, '
+        f'"payload": {delivery.payload.payload}}}'
+        for delivery in deliveries
+    ]
+    return f"[{', '.join(items)}]"
+
+
+@app.task(
+    queue=settings.WEBHOOK_CELERY_QUEUE_NAME,
+    bind=True,
+    retry_backoff=10,
+    retry_kwargs={"max_retries": 5},
+)
+def send_webhook_batch_async(self, webhook_id, event_delivery_ids=None):
+    """Send a batch of pending deliveries of the webhook in a single request.
+
+    Retries send again the deliveries of the failed batch, given by their IDs.
+    """
+    if event_delivery_ids is None:
+        # The deliveries created from now on are sent by the next batch.
+        cache.delete(get_webhook_batch_cache_key(webhook_id))
+        deliveries = EventDelivery.objects.filter(
+            webhook_id=webhook_id, event_type__in=WebhookEventAsyncType.ALL
+        )
+    else:
+        deliveries = EventDelivery.objects.filter(id__in=event_delivery_ids)
+    deliveries = deliveries.filter(status=EventDeliveryStatus.PENDING)
+    try:
+        webhook = Webhook.objects.select_related("app").get(id=webhook_id)
+    except Webhook.DoesNotExist:
+        logger.error("Webhook id: %r not found", webhook_id)
+        return
+
+    if not webhook.is_active:
+        deliveries.update(status=EventDeliveryStatus.FAILED)
+        logger.info("Webhook id: %r is disabled.", webhook_id)
+        return
+
+    if event_delivery_ids is None:
+        batch_size = max(webhook.batch_size, 1)
+        attempts = claim_pending_deliveries(webhook_id, batch_size, self.request.id)
+        if len(attempts) == batch_size:
+            # More deliveries can be pending; they're sent by the next task.
+            send_webhook_batch_async.delay(webhook_id)
+    else:
+        attempts = [
+            create_attempt(delivery, self.request.id)
+            for delivery in deliveries.select_related("payload")
+        ]
+    if not attempts:
+        return
+
+    deliveries = [attempt.delivery for attempt in attempts]
+    event_types = {delivery.event_type for delivery in deliveries}
+    event_type = event_types.pop() if len(event_types) == 1 else BATCH_EVENT_TYPE
+    domain = Site.objects.get_current().domain
+    delivery_status = EventDeliveryStatus.SUCCESS
+    try:
+        with webhooks_opentracing_trace(event_type, domain, app_name=webhook.app.name):
+            response = send_webhook_using_scheme_method(
+                webhook.target_url,
+                domain,
+                webhook.secret_key,
+                event_type,
+                get_batch_payload(deliveries),
+            )
+    except ValueError as e:
+        response = WebhookResponse(content=str(e), status=EventDeliveryStatus.FAILED)
+        delivery_status = EventDeliveryStatus.FAILED
+    for attempt in attempts:
+        attempt_update(attempt, response)
+
+    if (
+        response.status == EventDeliveryStatus.FAILED
+        and delivery_status == EventDeliveryStatus.SUCCESS
+    ):
+        task_logger.info(
+            "[Webhook ID: %r] Failed request to %r: %r for %r events.",
+            webhook.id,
+            webhook.target_url,
+            response.content,
+            len(deliveries),
+        )
+        try:
+            countdown = self.retry_backoff * (2**self.request.retries)
+            self.retry(
+                args=(webhook.id, [delivery.id for delivery in deliveries]),
+                countdown=countdown,
+                **self.retry_kwargs,
+            )
+        except Retry as retry_error:
+            next_retry = observability.task_next_retry_date(retry_error)
+            for attempt in attempts:
+                observability.report_event_delivery_attempt(attempt, next_retry)
+            raise retry_error
+        except MaxRetriesExceededError:
+            task_logger.warning(
+                "[Webhook ID: %r] Failed request to %r: exceeded retry limit.",
+                webhook.id,
+                webhook.target_url,
+            )
+            delivery_status = EventDeliveryStatus.FAILED
+    elif response.status == EventDeliveryStatus.SUCCESS:
+        task_logger.info(
+            "[Webhook ID:%r] Payload with %r events sent to %r.",
+            webhook.id,
+            len(deliveries),
+            webhook.target_url,
+        )
+    for attempt, delivery in zip(attempts, deliveries):
+        delivery_update(delivery, delivery_status)
+        observability.report_event_delivery_attempt(attempt)
+        clear_successful_delivery(delivery)
+
+
+OUTBOX_DISPATCH_CACHE_KEY = "webhook_outbox_dispatch"
+
+# Number of outbox events whose deliveries are created in a single transaction.
+OUTBOX_DISPATCH_BATCH_SIZE = 100
+
+# Number of times the deliveries of an outbox event are attempted to be created.
+OUTBOX_EVENT_MAX_ATTEMPTS = 5
+
+
+def schedule_outbox_dispatch():
+    """Dispatch the outbox events once the current transaction is committed.
+
+    Only the first event committed while no dispatch is pending schedules the
+    task; the following ones are picked up by it.
+    """
+
+    def dispatch():
+        if cache.add(OUTBOX_DISPATCH_CACHE_KEY, True, timeout=60):
+            dispatch_outbox_events_task.delay()
+
+    transaction.on_commit(dispatch)
+
+
+def create_deliveries_for_outbox_events(
+    events: List[OutboxEvent],
+) -> Tuple[List[EventDelivery], List[OutboxEvent]]:
+    """Create deliveries of the events; return them and the events that failed."""
+    webhook_ids = {webhook_id for event in events for webhook_id in event.webhook_ids}
+    webhooks = (
+        Webhook.objects.filter(is_active=True, app__is_active=True)
+        .select_related("app")
+        .in_bulk(webhook_ids)
+    )
+    deliveries: List[EventDelivery] = []
+    failed_events: List[OutboxEvent] = []
+    for event in events:
+        event_webhooks = [
+            webhooks[webhook_id]
+            for webhook_id in event.webhook_ids
+            if webhook_id in webhooks
+        ]
+        subscribable_object = load_instance(event.object_type, event.object_id)
+        if event.object_type and subscribable_object is None:
+            logger.warning(
+                "Skipping subscription webhooks of outbox event %r: %s %s no "
+                "longer exists.",
+                event.pk,
+                event.object_type,
+                event.object_id,
+            )
+            event_webhooks = [
+                webhook for webhook in event_webhooks if not webhook.subscription_query
+            ]
+        if not event_webhooks:
+            continue
+        try:
+            with transaction.atomic():
+                deliveries.extend(
+                    create_deliveries_for_webhooks(
+                        event.payload,
+                        event.event_type,
+                        event_webhooks,
+                        subscribable_object,
+                        load_instance(event.requestor_type, event.requestor_id),
+                    )
+                )
+        except Exception:
+            logger.exception(
+                "Could not create deliveries of outbox event %r.", event.pk
+            )
+            failed_events.append(event)
+    return deliveries, failed_events
+
+
+@app.task(queue=settings.WEBHOOK_CELERY_QUEUE_NAME)
+def dispatch_outbox_events_task():
+    """Create deliveries of the committed outbox events and send them.
+
+    The events are locked until their deliveries are committed, so concurrent
+    tasks skip them. Events whose deliveries couldn't be created are kept and
+    retried by the periodic run, up to `OUTBOX_EVENT_MAX_ATTEMPTS` times; events
+    left by a failed task are dispatched by it as well.
+    """
+    # The events committed from now on schedule the next task.
+    cache.delete(OUTBOX_DISPATCH_CACHE_KEY)
+    failed_event_ids: List[int] = []
+    while True:
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .exclude(pk__in=failed_event_ids)
+                .order_by("pk")[:OUTBOX_DISPATCH_BATCH_SIZE]
+            )
+            if not events:
+                return
+            deliveries, failed_events = create_deliveries_for_outbox_events(events)
+            retried_events = []
+            for event in failed_events:
+                failed_event_ids.append(event.pk)
+                event.attempts += 1
+                if event.attempts < OUTBOX_EVENT_MAX_ATTEMPTS:
+                    retried_events.append(event)
+                else:
+                    logger.error(
+                        "Outbox event %r dropped after %r failed attempts.",
+                        event.pk,
+                        event.attempts,
+                    )
+            OutboxEvent.objects.bulk_update(retried_events, ["attempts"])
+            retried_event_ids = {event.pk for event in retried_events}
+            OutboxEvent.objects.filter(
+                pk__in=[
+                    event.pk for event in events if event.pk not in retried_event_ids
+                ]
+            ).delete()
+        send_deliveries_async(deliveries)
+
+
 def send_webhook_request_sync(
     app_name, delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT
 ) -> Optional[Dict[Any, Any]]:
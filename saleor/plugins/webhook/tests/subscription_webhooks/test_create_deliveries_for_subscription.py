@@ -7,7 +7,10 @@ from freezegun import freeze_time
 
 from .....channel.models import Channel
 from .....giftcard.models import GiftCard
-from .....graphql.webhook.subscription_payload import validate_subscription_query
+from .....graphql.webhook.subscription_payload import (
+    generate_payload_from_subscription,
+    validate_subscription_query,
+)
 from .....menu.models import Menu, MenuItem
 from .....product.models import Category
 from .....shipping.models import ShippingMethod, ShippingZone
@@ -2145,18 +2148,18 @@ def test_create_deliveries_for_subscriptions_unsubscribable_event(
     assert len(deliveries) == 0
 
 
-@patch("saleor.graphql.webhook.subscription_payload.get_default_backend")
+@patch("saleor.graphql.webhook.subscription_payload.get_subscription_document")
 @patch.object(logger, "warning")
 def test_create_deliveries_for_subscriptions_document_executed_with_error(
     mocked_task_logger,
-    mocked_backend,
+    mocked_get_document,
     product,
     subscription_product_updated_webhook,
 ):
     # given
     webhooks = [subscription_product_updated_webhook]
     event_type = WebhookEventAsyncType.ORDER_CREATED
-    mocked_backend.document_from_string.execute.errors = "errors"
+    mocked_get_document.return_value.document.execute.return_value.errors = "errors"
     # when
     deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
     # then
@@ -2166,6 +2169,46 @@ def test_create_deliveries_for_subscriptions_document_executed_with_error(
     assert len(deliveries) == 0
 
 
+@patch(
+    "saleor.plugins.webhook.tasks.generate_payload_from_subscription",
+    wraps=generate_payload_from_subscription,
+)
+def test_create_deliveries_for_subscriptions_share_payload_of_equal_queries(
+    mocked_generate_payload,
+    product,
+    subscription_product_updated_webhook,
+    subscription_webhook,
+    app,
+):
+    # given
+    reformatted_query_webhook = subscription_webhook(
+        " ".join(subscription_queries.PRODUCT_UPDATED.split()),
+        WebhookEventAsyncType.PRODUCT_UPDATED,
+    )
+    other_app_webhook = app.webhooks.create(
+        target_url="http://www.example.com/any",
+        subscription_query=subscription_queries.PRODUCT_UPDATED,
+    )
+    webhooks = [
+        subscription_product_updated_webhook,
+        reformatted_query_webhook,
+        other_app_webhook,
+    ]
+    event_type = WebhookEventAsyncType.PRODUCT_UPDATED
+    product_id = graphene.Node.to_global_id("Product", product.id)
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(event_type, product, webhooks)
+
+    # then
+    expected_payload = json.dumps({"product": {"id": product_id}})
+    assert mocked_generate_payload.call_count == 2
+    assert [delivery.webhook for delivery in deliveries] == webhooks
+    assert all(delivery.payload.payload == expected_payload for delivery in deliveries)
+    assert deliveries[0].payload_id == deliveries[1].payload_id
+    assert deliveries[0].payload_id != deliveries[2].payload_id
+
+
 def test_validate_subscription_query_valid():
     result = validate_subscription_query(
         subscription_queries.TEST_VALID_SUBSCRIPTION_QUERY
@@ -1227,7 +1227,7 @@ def test_create_event_payload_reference_with_error(
     mocked_client_constructor = MagicMock(spec=boto3.client, return_value=mocked_client)
 
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.boto3.client",
+        "saleor.plugins.webhook.clients.boto3.client",
         mocked_client_constructor,
     )
 
@@ -0,0 +1,75 @@
+from http.client import HTTPMessage
+from unittest.mock import MagicMock, patch
+
+import requests
+from requests.cookies import MockRequest, MockResponse
+
+from ..clients import WebhookClients
+
+
+def test_get_http_session_reused_for_host(settings):
+    # given
+    settings.WEBHOOK_CONNECTION_POOL_SIZE = 5
+    clients = WebhookClients()
+
+    # when
+    session = clients.get_http_session("https://example.com/first/")
+    same_host_session = clients.get_http_session("https://EXAMPLE.com/second/")
+    other_host_session = clients.get_http_session("https://example.org/")
+
+    # then
+    assert session is same_host_session
+    assert session is not other_host_session
+    adapter = session.get_adapter("https://example.com/")
+    assert adapter._pool_maxsize == 5
+    assert clients.get_stats()["http"] == {
+        "https://example.com": {"requests": 0, "connections": 0, "idle_connections": 0},
+        "https://example.org": {"requests": 0, "connections": 0, "idle_connections": 0},
+    }
+
+
+def test_get_http_session_doesnt_store_cookies(settings):
+    # given
+    settings.WEBHOOK_CONNECTION_POOL_SIZE = 5
+    clients = WebhookClients()
+    session = clients.get_http_session("https://example.com/")
+    request = requests.Request("POST", "https://example.com/webhook/").prepare()
+    headers = HTTPMessage()
+    headers["Set-Cookie"] = "sessionid=secret; Path=/"
+
+    # when
+    session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+
+    # then
+    assert not session.cookies
+
+
+def test_get_http_session_pooling_disabled(settings):
+    # given
+    settings.WEBHOOK_CONNECTION_POOL_SIZE = 0
+    clients = WebhookClients()
+
+    # when
+    session = clients.get_http_session("https://example.com/")
+
+    # then
+    assert session is None
+
+
+@patch("saleor.plugins.webhook.clients.boto3.client")
+def test_get_sqs_client_reused_for_credentials(client_mock, settings):
+    # given
+    settings.WEBHOOK_CONNECTION_POOL_SIZE = 5
+    client_mock.side_effect = lambda *args, **kwargs: MagicMock()
+    clients = WebhookClients()
+
+    # when
+    client = clients.get_sqs_client("us-east-1", "key", "secret")
+    same_client = clients.get_sqs_client("us-east-1", "key", "secret")
+    other_client = clients.get_sqs_client("eu-west-1", "key", "secret")
+
+    # then
+    assert client is same_client
+    assert client is not other_client
+    assert client_mock.call_count == 2
+    assert clients.get_stats()["sqs_clients"] == 2
@@ -1,9 +1,22 @@
+import json
+from unittest.mock import patch
+
 import pytest
+from django.db import transaction
 
 from ....app.models import App
-from ....webhook.event_types import WebhookEventAsyncType
+from ....core import EventDeliveryStatus
+from ....core.models import EventDelivery, EventPayload, OutboxEvent
+from ....webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
 from ....webhook.models import Webhook, WebhookEvent
 from ....webhook.utils import get_webhooks_for_event
+from ..tasks import (
+    WebhookResponse,
+    claim_pending_deliveries,
+    dispatch_outbox_events_task,
+    send_webhook_batch_async,
+    trigger_webhooks_async,
+)
 
 
 @pytest.fixture
@@ -33,3 +46,161 @@ def test_get_webhooks_for_event_webhook_ordering(webhooks_factory):
         assert prev_webhook.app_id <= next_webhook.app_id
         if prev_webhook.app_id == next_webhook.app_id:
             assert prev_webhook.pk < next_webhook.pk
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request_async.delay")
+@patch("saleor.plugins.webhook.tasks.send_webhook_batch_async.apply_async")
+def test_trigger_webhooks_async_batched_webhook(
+    mocked_batch_task,
+    mocked_task,
+    webhook,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.WEBHOOK_BATCH_DELAY_MS = 200
+    webhook.batch_size = 10
+    webhook.save(update_fields=["batch_size"])
+    event_type = WebhookEventAsyncType.ORDER_CREATED
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        trigger_webhooks_async('{"id": 1}', event_type, [webhook])
+        trigger_webhooks_async('{"id": 2}', event_type, [webhook])
+        batch_scheduled_before_commit = mocked_batch_task.called
+
+    # then
+    assert not batch_scheduled_before_commit
+    assert len(callbacks) == 2
+    mocked_task.assert_not_called()
+    mocked_batch_task.assert_called_once_with((webhook.id,), countdown=0.2)
+    assert EventDelivery.objects.filter(webhook=webhook).count() == 2
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_batch_async.delay")
+@patch("saleor.plugins.webhook.tasks.send_webhook_using_scheme_method")
+def test_send_webhook_batch_async(mocked_send, mocked_next_batch, webhook):
+    # given
+    mocked_send.return_value = WebhookResponse(content="")
+    webhook.batch_size = 2
+    webhook.save(update_fields=["batch_size"])
+    event_type = WebhookEventAsyncType.ORDER_CREATED
+    with patch("saleor.plugins.webhook.tasks.schedule_webhook_batch"):
+        for i in range(3):
+            trigger_webhooks_async(json.dumps([{"id": i}]), event_type, [webhook])
+
+    # when
+    send_webhook_batch_async(webhook.id)
+
+    # then
+    mocked_send.assert_called_once()
+    target_url, _, _, sent_event_type, data = mocked_send.call_args.args
+    assert sent_event_type == event_type
+    assert json.loads(data) == [
+        {"event_type": event_type, "payload": [{"id": 0}]},
+        {"event_type": event_type, "payload": [{"id": 1}]},
+    ]
+    mocked_next_batch.assert_called_once_with(webhook.id)
+    pending_delivery = EventDelivery.objects.get()
+    assert pending_delivery.status == EventDeliveryStatus.PENDING
+    assert not pending_delivery.attempts.exists()
+
+
+def test_claim_pending_deliveries_skips_sync_events(webhook):
+    # given
+    payload = EventPayload.objects.create(payload="{}")
+    async_delivery, sync_delivery = EventDelivery.objects.bulk_create(
+        [
+            EventDelivery(
+                event_type=event_type,
+                payload=payload,
+                webhook=webhook,
+                status=EventDeliveryStatus.PENDING,
+            )
+            for event_type in [
+                WebhookEventAsyncType.ORDER_CREATED,
+                WebhookEventSyncType.PAYMENT_AUTHORIZE,
+            ]
+        ]
+    )
+
+    # when
+    attempts = claim_pending_deliveries(webhook.id, 10, None)
+
+    # then
+    assert [attempt.delivery for attempt in attempts] == [async_delivery]
+    assert not sync_delivery.attempts.exists()
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request_async.delay")
+@patch("saleor.plugins.webhook.tasks.dispatch_outbox_events_task.delay")
+def test_trigger_webhooks_async_with_outbox(
+    mocked_dispatch,
+    mocked_send,
+    webhook,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.WEBHOOK_OUTBOX_ENABLED = True
+    event_type = WebhookEventAsyncType.ORDER_CREATED
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        trigger_webhooks_async('{"id": 1}', event_type, [webhook])
+    event_delivery_created = EventDelivery.objects.exists()
+    dispatch_outbox_events_task()
+
+    # then
+    assert not event_delivery_created
+    mocked_dispatch.assert_called_once_with()
+    delivery = EventDelivery.objects.get()
+    assert delivery.webhook == webhook
+    assert delivery.event_type == event_type
+    assert delivery.payload.payload == '{"id": 1}'
+    mocked_send.assert_called_once_with(delivery.id)
+    assert not OutboxEvent.objects.exists()
+
+
+@patch("saleor.plugins.webhook.tasks.dispatch_outbox_events_task.delay")
+def test_trigger_webhooks_async_with_outbox_rolled_back(
+    mocked_dispatch, webhook, settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.WEBHOOK_OUTBOX_ENABLED = True
+    event_type = WebhookEventAsyncType.ORDER_CREATED
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(ValueError):
+            with transaction.atomic():
+                trigger_webhooks_async('{"id": 1}', event_type, [webhook])
+                raise ValueError()
+
+    # then
+    mocked_dispatch.assert_not_called()
+    assert not OutboxEvent.objects.exists()
+    assert not EventDelivery.objects.exists()
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request_async.delay")
+@patch("saleor.plugins.webhook.tasks.dispatch_outbox_events_task.delay")
+def test_dispatch_outbox_events_task_keeps_failed_event(
+    mocked_dispatch, mocked_send, webhook, settings
+):
+    # given
+    settings.WEBHOOK_OUTBOX_ENABLED = True
+    trigger_webhooks_async('{"id": 1}', WebhookEventAsyncType.ORDER_CREATED, [webhook])
+
+    # when
+    with patch(
+        "saleor.plugins.webhook.tasks.create_deliveries_for_webhooks",
+        side_effect=ValueError(),
+    ):
+        dispatch_outbox_events_task()
+
+    # then
+    event = OutboxEvent.objects.get()
+    assert event.attempts == 1
+    assert not EventDelivery.objects.exists()
+    mocked_send.assert_not_called()
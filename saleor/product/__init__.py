@@ -19,3 +19,23 @@ class ProductTypeKind:
         (NORMAL, "A standard product type."),
         (GIFT_CARD, "A gift card product type."),
     ]
+
+
+class ProductSearchIndexChangeSource:
+    """Parts of the product data indexed in the search vector."""
+
+    NAME = "name"
+    DESCRIPTION = "description"
+    VARIANTS = "variants"
+    ATTRIBUTES = "attributes"
+    ATTRIBUTE_VALUE = "attribute_value"
+    ALL = "all"
+
+    CHOICES = [
+        (NAME, "Product name."),
+        (DESCRIPTION, "Product description."),
+        (VARIANTS, "Variants of the product."),
+        (ATTRIBUTES, "Attributes of the product and its variants."),
+        (ATTRIBUTE_VALUE, "Attribute value assigned to products or variants."),
+        (ALL, "All indexed product data."),
+    ]
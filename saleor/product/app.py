@@ -1,16 +1,24 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 
 
 class ProductAppConfig(AppConfig):
     name = "saleor.product"
 
     def ready(self):
-        from .models import Category, Collection, DigitalContent, ProductMedia
+        from .models import (
+            Category,
+            CategoryTranslation,
+            Collection,
+            DigitalContent,
+            ProductMedia,
+        )
         from .signals import (
             delete_background_image,
             delete_digital_content_file,
             delete_product_media_image,
+            invalidate_category_discounts,
+            invalidate_category_tree,
         )
 
         # preventing duplicate signals
@@ -34,3 +42,15 @@ class ProductAppConfig(AppConfig):
             sender=DigitalContent,
             dispatch_uid="delete_digital_content_file",
         )
+        for signal in [post_save, post_delete]:
+            for model in [Category, CategoryTranslation]:
+                signal.connect(
+                    invalidate_category_tree,
+                    sender=model,
+                    dispatch_uid=f"invalidate_category_tree_{model.__name__}",
+                )
+            signal.connect(
+                invalidate_category_discounts,
+                sender=Category,
+                dispatch_uid="invalidate_category_discounts",
+            )
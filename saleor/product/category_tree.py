@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+
+from ..core.utils.flat_tree import FlatTree
+from ..core.utils.versioned_cache import VersionedMemoryCache
+from .models import Category, CategoryTranslation
+
+CATEGORY_TREE_CACHE_VERSION_KEY = "category_tree_version"
+
+
+@dataclass
+class CategoryTreeSnapshot:
+    categories: FlatTree[Category]
+    translations: Dict[Tuple[int, str], CategoryTranslation]
+
+
+_category_tree_snapshot_cache: VersionedMemoryCache[
+    CategoryTreeSnapshot
+] = VersionedMemoryCache(CATEGORY_TREE_CACHE_VERSION_KEY)
+
+
+def build_category_tree_snapshot() -> CategoryTreeSnapshot:
+    return CategoryTreeSnapshot(
+        categories=FlatTree(Category.objects.order_by("tree_id", "lft")),
+        translations={
+            (translation.category_id, translation.language_code): translation
+            for translation in CategoryTranslation.objects.all()
+        },
+    )
+
+
+def get_category_tree_snapshot() -> CategoryTreeSnapshot:
+    """Return the category tree shared by the whole process."""
+    return _category_tree_snapshot_cache.get_or_build(
+        CATEGORY_TREE_CACHE_VERSION_KEY, build_category_tree_snapshot
+    )
+
+
+def invalidate_category_tree_cache():
+    """Make all workers rebuild the category tree once the transaction commits."""
+    _category_tree_snapshot_cache.invalidate()
+
+
+def get_category_subtree_ids(category: Category) -> List[int]:
+    """Return IDs of the category and all its descendants.
+
+    With `settings.NAVIGATION_CACHE_ENABLED`, the IDs are taken from the category
+    tree shared by the whole process, when the category is already in it.
+    """
+    if settings.NAVIGATION_CACHE_ENABLED:
+        snapshot = get_category_tree_snapshot()
+        # categories created in the current transaction aren't in the snapshot yet
+        if subtree_ids := snapshot.categories.get_subtree_ids(category.pk):
+            return subtree_ids
+    return list(
+        category.get_descendants(include_self=True).values_list("pk", flat=True)
+    )
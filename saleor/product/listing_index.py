@@ -0,0 +1,291 @@
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Greatest
+
+from ..attribute.models import (
+    AssignedProductAttributeValue,
+    AssignedVariantAttributeValue,
+)
+from ..channel.models import Channel
+from ..warehouse.models import Stock
+from .models import (
+    CollectionProduct,
+    Product,
+    ProductChannelListing,
+    ProductListingIndex,
+    ProductVariantChannelListing,
+)
+
+LISTING_INDEX_BATCH_SIZE = 500
+
+
+def mark_products_listing_index_dirty(product_ids: Iterable[int]):
+    """Mark products whose listing index has to be rebuilt.
+
+    Products that are already marked are not updated again, so frequent changes,
+    like stock allocations, don't write to the product rows.
+    """
+    if not settings.PRODUCT_LISTING_INDEX_ENABLED:
+        return
+    Product.objects.filter(id__in=product_ids, listing_index_dirty=False).update(
+        listing_index_dirty=True
+    )
+
+
+def mark_products_listing_index_dirty_on_commit(product_ids: Iterable[int]):
+    """Mark products whose listing index has to be rebuilt once the transaction commits.
+
+    Used by stock changes, so the product rows aren't locked for the rest of
+    the allocation transactions.
+    """
+    if not settings.PRODUCT_LISTING_INDEX_ENABLED:
+        return
+    product_ids = list(product_ids)
+    transaction.on_commit(lambda: mark_products_listing_index_dirty(product_ids))
+
+
+def update_dirty_products_listing_index(batch_size=LISTING_INDEX_BATCH_SIZE) -> int:
+    """Rebuild the listing index of a batch of marked products.
+
+    Products are unmarked before their data is read, so changes made while the
+    index is being rebuilt mark them again. Return the number of updated products.
+    """
+    with transaction.atomic():
+        product_ids = list(
+            Product.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(listing_index_dirty=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        Product.objects.filter(pk__in=product_ids).update(listing_index_dirty=False)
+    try:
+        update_products_listing_index(product_ids)
+    except Exception:
+        Product.objects.filter(pk__in=product_ids).update(listing_index_dirty=True)
+        raise
+    return len(product_ids)
+
+
+def update_products_listing_index(product_ids: List[int]):
+    """Rebuild the listing index rows of the given products in all their channels."""
+    for start in range(0, len(product_ids), LISTING_INDEX_BATCH_SIZE):
+        _update_products_listing_index(
+            product_ids[start : start + LISTING_INDEX_BATCH_SIZE]  # noqa: E203
+        )
+
+
+def _update_products_listing_index(product_ids: List[int]):
+    categories = dict(
+        Product.objects.filter(id__in=product_ids)
+        .order_by()
+        .values_list("id", "category_id")
+    )
+    existing_product_ids = list(categories)
+    listings = list(
+        ProductChannelListing.objects.filter(product_id__in=existing_product_ids)
+        .order_by()
+        .values_list(
+            "product_id",
+            "channel_id",
+            "is_published",
+            "published_at",
+            "visible_in_listings",
+            "available_for_purchase_at",
+            "discounted_price_amount",
+        )
+    )
+    channel_ids = {listing[1] for listing in listings}
+    prices = _get_variant_prices(existing_product_ids)
+    quantities = _get_available_quantities(existing_product_ids, channel_ids)
+    collection_ids = _get_collection_ids(existing_product_ids)
+    attribute_value_ids = _get_attribute_value_ids(existing_product_ids)
+
+    indexes = []
+    for (
+        product_id,
+        channel_id,
+        is_published,
+        published_at,
+        visible_in_listings,
+        available_for_purchase_at,
+        discounted_price_amount,
+    ) in listings:
+        min_price, max_price, without_price_count = prices.get(
+            (product_id, channel_id), (None, None, 0)
+        )
+        indexes.append(
+            ProductListingIndex(
+                product_id=product_id,
+                channel_id=channel_id,
+                category_id=categories[product_id],
+                is_published=is_published,
+                published_at=published_at,
+                visible_in_listings=visible_in_listings,
+                available_for_purchase_at=available_for_purchase_at,
+                discounted_price_amount=discounted_price_amount,
+                min_variant_price_amount=min_price,
+                max_variant_price_amount=max_price,
+                has_variants_without_price=bool(without_price_count),
+                quantity_available=quantities.get((product_id, channel_id), 0),
+                collection_ids=sorted(collection_ids[product_id]),
+                attribute_value_ids=sorted(attribute_value_ids[product_id]),
+            )
+        )
+
+    with transaction.atomic():
+        ProductListingIndex.objects.filter(product_id__in=product_ids).delete()
+        ProductListingIndex.objects.bulk_create(indexes)
+
+
+def _get_variant_prices(product_ids: List[int]):
+    rows = (
+        ProductVariantChannelListing.objects.filter(variant__product_id__in=product_ids)
+        .order_by()
+        .values("variant__product_id", "channel_id")
+        .annotate(
+            min_price=Min("price_amount"),
+            max_price=Max("price_amount"),
+            without_price_count=Count("id", filter=Q(price_amount__isnull=True)),
+        )
+    )
+    return {
+        (row["variant__product_id"], row["channel_id"]): (
+            row["min_price"],
+            row["max_price"],
+            row["without_price_count"],
+        )
+        for row in rows
+    }
+
+
+def _get_available_quantities(
+    product_ids: List[int], channel_ids: Set[int]
+) -> Dict[Tuple[int, int], int]:
+    quantities = {}
+    for channel_id, channel_slug in Channel.objects.filter(
+        id__in=channel_ids
+    ).values_list("id", "slug"):
+        rows = (
+            Stock.objects.for_channel_and_country(channel_slug)
+            .filter(product_variant__product_id__in=product_ids)
+            .order_by()
+            .values("product_variant__product_id")
+            .annotate(
+                quantity_available=Sum(
+                    Greatest(F("quantity") - F("quantity_allocated"), Value(0))
+                )
+            )
+        )
+        for row in rows:
+            product_id = row["product_variant__product_id"]
+            quantities[(product_id, channel_id)] = row["quantity_available"] or 0
+    return quantities
+
+
+def _get_collection_ids(product_ids: List[int]) -> DefaultDict[int, Set[int]]:
+    collection_ids: DefaultDict[int, Set[int]] = defaultdict(set)
+    rows = (
+        CollectionProduct.objects.filter(product_id__in=product_ids)
+        .order_by()
+        .values_list("product_id", "collection_id")
+    )
+    for product_id, collection_id in rows:
+        collection_ids[product_id].add(collection_id)
+    return collection_ids
+
+
+def _get_attribute_value_ids(product_ids: List[int]) -> DefaultDict[int, Set[int]]:
+    attribute_value_ids: DefaultDict[int, Set[int]] = defaultdict(set)
+    product_values = (
+        AssignedProductAttributeValue.objects.filter(
+            assignment__product_id__in=product_ids
+        )
+        .order_by()
+        .values_list("assignment__product_id", "value_id")
+    )
+    variant_values = (
+        AssignedVariantAttributeValue.objects.filter(
+            assignment__variant__product_id__in=product_ids
+        )
+        .order_by()
+        .values_list("assignment__variant__product_id", "value_id")
+    )
+    for product_id, value_id in product_values.union(variant_values):
+        attribute_value_ids[product_id].add(value_id)
+    return attribute_value_ids
+
+
+def get_attribute_value_counts(
+    products: QuerySet, channel_slug: Optional[str]
+) -> Dict[int, int]:
+    """Return the number of the given products with each attribute value.
+
+    Products listed in the channel are counted from their listing index when it's
+    enabled, in a single aggregation over the indexed attribute value IDs. The
+    attribute assignments of the remaining products are counted directly.
+    """
+    products = products.order_by()
+    counts: DefaultDict[int, int] = defaultdict(int)
+    if settings.PRODUCT_LISTING_INDEX_ENABLED and channel_slug:
+        channels = Channel.objects.filter(slug=channel_slug).values("pk")
+        indexes = ProductListingIndex.objects.filter(
+            Exists(channels.filter(pk=OuterRef("channel_id")))
+        )
+        index_ids = indexes.filter(product_id__in=products.values("pk")).values("pk")
+        index_ids_sql, params = index_ids.query.sql_with_params()
+        # Set-returning functions aren't allowed in GROUP BY, so the values are
+        # unnested in a lateral join and aggregated outside of it.
+        meta = ProductListingIndex._meta
+        with connections[index_ids.db].cursor() as cursor:
+            cursor.execute(
+                f"SELECT value_id, COUNT(*) "
+                f"FROM {meta.db_table} AS listing_index, "
+                f"unnest(listing_index.attribute_value_ids) AS value_id "
+                f"WHERE listing_index.{meta.pk.column} IN ({index_ids_sql}) "
+                f"GROUP BY value_id",
+                params,
+            )
+            rows = cursor.fetchall()
+        for value_id, count in rows:
+            counts[value_id] += count
+        products = products.exclude(Exists(indexes.filter(product_id=OuterRef("pk"))))
+
+    # An attribute is assigned either to products or to variants of a product type,
+    # so a product is never counted twice for the same value.
+    product_rows = (
+        AssignedProductAttributeValue.objects.filter(
+            assignment__product_id__in=products.values("pk")
+        )
+        .order_by()
+        .values("value_id")
+        .annotate(count=Count("assignment__product_id", distinct=True))
+        .values_list("value_id", "count")
+    )
+    variant_rows = (
+        AssignedVariantAttributeValue.objects.filter(
+            assignment__variant__product_id__in=products.values("pk")
+        )
+        .order_by()
+        .values("value_id")
+        .annotate(count=Count("assignment__variant__product_id", distinct=True))
+        .values_list("value_id", "count")
+    )
+    for rows in (product_rows, variant_rows):
+        for value_id, count in rows:
+            counts[value_id] += count
+    return counts
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from ...listing_index import LISTING_INDEX_BATCH_SIZE, update_products_listing_index
+from ...models import Product
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the listing index of all the products in all channels."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Updating the listing index of all the products.")
+        product_ids = list(Product.objects.order_by("pk").values_list("pk", flat=True))
+        for start in range(0, len(product_ids), LISTING_INDEX_BATCH_SIZE):
+            batch = product_ids[start : start + LISTING_INDEX_BATCH_SIZE]  # noqa: E203
+            update_products_listing_index(batch)
+            self.stdout.write(f"Updated products up to PK: {batch[-1]}")
@@ -0,0 +1,87 @@
+# Generated by Django 3.2.16 on 2022-10-24 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attribute", "0026_merge_20221019_0937"),
+        ("product", "0176_merge_20221007_1324"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSearchIndexChange",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("name", "Product name."),
+                            ("description", "Product description."),
+                            ("variants", "Variants of the product."),
+                            (
+                                "attributes",
+                                "Attributes of the product and its variants.",
+                            ),
+                            (
+                                "attribute_value",
+                                "Attribute value assigned to products or variants.",
+                            ),
+                            ("all", "All indexed product data."),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "attribute_value",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="attribute.attributevalue",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_index_changes",
+                        to="product.product",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("pk",),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="productsearchindexchange",
+            constraint=models.UniqueConstraint(
+                fields=("product", "source"),
+                name="unique_product_search_index_change",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productsearchindexchange",
+            constraint=models.UniqueConstraint(
+                fields=("attribute_value",),
+                name="unique_attribute_value_search_index_change",
+            ),
+        ),
+    ]
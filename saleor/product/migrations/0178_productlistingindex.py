@@ -0,0 +1,132 @@
+# Generated by Django 3.2.16 on 2022-10-26 08:41
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channel", "0005_channel_allocation_strategy"),
+        ("product", "0177_productsearchindexchange"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="listing_index_dirty",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.CreateModel(
+            name="ProductListingIndex",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("is_published", models.BooleanField(default=False)),
+                ("published_at", models.DateTimeField(blank=True, null=True)),
+                ("visible_in_listings", models.BooleanField(default=False)),
+                (
+                    "available_for_purchase_at",
+                    models.DateTimeField(blank=True, null=True),
+                ),
+                (
+                    "discounted_price_amount",
+                    models.DecimalField(
+                        blank=True, decimal_places=3, max_digits=12, null=True
+                    ),
+                ),
+                (
+                    "min_variant_price_amount",
+                    models.DecimalField(
+                        blank=True, decimal_places=3, max_digits=12, null=True
+                    ),
+                ),
+                (
+                    "max_variant_price_amount",
+                    models.DecimalField(
+                        blank=True, decimal_places=3, max_digits=12, null=True
+                    ),
+                ),
+                ("has_variants_without_price", models.BooleanField(default=False)),
+                ("quantity_available", models.IntegerField(default=0)),
+                (
+                    "collection_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "attribute_value_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), default=list, size=None
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="product.category",
+                    ),
+                ),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="channel.channel",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listing_indexes",
+                        to="product.product",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("pk",),
+                "unique_together": {("channel", "product")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="productlistingindex",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["min_variant_price_amount"],
+                name="listing_index_min_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productlistingindex",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["discounted_price_amount"],
+                name="listing_index_discounted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productlistingindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["collection_ids"], name="listing_index_collections_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productlistingindex",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["attribute_value_ids"], name="listing_index_attributes_gin"
+            ),
+        ),
+    ]
@@ -6,6 +6,7 @@ import graphene
 import pytz
 from django.conf import settings
 from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.indexes import BTreeIndex, GinIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
@@ -57,7 +58,7 @@ from ..core.weight import zero_weight
 from ..discount import DiscountInfo
 from ..discount.utils import calculate_discounted_price
 from ..seo.models import SeoModel, SeoModelTranslation
-from . import ProductMediaTypes, ProductTypeKind
+from . import ProductMediaTypes, ProductSearchIndexChangeSource, ProductTypeKind
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -397,6 +398,7 @@ class Product(SeoModel, ModelWithMetadata):
     search_document = models.TextField(blank=True, default="")
     search_vector = SearchVectorField(blank=True, null=True)
     search_index_dirty = models.BooleanField(default=False, db_index=True)
+    listing_index_dirty = models.BooleanField(default=False, db_index=True)
 
     category = models.ForeignKey(
         Category,
@@ -508,6 +510,46 @@ class ProductTranslation(SeoModelTranslation):
         return translated_keys
 
 
+class ProductSearchIndexChange(models.Model):
+    """Pending change of the product data indexed in the search vector.
+
+    Changes are coalesced per product and source. A change of an attribute value
+    is recorded once and expanded to the products using the value by the indexer.
+    """
+
+    product = models.ForeignKey(
+        Product,
+        null=True,
+        blank=True,
+        related_name="search_index_changes",
+        on_delete=models.CASCADE,
+    )
+    attribute_value = models.ForeignKey(
+        "attribute.AttributeValue",
+        null=True,
+        blank=True,
+        related_name="+",
+        on_delete=models.CASCADE,
+    )
+    source = models.CharField(
+        max_length=32, choices=ProductSearchIndexChangeSource.CHOICES
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("pk",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "source"],
+                name="unique_product_search_index_change",
+            ),
+            models.UniqueConstraint(
+                fields=["attribute_value"],
+                name="unique_attribute_value_search_index_change",
+            ),
+        ]
+
+
 class ProductVariantQueryset(models.QuerySet):
     def annotate_quantities(self):
         return self.annotate(
@@ -574,6 +616,68 @@ class ProductChannelListing(PublishableModel):
         )
 
 
+class ProductListingIndex(models.Model):
+    """Denormalized listing of a product in a channel used by the product filters.
+
+    Rows are rebuilt for products marked with `listing_index_dirty`. The data comes
+    from the product, its channel listings, variant channel listings, stocks,
+    collections and assigned attribute values.
+    """
+
+    product = models.ForeignKey(
+        Product, related_name="listing_indexes", on_delete=models.CASCADE
+    )
+    channel = models.ForeignKey(Channel, related_name="+", on_delete=models.CASCADE)
+    category = models.ForeignKey(
+        Category, null=True, blank=True, related_name="+", on_delete=models.SET_NULL
+    )
+    is_published = models.BooleanField(default=False)
+    published_at = models.DateTimeField(blank=True, null=True)
+    visible_in_listings = models.BooleanField(default=False)
+    available_for_purchase_at = models.DateTimeField(blank=True, null=True)
+    discounted_price_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        blank=True,
+        null=True,
+    )
+    min_variant_price_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        blank=True,
+        null=True,
+    )
+    max_variant_price_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        blank=True,
+        null=True,
+    )
+    has_variants_without_price = models.BooleanField(default=False)
+    quantity_available = models.IntegerField(default=0)
+    collection_ids = ArrayField(models.IntegerField(), default=list)
+    attribute_value_ids = ArrayField(models.IntegerField(), default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [["channel", "product"]]
+        ordering = ("pk",)
+        indexes = [
+            BTreeIndex(
+                name="listing_index_min_price_idx",
+                fields=["min_variant_price_amount"],
+            ),
+            BTreeIndex(
+                name="listing_index_discounted_idx",
+                fields=["discounted_price_amount"],
+            ),
+            GinIndex(name="listing_index_collections_gin", fields=["collection_ids"]),
+            GinIndex(
+                name="listing_index_attributes_gin", fields=["attribute_value_ids"]
+            ),
+        ]
+
+
 class ProductVariant(SortableModel, ModelWithMetadata):
     sku = models.CharField(max_length=255, unique=True, null=True, blank=True)
     name = models.CharField(max_length=255, blank=True)
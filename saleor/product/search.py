@@ -1,15 +1,36 @@
-from typing import TYPE_CHECKING, List
+from collections import defaultdict
+from itertools import islice
+from typing import TYPE_CHECKING, DefaultDict, Dict, Iterable, List, Optional, Set
 
 from django.conf import settings
 from django.contrib.postgres.search import SearchQuery, SearchRank
-from django.db.models import F, Q, Value, prefetch_related_objects
+from django.db import transaction
+from django.db.models import (
+    BooleanField,
+    ExpressionWrapper,
+    F,
+    Q,
+    Value,
+    prefetch_related_objects,
+)
 
 from ..attribute import AttributeInputType
-from ..core.postgres import FlatConcatSearchVector, NoValidationSearchVector
+from ..attribute.models import (
+    AssignedProductAttributeValue,
+    AssignedVariantAttributeValue,
+)
+from ..core.postgres import (
+    FilterSearchVectorWeights,
+    FlatConcatSearchVector,
+    NoValidationSearchVector,
+)
 from ..core.utils.editorjs import clean_editor_js
-from .models import Product
+from . import ProductSearchIndexChangeSource
+from .models import Product, ProductSearchIndexChange, ProductVariant
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from django.db.models import QuerySet
 
 PRODUCT_SEARCH_FIELDS = ["name", "description_plaintext"]
@@ -26,6 +47,22 @@ PRODUCTS_BATCH_SIZE = 300
 # update task on a large dataset and measuring the total time, memory usage
 # and time of a single SQL statement.
 
+# Changed products are indexed from flat rows without prefetching whole objects,
+# so a batch can be larger.
+SEARCH_INDEX_CHANGES_BATCH_SIZE = 1000
+ATTRIBUTE_VALUE_CHANGES_BATCH_SIZE = 10
+
+# Weights of the search vector parts: the product name and variants are indexed
+# with weight A, attributes with weight B and the description with weight C.
+SEARCH_VECTOR_WEIGHTS = {"A", "B", "C"}
+SOURCE_SEARCH_VECTOR_WEIGHTS = {
+    ProductSearchIndexChangeSource.NAME: {"A"},
+    ProductSearchIndexChangeSource.DESCRIPTION: {"C"},
+    ProductSearchIndexChangeSource.VARIANTS: {"A", "B"},
+    ProductSearchIndexChangeSource.ATTRIBUTES: {"B"},
+    ProductSearchIndexChangeSource.ALL: SEARCH_VECTOR_WEIGHTS,
+}
+
 
 def _prep_product_search_vector_index(products):
     prefetch_related_objects(products, *PRODUCT_FIELDS_TO_PREFETCH)
@@ -60,6 +97,259 @@ def update_product_search_vector(product: "Product"):
     product.save(update_fields=["search_vector", "updated_at"])
 
 
+def _in_batches(iterable: Iterable, batch_size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def mark_products_search_index_changed(product_ids: Iterable[int], source: str):
+    """Record that the given part of the products' indexed data has changed."""
+    for batch_ids in _in_batches(product_ids, SEARCH_INDEX_CHANGES_BATCH_SIZE):
+        ProductSearchIndexChange.objects.bulk_create(
+            [
+                ProductSearchIndexChange(product_id=product_id, source=source)
+                for product_id in batch_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def mark_attribute_value_search_index_changed(attribute_value_id: int):
+    """Record a change of the attribute value without touching its products.
+
+    The products using the value are found later by the indexer.
+    """
+    ProductSearchIndexChange.objects.bulk_create(
+        [
+            ProductSearchIndexChange(
+                attribute_value_id=attribute_value_id,
+                source=ProductSearchIndexChangeSource.ATTRIBUTE_VALUE,
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _get_product_ids_with_attribute_value(attribute_value_id: int):
+    product_ids = (
+        AssignedProductAttributeValue.objects.filter(value_id=attribute_value_id)
+        .order_by()
+        .values_list("assignment__product_id", flat=True)
+    )
+    variant_product_ids = (
+        AssignedVariantAttributeValue.objects.filter(value_id=attribute_value_id)
+        .order_by()
+        .values_list("assignment__variant__product_id", flat=True)
+    )
+    return product_ids.union(variant_product_ids)
+
+
+def expand_attribute_value_search_index_changes():
+    """Replace the attribute value changes with changes of the affected products."""
+    with transaction.atomic():
+        changes = list(
+            ProductSearchIndexChange.objects.select_for_update(skip_locked=True)
+            .filter(attribute_value_id__isnull=False)
+            .values_list("pk", "attribute_value_id")[
+                :ATTRIBUTE_VALUE_CHANGES_BATCH_SIZE
+            ]
+        )
+        for _, attribute_value_id in changes:
+            product_ids = _get_product_ids_with_attribute_value(attribute_value_id)
+            mark_products_search_index_changed(
+                product_ids.iterator(), ProductSearchIndexChangeSource.ATTRIBUTES
+            )
+        ProductSearchIndexChange.objects.filter(
+            pk__in=[pk for pk, _ in changes]
+        ).delete()
+
+
+def update_products_search_vector_from_changes(
+    batch_size=SEARCH_INDEX_CHANGES_BATCH_SIZE,
+) -> int:
+    """Update the search vectors of a batch of changed products.
+
+    Changes are claimed and deleted before the product data is read, in the same
+    transaction as the update of the search vectors. A change recorded in the
+    meantime waits for the deleted row and is inserted again, so it isn't lost,
+    and concurrent workers don't process the same products. Return the number of
+    updated products.
+    """
+    expand_attribute_value_search_index_changes()
+    with transaction.atomic():
+        changes = ProductSearchIndexChange.objects.select_for_update(
+            skip_locked=True
+        ).filter(product_id__isnull=False)
+        product_ids = set(changes.values_list("product_id", flat=True)[:batch_size])
+        if not product_ids:
+            return 0
+        weights: DefaultDict[int, Set[str]] = defaultdict(set)
+        change_pks = []
+        for pk, product_id, source in changes.filter(
+            product_id__in=product_ids
+        ).values_list("pk", "product_id", "source"):
+            weights[product_id] |= SOURCE_SEARCH_VECTOR_WEIGHTS[source]
+            change_pks.append(pk)
+        ProductSearchIndexChange.objects.filter(pk__in=change_pks).delete()
+        update_products_search_vector_parts(weights)
+    return len(product_ids)
+
+
+def update_products_search_vector_parts(weights: Dict[int, Set[str]]):
+    """Recompute only the given weighted parts of the products' search vectors.
+
+    The parts that didn't change are kept from the current search vector. Indexed
+    data is fetched as flat rows, without prefetching variants and attributes.
+    """
+    products = (
+        Product.objects.filter(id__in=weights.keys())
+        .annotate(
+            has_search_vector=ExpressionWrapper(
+                Q(search_vector__isnull=False), output_field=BooleanField()
+            )
+        )
+        .order_by()
+        .values_list("id", "name", "description_plaintext", "has_search_vector")
+    )
+    products_data = []
+    for product_id, name, description, has_search_vector in products:
+        product_weights = weights[product_id] if has_search_vector else set()
+        products_data.append(
+            (product_id, name, description, product_weights or SEARCH_VECTOR_WEIGHTS)
+        )
+
+    variants = _get_indexed_variants(
+        [data[0] for data in products_data if data[3] & {"A", "B"}]
+    )
+    attribute_product_ids = [data[0] for data in products_data if "B" in data[3]]
+    product_attributes = _get_attributes_search_vectors(
+        AssignedProductAttributeValue.objects.filter(
+            assignment__product_id__in=attribute_product_ids
+        ),
+        "assignment__product_id",
+    )
+    variant_attributes = _get_attributes_search_vectors(
+        AssignedVariantAttributeValue.objects.filter(
+            assignment__variant_id__in=[
+                variant_id
+                for product_id in attribute_product_ids
+                for variant_id, _ in variants.get(product_id, [])
+            ]
+        ),
+        "assignment__variant_id",
+    )
+
+    instances = []
+    for product_id, name, description, product_weights in products_data:
+        search_vectors: list = []
+        kept_weights = SEARCH_VECTOR_WEIGHTS - product_weights
+        if kept_weights:
+            search_vectors.append(
+                FilterSearchVectorWeights(F("search_vector"), kept_weights)
+            )
+        if "A" in product_weights:
+            search_vectors.append(
+                NoValidationSearchVector(Value(name), config="simple", weight="A")
+            )
+        if "C" in product_weights:
+            search_vectors.append(
+                NoValidationSearchVector(
+                    Value(description), config="simple", weight="C"
+                )
+            )
+        if "B" in product_weights:
+            search_vectors += product_attributes.get(product_id, [])
+        product_variants = variants.get(product_id, [])
+        variant_vectors = [vector for _, vector in product_variants if vector]
+        if "A" in product_weights:
+            search_vectors += variant_vectors
+        if "B" in product_weights and variant_vectors:
+            for variant_id, _ in product_variants:
+                search_vectors += variant_attributes.get(variant_id, [])
+        instances.append(
+            Product(
+                id=product_id, search_vector=FlatConcatSearchVector(*search_vectors)
+            )
+        )
+    Product.objects.bulk_update(
+        instances, ["search_vector"], batch_size=PRODUCTS_BATCH_SIZE
+    )
+
+
+def _get_indexed_variants(product_ids: List[int]):
+    """Return the indexed variants of the products with their search vectors.
+
+    Variants without SKU and name have no search vector, but their attributes
+    are still indexed.
+    """
+    variants: DefaultDict[int, list] = defaultdict(list)
+    rows = (
+        ProductVariant.objects.filter(product_id__in=product_ids)
+        .order_by("product_id", "sort_order", "sku")
+        .values_list("id", "product_id", "sku", "name")
+    )
+    for variant_id, product_id, sku, name in rows.iterator():
+        product_variants = variants[product_id]
+        if len(product_variants) >= settings.PRODUCT_MAX_INDEXED_VARIANTS:
+            continue
+        vector = None
+        if sku or name:
+            values = [Value(sku), Value(name)] if sku else [Value(name)]
+            vector = NoValidationSearchVector(*values, config="simple", weight="A")
+        product_variants.append((variant_id, vector))
+    return variants
+
+
+def _get_attributes_search_vectors(assigned_values: "QuerySet", owner_lookup: str):
+    """Return search vectors of the attribute values assigned to products or variants.
+
+    Values are streamed as flat rows grouped by the owner of the assignment.
+    """
+    search_vectors: DefaultDict[int, List[NoValidationSearchVector]] = defaultdict(list)
+    owner_assignments: DefaultDict[int, Set[int]] = defaultdict(set)
+    assignment_values_count: DefaultDict[int, int] = defaultdict(int)
+    rows = assigned_values.order_by(
+        owner_lookup, "assignment_id", "value__sort_order", "value_id"
+    ).values_list(
+        owner_lookup,
+        "assignment_id",
+        "assignment__assignment__attribute__input_type",
+        "assignment__assignment__attribute__unit",
+        "value__name",
+        "value__rich_text",
+        "value__plain_text",
+        "value__date_time",
+    )
+    for row in rows.iterator():
+        owner_id, assignment_id, input_type, unit, *value_data = row
+        assignments = owner_assignments[owner_id]
+        if assignment_id not in assignments:
+            if len(assignments) >= settings.PRODUCT_MAX_INDEXED_ATTRIBUTES:
+                continue
+            assignments.add(assignment_id)
+        if (
+            assignment_values_count[assignment_id]
+            >= settings.PRODUCT_MAX_INDEXED_ATTRIBUTE_VALUES
+        ):
+            continue
+        assignment_values_count[assignment_id] += 1
+        name, rich_text, plain_text, date_time = value_data
+        text = get_attribute_value_search_text(
+            input_type,
+            unit,
+            name=name,
+            rich_text=rich_text,
+            plain_text=plain_text,
+            date_time=date_time,
+        )
+        if text is not None:
+            search_vectors[owner_id].append(
+                NoValidationSearchVector(Value(text), config="simple", weight="B")
+            )
+    return search_vectors
+
+
 def prepare_product_search_vector_value(
     product: "Product", *, already_prefetched=False
 ) -> List[NoValidationSearchVector]:
@@ -111,54 +401,48 @@ def generate_attributes_search_vector_value(
     search_vectors = []
     for assigned_attribute in assigned_attributes:
         attribute = assigned_attribute.assignment.attribute
-
-        input_type = attribute.input_type
         values = assigned_attribute.values.all()[
             : settings.PRODUCT_MAX_INDEXED_ATTRIBUTE_VALUES
         ]
-        if input_type in [AttributeInputType.DROPDOWN, AttributeInputType.MULTISELECT]:
-            search_vectors += [
-                NoValidationSearchVector(Value(value.name), config="simple", weight="B")
-                for value in values
-            ]
-        elif input_type == AttributeInputType.RICH_TEXT:
-            search_vectors += [
-                NoValidationSearchVector(
-                    Value(clean_editor_js(value.rich_text, to_string=True)),
-                    config="simple",
-                    weight="B",
-                )
-                for value in values
-            ]
-        elif input_type == AttributeInputType.PLAIN_TEXT:
-            search_vectors += [
-                NoValidationSearchVector(
-                    Value(value.plain_text), config="simple", weight="B"
-                )
-                for value in values
-            ]
-        elif input_type == AttributeInputType.NUMERIC:
-            unit = attribute.unit
-            search_vectors += [
-                NoValidationSearchVector(
-                    Value(value.name + " " + unit if unit else value.name),
-                    config="simple",
-                    weight="B",
-                )
-                for value in values
-            ]
-        elif input_type in [AttributeInputType.DATE, AttributeInputType.DATE_TIME]:
-            search_vectors += [
-                NoValidationSearchVector(
-                    Value(value.date_time.strftime("%Y-%m-%d %H:%M:%S")),
-                    config="simple",
-                    weight="B",
+        for value in values:
+            text = get_attribute_value_search_text(
+                attribute.input_type,
+                attribute.unit,
+                name=value.name,
+                rich_text=value.rich_text,
+                plain_text=value.plain_text,
+                date_time=value.date_time,
+            )
+            if text is not None:
+                search_vectors.append(
+                    NoValidationSearchVector(Value(text), config="simple", weight="B")
                 )
-                for value in values
-            ]
     return search_vectors
 
 
+def get_attribute_value_search_text(
+    input_type: str,
+    unit: Optional[str],
+    *,
+    name: str,
+    rich_text: Optional[dict],
+    plain_text: Optional[str],
+    date_time: Optional["datetime"],
+) -> Optional[str]:
+    """Return the indexed text of an attribute value or None if it's not indexed."""
+    if input_type in [AttributeInputType.DROPDOWN, AttributeInputType.MULTISELECT]:
+        return name
+    if input_type == AttributeInputType.RICH_TEXT:
+        return clean_editor_js(rich_text, to_string=True)
+    if input_type == AttributeInputType.PLAIN_TEXT:
+        return plain_text
+    if input_type == AttributeInputType.NUMERIC:
+        return name + " " + unit if unit else name
+    if input_type in [AttributeInputType.DATE, AttributeInputType.DATE_TIME]:
+        return date_time.strftime("%Y-%m-%d %H:%M:%S") if date_time else None
+    return None
+
+
 def search_products(qs, value):
     if value:
         query = SearchQuery(value, search_type="websearch", config="simple")
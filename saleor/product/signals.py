@@ -1,4 +1,6 @@
 from ..core.tasks import delete_from_storage_task
+from ..discount.utils import invalidate_discounts_cache
+from .category_tree import invalidate_category_tree_cache
 
 
 def delete_background_image(sender, instance, **kwargs):
@@ -14,3 +16,12 @@ def delete_digital_content_file(sender, instance, **kwargs):
 def delete_product_media_image(sender, instance, **kwargs):
     if file := instance.image:
         delete_from_storage_task.delay(file.name)
+
+
+def invalidate_category_tree(sender, instance, **kwargs):
+    invalidate_category_tree_cache()
+
+
+def invalidate_category_discounts(sender, instance, **kwargs):
+    # sales of a category apply to all its descendants
+    invalidate_discounts_cache()
@@ -11,8 +11,13 @@ from ..celeryconf import app
 from ..core.exceptions import PreorderAllocationError
 from ..discount.models import Sale
 from ..warehouse.management import deactivate_preorder_for_variant
+from .listing_index import update_dirty_products_listing_index
 from .models import Product, ProductType, ProductVariant
-from .search import PRODUCTS_BATCH_SIZE, update_products_search_vector
+from .search import (
+    PRODUCTS_BATCH_SIZE,
+    update_products_search_vector,
+    update_products_search_vector_from_changes,
+)
 from .utils.variant_prices import (
     update_product_discounted_price,
     update_products_discounted_prices,
@@ -124,7 +129,16 @@ def _get_preorder_variants_to_clean():
 
 @app.task(queue=settings.UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME, expires=20)
 def update_products_search_vector_task():
+    update_products_search_vector_from_changes()
+
+    # Products flagged as dirty get their whole search vector rebuilt.
     products = Product.objects.filter(search_index_dirty=True).order_by()[
         :PRODUCTS_BATCH_SIZE
     ]
     update_products_search_vector(products, use_batches=False)
+
+
+@app.task(expires=20)
+def update_products_listing_index_task():
+    if settings.PRODUCT_LISTING_INDEX_ENABLED:
+        update_dirty_products_listing_index()
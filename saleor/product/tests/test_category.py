@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 from ...plugins.manager import get_plugins_manager
+from ..category_tree import _category_tree_snapshot_cache, get_category_subtree_ids
 from ..models import Category
 from ..utils import collect_categories_tree_products, delete_categories
 
@@ -18,6 +19,43 @@ def test_collect_categories_tree_products(categories_tree):
     )
 
 
+def test_collect_categories_tree_products_navigation_cache_enabled(
+    categories_tree, settings
+):
+    # given
+    settings.NAVIGATION_CACHE_ENABLED = True
+    _category_tree_snapshot_cache.clear()
+    parent = categories_tree
+    child = parent.children.first()
+    products = parent.products.all() | child.products.all()
+
+    # when
+    result = collect_categories_tree_products(parent)
+
+    # then
+    assert set(result.values_list("pk", flat=True)) == set(
+        products.values_list("pk", flat=True)
+    )
+
+
+def test_get_category_subtree_ids_category_not_in_cached_tree(
+    categories_tree, settings
+):
+    # given
+    settings.NAVIGATION_CACHE_ENABLED = True
+    _category_tree_snapshot_cache.clear()
+    get_category_subtree_ids(categories_tree)
+    new_category = Category.objects.create(
+        name="New", slug="new", parent=categories_tree.children.first()
+    )
+
+    # when
+    subtree_ids = get_category_subtree_ids(new_category)
+
+    # then
+    assert subtree_ids == [new_category.pk]
+
+
 @patch("saleor.product.utils.update_products_discounted_prices_task")
 def test_delete_categories(
     mock_update_products_discounted_prices_task,
@@ -62,3 +100,29 @@ def test_delete_categories_trigger_product_updated_webhook(
     ).exists()
 
     assert len(product_list) == product_updated_mock.call_count
+
+
+@patch("saleor.product.signals.invalidate_discounts_cache")
+def test_category_parent_change_invalidates_discounts_cache(
+    invalidate_discounts_cache_mock, categories_tree
+):
+    # given
+    child = categories_tree.children.first()
+
+    # when
+    child.parent = None
+    child.save()
+
+    # then
+    invalidate_discounts_cache_mock.assert_called_once_with()
+
+
+@patch("saleor.product.signals.invalidate_discounts_cache")
+def test_delete_categories_invalidates_discounts_cache(
+    invalidate_discounts_cache_mock, categories_tree
+):
+    # when
+    delete_categories([categories_tree.pk], manager=get_plugins_manager())
+
+    # then
+    invalidate_discounts_cache_mock.assert_called()
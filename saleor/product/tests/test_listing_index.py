@@ -0,0 +1,130 @@
+from decimal import Decimal
+
+from ..listing_index import (
+    get_attribute_value_counts,
+    mark_products_listing_index_dirty,
+    mark_products_listing_index_dirty_on_commit,
+    update_dirty_products_listing_index,
+    update_products_listing_index,
+)
+from ..models import Product, ProductListingIndex
+
+
+def test_mark_products_listing_index_dirty(product, settings):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = True
+
+    # when
+    mark_products_listing_index_dirty([product.pk])
+
+    # then
+    product.refresh_from_db()
+    assert product.listing_index_dirty is True
+
+
+def test_mark_products_listing_index_dirty_index_disabled(product, settings):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = False
+
+    # when
+    mark_products_listing_index_dirty([product.pk])
+
+    # then
+    product.refresh_from_db()
+    assert product.listing_index_dirty is False
+
+
+def test_mark_products_listing_index_dirty_on_commit(
+    product, settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = True
+
+    # when
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        mark_products_listing_index_dirty_on_commit([product.pk])
+
+    # then
+    product.refresh_from_db()
+    assert product.listing_index_dirty is False
+
+    callbacks[0]()
+    product.refresh_from_db()
+    assert product.listing_index_dirty is True
+
+
+def test_update_products_listing_index(product, channel_USD, collection):
+    # given
+    collection.products.add(product)
+    variant = product.variants.get()
+    stock = variant.stocks.get()
+    stock.quantity_allocated = 3
+    stock.save(update_fields=["quantity_allocated"])
+    product_value = product.attributes.get().values.get()
+    variant_value = variant.attributes.get().values.get()
+
+    # when
+    update_products_listing_index([product.pk])
+
+    # then
+    index = ProductListingIndex.objects.get(product=product)
+    listing = product.channel_listings.get()
+    assert index.channel_id == channel_USD.pk
+    assert index.category_id == product.category_id
+    assert index.is_published is listing.is_published
+    assert index.visible_in_listings is listing.visible_in_listings
+    assert index.available_for_purchase_at == listing.available_for_purchase_at
+    assert index.discounted_price_amount == listing.discounted_price_amount
+    assert index.min_variant_price_amount == Decimal(10)
+    assert index.max_variant_price_amount == Decimal(10)
+    assert index.has_variants_without_price is False
+    assert index.quantity_available == stock.quantity - 3
+    assert index.collection_ids == [collection.pk]
+    assert index.attribute_value_ids == sorted([product_value.pk, variant_value.pk])
+
+
+def test_update_products_listing_index_removes_channels_without_listing(
+    product, channel_USD
+):
+    # given
+    update_products_listing_index([product.pk])
+    product.channel_listings.all().delete()
+
+    # when
+    update_products_listing_index([product.pk])
+
+    # then
+    assert not ProductListingIndex.objects.filter(product=product).exists()
+
+
+def test_update_dirty_products_listing_index(product, product_list):
+    # given
+    product.listing_index_dirty = True
+    product.save(update_fields=["listing_index_dirty"])
+
+    # when
+    updated_count = update_dirty_products_listing_index()
+
+    # then
+    assert updated_count == 1
+    product.refresh_from_db()
+    assert product.listing_index_dirty is False
+    assert list(ProductListingIndex.objects.values_list("product_id", flat=True)) == [
+        product.pk
+    ]
+
+
+def test_get_attribute_value_counts_from_listing_index(product, channel_USD, settings):
+    # given
+    settings.PRODUCT_LISTING_INDEX_ENABLED = True
+    update_products_listing_index([product.pk])
+    product_value = product.attributes.get().values.get()
+    variant_value = product.variants.get().attributes.get().values.get()
+
+    # when
+    counts = get_attribute_value_counts(
+        Product.objects.filter(pk=product.pk), channel_USD.slug
+    )
+
+    # then
+    assert counts == {product_value.pk: 1, variant_value.pk: 1}
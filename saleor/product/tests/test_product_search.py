@@ -1,5 +1,16 @@
-from ..models import Product
-from ..search import update_product_search_vector, update_products_search_vector
+from unittest.mock import patch
+
+from django.contrib.postgres.search import SearchQuery
+
+from .. import ProductSearchIndexChangeSource
+from ..models import Product, ProductSearchIndexChange
+from ..search import (
+    mark_attribute_value_search_index_changed,
+    mark_products_search_index_changed,
+    update_product_search_vector,
+    update_products_search_vector,
+    update_products_search_vector_from_changes,
+)
 
 
 def test_update_product_search_vector(product_type, category):
@@ -35,3 +46,131 @@ def test_update_products_search_vector(product_list):
     for product in product_list:
         product.refresh_from_db()
         assert product.search_vector
+
+
+def _search_products(value):
+    return Product.objects.filter(
+        search_vector=SearchQuery(value, search_type="websearch", config="simple")
+    )
+
+
+def test_mark_products_search_index_changed_coalesces_changes(product):
+    # when
+    mark_products_search_index_changed(
+        [product.id, product.id], ProductSearchIndexChangeSource.NAME
+    )
+    mark_products_search_index_changed(
+        [product.id], ProductSearchIndexChangeSource.NAME
+    )
+
+    # then
+    change = ProductSearchIndexChange.objects.get()
+    assert change.product_id == product.id
+    assert change.source == ProductSearchIndexChangeSource.NAME
+
+
+def test_update_products_search_vector_from_changes_builds_missing_vector(product):
+    # given
+    product.search_vector = None
+    product.save(update_fields=["search_vector"])
+    mark_products_search_index_changed(
+        [product.id], ProductSearchIndexChangeSource.NAME
+    )
+
+    # when
+    updated_count = update_products_search_vector_from_changes()
+
+    # then
+    assert updated_count == 1
+    assert not ProductSearchIndexChange.objects.exists()
+    # The whole vector is built, including the product and variant attributes.
+    assert _search_products("Test product").get() == product
+    assert _search_products("123").get() == product
+    attribute_value = product.attributes.get().values.get()
+    assert _search_products(attribute_value.name).get() == product
+
+
+def test_update_products_search_vector_from_changes_keeps_unchanged_parts(
+    product,
+):
+    # given
+    update_product_search_vector(product)
+    attribute_value = product.attributes.get().values.get()
+    attribute_value.name = "Crimson"
+    attribute_value.save(update_fields=["name"])
+    product.name = "Renamed product"
+    product.save(update_fields=["name"])
+    mark_products_search_index_changed(
+        [product.id], ProductSearchIndexChangeSource.NAME
+    )
+
+    # when
+    update_products_search_vector_from_changes()
+
+    # then
+    assert _search_products("Renamed").get() == product
+    assert _search_products("123").get() == product
+    # Attributes are not reindexed, as only the name change was recorded.
+    assert not _search_products("Crimson").exists()
+
+
+def test_update_products_search_vector_from_changes_attribute_value(product):
+    # given
+    update_product_search_vector(product)
+    attribute_value = product.attributes.get().values.get()
+    attribute_value.name = "Crimson"
+    attribute_value.save(update_fields=["name"])
+    mark_attribute_value_search_index_changed(attribute_value.id)
+    mark_attribute_value_search_index_changed(attribute_value.id)
+
+    # when
+    updated_count = update_products_search_vector_from_changes()
+
+    # then
+    assert updated_count == 1
+    assert not ProductSearchIndexChange.objects.exists()
+    assert _search_products("Crimson").get() == product
+    assert _search_products("Test product").get() == product
+
+
+def test_update_products_search_vector_from_changes_keeps_change_recorded_meanwhile(
+    product,
+):
+    # given
+    mark_products_search_index_changed(
+        [product.id], ProductSearchIndexChangeSource.NAME
+    )
+
+    def record_change(weights):
+        mark_products_search_index_changed(
+            [product.id], ProductSearchIndexChangeSource.NAME
+        )
+
+    # when
+    with patch(
+        "saleor.product.search.update_products_search_vector_parts",
+        side_effect=record_change,
+    ):
+        update_products_search_vector_from_changes()
+
+    # then
+    change = ProductSearchIndexChange.objects.get()
+    assert change.product_id == product.id
+    assert change.source == ProductSearchIndexChangeSource.NAME
+
+
+def test_update_products_search_vector_from_changes_respects_batch_size(
+    product_list,
+):
+    # given
+    mark_products_search_index_changed(
+        [product.id for product in product_list],
+        ProductSearchIndexChangeSource.ALL,
+    )
+
+    # when
+    updated_count = update_products_search_vector_from_changes(batch_size=2)
+
+    # then
+    assert updated_count == 2
+    assert ProductSearchIndexChange.objects.count() == len(product_list) - 2
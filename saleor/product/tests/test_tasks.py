@@ -4,6 +4,9 @@ from unittest.mock import patch
 
 from django.utils import timezone
 
+from .. import ProductSearchIndexChangeSource
+from ..models import ProductSearchIndexChange
+from ..search import mark_products_search_index_changed
 from ..tasks import (
     _get_preorder_variants_to_clean,
     update_product_discounted_price_task,
@@ -128,3 +131,16 @@ def test_update_products_search_vector_task(product):
 
     # then
     assert product.search_index_dirty is False
+
+
+def test_update_products_search_vector_task_processes_changes(product):
+    # given
+    mark_products_search_index_changed([product.id], ProductSearchIndexChangeSource.ALL)
+
+    # when
+    update_products_search_vector_task()
+    product.refresh_from_db(fields=["search_vector"])
+
+    # then
+    assert product.search_vector
+    assert not ProductSearchIndexChange.objects.exists()
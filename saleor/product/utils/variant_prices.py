@@ -6,7 +6,9 @@ from typing import Optional
 from django.db.models.query_utils import Q
 from prices import Money
 
+from ...core.utils.cache_tags import purge_instances_cache_tags
 from ...discount.utils import calculate_discounted_price, fetch_active_discounts
+from ..listing_index import mark_products_listing_index_dirty
 from ..models import Product, ProductChannelListing, ProductVariantChannelListing
 
 
@@ -62,6 +64,9 @@ def update_product_discounted_price(product, discounts=None):
     ProductChannelListing.objects.bulk_update(
         changed_products_channels_to_update, ["discounted_price_amount"]
     )
+    # Variant prices and channel listings change together with discounted prices.
+    mark_products_listing_index_dirty([product.pk])
+    purge_instances_cache_tags([product])
 
 
 def update_products_discounted_prices(products, discounts=None):
@@ -521,6 +521,13 @@ EXPORT_FILES_TIMEDELTA = timedelta(
     seconds=parse(os.environ.get("EXPORT_FILES_TIMEDELTA", "30 days"))
 )
 
+# Compress exported CSV files with gzip.
+EXPORT_FILES_CSV_GZIP = get_bool_from_env("EXPORT_FILES_CSV_GZIP", False)
+
+# Number of products exported by a single task of a products export split into
+# shards run in parallel. Exports are not split when set to 0.
+EXPORT_PRODUCTS_SHARD_SIZE = int(os.environ.get("EXPORT_PRODUCTS_SHARD_SIZE", 0))
+
 # CELERY SETTINGS
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BROKER_URL = (
@@ -569,6 +576,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.warehouse.tasks.update_stocks_quantity_allocated_task",
         "schedule": crontab(hour=0, minute=0),
     },
+    "fold-stock-shards": {
+        "task": "saleor.warehouse.tasks.fold_stock_shards_task",
+        "schedule": timedelta(seconds=30),
+    },
     "delete-old-export-files": {
         "task": "saleor.csv.tasks.delete_old_export_files",
         "schedule": crontab(hour=1, minute=0),
@@ -581,6 +592,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.product.tasks.update_products_search_vector_task",
         "schedule": timedelta(seconds=20),
     },
+    "update-products-listing-index": {
+        "task": "saleor.product.tasks.update_products_listing_index_task",
+        "schedule": timedelta(seconds=20),
+    },
 }
 
 # The maximum wait time between each is_due() call on schedulers
@@ -663,6 +678,12 @@ GRAPHENE = {
     "RELAY_CONNECTION_MAX_LIMIT": 100,
 }
 
+# Number of threads executing GraphQL operations of a single ASGI worker, which is
+# the number of requests it handles at a time, e.g. while they wait for sync
+# webhooks. Each thread keeps its own database connection. Set
+# GRAPHQL_ASYNC_VIEW_THREADS=0 in env to serve the API with a synchronous view.
+GRAPHQL_ASYNC_VIEW_THREADS = int(os.environ.get("GRAPHQL_ASYNC_VIEW_THREADS", 0))
+
 # Set GRAPHQL_QUERY_MAX_COMPLEXITY=0 in env to disable (not recommended)
 GRAPHQL_QUERY_MAX_COMPLEXITY = int(
     os.environ.get("GRAPHQL_QUERY_MAX_COMPLEXITY", 50000)
@@ -674,6 +695,34 @@ GRAPHQL_QUERY_MAX_COMPLEXITY = int(
 # Set FEDERATED_QUERY_MAX_ENTITIES=0 in env to disable (not recommended)
 FEDERATED_QUERY_MAX_ENTITIES = int(os.environ.get("FEDERATED_QUERY_MAX_ENTITIES", 100))
 
+# Number of parsed and validated GraphQL documents kept in memory by each process.
+# Set GRAPHQL_DOCUMENT_CACHE_SIZE=0 in env to disable.
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 500))
+
+# Store parsed GraphQL documents in the cache, so they're shared between processes.
+GRAPHQL_DOCUMENT_CACHE_SHARED = get_bool_from_env(
+    "GRAPHQL_DOCUMENT_CACHE_SHARED", False
+)
+
+# Accept the sha256 hash of a query in the `persistedQuery` request extension
+# instead of the query text (automatic persisted queries).
+GRAPHQL_PERSISTED_QUERIES_ENABLED = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ENABLED", False
+)
+# Accept only the queries registered with the `register_persisted_queries` command.
+GRAPHQL_PERSISTED_QUERIES_ALLOWLIST = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ALLOWLIST", False
+)
+# Time in seconds for which the queries registered by the clients are kept.
+GRAPHQL_PERSISTED_QUERIES_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERIES_TIMEOUT", 24 * 60 * 60)
+)
+
+# Execute the queries of a batched request together, with shared dataloaders.
+GRAPHQL_BATCH_CONCURRENT_EXECUTION = get_bool_from_env(
+    "GRAPHQL_BATCH_CONCURRENT_EXECUTION", False
+)
+
 BUILTIN_PLUGINS = [
     "saleor.plugins.avatax.plugin.AvataxPlugin",
     "saleor.plugins.vatlayer.plugin.VatlayerPlugin",
@@ -707,6 +756,40 @@ for entry_point in installed_plugins:
 
 PLUGINS = BUILTIN_PLUGINS + EXTERNAL_PLUGINS
 
+# Share the plugins configuration between requests handled by the same process.
+# The configuration is reloaded when it's changed through the API.
+PLUGINS_MANAGER_CACHE_ENABLED = get_bool_from_env(
+    "PLUGINS_MANAGER_CACHE_ENABLED", False
+)
+
+# Share active sales and their catalogue index between requests handled by the same
+# process. The sales are reloaded when they're changed through the API.
+DISCOUNTS_CACHE_ENABLED = get_bool_from_env("DISCOUNTS_CACHE_ENABLED", False)
+
+# Share menus and the category tree, with their translations, between requests
+# handled by the same process, so navigation is resolved without database queries.
+# The trees are reloaded when menus or categories change.
+NAVIGATION_CACHE_ENABLED = get_bool_from_env("NAVIGATION_CACHE_ENABLED", False)
+
+# Share the active webhooks, grouped by the events their apps are allowed to
+# receive, between requests handled by the same process, so triggering an event
+# doesn't query the database. The webhooks are reloaded when webhooks, apps or
+# their permissions change.
+WEBHOOKS_CACHE_ENABLED = get_bool_from_env("WEBHOOKS_CACHE_ENABLED", False)
+
+# Time in seconds for which responses to anonymous storefront queries are cached.
+# Entries are purged when the products, categories, collections or menus they were
+# built from are changed through the API. Set GRAPHQL_RESPONSE_CACHE_TIMEOUT=0 in
+# env to disable.
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", 0)
+)
+# Time in seconds for which expired responses are still served, while a single
+# request builds the new one.
+GRAPHQL_RESPONSE_CACHE_STALE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_STALE_TIMEOUT", 0)
+)
+
 if (
     not DEBUG
     and ENABLE_ACCOUNT_CONFIRMATION_BY_EMAIL
@@ -722,6 +805,27 @@ if (
 WEBHOOK_TIMEOUT = 10
 WEBHOOK_SYNC_TIMEOUT = 20
 
+# Maximum number of connections to a single webhook host kept alive by a process
+# and reused by the following requests. SQS and Pub/Sub clients are reused as
+# well. Set WEBHOOK_CONNECTION_POOL_SIZE=0 in env to open new connections for
+# every request.
+WEBHOOK_CONNECTION_POOL_SIZE = int(os.environ.get("WEBHOOK_CONNECTION_POOL_SIZE", 0))
+
+# Time in milliseconds for which async events are collected before they're sent
+# together to webhooks with batch size greater than 1.
+WEBHOOK_BATCH_DELAY_MS = int(os.environ.get("WEBHOOK_BATCH_DELAY_MS", 500))
+
+# Store async events in an outbox table, in the transaction of the change that
+# triggered them, and create their deliveries by a Celery task once the
+# transaction is committed. Events of rolled back transactions aren't delivered.
+WEBHOOK_OUTBOX_ENABLED = get_bool_from_env("WEBHOOK_OUTBOX_ENABLED", False)
+if WEBHOOK_OUTBOX_ENABLED:
+    # Dispatches events left by failed tasks.
+    CELERY_BEAT_SCHEDULE["dispatch-webhook-outbox-events"] = {
+        "task": "saleor.plugins.webhook.tasks.dispatch_outbox_events_task",
+        "schedule": timedelta(minutes=1),
+    }
+
 # Since we split checkout complete logic into two separate transactions, in order to
 # mimic stock lock, we apply short reservation for the stocks. The value represents
 # time of the reservation in seconds.
@@ -788,6 +892,36 @@ PRODUCT_MAX_INDEXED_ATTRIBUTES = 1000
 PRODUCT_MAX_INDEXED_ATTRIBUTE_VALUES = 100
 PRODUCT_MAX_INDEXED_VARIANTS = 1000
 
+# Keep a denormalized listing of products per channel with prices, stock,
+# publication data, collections and attribute values, and use it in the
+# channel-scoped product filters. The listing is rebuilt by a periodic task, so it
+# can lag behind recent changes, and its stock availability doesn't take checkout
+# reservations into account.
+PRODUCT_LISTING_INDEX_ENABLED = get_bool_from_env(
+    "PRODUCT_LISTING_INDEX_ENABLED", False
+)
+
+# Number of shards the free quantity of every stock is split into. Orders of popular
+# variants are allocated from the shards without locking the stock rows, and the
+# shards are periodically folded back into the stocks. Set STOCK_SHARDS=0 in env to
+# disable.
+STOCK_SHARDS = int(os.environ.get("STOCK_SHARDS", 0))
+
+# Create all thumbnail sizes and formats of new product media, category and collection
+# backgrounds and user avatars in Celery workers, instead of rendering them in the
+# thumbnail view on the first request. Until the thumbnails exist, the view redirects
+# to the original image. Route the tasks to THUMBNAIL_CELERY_QUEUE_NAME to keep
+# image processing on a dedicated pool of worker processes.
+THUMBNAIL_PREGENERATION_ENABLED = get_bool_from_env(
+    "THUMBNAIL_PREGENERATION_ENABLED", False
+)
+
+# Time in seconds for which thumbnail file names are cached by instance, size and
+# format, so the thumbnail view and the GraphQL thumbnail fields return the storage
+# URL without querying the database. Entries are removed when the thumbnails are
+# deleted. Set THUMBNAIL_CACHE_TIMEOUT=0 in env to disable.
+THUMBNAIL_CACHE_TIMEOUT = int(os.environ.get("THUMBNAIL_CACHE_TIMEOUT", 0))
+
 
 # Patch SubscriberExecutionContext class from `graphql-core-legacy` package
 # to fix bug causing not returning errors for subscription queries.
@@ -803,6 +937,8 @@ UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME = os.environ.get(
 )
 # Queue name for "async webhook" events
 WEBHOOK_CELERY_QUEUE_NAME = os.environ.get("WEBHOOK_CELERY_QUEUE_NAME", None)
+# Queue name for thumbnails pre-generation
+THUMBNAIL_CELERY_QUEUE_NAME = os.environ.get("THUMBNAIL_CELERY_QUEUE_NAME", None)
 
 # Lock time for request password reset mutation per user (seconds)
 RESET_PASSWORD_LOCK_TIME = parse(
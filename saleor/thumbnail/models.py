@@ -1,3 +1,5 @@
+from collections import namedtuple
+
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -44,3 +46,13 @@ class Thumbnail(models.Model):
     user = models.ForeignKey(
         User, null=True, blank=True, on_delete=models.CASCADE, related_name="thumbnails"
     )
+
+
+ModelData = namedtuple("ModelData", ["model", "image_field", "thumbnail_field"])
+
+TYPE_TO_MODEL_DATA_MAPPING = {
+    "User": ModelData(User, "avatar", "user"),
+    "Category": ModelData(Category, "background_image", "category"),
+    "Collection": ModelData(Collection, "background_image", "collection"),
+    "ProductMedia": ModelData(ProductMedia, "image", "product_media"),
+}
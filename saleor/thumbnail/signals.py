@@ -1,6 +1,25 @@
 from ..core.tasks import delete_from_storage_task
+from .models import TYPE_TO_MODEL_DATA_MAPPING
+from .utils import delete_cached_thumbnail_name
 
 
 def delete_thumbnail_image(sender, instance, **kwargs):
     if image := instance.image:
         delete_from_storage_task.delay(image.name)
+
+
+def delete_cached_thumbnail(sender, instance, **kwargs):
+    for object_type, model_data in TYPE_TO_MODEL_DATA_MAPPING.items():
+        instance_id = getattr(instance, f"{model_data.thumbnail_field}_id")
+        if instance_id is None:
+            continue
+        if object_type == "User":
+            # user thumbnails are cached by the user UUID
+            instance_id = (
+                model_data.model.objects.filter(pk=instance_id)
+                .values_list("uuid", flat=True)
+                .first()
+            )
+        delete_cached_thumbnail_name(
+            object_type, instance_id, instance.size, instance.format
+        )
@@ -0,0 +1,107 @@
+from typing import Iterable, List, Optional
+
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.db import transaction
+
+from ..celeryconf import app
+from . import THUMBNAIL_SIZES, ThumbnailFormat
+from .models import TYPE_TO_MODEL_DATA_MAPPING, Thumbnail
+from .utils import (
+    ProcessedImage,
+    cache_thumbnail_names,
+    prepare_thumbnail_file_name,
+)
+
+task_logger = get_task_logger(__name__)
+
+# Formats of the pre-generated thumbnails, `None` keeps the format of the source image.
+THUMBNAIL_FORMATS = [None, ThumbnailFormat.WEBP]
+
+# Time in seconds for which the thumbnail view doesn't schedule the thumbnails of
+# the same instance again, while the previously scheduled ones are pending.
+THUMBNAILS_PENDING_TIMEOUT = 60
+
+
+def get_thumbnails_pending_cache_key(object_type: str, instance_pk) -> str:
+    return f"thumbnails-pending:{object_type}:{instance_pk}"
+
+
+def create_thumbnails(
+    object_type: str,
+    instance,
+    sizes: Iterable[int] = THUMBNAIL_SIZES,
+    formats: Iterable[Optional[str]] = THUMBNAIL_FORMATS,
+) -> List[Thumbnail]:
+    """Create the missing thumbnails of the instance image in given sizes and formats.
+
+    Return the created thumbnails.
+    """
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    image = getattr(instance, model_data.image_field)
+    if not image:
+        return []
+
+    existing_thumbnails = set(
+        Thumbnail.objects.filter(**{model_data.thumbnail_field: instance}).values_list(
+            "size", "format"
+        )
+    )
+    missing_thumbnails = {
+        (size, format)
+        for format in formats
+        for size in sizes
+        if (size, format) not in existing_thumbnails
+    }
+    if not missing_thumbnails:
+        return []
+
+    thumbnail_files = ProcessedImage(image.name).create_thumbnails(
+        sizes={size for size, _ in missing_thumbnails},
+        formats={format for _, format in missing_thumbnails},
+    )
+    thumbnails = []
+    for (size, format), thumbnail_file in thumbnail_files.items():
+        if (size, format) not in missing_thumbnails:
+            continue
+        thumbnail = Thumbnail(
+            size=size, format=format, **{model_data.thumbnail_field: instance}
+        )
+        thumbnail.image.save(
+            prepare_thumbnail_file_name(image.name, size, format),
+            thumbnail_file,
+            save=False,
+        )
+        thumbnails.append(thumbnail)
+    return Thumbnail.objects.bulk_create(thumbnails)
+
+
+def schedule_thumbnails_creation(object_type: str, instance_pk):
+    """Schedule creating all thumbnails of the instance image once committed.
+
+    Do nothing unless thumbnails pre-generation is enabled.
+    """
+    if not settings.THUMBNAIL_PREGENERATION_ENABLED:
+        return
+    transaction.on_commit(
+        lambda: create_thumbnails_task.delay(object_type, instance_pk)
+    )
+
+
+@app.task(queue=settings.THUMBNAIL_CELERY_QUEUE_NAME)
+def create_thumbnails_task(object_type: str, instance_pk):
+    model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
+    instance = model_data.model.objects.filter(pk=instance_pk).first()
+    if instance is None:
+        task_logger.info(
+            "Skipping thumbnails of %s %s, the instance doesn't exist.",
+            object_type,
+            instance_pk,
+        )
+        return
+    thumbnails = create_thumbnails(object_type, instance)
+    instance_id = instance.uuid if object_type == "User" else instance.pk
+    cache_thumbnail_names(object_type, instance_id, thumbnails)
+    task_logger.info(
+        "Created %s thumbnails of %s %s.", len(thumbnails), object_type, instance_pk
+    )
@@ -0,0 +1,33 @@
+from .. import THUMBNAIL_SIZES, ThumbnailFormat
+from ..models import Thumbnail
+from ..tasks import create_thumbnails_task
+
+
+def test_create_thumbnails_task(category_with_image):
+    # given
+    Thumbnail.objects.create(category=category_with_image, size=64, format=None)
+
+    # when
+    create_thumbnails_task("Category", category_with_image.pk)
+
+    # then
+    thumbnails = Thumbnail.objects.filter(category=category_with_image)
+    assert thumbnails.count() == len(THUMBNAIL_SIZES) * 2
+    assert set(thumbnails.values_list("size", "format")) == {
+        (size, format)
+        for size in THUMBNAIL_SIZES
+        for format in [None, ThumbnailFormat.WEBP]
+    }
+    file_path, _ = category_with_image.background_image.name.rsplit(".")
+    assert (
+        thumbnails.get(size=128, format=ThumbnailFormat.WEBP).image.name
+        == f"thumbnails/{file_path}_thumbnail_128.webp"
+    )
+
+
+def test_create_thumbnails_task_instance_without_image(category):
+    # when
+    create_thumbnails_task("Category", category.pk)
+
+    # then
+    assert not Thumbnail.objects.filter(category=category).exists()
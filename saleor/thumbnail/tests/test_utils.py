@@ -1,11 +1,18 @@
+from io import BytesIO
 from unittest.mock import MagicMock
 
 import graphene
 import pytest
 from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
 
 from ..models import Thumbnail
 from ..utils import (
+    ProcessedImage,
+    cache_thumbnail_names,
+    get_cached_thumbnail_names,
     get_image_or_proxy_url,
     get_thumbnail_size,
     prepare_image_proxy_url,
@@ -91,3 +98,65 @@ def test_get_image_or_proxy_url_thumbnail_url_returned(collection, media_root):
 
     # then
     assert url == thumbnail.image.url
+
+
+def test_cache_thumbnail_names(collection, media_root, settings):
+    # given
+    settings.THUMBNAIL_CACHE_TIMEOUT = 60
+    thumbnail_mock = MagicMock(spec=File)
+    thumbnail_mock.name = "thumbnail_image.jpg"
+    thumbnail = Thumbnail.objects.create(
+        collection=collection, size=128, format="webp", image=thumbnail_mock
+    )
+
+    # when
+    cache_thumbnail_names("Collection", collection.id, [thumbnail])
+
+    # then
+    keys = [(collection.id, 128, "webp"), (collection.id, 128, None)]
+    assert get_cached_thumbnail_names("Collection", keys) == {
+        (collection.id, 128, "webp"): thumbnail.image.name
+    }
+
+
+def test_cached_thumbnail_name_removed_on_thumbnail_delete(
+    collection, media_root, settings, django_capture_on_commit_callbacks
+):
+    # given
+    settings.THUMBNAIL_CACHE_TIMEOUT = 60
+    thumbnail_mock = MagicMock(spec=File)
+    thumbnail_mock.name = "thumbnail_image.jpg"
+    thumbnail = Thumbnail.objects.create(
+        collection=collection, size=128, image=thumbnail_mock
+    )
+    cache_thumbnail_names("Collection", collection.id, [thumbnail])
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        thumbnail.delete()
+
+    # then
+    keys = [(collection.id, 128, None)]
+    assert get_cached_thumbnail_names("Collection", keys) == {}
+
+
+def test_processed_image_create_thumbnails(media_root):
+    # given
+    image_data = BytesIO()
+    Image.new("RGB", size=(300, 200)).save(image_data, format="JPEG")
+    image_path = default_storage.save("image.jpg", ContentFile(image_data.getvalue()))
+
+    # when
+    thumbnails = ProcessedImage(image_path).create_thumbnails(
+        sizes=[32, 128, 64], formats=[None, "webp"]
+    )
+
+    # then
+    assert set(thumbnails) == {
+        (size, format) for size in [32, 64, 128] for format in [None, "webp"]
+    }
+    for (size, format), thumbnail_file in thumbnails.items():
+        thumbnail = Image.open(thumbnail_file)
+        assert thumbnail.format == ("WEBP" if format else "JPEG")
+        assert thumbnail.width == size
+        assert abs(thumbnail.height - size * 2 / 3) <= 1
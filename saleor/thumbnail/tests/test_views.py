@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import graphene
 
 from .. import ThumbnailFormat
@@ -109,6 +111,48 @@ def test_handle_thumbnail_view_for_product_media(
     assert Thumbnail.objects.count() == thumbnail_count + 1
 
 
+@patch("saleor.thumbnail.views.create_thumbnails_task.delay")
+def test_handle_thumbnail_view_with_pregeneration_enabled(
+    create_thumbnails_task_mock, client, category_with_image, settings
+):
+    # given
+    settings.THUMBNAIL_PREGENERATION_ENABLED = True
+    size = 60
+    category_id = graphene.Node.to_global_id("Category", category_with_image.id)
+
+    # when
+    response = client.get(f"/thumbnail/{category_id}/{size}/")
+    second_response = client.get(f"/thumbnail/{category_id}/{size}/")
+
+    # then
+    assert response.status_code == 302
+    assert response.url == category_with_image.background_image.url
+    assert second_response.url == category_with_image.background_image.url
+    assert not Thumbnail.objects.exists()
+    create_thumbnails_task_mock.assert_called_once_with(
+        "Category", category_with_image.pk
+    )
+
+
+def test_handle_thumbnail_view_thumbnail_name_cached(
+    client, category_with_image, settings, django_assert_num_queries
+):
+    # given
+    settings.THUMBNAIL_CACHE_TIMEOUT = 60
+    size = 64
+    category_id = graphene.Node.to_global_id("Category", category_with_image.id)
+    response = client.get(f"/thumbnail/{category_id}/{size}/")
+
+    # when
+    with django_assert_num_queries(0):
+        cached_response = client.get(f"/thumbnail/{category_id}/{size}/")
+
+    # then
+    assert cached_response.status_code == 302
+    assert cached_response.url == response.url
+    assert cached_response.url == Thumbnail.objects.get().image.url
+
+
 def test_handle_thumbnail_view_for_category_thumbnail_already_exist(
     client, category, settings, image, media_root
 ):
@@ -1,9 +1,12 @@
 from io import BytesIO
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Union
 
 import graphene
 import magic
+from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage
+from django.db import transaction
 from django.urls import reverse
 from PIL import Image
 
@@ -55,6 +58,63 @@ def prepare_thumbnail_file_name(
     return file_path + f"_thumbnail_{size}." + file_ext
 
 
+def get_thumbnail_cache_key(
+    object_type: str, instance_id, size: int, format: Optional[str]
+) -> str:
+    """Return the cache key of the thumbnail file name.
+
+    The `instance_id` is the ID used in the thumbnail proxy URL, i.e. the UUID
+    for users and the primary key for the other types.
+    """
+    format = format.lower() if format else ""
+    return f"thumbnail:{object_type}:{instance_id}:{size}:{format}"
+
+
+def get_cached_thumbnail_names(
+    object_type: str, keys: Iterable[Tuple[object, int, Optional[str]]]
+) -> Dict[Tuple[object, int, Optional[str]], str]:
+    """Return cached thumbnail file names for (instance ID, size, format) keys."""
+    if not settings.THUMBNAIL_CACHE_TIMEOUT:
+        return {}
+    cache_keys = {get_thumbnail_cache_key(object_type, *key): key for key in set(keys)}
+    return {
+        cache_keys[cache_key]: name
+        for cache_key, name in cache.get_many(cache_keys).items()
+    }
+
+
+def cache_thumbnail_names(
+    object_type: str, instance_id, thumbnails: Iterable["Thumbnail"]
+):
+    """Cache file names of the instance thumbnails by their size and format."""
+    if not settings.THUMBNAIL_CACHE_TIMEOUT:
+        return
+    cache.set_many(
+        {
+            get_thumbnail_cache_key(
+                object_type, instance_id, thumbnail.size, thumbnail.format
+            ): thumbnail.image.name
+            for thumbnail in thumbnails
+        },
+        timeout=settings.THUMBNAIL_CACHE_TIMEOUT,
+    )
+
+
+def delete_cached_thumbnail_name(
+    object_type: str, instance_id, size: int, format: Optional[str]
+):
+    """Remove the thumbnail file name from the cache.
+
+    The name is removed again once the transaction is committed, so it isn't
+    cached back by requests that still see the thumbnail in the database.
+    """
+    if not settings.THUMBNAIL_CACHE_TIMEOUT:
+        return
+    cache_key = get_thumbnail_cache_key(object_type, instance_id, size, format)
+    cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
 class ProcessedImage:
     EXIF_ORIENTATION_KEY = 274
     # Whether to create progressive JPEGs. Read more about progressive JPEGs
@@ -74,7 +134,7 @@ class ProcessedImage:
     def __init__(
         self,
         image_path: str,
-        size: int,
+        size: Optional[int] = None,
         format: Optional[str] = None,
         storage=default_storage,
     ):
@@ -92,6 +152,33 @@ class ProcessedImage:
         )
         return image_file
 
+    def create_thumbnails(
+        self, sizes: Iterable[int], formats: Iterable[Optional[str]]
+    ) -> Dict[Tuple[int, Optional[str]], BytesIO]:
+        """Return thumbnails in all given sizes and formats, by (size, format).
+
+        The source image is retrieved and decoded once. JPEG images are decoded
+        in draft mode, at the smallest scale that still fits the largest size.
+        For every format, each size is produced from the previous, bigger one.
+        """
+        sizes = sorted(set(sizes), reverse=True)
+        image, image_format = self.retrieve_image()
+        if image_format == "JPEG":
+            image.draft(None, (sizes[0], sizes[0]))
+        image = self.apply_exif_orientation(image)
+
+        thumbnails = {}
+        for format in formats:
+            thumbnail, save_kwargs = self.preprocess_format(
+                image.copy(), format or image_format
+            )
+            for size in sizes:
+                thumbnail.thumbnail((size, size))
+                image_file = BytesIO()
+                thumbnail.save(image_file, **save_kwargs)
+                thumbnails[(size, format)] = image_file
+        return thumbnails
+
     def retrieve_image(self):
         """Return a PIL Image instance stored at `image_path`."""
         image = self.storage.open(self.image_path, "rb")
@@ -130,10 +217,11 @@ class ProcessedImage:
                     arguments, return an empty dict ({}).
 
         """
-        format = self.format or image_format
-        save_kwargs = {"format": format}
+        image = self.apply_exif_orientation(image)
+        return self.preprocess_format(image, self.format or image_format)
 
-        # Ensuring image is properly rotated
+    def apply_exif_orientation(self, image):
+        """Return the image rotated according to its EXIF orientation."""
         if hasattr(image, "_getexif"):
             exif_datadict = image._getexif()  # returns None if no EXIF data
             if exif_datadict is not None:
@@ -145,6 +233,11 @@ class ProcessedImage:
                     image = image.transpose(Image.ROTATE_270)
                 elif orientation == 8:
                     image = image.transpose(Image.ROTATE_90)
+        return image
+
+    def preprocess_format(self, image, format):
+        """Call the pre-processor of the format and return the `preprocess` 2-tuple."""
+        save_kwargs = {"format": format}
 
         # Ensure any embedded ICC profile is preserved
         save_kwargs["icc_profile"] = image.info.get("icc_profile")
@@ -1,24 +1,25 @@
-from collections import namedtuple
-
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.files.storage import default_storage
 from django.http import HttpResponseNotFound, HttpResponseRedirect
 from graphql.error import GraphQLError
 
-from ..account.models import User
 from ..graphql.core.utils import from_global_id_or_error
-from ..product.models import Category, Collection, ProductMedia
-from ..thumbnail.models import Thumbnail
+from ..thumbnail.models import TYPE_TO_MODEL_DATA_MAPPING, Thumbnail
 from . import ThumbnailFormat
-from .utils import ProcessedImage, get_thumbnail_size, prepare_thumbnail_file_name
-
-ModelData = namedtuple("ModelData", ["model", "image_field", "thumbnail_field"])
-
-TYPE_TO_MODEL_DATA_MAPPING = {
-    "User": ModelData(User, "avatar", "user"),
-    "Category": ModelData(Category, "background_image", "category"),
-    "Collection": ModelData(Collection, "background_image", "collection"),
-    "ProductMedia": ModelData(ProductMedia, "image", "product_media"),
-}
+from .tasks import (
+    THUMBNAILS_PENDING_TIMEOUT,
+    create_thumbnails_task,
+    get_thumbnails_pending_cache_key,
+)
+from .utils import (
+    ProcessedImage,
+    cache_thumbnail_names,
+    get_cached_thumbnail_names,
+    get_thumbnail_size,
+    prepare_thumbnail_file_name,
+)
 
 
 def handle_thumbnail(request, instance_id: str, size: str, format: str = None):
@@ -26,6 +27,8 @@ def handle_thumbnail(request, instance_id: str, size: str, format: str = None):
 
     If the provided size is not in the available resolution list, the thumbnail with
     the closest available size is created and returned, if it does not exist.
+    With thumbnails pre-generation enabled, missing thumbnails are scheduled
+    for creation in the worker and the original image is returned meanwhile.
     """
     # check formats
     format = format.lower() if format else None
@@ -46,6 +49,12 @@ def handle_thumbnail(request, instance_id: str, size: str, format: str = None):
     size: int = get_thumbnail_size(size)
 
     # return the thumbnail if it's already exist
+    cached_thumbnail_names = get_cached_thumbnail_names(
+        object_type, [(pk, size, format)]
+    )
+    if thumbnail_name := cached_thumbnail_names.get((pk, size, format)):
+        return HttpResponseRedirect(default_storage.url(thumbnail_name))
+
     model_data = TYPE_TO_MODEL_DATA_MAPPING[object_type]
     if object_type == "User":
         instance_id_lookup = "user__uuid"
@@ -55,6 +64,7 @@ def handle_thumbnail(request, instance_id: str, size: str, format: str = None):
     if thumbnail := Thumbnail.objects.filter(
         format=format, size=size, **{instance_id_lookup: pk}
     ).first():
+        cache_thumbnail_names(object_type, pk, [thumbnail])
         return HttpResponseRedirect(thumbnail.image.url)
 
     try:
@@ -69,6 +79,12 @@ def handle_thumbnail(request, instance_id: str, size: str, format: str = None):
     if not bool(image):
         return HttpResponseNotFound("There is no image for provided instance.")
 
+    if settings.THUMBNAIL_PREGENERATION_ENABLED:
+        cache_key = get_thumbnails_pending_cache_key(object_type, instance.pk)
+        if cache.add(cache_key, True, timeout=THUMBNAILS_PENDING_TIMEOUT):
+            create_thumbnails_task.delay(object_type, instance.pk)
+        return HttpResponseRedirect(image.url)
+
     # prepare thumbnail
     processed_image = ProcessedImage(image.name, size, format)
     thumbnail_file = processed_image.create_thumbnail()
@@ -81,5 +97,6 @@ def handle_thumbnail(request, instance_id: str, size: str, format: str = None):
     )
     thumbnail.image.save(thumbnail_file_name, thumbnail_file)
     thumbnail.save()
+    cache_thumbnail_names(object_type, pk, [thumbnail])
 
     return HttpResponseRedirect(thumbnail.image.url)
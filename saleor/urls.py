@@ -6,7 +6,7 @@ from django.views.decorators.csrf import csrf_exempt
 
 from .core.views import jwks
 from .graphql.api import schema
-from .graphql.views import GraphQLView
+from .graphql.views import AsyncGraphQLView, GraphQLView
 from .plugins.views import (
     handle_global_plugin_webhook,
     handle_plugin_per_channel_webhook,
@@ -15,8 +15,13 @@ from .plugins.views import (
 from .product.views import digital_product
 from .thumbnail.views import handle_thumbnail
 
+if settings.GRAPHQL_ASYNC_VIEW_THREADS:
+    graphql_view = AsyncGraphQLView.as_view(schema=schema)
+else:
+    graphql_view = csrf_exempt(GraphQLView.as_view(schema=schema))
+
 urlpatterns = [
-    re_path(r"^graphql/$", csrf_exempt(GraphQLView.as_view(schema=schema)), name="api"),
+    re_path(r"^graphql/$", graphql_view, name="api"),
     re_path(
         r"^digital-download/(?P<token>[0-9A-Za-z_\-]+)/$",
         digital_product,
@@ -1,11 +1,23 @@
 import math
 from collections import defaultdict, namedtuple
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, cast
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 
+from django.conf import settings
 from django.db import transaction
 from django.db.models import F, Sum
 from django.db.models.expressions import Exists, OuterRef
-from django.db.models.functions import Coalesce
 
 from ..channel import AllocationStrategy
 from ..checkout.models import CheckoutLine
@@ -19,6 +31,7 @@ from ..core.tracing import traced_atomic_transaction
 from ..order.fetch import OrderLineInfo
 from ..order.models import OrderLine
 from ..plugins.manager import PluginsManager
+from ..product.listing_index import mark_products_listing_index_dirty_on_commit
 from ..product.models import ProductVariant, ProductVariantChannelListing
 from .models import (
     Allocation,
@@ -29,6 +42,12 @@ from .models import (
     Stock,
     Warehouse,
 )
+from .shards import (
+    create_missing_stock_shards,
+    fold_stock_shards,
+    release_stock_shards,
+    take_quantity_from_stock_shards,
+)
 
 if TYPE_CHECKING:
     from uuid import UUID
@@ -40,6 +59,25 @@ if TYPE_CHECKING:
 StockData = namedtuple("StockData", ["pk", "quantity"])
 
 
+@dataclass
+class StockAllocationRequest:
+    """Order lines of a single order to allocate with `allocate_stocks_in_bulk`."""
+
+    order_lines_info: Iterable["OrderLineInfo"]
+    country_code: str
+    channel: "Channel"
+    collection_point_pk: Optional[str] = None
+    additional_filter_lookup: Optional[Dict[str, Any]] = None
+    check_reservations: bool = False
+    checkout_lines: Optional[Iterable["CheckoutLine"]] = None
+
+
+@dataclass
+class StockAllocationResult:
+    allocations: List[Allocation] = field(default_factory=list)
+    insufficient_stock: List[InsufficientStockData] = field(default_factory=list)
+
+
 @traced_atomic_transaction()
 def allocate_stocks(
     order_lines_info: Iterable["OrderLineInfo"],
@@ -53,137 +91,418 @@ def allocate_stocks(
 ):
     """Allocate stocks for given `order_lines` in given country.
 
-    Function lock for update all stocks and allocations for variants in
-    given country and order by pk. Next, generate the dictionary
-    ({"stock_pk": "quantity_allocated"}) with actual allocated quantity for stocks.
-    Iterate by stocks and allocate as many items as needed or available in stock
-    for order line, until allocated all required quantity for the order line.
-    If there is less quantity in stocks then rise InsufficientStock exception.
+    Allocate as many items as needed or available in the stocks of the channel
+    for every order line. If there is less quantity in stocks then rise
+    InsufficientStock exception. See `allocate_stocks_in_bulk` for details.
     """
-    # allocation only applied to order lines with variants with track inventory
-    # set to True
-    order_lines_info = get_order_lines_with_track_inventory(order_lines_info)
-    if not order_lines_info:
-        return
+    request = StockAllocationRequest(
+        order_lines_info=order_lines_info,
+        country_code=country_code,
+        channel=channel,
+        collection_point_pk=collection_point_pk,
+        additional_filter_lookup=additional_filter_lookup,
+        check_reservations=check_reservations,
+        checkout_lines=checkout_lines,
+    )
+    [result] = allocate_stocks_in_bulk([request], manager)
+    if result.insufficient_stock:
+        raise InsufficientStock(result.insufficient_stock)
 
-    channel_slug = channel.slug
 
-    variants = [line_info.variant for line_info in order_lines_info]
-    filter_lookup = {"product_variant__in": variants}
+@traced_atomic_transaction()
+def allocate_stocks_in_bulk(
+    requests: List[StockAllocationRequest], manager: PluginsManager
+) -> List[StockAllocationResult]:
+    """Allocate stocks for many orders at once.
+
+    Function lock for update all stocks available for the orders in a single query
+    ordered by pk, so every stock is locked once and concurrent batches don't
+    deadlock. Next, allocate the order lines in memory one order after another,
+    using the allocation strategy of the order channel and the quantities already
+    allocated to the preceding orders. An order with insufficient stock gets no
+    allocations and doesn't affect the other orders. Allocations and stock
+    `quantity_allocated` updates of all orders are written in bulk.
+
+    When `settings.STOCK_SHARDS` is set, orders are first allocated from the stock
+    shards without locking the stocks, see `_allocate_stocks_from_shards`. Only the
+    orders that can't be served by the shards are allocated with stocks locked,
+    from the stock quantity and the released quantity of not used shards. Stock
+    `quantity_allocated` is updated only for the allocations made with stocks
+    locked; shard allocations are added when the shards are folded.
+
+    Only order lines with variants with track inventory set to True are allocated.
+    Return the allocation result of every request, in the same order.
+
+    Orders are not coalesced into batches yet: `allocate_stocks` calls this function
+    with a single request, so orders completed concurrently still lock their stocks
+    in separate transactions. Callers have to collect the requests themselves to
+    benefit from the single locking pass.
+    """
+    results = [StockAllocationResult() for _ in requests]
+    lines_per_request = [
+        get_order_lines_with_track_inventory(request.order_lines_info)
+        for request in requests
+    ]
+    stock_ids_per_request = _get_stock_ids_per_request(requests, lines_per_request)
 
-    if additional_filter_lookup is not None:
-        filter_lookup.update(additional_filter_lookup)
+    stocks: Dict[int, dict] = {}
+    quantity_allocation_for_stocks: Dict[int, int] = defaultdict(int)
+    shard_allocations: List[Allocation] = []
+    allocations: List[Allocation] = []
+    pending_requests = list(range(len(requests)))
+    if settings.STOCK_SHARDS:
+        stocks = _get_stocks_data(set().union(*stock_ids_per_request))
+        quantity_allocation_for_stocks = _get_quantity_allocation(stocks)
+        pending_requests = _allocate_stocks_from_shards(
+            requests,
+            lines_per_request,
+            stock_ids_per_request,
+            results,
+            stocks,
+            quantity_allocation_for_stocks,
+        )
+        for result in results:
+            shard_allocations.extend(result.allocations)
+
+    if pending_requests:
+        requests = [requests[index] for index in pending_requests]
+        lines_per_request = [lines_per_request[index] for index in pending_requests]
+        stock_ids_per_request = [
+            stock_ids_per_request[index] for index in pending_requests
+        ]
+        locked_stocks = _get_stocks_data(set().union(*stock_ids_per_request), lock=True)
+        # the quantity leased to shards is read before the allocations, so a shard
+        # allocation committed in between is counted twice rather than not at all
+        quantity_leased_for_stocks: DefaultDict[int, int] = defaultdict(int)
+        if settings.STOCK_SHARDS:
+            quantity_leased_for_stocks = release_stock_shards(locked_stocks)
+            create_missing_stock_shards(locked_stocks)
+        locked_quantity_allocation = _get_quantity_allocation(locked_stocks)
+        for allocation in shard_allocations:
+            locked_quantity_allocation[
+                allocation.stock_id
+            ] += allocation.quantity_allocated
+        stocks.update(locked_stocks)
+        for stock_id in locked_stocks:
+            quantity_allocation_for_stocks[stock_id] = locked_quantity_allocation[
+                stock_id
+            ]
+        reservations = _get_stock_reservations(requests, locked_stocks)
 
-    # in case of click and collect order, we need to check local or global stock
-    # regardless of the country code
-    stocks = (
-        Stock.objects.for_channel_and_click_and_collect(channel_slug)
-        if collection_point_pk
-        else Stock.objects.for_channel_and_country(channel_slug, country_code)
-    )
+        for request, lines_info, stock_ids, result in zip(
+            requests,
+            lines_per_request,
+            stock_ids_per_request,
+            [results[index] for index in pending_requests],
+        ):
+            quantity_reservation_for_stocks = defaultdict(
+                int, quantity_leased_for_stocks
+            )
+            if request.check_reservations:
+                checkout_line_ids = {line.pk for line in request.checkout_lines or []}
+                for stock_id, checkout_line_id, quantity_reserved in reservations:
+                    if checkout_line_id not in checkout_line_ids:
+                        quantity_reservation_for_stocks[stock_id] += quantity_reserved
+
+            # quantities are allocated on a copy, so a failed order doesn't change
+            # them
+            order_quantity_allocation = defaultdict(int, quantity_allocation_for_stocks)
+            variant_to_stocks = _get_variant_to_stocks(
+                request, stock_ids, stocks, order_quantity_allocation
+            )
+            for line_info in lines_info:
+                line_info.variant = cast(ProductVariant, line_info.variant)
+                insufficient_stock, line_allocations = _create_allocations(
+                    line_info,
+                    variant_to_stocks[line_info.variant.pk],
+                    order_quantity_allocation,
+                    quantity_reservation_for_stocks,
+                    result.insufficient_stock,
+                )
+                for allocation in line_allocations:
+                    order_quantity_allocation[
+                        allocation.stock_id
+                    ] += allocation.quantity_allocated
+                result.allocations.extend(line_allocations)
+
+            if result.insufficient_stock:
+                result.allocations = []
+            else:
+                quantity_allocation_for_stocks = order_quantity_allocation
+                allocations.extend(result.allocations)
+
+    if shard_allocations or allocations:
+        _save_allocations(
+            shard_allocations,
+            allocations,
+            stocks,
+            quantity_allocation_for_stocks,
+            manager,
+        )
+    return results
 
-    stocks = list(
-        stocks.select_for_update(of=("self",))
-        .filter(**filter_lookup)
-        .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity", "warehouse_id")
-    )
-    stocks_id = (stock.pop("id") for stock in stocks)
 
-    quantity_reservation_for_stocks: Dict = _prepare_stock_to_reserved_quantity_map(
-        checkout_lines, check_reservations, stocks_id
-    )
+def _allocate_stocks_from_shards(
+    requests: List[StockAllocationRequest],
+    lines_per_request: List[Iterable["OrderLineInfo"]],
+    stock_ids_per_request: List[Set[int]],
+    results: List[StockAllocationResult],
+    stocks: Dict[int, dict],
+    quantity_allocation_for_stocks: Dict[int, int],
+) -> List[int]:
+    """Allocate orders from the shards of their stocks, without locking the stocks.
+
+    Stocks are tried in the order of the channel allocation strategy. Quantity of
+    every order is taken from the shards in a savepoint, so an order the shards
+    can't fully serve releases the taken quantity and the shard locks. Shards are
+    split from the stock quantity that was neither allocated nor reserved when they
+    were folded, so only the quantity that is still not allocated nor reserved by
+    other checkouts is taken from them. Return indexes of the requests that have
+    to be allocated with stocks locked.
+    """
+    reservations = _get_stock_reservations(requests, stocks)
+    pending_requests = []
+    for index, (request, lines_info, stock_ids, result) in enumerate(
+        zip(requests, lines_per_request, stock_ids_per_request, results)
+    ):
+        variant_to_stocks = _get_variant_to_stocks(
+            request, stock_ids, stocks, quantity_allocation_for_stocks
+        )
+        quantity_available_for_stocks = {
+            stock_id: stocks[stock_id]["quantity"]
+            - quantity_allocation_for_stocks[stock_id]
+            for stock_id in stock_ids
+            if stock_id in stocks
+        }
+        if request.check_reservations:
+            checkout_line_ids = {line.pk for line in request.checkout_lines or []}
+            for stock_id, checkout_line_id, quantity_reserved in reservations:
+                if (
+                    stock_id in quantity_available_for_stocks
+                    and checkout_line_id not in checkout_line_ids
+                ):
+                    quantity_available_for_stocks[stock_id] -= quantity_reserved
+        savepoint_id = transaction.savepoint()
+        allocations = _take_order_lines_from_shards(
+            lines_info, variant_to_stocks, quantity_available_for_stocks
+        )
+        if allocations is None:
+            transaction.savepoint_rollback(savepoint_id)
+            pending_requests.append(index)
+            continue
+        transaction.savepoint_commit(savepoint_id)
+        result.allocations = allocations
+        for allocation in allocations:
+            quantity_allocation_for_stocks[
+                allocation.stock_id
+            ] += allocation.quantity_allocated
+    return pending_requests
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
+
+def _take_order_lines_from_shards(
+    lines_info: Iterable["OrderLineInfo"],
+    variant_to_stocks: Dict[int, List[StockData]],
+    quantity_available_for_stocks: Dict[int, int],
+) -> Optional[List[Allocation]]:
+    """Take quantity of the order lines from the stock shards.
+
+    No more than the available quantity of the stock is taken from its shards.
+    Return None if the shards don't have enough quantity for all the lines.
+    """
+    allocations = []
+    for line_info in lines_info:
+        line_info.variant = cast(ProductVariant, line_info.variant)
+        quantity_to_allocate = line_info.quantity
+        for stock_data in variant_to_stocks[line_info.variant.pk]:
+            quantity_available = min(
+                quantity_to_allocate,
+                quantity_available_for_stocks.get(stock_data.pk, 0),
+            )
+            if quantity_available <= 0:
+                continue
+            quantity = take_quantity_from_stock_shards(
+                stock_data.pk, quantity_available
+            )
+            quantity_available_for_stocks[stock_data.pk] -= quantity
+            if quantity:
+                allocations.append(
+                    Allocation(
+                        order_line=line_info.line,
+                        stock_id=stock_data.pk,
+                        quantity_allocated=quantity,
+                    )
+                )
+                quantity_to_allocate -= quantity
+            if not quantity_to_allocate:
+                break
+        if quantity_to_allocate:
+            return None
+    return allocations
+
+
+def _get_stocks_data(stock_ids: Iterable[int], lock: bool = False) -> Dict[int, dict]:
+    stocks = Stock.objects.filter(pk__in=stock_ids)
+    if lock:
+        stocks = stocks.select_for_update(of=("self",))
+    return {
+        stock_data["pk"]: stock_data
+        for stock_data in stocks.order_by("pk").values(
+            "pk", "product_variant_id", "quantity", "warehouse_id"
         )
-        .values("stock")
+    }
+
+
+def _get_quantity_allocation(stock_ids: Iterable[int]) -> Dict[int, int]:
+    quantity_allocation_for_stocks: Dict[int, int] = defaultdict(int)
+    for stock_id, quantity_allocated in (
+        Allocation.objects.filter(stock_id__in=stock_ids, quantity_allocated__gt=0)
+        .order_by()
+        .values("stock_id")
         .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
-    )
-    quantity_allocation_for_stocks: Dict = defaultdict(int)
-    for allocation_data in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation_data["stock"]] += allocation_data[
-            "quantity_allocated_sum"
-        ]
+        .values_list("stock_id", "quantity_allocated_sum")
+    ):
+        quantity_allocation_for_stocks[stock_id] = quantity_allocated
+    return quantity_allocation_for_stocks
 
-    stocks = sort_stocks(
-        channel.allocation_strategy,
-        stocks,
-        channel,
+
+def _get_variant_to_stocks(
+    request: StockAllocationRequest,
+    stock_ids: Set[int],
+    stocks: Dict[int, dict],
+    quantity_allocation_for_stocks: Dict[int, int],
+) -> Dict[int, List[StockData]]:
+    """Return stocks of the request per variant, sorted by the allocation strategy."""
+    request_stocks = sort_stocks(
+        request.channel.allocation_strategy,
+        [dict(stocks[pk]) for pk in sorted(stock_ids) if pk in stocks],
+        request.channel,
         quantity_allocation_for_stocks,
-        collection_point_pk,
+        request.collection_point_pk,
     )
-
     variant_to_stocks: Dict[int, List[StockData]] = defaultdict(list)
-    for stock_data in stocks:
-        variant = stock_data.pop("product_variant")
+    for stock_data in request_stocks:
+        variant = stock_data.pop("product_variant_id")
         variant_to_stocks[variant].append(StockData(**stock_data))
+    return variant_to_stocks
 
-    insufficient_stock: List[InsufficientStockData] = []
-    allocations: List[Allocation] = []
-    for line_info in order_lines_info:
-        line_info.variant = cast(ProductVariant, line_info.variant)
-        stock_allocations = variant_to_stocks[line_info.variant.pk]
-        insufficient_stock, allocation_items = _create_allocations(
-            line_info,
-            stock_allocations,
-            quantity_allocation_for_stocks,
-            quantity_reservation_for_stocks,
-            insufficient_stock,
+
+def _get_stock_ids_per_request(
+    requests: List[StockAllocationRequest],
+    lines_per_request: List[Iterable["OrderLineInfo"]],
+) -> List[Set[int]]:
+    """Return IDs of the stocks available for the order lines of each request.
+
+    Requests with the same channel, country and warehouse lookup share the query.
+    """
+    variant_ids_per_lookup: Dict[tuple, Set[int]] = defaultdict(set)
+    lookup_keys = []
+    for request, lines_info in zip(requests, lines_per_request):
+        lookup_key = (
+            request.channel.slug,
+            request.country_code,
+            request.collection_point_pk,
+            tuple(sorted((request.additional_filter_lookup or {}).items())),
+        )
+        lookup_keys.append(lookup_key)
+        variant_ids_per_lookup[lookup_key].update(
+            line_info.variant.pk for line_info in lines_info  # type: ignore
         )
-        allocations.extend(allocation_items)
 
-    if insufficient_stock:
-        raise InsufficientStock(insufficient_stock)
+    stock_ids_per_lookup: Dict[tuple, Dict[int, Set[int]]] = {}
+    for lookup_key, variant_ids in variant_ids_per_lookup.items():
+        channel_slug, country_code, collection_point_pk, filter_lookup = lookup_key
+        # in case of click and collect order, we need to check local or global stock
+        # regardless of the country code
+        stocks = (
+            Stock.objects.for_channel_and_click_and_collect(channel_slug)
+            if collection_point_pk
+            else Stock.objects.for_channel_and_country(channel_slug, country_code)
+        )
+        variant_stock_ids: Dict[int, Set[int]] = defaultdict(set)
+        for stock_id, variant_id in stocks.filter(
+            product_variant_id__in=variant_ids, **dict(filter_lookup)
+        ).values_list("pk", "product_variant_id"):
+            variant_stock_ids[variant_id].add(stock_id)
+        stock_ids_per_lookup[lookup_key] = variant_stock_ids
 
-    if allocations:
-        stocks_to_update = []
-        for alloc in Allocation.objects.bulk_create(allocations):
-            stock = alloc.stock
-            stock.quantity_allocated = (
-                F("quantity_allocated") + alloc.quantity_allocated
+    return [
+        set().union(
+            *(
+                stock_ids_per_lookup[lookup_key][line_info.variant.pk]  # type: ignore
+                for line_info in lines_info
             )
-            stocks_to_update.append(stock)
-        Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+        )
+        for lookup_key, lines_info in zip(lookup_keys, lines_per_request)
+    ]
 
-        for allocation in allocations:
-            allocated_stock = (
-                Allocation.objects.filter(stock_id=allocation.stock_id).aggregate(
-                    Sum("quantity_allocated")
-                )["quantity_allocated__sum"]
-                or 0
-            )
-            if not max(allocation.stock.quantity - allocated_stock, 0):
-                transaction.on_commit(
-                    lambda: manager.product_variant_out_of_stock(allocation.stock)
-                )
 
+def _get_stock_reservations(
+    requests: List[StockAllocationRequest], stock_ids: Iterable[int]
+) -> List[Tuple[int, int, int]]:
+    """Return not expired reservations of the stocks for requests that check them."""
+    if not any(request.check_reservations for request in requests):
+        return []
+    return list(
+        Reservation.objects.filter(stock_id__in=stock_ids, quantity_reserved__gt=0)
+        .not_expired()
+        .values_list("stock_id", "checkout_line_id", "quantity_reserved")
+    )
 
-def _prepare_stock_to_reserved_quantity_map(
-    checkout_lines, check_reservations, stocks_id
-):
-    """Prepare stock id to quantity reserved map for provided stock ids."""
-    quantity_reservation_for_stocks: Dict = defaultdict(int)
 
-    if check_reservations:
-        quantity_reservation = (
-            Reservation.objects.filter(
-                stock_id__in=stocks_id,
+def _save_allocations(
+    shard_allocations: List[Allocation],
+    allocations: List[Allocation],
+    stocks: Dict[int, dict],
+    quantity_allocation_for_stocks: Dict[int, int],
+    manager: PluginsManager,
+):
+    Allocation.objects.bulk_create(shard_allocations + allocations)
+
+    # `quantity_allocated` of stocks allocated from shards is updated when their
+    # shards are folded, so popular stock rows aren't written by every order
+    locked_quantity_allocated_per_stock: Dict[int, int] = defaultdict(int)
+    for allocation in allocations:
+        locked_quantity_allocated_per_stock[
+            allocation.stock_id
+        ] += allocation.quantity_allocated
+    Stock.objects.bulk_update(
+        [
+            Stock(
+                pk=stock_id,
+                quantity_allocated=F("quantity_allocated") + quantity_allocated,
             )
-            .not_expired()
-            .exclude_checkout_lines(checkout_lines or [])
-            .values("stock")
-            .annotate(
-                quantity_reserved=Coalesce(Sum("quantity_reserved"), 0),
+            for stock_id, quantity_allocated in (
+                locked_quantity_allocated_per_stock.items()
+            )
+        ],
+        ["quantity_allocated"],
+    )
+
+    quantity_allocated_per_stock = defaultdict(int, locked_quantity_allocated_per_stock)
+    for allocation in shard_allocations:
+        quantity_allocated_per_stock[
+            allocation.stock_id
+        ] += allocation.quantity_allocated
+
+    mark_products_listing_index_dirty_on_commit(
+        ProductVariant.objects.filter(
+            pk__in={
+                stocks[stock_id]["product_variant_id"]
+                for stock_id in quantity_allocated_per_stock
+            }
+        ).values_list("product_id", flat=True)
+    )
+
+    out_of_stock_ids = [
+        stock_id
+        for stock_id in quantity_allocated_per_stock
+        if stocks[stock_id]["quantity"] - quantity_allocation_for_stocks[stock_id] <= 0
+    ]
+    if out_of_stock_ids:
+        for stock in Stock.objects.filter(pk__in=out_of_stock_ids):
+            transaction.on_commit(
+                lambda stock=stock: manager.product_variant_out_of_stock(stock)
             )
-        )  # type: ignore
-        for reservation in quantity_reservation:
-            quantity_reservation_for_stocks[reservation["stock"]] += reservation[
-                "quantity_reserved"
-            ]
-    return quantity_reservation_for_stocks
 
 
 def sort_stocks(
@@ -353,6 +672,11 @@ def deallocate_stock(
             )
 
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    mark_products_listing_index_dirty_on_commit(
+        ProductVariant.objects.filter(
+            pk__in={stock.product_variant_id for stock in stocks_to_update}
+        ).values_list("product_id", flat=True)
+    )
 
     if not_dellocated_lines:
         raise AllocationError(not_dellocated_lines)
@@ -398,6 +722,7 @@ def increase_stock(
             )
         stock.quantity_allocated = F("quantity_allocated") + quantity
         stock.save(update_fields=["quantity_allocated"])
+    mark_products_listing_index_dirty_on_commit([order_line.variant.product_id])
 
 
 @traced_atomic_transaction()
@@ -509,6 +834,9 @@ def decrease_stock(
             quantity_allocation_for_stocks,
             allow_stock_to_be_exceeded,
         )
+        mark_products_listing_index_dirty_on_commit(
+            {variant.product_id for variant in variants}
+        )
 
         stock_ids = (s.id for s in stocks)
         for stock in Stock.objects.filter(
@@ -808,6 +1136,10 @@ def deactivate_preorder_for_variant(product_variant: ProductVariant):
 
     if allocations_to_create:
         Allocation.objects.bulk_create(allocations_to_create)
+        if settings.STOCK_SHARDS:
+            fold_stock_shards(
+                [allocation.stock.pk for allocation in allocations_to_create]
+            )
 
     if preorder_allocations:
         preorder_allocations.delete()
@@ -827,6 +1159,7 @@ def deactivate_preorder_for_variant(product_variant: ProductVariant):
     ProductVariantChannelListing.objects.filter(variant_id=product_variant.pk).update(
         preorder_quantity_threshold=None
     )
+    mark_products_listing_index_dirty_on_commit([product_variant.product_id])
 
 
 def _get_stock_for_preorder_allocation(
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse", "0033_stockshard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stockshard",
+            name="dirty",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
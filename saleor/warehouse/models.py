@@ -362,6 +362,25 @@ class Stock(models.Model):
             self.save(update_fields=["quantity"])
 
 
+class StockShard(models.Model):
+    """Part of the free quantity of a stock leased for lock-free allocations.
+
+    Shards are created only when `settings.STOCK_SHARDS` is set, and are
+    periodically recalculated from the stock, its allocations and reservations.
+    Shards are marked as dirty when their quantity is taken, so only stocks of
+    the marked shards are recalculated.
+    """
+
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name="shards")
+    index = models.PositiveSmallIntegerField()
+    quantity = models.IntegerField(default=0)
+    dirty = models.BooleanField(default=False, db_index=True)
+
+    class Meta:
+        unique_together = [["stock", "index"]]
+        ordering = ("pk",)
+
+
 class AllocationQueryset(models.QuerySet):
     def annotate_stock_available_quantity(self):
         return self.annotate(
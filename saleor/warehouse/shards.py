@@ -0,0 +1,182 @@
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import Allocation, Reservation, Stock, StockShard
+
+STOCK_SHARDS_FOLD_BATCH_SIZE = 500
+
+
+def take_quantity_from_stock_shards(stock_id: int, quantity: int) -> int:
+    """Take up to the given quantity from the shards of the stock.
+
+    Shards are tried one at a time in random order, and shards locked by
+    concurrent allocations are skipped, so orders of the same variant don't wait
+    for each other. Return the quantity taken.
+    """
+    taken = 0
+    used_shard_ids: List[int] = []
+    while taken < quantity:
+        shard = (
+            StockShard.objects.select_for_update(skip_locked=True)
+            .filter(stock_id=stock_id, quantity__gt=0)
+            .exclude(pk__in=used_shard_ids)
+            .order_by("?")
+            .first()
+        )
+        if shard is None:
+            break
+        quantity_to_take = min(shard.quantity, quantity - taken)
+        shard.quantity -= quantity_to_take
+        shard.dirty = True
+        shard.save(update_fields=["quantity", "dirty"])
+        taken += quantity_to_take
+        used_shard_ids.append(shard.pk)
+    return taken
+
+
+def release_stock_shards(stock_ids: Iterable[int]) -> DefaultDict[int, int]:
+    """Release the quantity of shards that aren't locked by concurrent allocations.
+
+    Used by allocations made with the stocks locked, so the released quantity can
+    be allocated directly from the stocks until the next fold. Return the quantity
+    that stays leased to the locked shards of each stock.
+    """
+    shard_ids = list(
+        StockShard.objects.select_for_update(skip_locked=True)
+        .filter(stock_id__in=stock_ids, quantity__gt=0)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    StockShard.objects.filter(pk__in=shard_ids).update(quantity=0, dirty=True)
+    return get_stock_shards_quantity(stock_ids)
+
+
+def create_missing_stock_shards(stock_ids: Iterable[int]):
+    """Create empty shards marked as dirty for stocks without shards.
+
+    The shards are filled by the next fold, so stocks created after sharding was
+    enabled start to be allocated from shards.
+    """
+    stock_ids = list(stock_ids)
+    sharded_stock_ids = set(
+        StockShard.objects.filter(stock_id__in=stock_ids)
+        .order_by()
+        .values_list("stock_id", flat=True)
+        .distinct()
+    )
+    StockShard.objects.bulk_create(
+        [
+            StockShard(stock_id=stock_id, index=index, quantity=0, dirty=True)
+            for stock_id in stock_ids
+            if stock_id not in sharded_stock_ids
+            for index in range(settings.STOCK_SHARDS)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def get_stock_ids_with_dirty_shards() -> List[int]:
+    """Return IDs of stocks with shards used since the last fold."""
+    return list(
+        StockShard.objects.filter(dirty=True)
+        .order_by("stock_id")
+        .values_list("stock_id", flat=True)
+        .distinct()
+    )
+
+
+def get_stock_shards_quantity(stock_ids: Iterable[int]) -> DefaultDict[int, int]:
+    """Return the quantity leased to the shards of each stock."""
+    quantities: DefaultDict[int, int] = defaultdict(int)
+    for stock_id, quantity in (
+        StockShard.objects.filter(stock_id__in=stock_ids, quantity__gt=0)
+        .order_by()
+        .values("stock_id")
+        .annotate(quantity_sum=Sum("quantity"))
+        .values_list("stock_id", "quantity_sum")
+    ):
+        quantities[stock_id] = quantity
+    return quantities
+
+
+def fold_stock_shards(stock_ids: Iterable[int], skip_locked: bool = False) -> List[int]:
+    """Fold the shards of the stocks back into the stocks and split them again.
+
+    Stock `quantity_allocated` is recalculated from the allocations, and the
+    quantity that is neither allocated nor reserved is split evenly into
+    `settings.STOCK_SHARDS` shards, or the shards are removed when sharding is
+    disabled. With `skip_locked`, stocks and shards locked by pending allocations
+    are left for the next run. Return IDs of folded stocks.
+    """
+    with transaction.atomic():
+        stocks = {
+            stock.pk: stock
+            for stock in Stock.objects.select_for_update(skip_locked=skip_locked)
+            .filter(pk__in=stock_ids)
+            .order_by("pk")
+        }
+        locked_shards_count: DefaultDict[int, int] = defaultdict(int)
+        for stock_id in (
+            StockShard.objects.select_for_update(skip_locked=skip_locked)
+            .filter(stock_id__in=stocks)
+            .order_by("pk")
+            .values_list("stock_id", flat=True)
+        ):
+            locked_shards_count[stock_id] += 1
+        if skip_locked:
+            for stock_id, shards_count in (
+                StockShard.objects.filter(stock_id__in=stocks)
+                .order_by()
+                .values("stock_id")
+                .annotate(shards_count=Count("pk"))
+                .values_list("stock_id", "shards_count")
+            ):
+                if locked_shards_count[stock_id] != shards_count:
+                    del stocks[stock_id]
+
+        quantity_allocated = _get_quantity_per_stock(
+            Allocation.objects.filter(stock_id__in=stocks), "quantity_allocated"
+        )
+        quantity_reserved = _get_quantity_per_stock(
+            Reservation.objects.filter(stock_id__in=stocks).not_expired(),
+            "quantity_reserved",
+        )
+        shards_count = settings.STOCK_SHARDS
+        shards = []
+        for stock in stocks.values():
+            stock.quantity_allocated = quantity_allocated.get(stock.pk, 0)
+            free_quantity = max(
+                stock.quantity
+                - stock.quantity_allocated
+                - quantity_reserved.get(stock.pk, 0),
+                0,
+            )
+            if not shards_count:
+                continue
+            quantity, remainder = divmod(free_quantity, shards_count)
+            for index in range(shards_count):
+                shards.append(
+                    StockShard(
+                        stock=stock,
+                        index=index,
+                        quantity=quantity + (1 if index < remainder else 0),
+                    )
+                )
+
+        StockShard.objects.filter(stock_id__in=stocks).delete()
+        StockShard.objects.bulk_create(shards)
+        Stock.objects.bulk_update(stocks.values(), ["quantity_allocated"])
+    return list(stocks)
+
+
+def _get_quantity_per_stock(queryset, field_name: str) -> Dict[int, int]:
+    return dict(
+        queryset.order_by()
+        .values("stock_id")
+        .annotate(quantity_sum=Sum(field_name))
+        .values_list("stock_id", "quantity_sum")
+    )
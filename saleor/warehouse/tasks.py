@@ -1,10 +1,16 @@
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.db.models import F, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from ..celeryconf import app
 from .models import Allocation, PreorderReservation, Reservation, Stock
+from .shards import (
+    STOCK_SHARDS_FOLD_BATCH_SIZE,
+    fold_stock_shards,
+    get_stock_ids_with_dirty_shards,
+)
 
 task_logger = get_task_logger(__name__)
 
@@ -54,3 +60,25 @@ def update_stocks_quantity_allocated_task():
         "Finished updating quantity_allocated on stocks, %d were corrected.",
         len(stocks_to_update),
     )
+
+
+@app.task
+def fold_stock_shards_task():
+    """Fold shards of the stocks allocated since their last fold.
+
+    Only stocks with shards marked as dirty by allocations are folded, so the run
+    doesn't scan all stocks and allocations. Stocks locked by pending allocations
+    are folded in the next run.
+    """
+    if not settings.STOCK_SHARDS:
+        return
+    stock_ids = get_stock_ids_with_dirty_shards()
+    folded_count = 0
+    for start in range(0, len(stock_ids), STOCK_SHARDS_FOLD_BATCH_SIZE):
+        batch = stock_ids[start : start + STOCK_SHARDS_FOLD_BATCH_SIZE]  # noqa: E203
+        folded_count += len(fold_stock_shards(batch, skip_locked=True))
+    task_logger.info(
+        "Folded shards of %d stocks, %d were skipped.",
+        folded_count,
+        len(stock_ids) - folded_count,
+    )
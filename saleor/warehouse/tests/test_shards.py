@@ -0,0 +1,83 @@
+from ..models import StockShard
+from ..shards import (
+    fold_stock_shards,
+    release_stock_shards,
+    take_quantity_from_stock_shards,
+)
+
+
+def test_fold_stock_shards(allocation, settings):
+    # given
+    settings.STOCK_SHARDS = 3
+    stock = allocation.stock
+    stock.quantity = 20
+    stock.quantity_allocated = 0
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+
+    # when
+    folded_stock_ids = fold_stock_shards([stock.pk])
+
+    # then
+    assert folded_stock_ids == [stock.pk]
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == allocation.quantity_allocated
+    quantities = list(stock.shards.order_by("index").values_list("quantity", flat=True))
+    assert len(quantities) == 3
+    assert sum(quantities) == stock.quantity - allocation.quantity_allocated
+    assert max(quantities) - min(quantities) <= 1
+
+
+def test_fold_stock_shards_sharding_disabled(stock, settings):
+    # given
+    StockShard.objects.create(stock=stock, index=0, quantity=5)
+    settings.STOCK_SHARDS = 0
+
+    # when
+    fold_stock_shards([stock.pk])
+
+    # then
+    assert not stock.shards.exists()
+
+
+def test_take_quantity_from_stock_shards(stock, settings):
+    # given
+    settings.STOCK_SHARDS = 3
+    stock.quantity = 9
+    stock.save(update_fields=["quantity"])
+    fold_stock_shards([stock.pk])
+
+    # when
+    taken = take_quantity_from_stock_shards(stock.pk, 5)
+
+    # then
+    assert taken == 5
+    assert sum(stock.shards.values_list("quantity", flat=True)) == 4
+    assert stock.shards.filter(dirty=True).exists()
+
+
+def test_take_quantity_from_stock_shards_insufficient_quantity(stock, settings):
+    # given
+    settings.STOCK_SHARDS = 2
+    stock.quantity = 3
+    stock.save(update_fields=["quantity"])
+    fold_stock_shards([stock.pk])
+
+    # when
+    taken = take_quantity_from_stock_shards(stock.pk, 5)
+
+    # then
+    assert taken == 3
+    assert sum(stock.shards.values_list("quantity", flat=True)) == 0
+
+
+def test_release_stock_shards(stock, settings):
+    # given
+    settings.STOCK_SHARDS = 2
+    fold_stock_shards([stock.pk])
+
+    # when
+    leased_quantity = release_stock_shards([stock.pk])
+
+    # then
+    assert leased_quantity[stock.pk] == 0
+    assert sum(stock.shards.values_list("quantity", flat=True)) == 0
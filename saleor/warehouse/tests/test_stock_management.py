@@ -1,8 +1,10 @@
+from datetime import timedelta
 from unittest import mock
 
 import pytest
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from ...channel import AllocationStrategy
 from ...core.exceptions import InsufficientStock
@@ -12,15 +14,18 @@ from ...plugins.manager import get_plugins_manager
 from ...tests.utils import flush_post_commit_hooks
 from ...warehouse.models import Stock
 from ..management import (
+    StockAllocationRequest,
     allocate_preorders,
     allocate_stocks,
+    allocate_stocks_in_bulk,
     deallocate_stock,
     deallocate_stock_for_order,
     decrease_stock,
     increase_allocations,
     increase_stock,
 )
-from ..models import Allocation, ChannelWarehouse, PreorderAllocation
+from ..models import Allocation, ChannelWarehouse, PreorderAllocation, Reservation
+from ..shards import fold_stock_shards
 
 COUNTRY_CODE = "US"
 
@@ -446,6 +451,187 @@ def test_allocate_stock_insufficient_stocks_for_multiple_lines(
     ).exists()
 
 
+def test_allocate_stocks_in_bulk(order_line, order_with_lines, stock, channel_USD):
+    # given
+    stock.quantity = 60
+    stock.save(update_fields=["quantity"])
+    order_line_2 = order_with_lines.lines.first()
+    order_line_2.variant = order_line.variant
+    order_line_2.save(update_fields=["variant"])
+    requests = [
+        StockAllocationRequest(
+            order_lines_info=[
+                OrderLineInfo(line=line, variant=order_line.variant, quantity=30)
+            ],
+            country_code=COUNTRY_CODE,
+            channel=channel_USD,
+        )
+        for line in [order_line, order_line_2]
+    ]
+
+    # when
+    results = allocate_stocks_in_bulk(requests, manager=get_plugins_manager())
+
+    # then
+    assert [len(result.allocations) for result in results] == [1, 1]
+    assert not any(result.insufficient_stock for result in results)
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 60
+    assert Allocation.objects.get(order_line=order_line).quantity_allocated == 30
+    assert Allocation.objects.get(order_line=order_line_2).quantity_allocated == 30
+
+
+def test_allocate_stocks_in_bulk_insufficient_stock_for_one_order(
+    order_line, order_with_lines, stock, channel_USD
+):
+    # given
+    stock.quantity = 50
+    stock.save(update_fields=["quantity"])
+    order_line_2 = order_with_lines.lines.first()
+    order_line_2.variant = order_line.variant
+    order_line_2.save(update_fields=["variant"])
+    requests = [
+        StockAllocationRequest(
+            order_lines_info=[
+                OrderLineInfo(line=line, variant=order_line.variant, quantity=30)
+            ],
+            country_code=COUNTRY_CODE,
+            channel=channel_USD,
+        )
+        for line in [order_line, order_line_2]
+    ]
+
+    # when
+    results = allocate_stocks_in_bulk(requests, manager=get_plugins_manager())
+
+    # then
+    first_result, second_result = results
+    assert len(first_result.allocations) == 1
+    assert not first_result.insufficient_stock
+    assert not second_result.allocations
+    assert second_result.insufficient_stock[0].order_line == order_line_2
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 30
+    assert not Allocation.objects.filter(order_line=order_line_2).exists()
+
+
+def test_allocate_stocks_in_bulk_from_stock_shards(
+    order_line, order_with_lines, stock, channel_USD, settings
+):
+    # given
+    settings.STOCK_SHARDS = 4
+    stock.quantity = 60
+    stock.save(update_fields=["quantity"])
+    fold_stock_shards([stock.pk])
+    order_line_2 = order_with_lines.lines.first()
+    order_line_2.variant = order_line.variant
+    order_line_2.save(update_fields=["variant"])
+    requests = [
+        StockAllocationRequest(
+            order_lines_info=[
+                OrderLineInfo(line=line, variant=order_line.variant, quantity=10)
+            ],
+            country_code=COUNTRY_CODE,
+            channel=channel_USD,
+        )
+        for line in [order_line, order_line_2]
+    ]
+
+    # when
+    results = allocate_stocks_in_bulk(requests, manager=get_plugins_manager())
+
+    # then
+    assert not any(result.insufficient_stock for result in results)
+    assert Allocation.objects.get(order_line=order_line).quantity_allocated == 10
+    assert Allocation.objects.get(order_line=order_line_2).quantity_allocated == 10
+    assert sum(stock.shards.values_list("quantity", flat=True)) == 40
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 0
+
+
+def test_allocate_stocks_in_bulk_stock_shards_with_insufficient_quantity(
+    order_line, stock, channel_USD, settings
+):
+    # given
+    settings.STOCK_SHARDS = 4
+    stock.quantity = 20
+    stock.save(update_fields=["quantity"])
+    fold_stock_shards([stock.pk])
+    stock.increase_stock(10)
+    request = StockAllocationRequest(
+        order_lines_info=[
+            OrderLineInfo(line=order_line, variant=order_line.variant, quantity=30)
+        ],
+        country_code=COUNTRY_CODE,
+        channel=channel_USD,
+    )
+
+    # when
+    [result] = allocate_stocks_in_bulk([request], manager=get_plugins_manager())
+
+    # then
+    assert not result.insufficient_stock
+    assert Allocation.objects.get(order_line=order_line).quantity_allocated == 30
+    assert sum(stock.shards.values_list("quantity", flat=True)) == 0
+
+
+def test_allocate_stocks_in_bulk_stock_without_shards(
+    order_line, stock, channel_USD, settings
+):
+    # given
+    settings.STOCK_SHARDS = 2
+    stock.quantity = 20
+    stock.quantity_allocated = 0
+    stock.save(update_fields=["quantity", "quantity_allocated"])
+    request = StockAllocationRequest(
+        order_lines_info=[
+            OrderLineInfo(line=order_line, variant=order_line.variant, quantity=5)
+        ],
+        country_code=COUNTRY_CODE,
+        channel=channel_USD,
+    )
+
+    # when
+    [result] = allocate_stocks_in_bulk([request], manager=get_plugins_manager())
+
+    # then
+    assert not result.insufficient_stock
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 5
+    assert stock.shards.filter(dirty=True).count() == 2
+
+
+def test_allocate_stocks_in_bulk_stock_shards_with_reservations(
+    order_line, stock, channel_USD, checkout_line, settings
+):
+    # given
+    settings.STOCK_SHARDS = 4
+    stock.quantity = 20
+    stock.save(update_fields=["quantity"])
+    fold_stock_shards([stock.pk])
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=15,
+        reserved_until=timezone.now() + timedelta(minutes=5),
+    )
+    request = StockAllocationRequest(
+        order_lines_info=[
+            OrderLineInfo(line=order_line, variant=order_line.variant, quantity=10)
+        ],
+        country_code=COUNTRY_CODE,
+        channel=channel_USD,
+        check_reservations=True,
+    )
+
+    # when
+    [result] = allocate_stocks_in_bulk([request], manager=get_plugins_manager())
+
+    # then
+    assert result.insufficient_stock
+    assert not Allocation.objects.filter(order_line=order_line).exists()
+
+
 def test_deallocate_stock(allocation):
     stock = allocation.stock
     stock.quantity = 100
@@ -3,9 +3,10 @@ from datetime import timedelta
 import pytest
 from django.utils import timezone
 
-from ..models import PreorderReservation, Reservation
+from ..models import PreorderReservation, Reservation, StockShard
 from ..tasks import (
     delete_expired_reservations_task,
+    fold_stock_shards_task,
     update_stocks_quantity_allocated_task,
 )
 
@@ -85,3 +86,54 @@ def test_update_stocks_quantity_allocated_task_stock_without_allocations(stock):
 
     stock.refresh_from_db()
     assert stock.quantity_allocated == 0
+
+
+def test_fold_stock_shards_task(allocation, stock, settings):
+    # given
+    settings.STOCK_SHARDS = 2
+    stock.quantity_allocated = 0
+    stock.save(update_fields=["quantity_allocated"])
+    StockShard.objects.create(stock=stock, index=0, quantity=0, dirty=True)
+
+    # when
+    fold_stock_shards_task()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == allocation.quantity_allocated
+    assert sum(stock.shards.values_list("quantity", flat=True)) == (
+        stock.quantity - allocation.quantity_allocated
+    )
+
+
+def test_fold_stock_shards_task_skips_stocks_without_dirty_shards(
+    allocation, stock, settings
+):
+    # given
+    settings.STOCK_SHARDS = 2
+    stock.quantity_allocated = 0
+    stock.save(update_fields=["quantity_allocated"])
+    StockShard.objects.create(stock=stock, index=0, quantity=0)
+
+    # when
+    fold_stock_shards_task()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 0
+    assert list(stock.shards.values_list("quantity", flat=True)) == [0]
+
+
+def test_fold_stock_shards_task_sharding_disabled(allocation, stock, settings):
+    # given
+    settings.STOCK_SHARDS = 0
+    stock.quantity_allocated = 0
+    stock.save(update_fields=["quantity_allocated"])
+
+    # when
+    fold_stock_shards_task()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 0
+    assert not stock.shards.exists()
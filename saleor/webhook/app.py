@@ -0,0 +1,25 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class WebhookAppConfig(AppConfig):
+    name = "saleor.webhook"
+
+    def ready(self):
+        from ..app.models import App
+        from .models import Webhook, WebhookEvent
+        from .signals import invalidate_webhooks
+
+        # preventing duplicate signals
+        for signal in [post_save, post_delete]:
+            for model in [Webhook, WebhookEvent, App]:
+                signal.connect(
+                    invalidate_webhooks,
+                    sender=model,
+                    dispatch_uid=f"invalidate_webhooks_{model.__name__}",
+                )
+        m2m_changed.connect(
+            invalidate_webhooks,
+            sender=App.permissions.through,
+            dispatch_uid="invalidate_webhooks_app_permissions",
+        )
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhook", "0008_webhook_subscription_query"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhook",
+            name="batch_size",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -17,6 +17,9 @@ class Webhook(models.Model):
     is_active = models.BooleanField(default=True)
     secret_key = models.CharField(max_length=255, null=True, blank=True)
     subscription_query = models.TextField(null=True, blank=True)
+    # Maximum number of async events sent in a single request; events are sent
+    # one by one, if lower than 2.
+    batch_size = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ("pk",)
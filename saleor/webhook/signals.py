@@ -0,0 +1,5 @@
+from .utils import invalidate_webhooks_cache
+
+
+def invalidate_webhooks(sender, **kwargs):
+    invalidate_webhooks_cache()
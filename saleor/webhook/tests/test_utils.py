@@ -11,7 +11,7 @@ from ..observability.exceptions import (
     TruncationError,
 )
 from ..observability.payload_schema import ObservabilityEventTypes
-from ..utils import get_webhooks_for_event
+from ..utils import _webhooks_registry_cache, get_webhooks_for_event
 
 
 @pytest.fixture
@@ -116,6 +116,37 @@ def test_get_webhook_for_event_not_returning_any_webhook_for_sync_event_types(
     assert set(webhooks) == {sync_webhook}
 
 
+def test_get_webhooks_for_event_from_registry(
+    sync_webhook,
+    async_app_factory,
+    async_type,
+    settings,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.WEBHOOKS_CACHE_ENABLED = True
+    _webhooks_registry_cache.clear()
+    _, async_webhook = async_app_factory()
+    app, any_webhook = async_app_factory(any_webhook=True)
+    get_webhooks_for_event(async_type)
+
+    # when
+    with django_assert_num_queries(0):
+        webhooks = get_webhooks_for_event(async_type)
+    with django_capture_on_commit_callbacks(execute=True):
+        app.permissions.clear()
+    webhooks_after_change = get_webhooks_for_event(async_type)
+
+    # then
+    assert set(webhooks) == {async_webhook, any_webhook}
+    assert get_webhooks_for_event(WebhookEventSyncType.PAYMENT_AUTHORIZE) == [
+        sync_webhook
+    ]
+    assert webhooks_after_change == [async_webhook]
+    _webhooks_registry_cache.clear()
+
+
 @pytest.mark.parametrize(
     "error,event_type",
     [
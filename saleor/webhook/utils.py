@@ -1,26 +1,83 @@
-from typing import TYPE_CHECKING, Optional
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
+from django.conf import settings
 from django.db.models import Q
 from django.db.models.expressions import Exists, OuterRef
 
 from ..app.models import App
+from ..core.utils.versioned_cache import VersionedMemoryCache
 from .event_types import WebhookEventAsyncType, WebhookEventSyncType
 from .models import Webhook, WebhookEvent
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
 
+WEBHOOKS_CACHE_VERSION_KEY = "webhooks_version"
+
+_webhooks_registry_cache: VersionedMemoryCache[
+    Dict[str, List[Webhook]]
+] = VersionedMemoryCache(WEBHOOKS_CACHE_VERSION_KEY)
+
+
+def get_required_permission(event_type: str) -> Optional[str]:
+    permission = WebhookEventAsyncType.PERMISSIONS.get(
+        event_type, WebhookEventSyncType.PERMISSIONS.get(event_type)
+    )
+    return permission.value if permission else None
+
+
+def build_webhooks_registry() -> Dict[str, List[Webhook]]:
+    """Map event types to active webhooks of active apps allowed to receive them."""
+    webhooks = (
+        Webhook.objects.filter(is_active=True, app__is_active=True)
+        .select_related("app")
+        .prefetch_related("events", "app__permissions__content_type")
+        .order_by("pk")
+    )
+    registry: Dict[str, List[Webhook]] = defaultdict(list)
+    for webhook in webhooks:
+        app_permissions = {
+            f"{permission.content_type.app_label}.{permission.codename}"
+            for permission in webhook.app.permissions.all()
+        }
+        event_types = {event.event_type for event in webhook.events.all()}
+        if WebhookEventAsyncType.ANY in event_types:
+            event_types.update(WebhookEventAsyncType.ALL)
+        for event_type in event_types:
+            required_permission = get_required_permission(event_type)
+            if required_permission and required_permission not in app_permissions:
+                continue
+            registry[event_type].append(webhook)
+    return dict(registry)
+
+
+def get_webhooks_registry() -> Dict[str, List[Webhook]]:
+    """Return webhooks by event type, shared by the whole process."""
+    return _webhooks_registry_cache.get_or_build(
+        WEBHOOKS_CACHE_VERSION_KEY, build_webhooks_registry
+    )
+
+
+def invalidate_webhooks_cache():
+    """Make all workers rebuild the webhooks registry once the transaction commits."""
+    _webhooks_registry_cache.invalidate()
+
 
 def get_webhooks_for_event(
     event_type: str, webhooks: Optional["QuerySet[Webhook]"] = None
-) -> "QuerySet[Webhook]":
-    """Get active webhooks from the database for an event."""
+) -> Union["QuerySet[Webhook]", List[Webhook]]:
+    """Get active webhooks for an event.
+
+    When `WEBHOOKS_CACHE_ENABLED` is set and no `webhooks` are given, they're taken
+    from the registry shared by the whole process instead of the database.
+    """
+    if webhooks is None and settings.WEBHOOKS_CACHE_ENABLED:
+        return get_webhooks_registry().get(event_type, [])
+
     permissions = {}
-    required_permission = WebhookEventAsyncType.PERMISSIONS.get(
-        event_type, WebhookEventSyncType.PERMISSIONS.get(event_type)
-    )
-    if required_permission:
-        app_label, codename = required_permission.value.split(".")
+    if required_permission := get_required_permission(event_type):
+        app_label, codename = required_permission.split(".")
         permissions["permissions__content_type__app_label"] = app_label
         permissions["permissions__codename"] = codename
 